@@ -0,0 +1,70 @@
+# 🔐 서비스 토큰 검증
+# 메인 API가 발급한 JWT(HS256, 공유 SECRET_KEY)를 검증하고 payload를 반환
+# 사용자 id(sub)와 구독 티어(tier)는 토큰에서만 가져옴 (요청 본문/쿼리 값은 신뢰하지 않음)
+# tier는 발급 시점 값 - 한도는 QuotaService.resolve_tier가 DB의 현재 티어로 다시 확인
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# 관리자/서비스 작업(팁 풀 재생성 등)을 허용하는 scope (공백 구분 scope 클레임) / role
+ADMIN_SCOPE = "coach:admin"
+ADMIN_ROLE = "admin"
+
+
+async def verify_token(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> dict:
+    """Bearer 토큰 검증 후 payload 반환"""
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="인증이 필요합니다",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if credentials is None:
+        raise unauthorized
+    try:
+        return jwt.decode(
+            credentials.credentials,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+    except JWTError as e:
+        raise unauthorized from e
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """검증된 토큰의 사용자"""
+
+    id: int
+    tier: str
+
+
+async def current_user(payload: dict = Depends(verify_token)) -> TokenUser:
+    """토큰 payload의 sub(사용자 id)/tier 클레임 (tier가 없으면 free)"""
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="토큰에 사용자 정보가 없습니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+    return TokenUser(id=user_id, tier=str(payload.get("tier") or "free"))
+
+
+async def require_admin(payload: dict = Depends(verify_token)) -> dict:
+    """scope에 coach:admin이 있거나 role이 admin인 토큰만 허용 (일반 사용자 토큰은 403)"""
+    scopes = str(payload.get("scope") or "").split()
+    if ADMIN_SCOPE not in scopes and payload.get("role") != ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다",
+        )
+    return payload
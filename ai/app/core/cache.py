@@ -0,0 +1,149 @@
+# 🧊 팁 캐시 (L1 인-프로세스 LRU + L2 Redis)
+# - L1: 항목 수/바이트 한도와 TTL이 있는 LRU (레플리카별, Redis 왕복 없이 응답)
+# - L2: Redis 문자열 + TTL (레플리카 간 공유)
+# 히트율 통계로 캐시가 절약한 LLM 호출 수를 측정
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """L2 캐시 백엔드 인터페이스"""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """Redis 없이 동작하는 인메모리 백엔드 (로컬 개발/벤치마크용)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+
+class RedisBackend(CacheBackend):
+    """Redis 백엔드 (장애 시 miss로 처리해 요청은 계속 진행)"""
+
+    def __init__(self, redis):
+        self._redis = redis
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self._redis.get(key)
+        except Exception as exc:  # Redis 장애는 캐시 miss로 취급
+            logger.warning("Redis 캐시 조회 실패: %s", exc)
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        try:
+            await self._redis.set(key, value, ex=ttl)
+        except Exception as exc:
+            logger.warning("Redis 캐시 저장 실패: %s", exc)
+
+
+class LRUCache:
+    """TTL과 항목 수/바이트 한도가 있는 인-프로세스 LRU (L1)"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        self._remove(key)
+        self._data[key] = (time.monotonic() + self.ttl, value, size)
+        self.bytes += size
+        while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted) = self._data.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """L1(LRU) → L2(백엔드) 순서로 조회하는 read-through 캐시"""
+
+    def __init__(self, backend: CacheBackend, l1: LRUCache, ttl: int):
+        self.backend = backend
+        self.l1 = l1
+        self.ttl = ttl
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.sets = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.l1.get(key)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+        value = await self.backend.get(key)
+        if value is not None:
+            self.l2_hits += 1
+            self.l1.set(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.sets += 1
+        self.l1.set(key, value)
+        await self.backend.set(key, value, self.ttl)
+
+    def stats(self) -> Dict[str, float]:
+        """히트/미스/축출 카운터와 히트율 (히트 수 = 절약한 LLM 호출 수)"""
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.l1_hits + self.l2_hits) / lookups, 4)
+            if lookups
+            else 0.0,
+            "sets": self.sets,
+            "l1_size": len(self.l1),
+            "l1_bytes": self.l1.bytes,
+            "l1_evictions": self.l1.evictions,
+        }
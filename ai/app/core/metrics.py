@@ -0,0 +1,85 @@
+# ⏱️ 지연시간/토큰 기록기
+# 지표 이름별 최근 N개 샘플을 보관해 p50/p95/p99를 계산 (프로세스 내, /coach/stats로 노출)
+import statistics
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyRecorder:
+    """이름별 지연시간(초) 샘플 저장소"""
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        if name not in self._samples:
+            self._samples[name] = deque(maxlen=self.window)
+            self._counts[name] = 0
+        self._samples[name].append(seconds)
+        self._counts[name] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """지표별 누적 횟수와 최근 창의 ms 단위 백분위"""
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            if len(ordered) > 1:
+                q = statistics.quantiles(ordered, n=100, method="inclusive")
+                p50, p95, p99 = q[49], q[94], q[98]
+            else:
+                p50 = p95 = p99 = ordered[0]
+            result[name] = {
+                "count": self._counts[name],
+                "p50_ms": round(p50 * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "p99_ms": round(p99 * 1000, 2),
+            }
+        return result
+
+
+latency = LatencyRecorder()
+
+
+class TokenRecorder:
+    """요청별 프롬프트/완성 토큰 수 (누적 합계 + 최근 N개 백분위)"""
+
+    KINDS = ("prompt", "completion")
+
+    def __init__(self, window: int = 2048):
+        self.requests = 0
+        self.truncated = 0
+        self._totals = dict.fromkeys(self.KINDS, 0)
+        self._samples: Dict[str, Deque[int]] = {
+            kind: deque(maxlen=window) for kind in self.KINDS
+        }
+
+    def record(self, prompt: int, completion: int, truncated: bool = False) -> None:
+        self.requests += 1
+        self.truncated += truncated
+        for kind, value in zip(self.KINDS, (prompt, completion), strict=True):
+            self._totals[kind] += value
+            self._samples[kind].append(value)
+
+    def summary(self) -> Dict[str, object]:
+        """누적 요청 수/예산 때문에 스텝을 줄인 요청 수와 종류별 토큰 분포"""
+        result: Dict[str, object] = {
+            "requests": self.requests,
+            "truncated": self.truncated,
+        }
+        for kind in self.KINDS:
+            ordered = sorted(self._samples[kind])
+            if not ordered:
+                continue
+            result[kind] = {
+                "total": self._totals[kind],
+                "mean": round(self._totals[kind] / self.requests, 1),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+                "max": ordered[-1],
+            }
+        return result
+
+
+tokens = TokenRecorder()
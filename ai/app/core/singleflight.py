@@ -0,0 +1,156 @@
+# 🛫 single-flight 요청 합치기
+# 같은 키로 동시에 들어온 생성 요청은 진행 중인 1건의 결과를 함께 기다림
+# - 프로세스 내: 키별 asyncio.Task 공유 (요청이 끊겨도 생성은 끝까지 진행되어 다른 대기자에게 전달)
+# - 레플리카 간(선택): Redis SET NX 락을 잡은 쪽만 생성, 나머지는 캐시에 결과가 써질 때까지 대기
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 락 소유자만 해제하도록 토큰 비교 후 삭제
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """레플리카 간 생성 락 (SET NX PX + 토큰 비교 해제)"""
+
+    def __init__(self, redis, ttl_ms: int, wait_timeout: float, poll_interval: float):
+        self.redis = redis
+        self.ttl_ms = ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    async def acquire(self, key: str) -> Optional[str]:
+        """락 획득 시 토큰, 이미 잠겨 있으면 None"""
+        token = uuid.uuid4().hex
+        if await self.redis.set(f"{key}:lock", token, nx=True, px=self.ttl_ms):
+            return token
+        return None
+
+    async def release(self, key: str, token: str) -> None:
+        await self.redis.eval(_RELEASE_SCRIPT, 1, f"{key}:lock", token)
+
+    async def is_locked(self, key: str) -> bool:
+        return bool(await self.redis.exists(f"{key}:lock"))
+
+
+class SingleFlight:
+    """키별 진행 중 작업 공유"""
+
+    LEADER = "leader"  # 이 요청이 직접 생성
+    COALESCED = "coalesced"  # 같은 프로세스의 진행 중 생성 결과를 공유
+    REMOTE = "remote"  # 다른 레플리카가 생성해 캐시에 쓴 결과를 사용
+
+    def __init__(self, lock: Optional[RedisLock] = None):
+        self.lock = lock
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote = 0
+        self.lock_timeouts = 0
+        self.lock_errors = 0
+        self.failures = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Tuple[Any, str]:
+        """
+        key의 작업을 실행하거나 진행 중인 작업에 합류
+
+        recheck: 분산 락 대기 중/획득 직후 결과가 이미 준비됐는지 확인 (보통 캐시 조회)
+        반환: (결과, LEADER | COALESCED | REMOTE)
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            value, _ = await asyncio.shield(task)
+            return value, self.COALESCED
+
+        task = asyncio.ensure_future(self._run(key, fn, recheck))
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]],
+    ) -> Tuple[Any, str]:
+        if self.lock is None:
+            self.leaders += 1
+            return await fn(), self.LEADER
+
+        token = None
+        try:
+            token = await self.lock.acquire(key)
+            if token is None:
+                value = await self._wait_remote(key, recheck)
+                if value is not None:
+                    self.remote += 1
+                    return value, self.REMOTE
+                token = await self.lock.acquire(key)
+            elif recheck is not None:
+                # 락을 잡기 직전에 다른 레플리카가 끝냈을 수 있음
+                value = await recheck()
+                if value is not None:
+                    self.remote += 1
+                    return value, self.REMOTE
+        except Exception as exc:  # Redis 장애 시 프로세스 내 합치기만 적용
+            self.lock_errors += 1
+            logger.warning("single-flight 락 오류 (%s): %s", key, exc)
+
+        self.leaders += 1
+        try:
+            return await fn(), self.LEADER
+        finally:
+            if token is not None:
+                try:
+                    await self.lock.release(key, token)
+                except Exception as exc:
+                    logger.warning("single-flight 락 해제 실패 (%s): %s", key, exc)
+
+    async def _wait_remote(
+        self, key: str, recheck: Optional[Callable[[], Awaitable[Any]]]
+    ) -> Any:
+        """다른 레플리카의 결과를 기다림 (락이 풀리거나 시간 초과 시 None)"""
+        deadline = time.monotonic() + self.lock.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.lock.poll_interval)
+            if recheck is not None:
+                value = await recheck()
+                if value is not None:
+                    return value
+            if not await self.lock.is_locked(key):
+                return await recheck() if recheck is not None else None
+        self.lock_timeouts += 1
+        return None
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, int]:
+        """합치기 카운터 (coalesced + remote = 절약한 LLM 호출 수)"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "remote": self.remote,
+            "lock_timeouts": self.lock_timeouts,
+            "lock_errors": self.lock_errors,
+            "failures": self.failures,
+            "in_flight": len(self._calls),
+        }
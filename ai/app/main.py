@@ -2,29 +2,92 @@
 # 루틴 퀘스트의 AI 코치 기능을 담당하는 분리된 서비스
 # PRD 요구사항: 짧은 팁(200-300자), 월 n회 제한, 캐싱, 배치 생성
 
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
+from fastapi.responses import StreamingResponse
 
 from app.core.config import settings
+from app.core.metrics import latency, tokens
+from app.core.singleflight import RedisLock, SingleFlight
 from app.services.coach_service import CoachService
-from app.core.auth import verify_token
+from app.services.llm import LLMDeadlineExceededError, LLMUnavailableError
+from app.services.quota import QuotaExceededError
+from app.core.auth import TokenUser, current_user, require_admin, verify_token
+
+logger = logging.getLogger(__name__)
 
-# Sentry 초기화
+# Sentry 초기화 (DSN이 있을 때만 임포트 - sentry_sdk 임포트 비용 절약)
 if settings.SENTRY_DSN:
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
         integrations=[FastApiIntegration()],
         environment=settings.ENVIRONMENT,
     )
 
+# 📋 코치 서비스 인스턴스 / 🛫 single-flight
+# lifespan 시작 시 생성 (임포트만으로 Redis 클라이언트/LLM 백엔드/토큰 인코더를 만들지 않도록
+# - 워커 부팅, 오토스케일링, 테스트 수집이 빨라지고 fork 전에 연결이 생기지 않음)
+coach_service: Optional[CoachService] = None
+tip_flight: Optional[SingleFlight] = None
+
+# 📊 응답 출처별 팁 요청 수 (pool / cache / generated / coalesced / fallback)
+tip_sources = Counter()
+
+async def create_services():
+    """코치 서비스와 single-flight 생성"""
+    global coach_service, tip_flight
+    coach_service = CoachService()
+    # 같은 캐시 키의 동시 팁 생성을 1회로 합침 (선택적으로 레플리카 간에도)
+    tip_flight = SingleFlight(
+        lock=RedisLock(
+            coach_service.redis,
+            ttl_ms=settings.SINGLEFLIGHT_LOCK_TTL_MS,
+            wait_timeout=settings.SINGLEFLIGHT_WAIT_TIMEOUT_SECONDS,
+            poll_interval=settings.SINGLEFLIGHT_POLL_INTERVAL_SECONDS,
+        )
+        if settings.SINGLEFLIGHT_DISTRIBUTED
+        else None
+    )
+
+async def start_quota_writeback():
+    """DB(coach_usage)에서 사용량 복원 후 주기적 write-back 시작"""
+    await coach_service.quota.restore()
+    coach_service.quota.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    🏁 시작: 서비스 생성 → 세그먼트 팁 풀 불러오기 → 사용량 복원/write-back 시작
+    🛑 종료: 남은 사용량 카운터를 DB에 기록 → Redis 연결 정리
+    """
+    await create_services()
+    try:
+        coach_service.load_tip_pool()
+        await start_quota_writeback()
+        yield
+    finally:
+        try:
+            await coach_service.quota.stop()
+        finally:
+            await coach_service.close()
+
 # 🤖 AI 서비스 앱 인스턴스
 app = FastAPI(
     title="Routine Quest AI Service",
     description="AI 코치 마이크로서비스 - 개인화된 루틴 팁 생성",
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -36,92 +99,265 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 📋 코치 서비스 인스턴스
-coach_service = CoachService()
-
 @app.get("/health")
 async def health_check():
     """AI 서비스 헬스체크"""
     return {"status": "healthy", "service": "ai"}
 
+async def subscriber(user: TokenUser = Depends(current_user)) -> TokenUser:
+    """토큰 사용자 + 현재 구독 티어 (DB 기준 - 토큰의 tier는 발급 시점 값이라 DB가 없을 때만)"""
+    tier = await coach_service.quota.resolve_tier(user.id, user.tier)
+    return TokenUser(id=user.id, tier=tier)
+
 @app.post("/coach/tip")
 async def generate_tip(
-    user_id: int,
     routine_data: dict,
     user_stats: dict,
-    user_token: dict = Depends(verify_token)
+    user: TokenUser = Depends(subscriber)
 ):
     """
     🎯 AI 코치 팁 생성
-    
+
     PRD 요구사항:
     - 200-300자 짧은 팁
-    - 구독 크레딧 차감
+    - 구독 크레딧 차감 (새로 생성할 때만, 한도 초과면 429)
     - Redis 캐싱
     - 개인화된 조언
+    - 같은 캐시 키의 동시 요청은 생성 1회를 공유 (single-flight)
+    - 하드 데드라인 초과/모든 공급자 서킷 열림 시 최근 팁/템플릿 팁으로 응답
+      (source: fallback, 차감 없음)
+    - 무료/기본 티어는 세그먼트 팁 풀에서 먼저 응답 (source: pool, LLM 호출/차감 없음)
+    사용자 id는 토큰, 티어는 현재 구독 기준 (user_stats의 tier는 무시)
     """
+    started = time.perf_counter()
+    user_id = user.id
+    user_stats = {**user_stats, "tier": user.tier}
     try:
+        # 세그먼트 팁 풀 확인
+        pooled_tip = coach_service.pool_tip(user_id, routine_data, user_stats)
+        if pooled_tip:
+            tip_sources["pool"] += 1
+            latency.record("tip.pool.total", time.perf_counter() - started)
+            return {"tip": pooled_tip, "source": "pool"}
+
         # 캐시 확인
-        cached_tip = await coach_service.get_cached_tip(user_id, routine_data)
+        cached_tip = await coach_service.get_cached_tip(
+            user_id, routine_data, user_stats
+        )
         if cached_tip:
+            tip_sources["cache"] += 1
+            latency.record("tip.cache.total", time.perf_counter() - started)
             return {"tip": cached_tip, "source": "cache"}
-        
-        # 새로운 팁 생성
-        tip = await coach_service.generate_personalized_tip(
-            user_id=user_id,
-            routine_data=routine_data,
-            user_stats=user_stats
+
+        async def generate():
+            # 새로운 팁 생성 → (팁, 대체 팁 여부)
+            try:
+                tip = await coach_service.generate_personalized_tip(
+                    user_id=user_id,
+                    routine_data=routine_data,
+                    user_stats=user_stats
+                )
+            except (LLMDeadlineExceededError, LLMUnavailableError):
+                # 크레딧은 환불됨, 대체 팁은 캐시에 저장하지 않음 (다음 요청에서 재시도)
+                fallback = await coach_service.fallback_tip(
+                    user_id, routine_data, user_stats
+                )
+                return fallback, True
+            # 캐시 저장
+            await coach_service.cache_tip(user_id, routine_data, tip, user_stats)
+            return tip, False
+
+        async def recheck():
+            tip = await coach_service.get_cached_tip(user_id, routine_data, user_stats)
+            return (tip, False) if tip else None
+
+        (tip, is_fallback), outcome = await tip_flight.do(
+            coach_service.cache_key(user_id, routine_data, user_stats),
+            generate,
+            recheck=recheck,
         )
-        
-        # 캐시 저장
-        await coach_service.cache_tip(user_id, routine_data, tip)
-        
-        return {"tip": tip, "source": "generated"}
-        
+        source = "fallback" if is_fallback else {
+            SingleFlight.LEADER: "generated",
+            SingleFlight.COALESCED: "coalesced",
+            SingleFlight.REMOTE: "cache",
+        }[outcome]
+        tip_sources[source] += 1
+        latency.record(f"tip.{source}.total", time.perf_counter() - started)
+
+        return {"tip": tip, "source": source}
+
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"팁 생성 중 오류가 발생했습니다: {str(e)}"
-        )
+        ) from e
+
+def sse_event(event: str, data: dict) -> str:
+    """SSE 이벤트 1개 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/coach/tip/stream")
+async def stream_tip(
+    routine_data: dict,
+    user_stats: dict,
+    user: TokenUser = Depends(subscriber)
+):
+    """
+    🌊 AI 코치 팁 스트리밍 (Server-Sent Events)
+
+    - 팁 풀/캐시 hit: tip 이벤트 1개로 즉시 응답
+    - 캐시 miss: 공급자 토큰을 token 이벤트로 중계, 완료 시 캐시 저장
+    - 첫 토큰이 하드 데드라인을 넘기거나 모든 공급자 서킷이 열려 있으면 대체 팁을 tip 이벤트로 전달
+    - 마지막에 done 이벤트 (실패 시 error 이벤트, 한도 초과면 status 429)
+    첫 바이트까지(TTFB)와 전체 지연시간을 따로 기록
+    사용자 id는 토큰, 티어는 현재 구독 기준 (user_stats의 tier는 무시)
+    """
+    started = time.perf_counter()
+    user_id = user.id
+    user_stats = {**user_stats, "tier": user.tier}
+
+    async def events():
+        first = True
+
+        def emit(event: str, data: dict) -> str:
+            nonlocal first
+            if first:
+                first = False
+                latency.record(
+                    f"tip_stream.{source}.ttfb", time.perf_counter() - started
+                )
+            return sse_event(event, data)
+
+        source = "pool"
+        cached_tip = coach_service.pool_tip(user_id, routine_data, user_stats)
+        if not cached_tip:
+            source = "cache"
+            cached_tip = await coach_service.get_cached_tip(
+                user_id, routine_data, user_stats
+            )
+        if cached_tip:
+            yield emit("tip", {"tip": cached_tip, "source": source})
+        else:
+            source = "generated"
+            try:
+                async for chunk in coach_service.stream_personalized_tip(
+                    user_id, routine_data, user_stats
+                ):
+                    yield emit("token", {"text": chunk})
+            except QuotaExceededError as e:
+                yield emit("error", {"status": 429, "detail": str(e)})
+                return
+            except (LLMDeadlineExceededError, LLMUnavailableError):
+                source = "fallback"
+                fallback = await coach_service.fallback_tip(
+                    user_id, routine_data, user_stats
+                )
+                yield emit("tip", {"tip": fallback, "source": source})
+            except Exception as e:
+                logger.exception("팁 스트리밍 중 오류")
+                yield emit(
+                    "error", {"detail": f"팁 생성 중 오류가 발생했습니다: {str(e)}"}
+                )
+                return
+        yield sse_event("done", {"source": source})
+        tip_sources[source] += 1
+        latency.record(f"tip_stream.{source}.total", time.perf_counter() - started)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.post("/coach/batch-generate")
 async def batch_generate_tips(
     batch_request: dict,
-    admin_token: dict = Depends(verify_token)  # 관리자 전용
+    admin_token: dict = Depends(require_admin)  # 관리자 전용 (scope/role 확인)
 ):
     """
     📦 배치 팁 생성 (Celery 작업용)
-    
+
     대량의 사용자를 위한 팁을 미리 생성하여
     응답 속도를 개선하고 API 비용을 절약
+
+    진행 상황은 NDJSON으로 스트리밍 (start → item... → done)
+    중단되면 start 이벤트의 job_id를 넣어 다시 요청하면 남은 항목만 처리
+    """
+    async def stream():
+        try:
+            async for event in coach_service.stream_batch(batch_request):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.exception("배치 생성 중 오류")
+            yield json.dumps(
+                {"event": "error", "detail": f"배치 생성 중 오류: {str(e)}"},
+                ensure_ascii=False,
+            ) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/coach/pool/build")
+async def build_tip_pool(
+    pool_request: dict,
+    admin_token: dict = Depends(require_admin)  # 관리자 전용 (scope/role 확인)
+):
+    """
+    🧩 세그먼트 팁 풀 재생성 (야간 작업용)
+
+    사용자 표본을 세그먼트로 묶고 세그먼트별 팁을 미리 생성해 교체
+    요청 형식은 배치 생성과 같음 (items) + segments / tips_per_segment
     """
     try:
-        result = await coach_service.batch_generate_tips(batch_request)
-        return {"status": "success", "generated_count": result}
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"배치 생성 중 오류: {str(e)}"
-        )
+        return await coach_service.rebuild_tip_pool(pool_request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
 @app.get("/coach/usage/{user_id}")
 async def get_usage_stats(
     user_id: int,
-    user_token: dict = Depends(verify_token)
+    user: TokenUser = Depends(subscriber)
 ):
     """
     📊 사용자별 AI 코치 이용 현황
-    
-    월 사용 횟수, 남은 크레딧 등을 반환
+
+    월 사용 횟수, 남은 크레딧 등을 반환 (본인만 조회, 한도는 현재 구독 티어 기준)
     """
+    if user_id != user.id:
+        raise HTTPException(status_code=403, detail="본인의 사용 현황만 조회할 수 있습니다")
     try:
-        usage = await coach_service.get_user_usage(user_id)
+        usage = await coach_service.get_user_usage(user.id, user.tier)
         return usage
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"사용 현황 조회 오류: {str(e)}"
-        )
+        ) from e
+
+@app.get("/coach/stats")
+async def get_coach_stats(user_token: dict = Depends(verify_token)):
+    """
+    📈 코치 서비스 내부 지표
+
+    single-flight로 합쳐진 호출 수, 팁 캐시 히트율 (둘 다 절약한 LLM 호출 수),
+    한도 초과로 거절한 요청 수, LLM 공급자별 상태 (서킷/헤지/장애 조치),
+    응답 출처별 요청 수와 팁 풀에서 응답한 비율, 요청별 토큰 수 분포
+    """
+    total = sum(tip_sources.values())
+    return {
+        "singleflight": tip_flight.stats(),
+        "tip_cache": coach_service.tip_cache.stats(),
+        "latency": latency.summary(),
+        "tokens": tokens.summary(),
+        "quota": coach_service.quota.stats(),
+        "llm": coach_service.llm.stats(),
+        "tip_sources": dict(tip_sources),
+        "tip_pool": {
+            **(coach_service.tip_pool.stats() if coach_service.tip_pool else {}),
+            "served_fraction": round(tip_sources["pool"] / total, 4) if total else 0.0,
+        },
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -130,4 +366,4 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8001,  # 메인 API와 다른 포트
         reload=True if settings.ENVIRONMENT == "development" else False,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,224 @@
+# 📦 배치 팁 생성 파이프라인
+# 야간 배치처럼 큰 입력을 LLM 공급자를 과부하시키지 않고 처리
+# - 동시 실행 수 제한 (워커 N개가 큐에서 항목을 가져감, 입력은 큐 크기만큼만 메모리에 올라감)
+# - 분당 토큰 예산 (토큰 버킷, 예상치로 선차감 후 실제 사용량으로 보정)
+# - 지터가 있는 지수 백오프 재시도 (full jitter)
+# - 팁 캐시/같은 배치 안의 중복 키는 생성하지 않음
+# - 완료한 항목 인덱스를 체크포인트에 기록 → 같은 job_id로 다시 실행하면 남은 항목만 처리
+# 진행 상황은 항목마다 이벤트(dict)로 내보내고, API는 이를 NDJSON으로 스트리밍
+import asyncio
+import logging
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.services.llm import LLMError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """분당 토큰 예산 (연속 충전, 잔량이 음수면 회복될 때까지 대기)"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    async def acquire(self, tokens: int) -> None:
+        """tokens만큼 차감 (예산이 모자라면 충전될 때까지 대기)"""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+    def adjust(self, delta: int) -> None:
+        """실제 사용량과 예상치의 차이 보정 (양수면 추가 차감)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class CheckpointStore:
+    """job_id별 완료 항목 인덱스 저장소 인터페이스"""
+
+    async def load(self, job_id: str) -> Set[int]:
+        raise NotImplementedError
+
+    async def mark(self, job_id: str, index: int) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """프로세스 내 체크포인트 (로컬 개발/벤치마크용)"""
+
+    def __init__(self):
+        self._done: Dict[str, Set[int]] = {}
+
+    async def load(self, job_id: str) -> Set[int]:
+        return set(self._done.get(job_id, set()))
+
+    async def mark(self, job_id: str, index: int) -> None:
+        self._done.setdefault(job_id, set()).add(index)
+
+
+class RedisCheckpointStore(CheckpointStore):
+    """Redis 집합 체크포인트 (레플리카/재시작 간 유지)"""
+
+    def __init__(self, redis, ttl: int = 60 * 60 * 24 * 7):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, job_id: str) -> str:
+        return f"rq:batch:{job_id}:done"
+
+    async def load(self, job_id: str) -> Set[int]:
+        return {int(index) for index in await self.redis.smembers(self._key(job_id))}
+
+    async def mark(self, job_id: str, index: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(self._key(job_id), index)
+            pipe.expire(self._key(job_id), self.ttl)
+            await pipe.execute()
+
+
+class BatchPipeline:
+    """동시성/토큰 예산이 제한된 배치 팁 생성기"""
+
+    def __init__(
+        self,
+        coach_service,
+        checkpoints: CheckpointStore,
+        concurrency: int = 8,
+        tokens_per_minute: int = 90_000,
+        estimated_tokens: int = 600,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+    ):
+        self.coach_service = coach_service
+        self.checkpoints = checkpoints
+        self.concurrency = max(concurrency, 1)
+        self.budget = TokenBucket(tokens_per_minute)
+        self.estimated_tokens = estimated_tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    async def run(
+        self, items: List[Dict[str, Any]], job_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """항목별 진행 이벤트를 생성 순서대로 내보냄 (start → item... → done)"""
+        job_id = job_id or uuid.uuid4().hex
+        done = await self.checkpoints.load(job_id)
+        pending = [index for index in range(len(items)) if index not in done]
+        counts = {"generated": 0, "cached": 0, "duplicate": 0, "failed": 0}
+        yield {
+            "event": "start",
+            "job_id": job_id,
+            "total": len(items),
+            "resumed": len(items) - len(pending),
+        }
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        events: asyncio.Queue = asyncio.Queue()
+        seen_keys: Set[str] = set()
+        started = time.monotonic()
+
+        async def produce() -> None:
+            for index in pending:
+                await queue.put(index)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            while True:
+                index = await queue.get()
+                if index is None:
+                    return
+                await events.put(
+                    await self._process(job_id, index, items[index], seen_keys)
+                )
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            for _ in pending:
+                event = await events.get()
+                counts[event["status"]] += 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        yield {
+            "event": "done",
+            "job_id": job_id,
+            **counts,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    async def _process(
+        self, job_id: str, index: int, item: Dict[str, Any], seen_keys: Set[str]
+    ) -> Dict[str, Any]:
+        user_id = item["user_id"]
+        routine_data = item.get("routine_data", {})
+        user_stats = item.get("user_stats", {})
+        event = {"event": "item", "index": index, "user_id": user_id, "attempts": 0}
+
+        key = self.coach_service.cache_key(user_id, routine_data, user_stats)
+        if key in seen_keys:
+            event["status"] = "duplicate"
+        elif await self.coach_service.get_cached_tip(user_id, routine_data, user_stats):
+            event["status"] = "cached"
+        else:
+            seen_keys.add(key)
+            event["status"] = "failed"
+            for attempt in range(self.max_retries + 1):
+                event["attempts"] = attempt + 1
+                try:
+                    await self.budget.acquire(self.estimated_tokens)
+                    result = await self.coach_service.generate_tip_result(
+                        routine_data, user_stats
+                    )
+                    self.budget.adjust(result.total_tokens - self.estimated_tokens)
+                    await self.coach_service.cache_tip(
+                        user_id, routine_data, result.text, user_stats
+                    )
+                    event["status"] = "generated"
+                    event["tokens"] = result.total_tokens
+                    break
+                except LLMError as exc:
+                    event["error"] = str(exc)
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt))
+                except Exception as exc:  # 재시도해도 소용없는 오류 (입력 오류 등)
+                    event["error"] = str(exc)
+                    logger.exception("배치 항목 처리 오류 (job=%s, index=%d)", job_id, index)
+                    break
+            else:
+                logger.warning("배치 항목 생성 실패 (job=%s, index=%d)", job_id, index)
+
+        if event["status"] != "failed":
+            event.pop("error", None)
+            await self.checkpoints.mark(job_id, index)
+        return event
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter: 0 ~ min(cap, base * 2^attempt)"""
+        return random.uniform(
+            0, min(self.backoff_cap, self.backoff_base * 2**attempt)
+        )
@@ -0,0 +1,305 @@
+# 🧑‍🏫 AI 코치 서비스
+# PRD 요구사항: 짧은 팁(200-300자), 월 n회 제한, 캐싱, 배치 생성
+# 팁은 정규화된 (사용자, 루틴, 통계 구간) 키로 L1 LRU + L2 Redis에 캐싱하고,
+# 생성은 교체 가능한 LLM 백엔드(app.services.llm) 사용
+# 공급자가 하드 데드라인 안에 응답하지 못하거나 모든 공급자 서킷이 열려 있으면
+# 사용자의 최근 팁 또는 템플릿 팁으로 대체
+# 무료/기본 티어는 세그먼트 팁 풀(app.services.tip_pool)에서 먼저 찾고, 없을 때만 생성
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+import redis.asyncio as redis
+
+from app.core.cache import InMemoryBackend, LRUCache, RedisBackend, TieredCache
+from app.core.config import settings
+from app.core.metrics import tokens
+from app.services.batch_pipeline import (
+    BatchPipeline,
+    InMemoryCheckpointStore,
+    RedisCheckpointStore,
+)
+from app.services.llm import LLMBackend, LLMResult, Messages, create_llm_backend
+from app.services.prompts import BuiltPrompt, TipPromptBuilder, TokenCounter
+from app.services.quota import (
+    InMemoryQuotaStore,
+    DatabaseQuotaSnapshot,
+    QuotaService,
+    RedisQuotaStore,
+)
+from app.services.tip_keys import as_number, step_order, tip_cache_key
+
+if TYPE_CHECKING:
+    # 팁 풀은 numpy를 쓰므로 풀을 불러오거나 만들 때 임포트 (임포트 시간 절약)
+    from app.services.tip_pool import TipPool
+
+logger = logging.getLogger(__name__)
+
+# LLM 없이 만드는 대체 팁 (하드 데드라인 초과 또는 공급자 없음)
+FALLBACK_TIP_TEMPLATES = {
+    "streak": "{streak}일째 이어 온 흐름을 지키는 것이 오늘의 목표입니다. 컨디션이 좋지 않다면 '{step}' 하나만이라도 끝내 보세요. 완벽하게 하는 것보다 끊기지 않는 것이 습관을 만드는 가장 빠른 길입니다.",
+    "default": "오늘은 '{step}'부터 가볍게 시작해 보세요. 첫 스텝을 부담 없이 넘기면 다음 스텝으로 넘어가는 관성이 생깁니다. 시간이 부족한 날에는 시간을 절반으로 줄여서라도 루틴을 이어 가는 것이 중요합니다.",
+}
+
+
+class CoachService:
+    """AI 코치 팁 생성/캐싱/사용량 조회"""
+
+    def __init__(
+        self, redis_url: Optional[str] = None, llm: Optional[LLMBackend] = None
+    ):
+        self.redis = redis.from_url(redis_url or settings.REDIS_URL)
+        use_redis = settings.TIP_CACHE_BACKEND == "redis"
+        self.tip_cache = TieredCache(
+            backend=RedisBackend(self.redis) if use_redis else InMemoryBackend(),
+            l1=LRUCache(
+                settings.TIP_CACHE_L1_MAX_ENTRIES,
+                settings.TIP_CACHE_L1_MAX_BYTES,
+                settings.TIP_CACHE_L1_TTL_SECONDS,
+            ),
+            ttl=settings.TIP_CACHE_TTL_SECONDS,
+        )
+        self.llm = llm or create_llm_backend(settings.LLM_BACKEND)
+        # 배치 체크포인트는 팁 캐시와 같은 저장소 사용 (Redis면 재시작 후에도 이어서 실행)
+        self.checkpoints = (
+            RedisCheckpointStore(self.redis) if use_redis else InMemoryCheckpointStore()
+        )
+        self.quota = QuotaService(
+            store=(
+                RedisQuotaStore(self.redis)
+                if settings.QUOTA_BACKEND == "redis"
+                else InMemoryQuotaStore()
+            ),
+            limits=settings.COACH_MONTHLY_LIMITS,
+            snapshot=(
+                DatabaseQuotaSnapshot(settings.QUOTA_DATABASE_URL)
+                if settings.QUOTA_DATABASE_URL
+                else None
+            ),
+            flush_interval=settings.QUOTA_FLUSH_INTERVAL_SECONDS,
+            reservation_ttl=settings.QUOTA_RESERVATION_TTL_SECONDS,
+            tier_ttl=settings.QUOTA_TIER_CACHE_SECONDS,
+        )
+        self.tip_pool: Optional["TipPool"] = None
+        # 프롬프트 템플릿/토큰 인코더는 시작 시 1회 준비
+        self.prompts = TipPromptBuilder(
+            TokenCounter(settings.OPENAI_MODEL), settings.TIP_PROMPT_TOKEN_BUDGET
+        )
+
+    async def close(self) -> None:
+        """Redis 연결 풀 정리 (앱 종료 시)"""
+        await self.redis.aclose()
+
+    # 🔑 캐시 키
+    def cache_key(
+        self,
+        user_id: int,
+        routine_data: Dict[str, Any],
+        user_stats: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """정규화된 루틴/통계 기반 팁 캐시 키 (app.services.tip_keys 참고)"""
+        return tip_cache_key(user_id, routine_data, user_stats)
+
+    def last_tip_key(self, user_id: int) -> str:
+        """사용자에게 마지막으로 생성한 팁 (대체 팁용)"""
+        return f"rq:tip:v2:{user_id}:last"
+
+    # 💾 팁 캐시
+    async def get_cached_tip(
+        self,
+        user_id: int,
+        routine_data: Dict[str, Any],
+        user_stats: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        return await self.tip_cache.get(
+            self.cache_key(user_id, routine_data, user_stats)
+        )
+
+    async def cache_tip(
+        self,
+        user_id: int,
+        routine_data: Dict[str, Any],
+        tip: str,
+        user_stats: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        await self.tip_cache.set(self.cache_key(user_id, routine_data, user_stats), tip)
+        await self.tip_cache.set(self.last_tip_key(user_id), tip)
+
+    async def fallback_tip(
+        self, user_id: int, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> str:
+        """LLM 없이 응답할 팁 (최근 팁 → 루틴 기반 템플릿 순)"""
+        last_tip = await self.tip_cache.get(self.last_tip_key(user_id))
+        if last_tip:
+            return last_tip
+        steps = [s for s in routine_data.get("steps") or [] if isinstance(s, dict)]
+        steps.sort(key=step_order)
+        step = (steps[0].get("title") if steps else None) or "첫 스텝"
+        streak = round(as_number((user_stats or {}).get("streak")) or 0)
+        template = FALLBACK_TIP_TEMPLATES["streak" if streak >= 3 else "default"]
+        return template.format(step=step, streak=streak)
+
+    # 🧩 세그먼트 팁 풀
+    def load_tip_pool(self) -> None:
+        """TIP_POOL_PATH의 팁 풀 불러오기 (없으면 풀 없이 동작)"""
+        if settings.TIP_POOL_PATH:
+            from app.services.tip_pool import TipPool
+
+            self.tip_pool = TipPool.load(settings.TIP_POOL_PATH)
+
+    def pool_tip(
+        self, user_id: int, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> Optional[str]:
+        """풀 대상 티어면 가장 가까운 세그먼트의 팁 (프리미엄 티어/miss는 None)"""
+        if self.tip_pool is None:
+            return None
+        if (user_stats.get("tier") or "free") not in settings.TIP_POOL_TIERS:
+            self.tip_pool.bypassed += 1
+            return None
+        return self.tip_pool.lookup(user_id, routine_data, user_stats)
+
+    async def rebuild_tip_pool(self, pool_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        사용자 표본으로 팁 풀을 다시 만들고 저장/교체
+
+        pool_request:
+        - items: [{"user_id", "routine_data", "user_stats"}, ...] (최근 요청 표본)
+        - segments / tips_per_segment: 없으면 설정값
+        """
+        from app.services.tip_pool import build_tip_pool
+
+        pool = await build_tip_pool(
+            pool_request.get("items", []),
+            self.llm,
+            segments=pool_request.get("segments") or settings.TIP_POOL_SEGMENTS,
+            tips_per_segment=pool_request.get("tips_per_segment")
+            or settings.TIP_POOL_TIPS_PER_SEGMENT,
+            max_tokens=settings.TIP_MAX_TOKENS,
+            concurrency=settings.BATCH_CONCURRENCY,
+        )
+        if settings.TIP_POOL_PATH:
+            await asyncio.to_thread(pool.save, settings.TIP_POOL_PATH)
+        self.tip_pool = pool
+        return pool.stats()
+
+    # 🤖 팁 생성
+    def build_messages(
+        self, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> Messages:
+        """토큰 예산 안의 팁 프롬프트 (app.services.prompts 참고)"""
+        return self.prompts.build(routine_data, user_stats).messages
+
+    def _record_tokens(
+        self, prompt: BuiltPrompt, text: str, result: Optional[LLMResult] = None
+    ) -> LLMResult:
+        """
+        요청별 토큰 수 기록/로그
+
+        공급자가 사용량을 주면 그 값(과금 기준), 없으면 인코더로 센 값 사용
+        """
+        result = result or LLMResult(text=text)
+        result.prompt_tokens = result.prompt_tokens or prompt.prompt_tokens
+        result.completion_tokens = result.completion_tokens or (
+            self.prompts.counter.count(text)
+        )
+        tokens.record(result.prompt_tokens, result.completion_tokens, prompt.truncated)
+        logger.info(
+            "팁 토큰 사용량: prompt=%d (예상 %d) completion=%d 스텝=%d/%d",
+            result.prompt_tokens,
+            prompt.prompt_tokens,
+            result.completion_tokens,
+            prompt.steps_included,
+            prompt.steps_total,
+        )
+        return result
+
+    async def generate_tip_result(
+        self, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> LLMResult:
+        """팁 생성 (사용량 차감 없음 - 배치 선생성용)"""
+        prompt = self.prompts.build(routine_data, user_stats)
+        result = await self.llm.generate(prompt.messages, settings.TIP_MAX_TOKENS)
+        return self._record_tokens(prompt, result.text, result)
+
+    async def generate_personalized_tip(
+        self, user_id: int, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> str:
+        """
+        루틴/통계 기반 개인화 팁 생성
+
+        크레딧 1개를 예약한 뒤 생성, 성공하면 확정하고 실패/취소되면 환불
+        (한도 초과면 LLM 호출 없이 QuotaExceededError)
+        user_stats["tier"]는 호출 측이 검증된 토큰의 티어로 채움
+        """
+        reservation = await self.quota.reserve(user_id, user_stats.get("tier"))
+        try:
+            result = await self.generate_tip_result(routine_data, user_stats)
+        except BaseException:
+            reservation.release()
+            raise
+        await reservation.commit()
+        return result.text
+
+    async def stream_personalized_tip(
+        self, user_id: int, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        팁을 토큰 단위로 스트리밍
+
+        끝까지 전달된 경우에만 캐시 저장/크레딧 확정
+        (중간에 연결이 끊기거나 실패하면 부분 텍스트는 버리고 크레딧 환불)
+        """
+        reservation = await self.quota.reserve(user_id, user_stats.get("tier"))
+        prompt = self.prompts.build(routine_data, user_stats)
+        parts = []
+        try:
+            async for chunk in self.llm.stream(
+                prompt.messages, settings.TIP_MAX_TOKENS
+            ):
+                parts.append(chunk)
+                yield chunk
+        except BaseException:
+            reservation.release()
+            raise
+        await reservation.commit()
+        tip = "".join(parts).strip()
+        self._record_tokens(prompt, tip)
+        await self.cache_tip(user_id, routine_data, tip, user_stats)
+
+    # 📦 배치 생성
+    def batch_pipeline(self, concurrency: Optional[int] = None) -> BatchPipeline:
+        return BatchPipeline(
+            self,
+            self.checkpoints,
+            concurrency=concurrency or settings.BATCH_CONCURRENCY,
+            tokens_per_minute=settings.BATCH_TOKENS_PER_MINUTE,
+            estimated_tokens=settings.BATCH_ESTIMATED_TOKENS,
+            max_retries=settings.BATCH_MAX_RETRIES,
+        )
+
+    def stream_batch(self, batch_request: Dict[str, Any]) -> AsyncIterator[Dict]:
+        """
+        배치 선생성 진행 이벤트 스트림
+
+        batch_request:
+        - items: [{"user_id", "routine_data", "user_stats"}, ...]
+        - job_id: 이어서 실행할 작업 id (없으면 새로 발급, start 이벤트로 전달)
+        - concurrency: 동시 생성 수 (없으면 BATCH_CONCURRENCY)
+        """
+        pipeline = self.batch_pipeline(batch_request.get("concurrency"))
+        return pipeline.run(batch_request.get("items", []), batch_request.get("job_id"))
+
+    async def batch_generate_tips(self, batch_request: Dict[str, Any]) -> int:
+        """배치를 끝까지 실행하고 생성 수 반환 (Celery 작업용)"""
+        generated = 0
+        async for event in self.stream_batch(batch_request):
+            if event.get("status") == "generated":
+                generated += 1
+        return generated
+
+    # 📊 사용 현황
+    async def get_user_usage(
+        self, user_id: int, tier: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """이번 달 팁 생성 횟수/예약 중인 크레딧/남은 크레딧"""
+        return await self.quota.usage(user_id, tier)
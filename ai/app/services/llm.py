@@ -0,0 +1,245 @@
+# 🤖 LLM 백엔드
+# 코치 서비스가 호출하는 생성 백엔드 추상화
+# - OpenAIBackend / AnthropicBackend: LangChain 채팅 모델 (운영)
+# - LLMRouter: 여러 공급자 사이 장애 조치/헤징 (app.services.llm_router)
+# - FakeLLMBackend: 지연/실패율을 설정할 수 있는 가짜 백엔드 (오프라인 벤치마크/로컬 개발)
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# (role, content) 목록 - role: system | human
+Messages = List[Tuple[str, str]]
+
+
+class LLMError(Exception):
+    """재시도 가능한 생성 실패 (타임아웃, 429, 5xx 등)"""
+
+
+class LLMDeadlineExceededError(LLMError):
+    """하드 데드라인 안에 어느 공급자도 응답하지 못함"""
+
+
+class LLMUnavailableError(LLMError):
+    """호출할 수 있는 공급자가 없음 (모든 서킷 브레이커 열림 또는 모든 공급자 실패)"""
+
+
+@dataclass
+class LLMResult:
+    """생성 결과와 토큰 사용량"""
+
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class LLMBackend:
+    """생성 백엔드 인터페이스"""
+
+    name = "base"
+
+    async def generate(self, messages: Messages, max_tokens: int) -> LLMResult:
+        raise NotImplementedError
+
+    async def stream(self, messages: Messages, max_tokens: int) -> AsyncIterator[str]:
+        """토큰 스트림 (스트리밍 미지원 백엔드는 완성된 텍스트를 한 번에 전달)"""
+        result = await self.generate(messages, max_tokens)
+        yield result.text
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class LangChainBackend(LLMBackend):
+    """LangChain 채팅 모델 공통 백엔드 (모델은 첫 호출 때 생성)"""
+
+    def __init__(self, model: str, api_key: Optional[str]):
+        self.model = model
+        self.api_key = api_key
+        self._llm = None
+
+    def _create_llm(self):
+        raise NotImplementedError
+
+    def _get_llm(self):
+        if self._llm is None:
+            self._llm = self._create_llm()
+        return self._llm
+
+    @staticmethod
+    def _prompt(messages: Messages):
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        return [
+            SystemMessage(content=content)
+            if role == "system"
+            else HumanMessage(content=content)
+            for role, content in messages
+        ]
+
+    async def generate(self, messages: Messages, max_tokens: int) -> LLMResult:
+        try:
+            result = await self._get_llm().agenerate(
+                [self._prompt(messages)], max_tokens=max_tokens
+            )
+        except Exception as exc:
+            raise LLMError(str(exc)) from exc
+        output = result.llm_output or {}
+        usage = output.get("token_usage") or output.get("usage") or {}
+        return LLMResult(
+            text=result.generations[0][0].text.strip(),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+
+    async def stream(self, messages: Messages, max_tokens: int) -> AsyncIterator[str]:
+        try:
+            async for chunk in self._get_llm().astream(
+                self._prompt(messages), max_tokens=max_tokens
+            ):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as exc:
+            raise LLMError(str(exc)) from exc
+
+
+class OpenAIBackend(LangChainBackend):
+    """LangChain ChatOpenAI 백엔드"""
+
+    name = "openai"
+
+    def _create_llm(self):
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(model=self.model, api_key=self.api_key, temperature=0.7)
+
+
+class AnthropicBackend(LangChainBackend):
+    """LangChain ChatAnthropic 백엔드"""
+
+    name = "anthropic"
+
+    def _create_llm(self):
+        from langchain_community.chat_models import ChatAnthropic
+
+        return ChatAnthropic(
+            model=self.model, anthropic_api_key=self.api_key, temperature=0.7
+        )
+
+
+FAKE_TIPS = [
+    "아침 첫 스텝은 가장 쉬운 것으로 두세요. 물 한 잔처럼 10초면 끝나는 행동이 다음 스텝으로 넘어가는 관성을 만들어 줍니다.",
+    "어제 건너뛴 스텝이 있다면 오늘은 시간을 절반으로 줄여 시도해 보세요. 완벽하게 하는 것보다 끊기지 않는 것이 스트릭을 지키는 핵심입니다.",
+    "루틴을 시작하는 신호를 하나 정해 보세요. 알람을 끄자마자 바로 첫 스텝을 하면 고민할 틈 없이 루틴이 시작됩니다.",
+]
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    설정한 지연/실패율로 응답하는 가짜 백엔드 (입력이 같으면 같은 팁)
+
+    tail_rate 확률로 tail_latency초를 더해 꼬리 지연을 흉내
+
+    스트리밍 시 첫 토큰까지 ttft초, 나머지 지연은 청크 사이에 고르게 분배
+    """
+
+    name = "fake"
+    CHUNK_CHARS = 8
+
+    def __init__(
+        self,
+        latency: float = 0.8,
+        jitter: float = 0.2,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        ttft: Optional[float] = None,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+        name: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.ttft = latency / 4 if ttft is None else ttft
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        if name:
+            self.name = name
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def _tip_for(self, messages: Messages) -> str:
+        digest = hashlib.sha1(messages[-1][1].encode("utf-8")).digest()
+        return FAKE_TIPS[digest[0] % len(FAKE_TIPS)]
+
+    async def _delay(self) -> None:
+        delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+        if self._rng.random() < self.tail_rate:
+            delay += self.tail_latency
+        await asyncio.sleep(max(delay, 0.0))
+        if self._rng.random() < self.failure_rate:
+            raise LLMError("가짜 백엔드 실패")
+
+    async def generate(self, messages: Messages, max_tokens: int) -> LLMResult:
+        self.calls += 1
+        await self._delay()
+        text = self._tip_for(messages)
+        return LLMResult(
+            text=text,
+            prompt_tokens=sum(len(content) for _, content in messages) // 2,
+            completion_tokens=len(text) // 2,
+        )
+
+    async def stream(self, messages: Messages, max_tokens: int) -> AsyncIterator[str]:
+        self.calls += 1
+        await asyncio.sleep(self.ttft)
+        if self._rng.random() < self.failure_rate:
+            raise LLMError("가짜 백엔드 실패")
+        text = self._tip_for(messages)
+        chunks = [
+            text[i : i + self.CHUNK_CHARS]
+            for i in range(0, len(text), self.CHUNK_CHARS)
+        ]
+        gap = max(self.latency - self.ttft, 0.0) / max(len(chunks) - 1, 1)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(gap)
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "calls": self.calls}
+
+
+def create_llm_backend(kind: str) -> LLMBackend:
+    """설정값으로 LLM 백엔드 생성 (router | openai | anthropic | fake)"""
+    if kind == "router":
+        from app.services.llm_router import LLMRouter
+
+        return LLMRouter(
+            [
+                create_llm_backend(provider.strip())
+                for provider in settings.LLM_ROUTER_PROVIDERS.split(",")
+                if provider.strip()
+            ],
+            hedge_default=settings.LLM_HEDGE_DEFAULT_MS / 1000,
+            hedge_min=settings.LLM_HEDGE_MIN_MS / 1000,
+            deadline=settings.LLM_HARD_DEADLINE_MS / 1000,
+            failure_threshold=settings.LLM_BREAKER_FAILURES,
+            reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+        )
+    if kind == "anthropic":
+        return AnthropicBackend(settings.ANTHROPIC_MODEL, settings.ANTHROPIC_API_KEY)
+    if kind == "fake":
+        return FakeLLMBackend(
+            latency=settings.FAKE_LLM_LATENCY_MS / 1000,
+            jitter=settings.FAKE_LLM_JITTER_MS / 1000,
+            failure_rate=settings.FAKE_LLM_FAILURE_RATE,
+        )
+    return OpenAIBackend(settings.OPENAI_MODEL, settings.OPENAI_API_KEY)
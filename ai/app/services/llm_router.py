@@ -0,0 +1,335 @@
+# 🔀 LLM 공급자 라우터
+# 여러 공급자(OpenAI, Anthropic 등)를 하나의 LLMBackend로 묶어 장애/꼬리 지연을 흡수
+# - 공급자별 서킷 브레이커: 연속 실패 N회면 열림 → reset_timeout 뒤 시험 호출 1회
+# - 지연 가중치: 최근 지연(EWMA)이 짧은 공급자에 더 많은 요청을 보냄
+# - 헤지 요청: 1순위 공급자가 자신의 p95 안에 응답하지 않으면 다음 공급자에도 요청,
+#   먼저 성공한 응답을 쓰고 나머지는 취소
+# - 실패 시 남은 공급자로 즉시 장애 조치, 하드 데드라인을 넘기면 LLMDeadlineExceededError,
+#   모든 서킷이 열려 있으면 LLMUnavailableError (둘 다 호출자가 최근 팁/템플릿 팁으로 대체)
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from app.services.llm import (
+    LLMBackend,
+    LLMDeadlineExceededError,
+    LLMError,
+    LLMResult,
+    LLMUnavailableError,
+    Messages,
+)
+
+
+class CircuitBreaker:
+    """closed → (연속 실패 threshold회) open → (reset_timeout 후) half-open"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def available(self) -> bool:
+        """지금 요청을 보낼 수 있는지 (half-open이면 시험 호출 1개만)"""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self.probing)
+
+    def start(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.probing = True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.probing:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def cancel(self) -> None:
+        """헤지에서 져서 취소된 호출 (성공/실패로 세지 않음)"""
+        self.probing = False
+
+
+class Provider:
+    """공급자 1개의 백엔드, 브레이커, 지연 통계"""
+
+    def __init__(
+        self,
+        label: str,
+        backend: LLMBackend,
+        breaker: CircuitBreaker,
+        window: int = 200,
+        alpha: float = 0.2,
+    ):
+        self.label = label
+        self.backend = backend
+        self.breaker = breaker
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.wins = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.ewma = (
+            seconds
+            if self.ewma is None
+            else self.alpha * seconds + (1 - self.alpha) * self.ewma
+        )
+
+    def p95(self, min_samples: int) -> Optional[float]:
+        if len(self.samples) < min_samples:
+            return None
+        return statistics.quantiles(self.samples, n=20, method="inclusive")[18]
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95(2)
+        return {
+            "state": self.breaker.state,
+            "trips": self.breaker.trips,
+            "calls": self.calls,
+            "wins": self.wins,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "ewma_ms": round(self.ewma * 1000, 1) if self.ewma is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class LLMRouter(LLMBackend):
+    """서킷 브레이커/지연 가중치/헤지 요청이 있는 다중 공급자 백엔드"""
+
+    name = "router"
+
+    def __init__(
+        self,
+        backends: List[LLMBackend],
+        hedge_default: float = 2.5,
+        hedge_min: float = 0.3,
+        deadline: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        min_samples: int = 20,
+        seed: Optional[int] = None,
+    ):
+        if not backends:
+            raise ValueError("공급자가 1개 이상 필요합니다")
+        names = [backend.name for backend in backends]
+        self.providers = [
+            Provider(
+                name if names.count(name) == 1 else f"{name}-{index}",
+                backend,
+                CircuitBreaker(failure_threshold, reset_timeout),
+            )
+            for index, (name, backend) in enumerate(
+                zip(names, backends, strict=True), start=1
+            )
+        ]
+        self.hedge_default = hedge_default
+        self.hedge_min = hedge_min
+        self.deadline = deadline
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.failovers = 0
+        self.deadline_misses = 0
+        self._rng = random.Random(seed)
+
+    # 🎯 공급자 선택
+    def ranked(self) -> List[Provider]:
+        """
+        브레이커가 허용하는 공급자를 지연 가중 랜덤 순서로 정렬
+
+        가중치 = 1 / EWMA 지연 (아직 샘플이 없으면 관측된 가장 빠른 지연으로 취급해
+        새 공급자도 트래픽을 받음)
+        """
+        available = [p for p in self.providers if p.breaker.available()]
+        known = [p.ewma for p in available if p.ewma is not None]
+        fallback = min(known) if known else 1.0
+        weighted = [
+            (max(p.ewma if p.ewma is not None else fallback, 1e-3), p)
+            for p in available
+        ]
+        # 가중치 비례 비복원 추출 (Efraimidis-Spirakis): key = u^(1/w)
+        keyed = [
+            (self._rng.random() ** latency, provider) for latency, provider in weighted
+        ]
+        keyed.sort(key=lambda item: item[0], reverse=True)
+        return [provider for _, provider in keyed]
+
+    def hedge_delay(self, provider: Provider) -> float:
+        """헤지 요청을 보낼 시점 (1순위 공급자의 p95)"""
+        p95 = provider.p95(self.min_samples)
+        delay = self.hedge_default if p95 is None else p95
+        return min(max(delay, self.hedge_min), self.deadline)
+
+    # 🤖 생성
+    async def _call(
+        self, provider: Provider, messages: Messages, max_tokens: int
+    ) -> LLMResult:
+        provider.calls += 1
+        provider.breaker.start()
+        started = time.monotonic()
+        try:
+            result = await provider.backend.generate(messages, max_tokens)
+        except asyncio.CancelledError:
+            # 헤지에서 진 호출의 경과 시간은 실제 지연의 하한 → 샘플로 반영해야
+            # 느려진 공급자의 EWMA/p95가 올라가 가중치가 줄어듦
+            provider.observe(time.monotonic() - started)
+            provider.cancelled += 1
+            provider.breaker.cancel()
+            raise
+        except Exception:
+            provider.errors += 1
+            provider.breaker.failure()
+            raise
+        provider.observe(time.monotonic() - started)
+        provider.breaker.success()
+        return result
+
+    async def generate(self, messages: Messages, max_tokens: int) -> LLMResult:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        candidates = self.ranked()
+        if not candidates:
+            raise LLMUnavailableError("사용 가능한 LLM 공급자가 없습니다 (모든 서킷 열림)")
+
+        pending: Dict[asyncio.Task, Provider] = {}
+
+        def launch() -> Provider:
+            provider = candidates.pop(0)
+            task = asyncio.create_task(self._call(provider, messages, max_tokens))
+            pending[task] = provider
+            return provider
+
+        hedge_at = loop.time() + self.hedge_delay(launch())
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                now = loop.time()
+                if now >= deadline:
+                    self.deadline_misses += 1
+                    raise LLMDeadlineExceededError(
+                        f"{self.deadline:.1f}초 안에 응답한 공급자가 없습니다"
+                    )
+                timeout = deadline - now
+                if candidates and not hedged:
+                    timeout = min(timeout, max(hedge_at - now, 0.0))
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        provider.wins += 1
+                        return task.result()
+                    last_error = task.exception()
+                if not done:
+                    if candidates and not hedged and loop.time() >= hedge_at:
+                        hedged = True
+                        self.hedges += 1
+                        launch()
+                elif not pending and candidates:
+                    self.failovers += 1
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        raise LLMUnavailableError(f"모든 LLM 공급자 호출 실패: {last_error}") from last_error
+
+    async def stream(self, messages: Messages, max_tokens: int) -> AsyncIterator[str]:
+        """
+        첫 청크가 올 때까지만 장애 조치 (이미 보낸 토큰은 되돌릴 수 없으므로
+        첫 청크 이후 실패는 그대로 전달), 스트림은 헤지하지 않음
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        candidates = self.ranked()
+        if not candidates:
+            raise LLMUnavailableError("사용 가능한 LLM 공급자가 없습니다 (모든 서킷 열림)")
+        last_error: Optional[BaseException] = None
+        for attempt, provider in enumerate(candidates):
+            if attempt:
+                self.failovers += 1
+            provider.calls += 1
+            provider.breaker.start()
+            chunks = provider.backend.stream(messages, max_tokens)
+            try:
+                first = await asyncio.wait_for(
+                    chunks.__anext__(), timeout=max(deadline - loop.time(), 0.0)
+                )
+            except StopAsyncIteration:
+                provider.breaker.success()
+                return
+            except asyncio.TimeoutError as exc:
+                provider.errors += 1
+                provider.breaker.failure()
+                await chunks.aclose()
+                self.deadline_misses += 1
+                raise LLMDeadlineExceededError(
+                    f"{self.deadline:.1f}초 안에 첫 토큰을 보낸 공급자가 없습니다"
+                ) from exc
+            except asyncio.CancelledError:
+                provider.cancelled += 1
+                provider.breaker.cancel()
+                raise
+            except Exception as exc:
+                provider.errors += 1
+                provider.breaker.failure()
+                last_error = exc
+                continue
+
+            try:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                provider.cancelled += 1
+                provider.breaker.cancel()
+                await chunks.aclose()
+                raise
+            except Exception as exc:
+                provider.errors += 1
+                provider.breaker.failure()
+                raise LLMError(str(exc)) from exc
+            provider.wins += 1
+            provider.breaker.success()
+            return
+        raise LLMUnavailableError(f"모든 LLM 공급자 호출 실패: {last_error}") from last_error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "deadline_misses": self.deadline_misses,
+            "providers": {p.label: p.stats() for p in self.providers},
+        }
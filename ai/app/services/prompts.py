@@ -0,0 +1,208 @@
+# 🧾 토큰 예산 기반 프롬프트 조립
+# routine_data/user_stats를 그대로 JSON으로 넣으면 스텝이 많은 루틴일수록 프롬프트가 커져
+# 지연시간과 비용을 예측할 수 없음 → 정해진 토큰 예산 안에서 프롬프트를 만든다
+# - 템플릿은 시작 시 1회 준비 (고정 문구의 토큰 수 미리 계산)
+# - 팁에 필요한 필드만 간결한 한 줄 형식으로 렌더링
+# - 예산을 넘으면 앞쪽 스텝만 남기고 나머지는 타입/난이도 요약 한 줄로 대체
+# - 토큰 수는 모델별로 캐시된 tiktoken 인코더로 계산 (없으면 보수적인 글자 수 추정)
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.services.llm import Messages
+from app.services.tip_keys import as_number, step_order, success_percent
+
+logger = logging.getLogger(__name__)
+
+TIP_SYSTEM_PROMPT = (
+    "당신은 습관 형성 앱 '루틴 퀘스트'의 코치입니다. "
+    "사용자의 루틴과 통계를 보고 오늘 바로 실천할 수 있는 팁을 "
+    "한국어 200-300자로 한 단락만 작성하세요."
+)
+
+DIFFICULTY_LABELS = {"easy": "쉬움", "medium": "보통", "hard": "어려움"}
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str):
+    """모델별 tiktoken 인코딩 (프로세스당 1회 로드, 불러올 수 없으면 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken이 없어 글자 수로 토큰을 추정합니다")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:  # 모르는 모델(Anthropic 등)은 cl100k 기준
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # BPE 파일을 내려받지 못한 경우 (오프라인 등)
+        logger.warning("tiktoken 인코딩을 불러오지 못해 글자 수로 추정합니다: %s", exc)
+        return None
+
+
+class TokenCounter:
+    """캐시된 인코더로 토큰 수 계산 (같은 문자열은 결과도 캐시)"""
+
+    # 채팅 메시지 1개당 역할/구분자 토큰 (OpenAI 채팅 형식 기준)
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoding = get_encoding(model)
+        self.count = lru_cache(maxsize=8192)(self._count)
+
+    def _count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        # 추정: ASCII 4자당 1토큰, 한글 등 비ASCII는 글자당 1토큰 (cl100k보다 약간 크게)
+        ascii_chars = sum(1 for char in text if ord(char) < 128)
+        return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+    def count_messages(self, messages: Messages) -> int:
+        return sum(
+            self.count(content) + self.MESSAGE_OVERHEAD for _, content in messages
+        )
+
+
+@dataclass
+class BuiltPrompt:
+    """조립된 프롬프트와 예산 적용 결과"""
+
+    messages: Messages
+    prompt_tokens: int
+    steps_total: int
+    steps_included: int
+
+    @property
+    def truncated(self) -> bool:
+        return self.steps_included < self.steps_total
+
+
+def _minutes(seconds: Any) -> Optional[str]:
+    seconds = as_number(seconds)
+    if seconds is None:
+        return None
+    return f"{max(round(seconds / 60), 1)}분"
+
+
+def _clip(value: Any, limit: int) -> str:
+    text = " ".join(str(value or "").split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def render_step(index: int, step: Any) -> str:
+    """스텝 1개 → '3. 물 마시기 (action, 쉬움, 1분, 선택)'"""
+    if not isinstance(step, dict):
+        return f"{index}. {step}"
+    details = [
+        step.get("type"),
+        DIFFICULTY_LABELS.get(step.get("difficulty"), step.get("difficulty")),
+        _minutes(step.get("t_ref_sec")) if step.get("t_ref_sec") else None,
+        "선택" if step.get("is_optional") else None,
+    ]
+    details = [str(detail) for detail in details if detail]
+    title = _clip(step.get("title"), 60) or "이름 없는 스텝"
+    return f"{index}. {title}" + (f" ({', '.join(details)})" if details else "")
+
+
+def summarize_steps(steps: List[Any]) -> str:
+    """생략한 스텝 요약 → '외 12개 스텝: action 7, timer 5 / 어려움 3'"""
+    types = Counter(
+        step.get("type")
+        for step in steps
+        if isinstance(step, dict) and step.get("type")
+    )
+    hard = sum(
+        1
+        for step in steps
+        if isinstance(step, dict) and step.get("difficulty") == "hard"
+    )
+    parts = ", ".join(f"{name} {count}" for name, count in types.most_common())
+    summary = f"외 {len(steps)}개 스텝"
+    if parts:
+        summary += f": {parts}"
+    if hard:
+        summary += f" / 어려움 {hard}"
+    return summary
+
+
+def render_stats(user_stats: Dict[str, Any]) -> Optional[str]:
+    parts = []
+    streak = as_number(user_stats.get("streak"))
+    if streak is not None:
+        parts.append(f"스트릭 {round(streak)}일")
+    rate = success_percent(user_stats.get("success_rate"))
+    if rate is not None:
+        parts.append(f"성공률 {round(rate)}%")
+    completions = as_number(user_stats.get("total_completions"))
+    if completions is not None:
+        parts.append(f"누적 완료 {round(completions)}회")
+    return ", ".join(parts) if parts else None
+
+
+class TipPromptBuilder:
+    """시스템 프롬프트 + 루틴/통계 요약을 토큰 예산 안에서 조립"""
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        budget: int,
+        title_chars: int = 80,
+        description_chars: int = 200,
+        system_prompt: str = TIP_SYSTEM_PROMPT,
+    ):
+        self.counter = counter
+        self.budget = budget
+        self.title_chars = title_chars
+        self.description_chars = description_chars
+        self.system_prompt = system_prompt
+        # 고정 문구 토큰 수는 한 번만 계산
+        self.base_tokens = (
+            counter.count(system_prompt) + 2 * TokenCounter.MESSAGE_OVERHEAD
+        )
+        self.step_header_tokens = counter.count("\n스텝:")
+
+    def build(
+        self, routine_data: Dict[str, Any], user_stats: Dict[str, Any]
+    ) -> BuiltPrompt:
+        lines = [f"루틴: {_clip(routine_data.get('title'), self.title_chars)}"]
+        description = _clip(routine_data.get("description"), self.description_chars)
+        if description:
+            lines.append(f"설명: {description}")
+        stats = render_stats(user_stats)
+        if stats:
+            lines.append(f"통계: {stats}")
+
+        steps = sorted(routine_data.get("steps") or [], key=step_order)
+        head = "\n".join(lines)
+        used = self.base_tokens + self.counter.count(head)
+        step_lines: List[str] = []
+        included = 0
+        if steps:
+            used += self.step_header_tokens
+            # 뒤에 스텝이 남으면 요약 한 줄이 들어갈 자리를 남겨 둠
+            # (전체 스텝 요약이 남은 스텝 요약보다 길거나 같으므로 상한으로 사용)
+            reserve = self.counter.count(summarize_steps(steps)) + 1
+            for index, step in enumerate(steps, start=1):
+                line = render_step(index, step)
+                cost = self.counter.count(line) + 1
+                last = index == len(steps)
+                if used + cost + (0 if last else reserve) > self.budget:
+                    break
+                step_lines.append(line)
+                used += cost
+            included = len(step_lines)
+            if included < len(steps):
+                step_lines.append(summarize_steps(steps[included:]))
+
+        human = head + ("\n스텝:\n" + "\n".join(step_lines) if step_lines else "")
+        messages = [("system", self.system_prompt), ("human", human)]
+        return BuiltPrompt(
+            messages=messages,
+            prompt_tokens=self.counter.count_messages(messages),
+            steps_total=len(steps),
+            steps_included=included,
+        )
@@ -0,0 +1,508 @@
+# 🎟️ 월 사용 한도 (AI 코치 크레딧)
+# PRD: Basic 월 3회, Pro 월 15회 - 팁을 새로 생성할 때만 차감 (캐시 hit은 무료)
+# - 사용자/월 카운터를 원자적으로 증감 (Redis: Lua 스크립트 1회 왕복, 로컬: 인메모리)
+# - 예약(reserve) → 생성 성공 시 확정(commit) / 실패 시 환불(refund)
+#   → LLM 호출이 실패해도 크레딧이 사라지지 않고, 동시 요청이 한도를 넘지 못함
+# - 예약은 만료 시각이 있는 임대(lease): 확정/환불 전에 프로세스가 죽어도
+#   QUOTA_RESERVATION_TTL_SECONDS 뒤 다음 reserve가 회수
+# - 확정된 카운터는 주기적으로 DB(coach_usage)에 기록(write-back), 시작 시 복원
+# - 한도를 정하는 티어는 같은 DB의 users.tier 기준 (짧은 TTL 캐시) - 토큰의 tier 클레임은
+#   발급 시점 값이라 구독 변경이 토큰 만료까지 반영되지 않으므로 DB가 없을 때만 사용
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    func,
+    select,
+)
+
+from app.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# 카운터 보관 기간 (한 달 + 여유)
+COUNTER_TTL_SECONDS = 60 * 60 * 24 * 40
+
+
+class QuotaExceededError(Exception):
+    """이번 달 사용 한도 초과"""
+
+    def __init__(self, user_id: int, limit: int):
+        super().__init__(f"이번 달 AI 코치 사용 한도({limit}회)를 모두 사용했습니다")
+        self.user_id = user_id
+        self.limit = limit
+
+
+def current_month() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+def previous_month(month: str) -> str:
+    year, number = map(int, month.split("-"))
+    return f"{year - 1}-12" if number == 1 else f"{year}-{number - 1:02d}"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class QuotaStore:
+    """사용자/월별 확정 카운터 + 예약 임대(lease id → 만료 시각) 저장소 인터페이스"""
+
+    async def reserve(
+        self, month: str, user_id: int, limit: int, lease_id: str, lease_ms: int
+    ) -> bool:
+        """만료된 임대 회수 후 확정 + 임대 수 < limit이면 임대 추가 후 True"""
+        raise NotImplementedError
+
+    async def commit(self, month: str, user_id: int, lease_id: str) -> None:
+        """임대 제거, 확정 +1 (임대가 이미 만료됐어도 생성된 팁은 차감, write-back 대상)"""
+        raise NotImplementedError
+
+    async def refund(self, month: str, user_id: int, lease_id: str) -> None:
+        """임대 제거"""
+        raise NotImplementedError
+
+    async def get(self, month: str, user_id: int) -> Tuple[int, int]:
+        """(확정, 유효한 임대 수)"""
+        raise NotImplementedError
+
+    async def drain_dirty(self, month: str) -> Dict[int, int]:
+        """마지막 write-back 이후 확정된 사용자의 확정 카운터"""
+        raise NotImplementedError
+
+    async def mark_dirty(self, month: str, user_ids: Iterable[int]) -> None:
+        """기록에 실패한 사용자를 다음 write-back 대상으로 되돌림"""
+        raise NotImplementedError
+
+    async def seed(self, month: str, used: Dict[int, int]) -> None:
+        """스냅샷 값으로 확정 카운터 복원 (현재 값보다 클 때만)"""
+        raise NotImplementedError
+
+
+class InMemoryQuotaStore(QuotaStore):
+    """프로세스 내 카운터 (단일 이벤트 루프 안에서 await 없이 증감하므로 원자적)"""
+
+    def __init__(self):
+        self._used: Dict[Tuple[str, int], int] = {}
+        self._leases: Dict[Tuple[str, int], Dict[str, int]] = {}
+        self._dirty: Dict[str, Set[int]] = {}
+
+    def _live_leases(self, key: Tuple[str, int]) -> Dict[str, int]:
+        now = _now_ms()
+        leases = self._leases.setdefault(key, {})
+        for lease_id in [i for i, deadline in leases.items() if deadline <= now]:
+            del leases[lease_id]
+        return leases
+
+    async def reserve(
+        self, month: str, user_id: int, limit: int, lease_id: str, lease_ms: int
+    ) -> bool:
+        key = (month, user_id)
+        leases = self._live_leases(key)
+        if self._used.get(key, 0) + len(leases) >= limit:
+            return False
+        leases[lease_id] = _now_ms() + lease_ms
+        return True
+
+    async def commit(self, month: str, user_id: int, lease_id: str) -> None:
+        key = (month, user_id)
+        self._leases.get(key, {}).pop(lease_id, None)
+        self._used[key] = self._used.get(key, 0) + 1
+        self._dirty.setdefault(month, set()).add(user_id)
+
+    async def refund(self, month: str, user_id: int, lease_id: str) -> None:
+        self._leases.get((month, user_id), {}).pop(lease_id, None)
+
+    async def get(self, month: str, user_id: int) -> Tuple[int, int]:
+        key = (month, user_id)
+        return self._used.get(key, 0), len(self._live_leases(key))
+
+    async def drain_dirty(self, month: str) -> Dict[int, int]:
+        dirty = self._dirty.pop(month, set())
+        return {user_id: self._used.get((month, user_id), 0) for user_id in dirty}
+
+    async def mark_dirty(self, month: str, user_ids: Iterable[int]) -> None:
+        self._dirty.setdefault(month, set()).update(user_ids)
+
+    async def seed(self, month: str, used: Dict[int, int]) -> None:
+        for user_id, count in used.items():
+            key = (month, user_id)
+            self._used[key] = max(self._used.get(key, 0), count)
+
+
+# KEYS[1]=카운터 해시, KEYS[2]=임대 ZSET(lease id → 만료 ms)
+# ARGV[1]=한도, ARGV[2]=TTL, ARGV[3]=lease id, ARGV[4]=현재 ms, ARGV[5]=임대 ms
+_RESERVE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[4])
+local used = tonumber(redis.call('HGET', KEYS[1], 'used') or '0')
+local reserved = redis.call('ZCARD', KEYS[2])
+if used + reserved >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], tonumber(ARGV[4]) + tonumber(ARGV[5]), ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# KEYS[1]=카운터 해시, KEYS[2]=임대 ZSET, KEYS[3]=dirty 집합
+# ARGV[1]=사용자 id, ARGV[2]=TTL, ARGV[3]=lease id
+_COMMIT_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[3])
+redis.call('HINCRBY', KEYS[1], 'used', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SADD', KEYS[3], ARGV[1])
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+return 1
+"""
+
+# KEYS[1]=카운터 해시, ARGV[1]=스냅샷 값, ARGV[2]=TTL
+_SEED_SCRIPT = """
+if tonumber(redis.call('HGET', KEYS[1], 'used') or '0') < tonumber(ARGV[1]) then
+    redis.call('HSET', KEYS[1], 'used', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisQuotaStore(QuotaStore):
+    """Redis 해시 카운터 + 임대 ZSET (레플리카 간 공유, 연산마다 Lua 스크립트 1회 왕복)"""
+
+    def __init__(self, redis, ttl: int = COUNTER_TTL_SECONDS):
+        self.redis = redis
+        self.ttl = ttl
+        self._reserve = redis.register_script(_RESERVE_SCRIPT)
+        self._commit = redis.register_script(_COMMIT_SCRIPT)
+        self._seed = redis.register_script(_SEED_SCRIPT)
+
+    def _key(self, month: str, user_id: int) -> str:
+        return f"rq:quota:{month}:{user_id}"
+
+    def _lease_key(self, month: str, user_id: int) -> str:
+        return f"rq:quota:{month}:{user_id}:leases"
+
+    def _dirty_key(self, month: str) -> str:
+        return f"rq:quota:{month}:dirty"
+
+    async def reserve(
+        self, month: str, user_id: int, limit: int, lease_id: str, lease_ms: int
+    ) -> bool:
+        granted = await self._reserve(
+            keys=[self._key(month, user_id), self._lease_key(month, user_id)],
+            args=[limit, self.ttl, lease_id, _now_ms(), lease_ms],
+        )
+        return bool(granted)
+
+    async def commit(self, month: str, user_id: int, lease_id: str) -> None:
+        await self._commit(
+            keys=[
+                self._key(month, user_id),
+                self._lease_key(month, user_id),
+                self._dirty_key(month),
+            ],
+            args=[user_id, self.ttl, lease_id],
+        )
+
+    async def refund(self, month: str, user_id: int, lease_id: str) -> None:
+        await self.redis.zrem(self._lease_key(month, user_id), lease_id)
+
+    async def get(self, month: str, user_id: int) -> Tuple[int, int]:
+        used = await self.redis.hget(self._key(month, user_id), "used")
+        reserved = await self.redis.zcount(
+            self._lease_key(month, user_id), f"({_now_ms()}", "+inf"
+        )
+        return int(used or 0), int(reserved)
+
+    async def drain_dirty(self, month: str) -> Dict[int, int]:
+        # SPOP이라 여러 레플리카가 동시에 write-back해도 사용자별로 한 곳만 가져감
+        # (기록에 실패하면 QuotaService.flush가 mark_dirty로 되돌림)
+        user_ids = await self.redis.spop(self._dirty_key(month), 10_000) or []
+        result = {}
+        for user_id in user_ids:
+            used, _ = await self.get(month, int(user_id))
+            result[int(user_id)] = used
+        return result
+
+    async def mark_dirty(self, month: str, user_ids: Iterable[int]) -> None:
+        user_ids = [str(user_id) for user_id in user_ids]
+        if user_ids:
+            await self.redis.sadd(self._dirty_key(month), *user_ids)
+            await self.redis.expire(self._dirty_key(month), self.ttl)
+
+    async def seed(self, month: str, used: Dict[int, int]) -> None:
+        for user_id, count in used.items():
+            await self._seed(keys=[self._key(month, user_id)], args=[count, self.ttl])
+
+
+# 💾 확정 카운터 영속 저장소 (API 마이그레이션 0008의 coach_usage 테이블)
+metadata = MetaData()
+coach_usage = Table(
+    "coach_usage",
+    metadata,
+    Column("month", String(7), primary_key=True),
+    Column("user_id", Integer, primary_key=True),
+    Column("used", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime, nullable=False),
+)
+# 구독 티어 조회용 (API의 users 테이블 중 필요한 열만)
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("tier", String, nullable=False),
+)
+
+
+class DatabaseQuotaSnapshot:
+    """
+    확정 카운터를 공유 DB에 upsert (모든 레플리카/재배포가 같은 값을 복원)
+
+    카운터는 증가만 하므로 더 큰 값만 반영 - 늦게 도착한 write-back이 값을 줄이지 않음
+    """
+
+    def __init__(self, url: str):
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        self.engine = create_async_engine(url, pool_pre_ping=True)
+
+    async def load(self, month: str) -> Dict[int, int]:
+        async with self.engine.connect() as conn:
+            rows = await conn.execute(
+                select(coach_usage.c.user_id, coach_usage.c.used).where(
+                    coach_usage.c.month == month
+                )
+            )
+            return dict(rows.all())
+
+    async def load_tier(self, user_id: int) -> Optional[str]:
+        """사용자의 현재 구독 티어 (사용자가 없으면 None)"""
+        async with self.engine.connect() as conn:
+            return await conn.scalar(select(users.c.tier).where(users.c.id == user_id))
+
+    async def save(self, month: str, used: Dict[int, int]) -> None:
+        if self.engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        statement = insert(coach_usage).values(
+            [
+                {"month": month, "user_id": user_id, "used": count, "updated_at": now}
+                for user_id, count in used.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[coach_usage.c.month, coach_usage.c.user_id],
+            set_={
+                "used": case(
+                    (
+                        statement.excluded.used > coach_usage.c.used,
+                        statement.excluded.used,
+                    ),
+                    else_=coach_usage.c.used,
+                ),
+                "updated_at": func.coalesce(statement.excluded.updated_at, now),
+            },
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(statement)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+
+class Reservation:
+    """
+    예약된 크레딧 1개 (commit/refund 중 처음 호출된 것만 반영)
+
+    settle 호출은 요청 취소(클라이언트 연결 끊김)에 중단되지 않도록 보호 -
+    commit은 shield로 끝까지 실행, 예외 경로의 release는 백그라운드 태스크로 환불
+    """
+
+    _pending: Set[asyncio.Task] = set()  # 백그라운드 환불 태스크 (GC로 사라지지 않도록)
+
+    def __init__(self, store: QuotaStore, month: str, user_id: int, lease_id: str):
+        self.store = store
+        self.month = month
+        self.user_id = user_id
+        self.lease_id = lease_id
+        self.settled = False
+
+    async def commit(self) -> None:
+        if not self.settled:
+            self.settled = True
+            await asyncio.shield(
+                self.store.commit(self.month, self.user_id, self.lease_id)
+            )
+
+    async def refund(self) -> None:
+        if not self.settled:
+            self.settled = True
+            await asyncio.shield(
+                self.store.refund(self.month, self.user_id, self.lease_id)
+            )
+
+    def release(self) -> None:
+        """기다리지 않고 환불 (취소/예외 처리 중에 호출, 실패해도 임대 만료로 회수)"""
+        if self.settled:
+            return
+        self.settled = True
+        task = asyncio.ensure_future(
+            self.store.refund(self.month, self.user_id, self.lease_id)
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._finished)
+
+    @classmethod
+    def _finished(cls, task: asyncio.Task) -> None:
+        cls._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("크레딧 환불 실패 (임대 만료로 회수됨): %s", task.exception())
+
+
+class QuotaService:
+    """티어별 월 한도 확인/예약과 주기적 write-back"""
+
+    def __init__(
+        self,
+        store: QuotaStore,
+        limits: Dict[str, int],
+        snapshot: Optional[DatabaseQuotaSnapshot] = None,
+        flush_interval: float = 30.0,
+        reservation_ttl: float = 120.0,
+        tier_ttl: float = 60.0,
+    ):
+        self.store = store
+        self.limits = limits
+        self.snapshot = snapshot
+        self.flush_interval = flush_interval
+        self.reservation_ttl = reservation_ttl
+        self.tiers = LRUCache(max_entries=10_000, max_bytes=1024 * 1024, ttl=tier_ttl)
+        self.rejected = 0
+        self.flushed = 0
+        self._flusher: Optional[asyncio.Task] = None
+
+    def limit_for(self, tier: Optional[str]) -> int:
+        """티어별 한도 (모르는 티어는 free 한도)"""
+        return self.limits.get(tier or "free", self.limits.get("free", 0))
+
+    async def resolve_tier(self, user_id: int, token_tier: Optional[str]) -> str:
+        """
+        한도를 정할 현재 티어 (DB 기준, tier_ttl초 캐시)
+
+        DB가 없거나 조회에 실패하거나 사용자가 없으면 토큰의 tier 클레임
+        """
+        fallback = token_tier or "free"
+        if self.snapshot is None:
+            return fallback
+        key = str(user_id)
+        tier = self.tiers.get(key)
+        if tier is not None:
+            return tier
+        try:
+            tier = await self.snapshot.load_tier(user_id)
+        except Exception as exc:
+            logger.warning("구독 티어 조회 실패 (토큰 티어 사용): %s", exc)
+            return fallback
+        tier = tier or fallback
+        self.tiers.set(key, tier)
+        return tier
+
+    async def reserve(self, user_id: int, tier: Optional[str]) -> Reservation:
+        """크레딧 1개 예약 (한도 초과면 QuotaExceededError)"""
+        month = current_month()
+        limit = self.limit_for(tier)
+        lease_id = uuid.uuid4().hex
+        lease_ms = int(self.reservation_ttl * 1000)
+        if not await self.store.reserve(month, user_id, limit, lease_id, lease_ms):
+            self.rejected += 1
+            raise QuotaExceededError(user_id, limit)
+        return Reservation(self.store, month, user_id, lease_id)
+
+    async def usage(self, user_id: int, tier: Optional[str]) -> Dict[str, object]:
+        month = current_month()
+        used, reserved = await self.store.get(month, user_id)
+        limit = self.limit_for(tier)
+        return {
+            "user_id": user_id,
+            "month": month,
+            "tier": tier or "free",
+            "used": used,
+            "reserved": reserved,
+            "limit": limit,
+            "remaining": max(limit - used - reserved, 0),
+        }
+
+    # 💾 write-back
+    async def restore(self) -> None:
+        """DB의 이번 달 카운터로 저장소 복원 (저장소가 비어 있을 때 대비)"""
+        if self.snapshot is None:
+            return
+        month = current_month()
+        used = await self.snapshot.load(month)
+        if used:
+            await self.store.seed(month, used)
+            logger.info("사용량 스냅샷 복원: %d명", len(used))
+
+    async def flush(self) -> int:
+        """
+        확정 카운터가 바뀐 사용자만 DB에 기록하고 기록한 수 반환
+
+        지난달부터 기록 - 월말에 예약한 크레딧은 자정 뒤에 확정돼도 예약한 달의 dirty에 남음
+        기록에 실패하면 가져온 사용자를 dirty로 되돌린 뒤 예외를 다시 던짐 (다음 주기에 재시도)
+        """
+        if self.snapshot is None:
+            return 0
+        month = current_month()
+        flushed = 0
+        for pending in (previous_month(month), month):
+            used = await self.store.drain_dirty(pending)
+            if not used:
+                continue
+            try:
+                await self.snapshot.save(pending, used)
+            except BaseException:
+                await asyncio.shield(self.store.mark_dirty(pending, used))
+                raise
+            self.flushed += len(used)
+            flushed += len(used)
+        return flushed
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("사용량 write-back 실패: %s", exc)
+
+    def start(self) -> None:
+        if self._flusher is None and self.snapshot is not None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """주기 작업 중지 후 남은 카운터 기록"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        try:
+            await self.flush()
+        finally:
+            if self.snapshot is not None:
+                await self.snapshot.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"rejected": self.rejected, "flushed": self.flushed}
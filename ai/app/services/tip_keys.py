@@ -0,0 +1,123 @@
+# 🔑 팁 캐시 키 정규화
+# 의미가 같은 요청이 같은 키를 갖도록 입력을 정규화한 뒤 해시
+# - routine_data: 팁 내용에 영향을 주는 필드만 남김 (id, 타임스탬프, 통계 카운터 등 제외)
+# - user_stats: 구간(bucket)으로 묶어 작은 변화로 키가 바뀌지 않게 함
+# - 정렬된 키 + 고정 구분자의 안정적인 JSON 직렬화
+#
+# 📏 숫자 필드 규칙 (팁 풀/프롬프트도 여기 함수를 사용)
+# - success_rate: API Routine.success_rate와 같은 0-100 퍼센트 (0-1 비율 아님)
+# - streak, total_completions, t_ref_sec, order: 숫자 또는 숫자 문자열
+# 클라이언트가 보낸 값이므로 숫자로 읽을 수 없는 값은 "없음"(None)으로 취급
+import hashlib
+import json
+import math
+import re
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional
+
+ROUTINE_FIELDS = ("title", "description")
+STEP_FIELDS = ("title", "type", "difficulty", "t_ref_sec", "is_optional")
+
+# 스트릭 구간 경계: 0 / 1-2 / 3-6 / 7-13 / 14-29 / 30+
+STREAK_BOUNDS = [1, 3, 7, 14, 30]
+# 완료 횟수 구간 경계: 0 / 1-4 / 5-19 / 20-49 / 50-99 / 100+
+COMPLETION_BOUNDS = [1, 5, 20, 50, 100]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def as_number(value: Any) -> Optional[float]:
+    """숫자/숫자 문자열 → float, 그 외(None, bool, 문자, NaN/inf)는 None"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def success_percent(rate: Any) -> Optional[float]:
+    """성공률(0-100 퍼센트)을 범위 안으로 자른 값"""
+    rate = as_number(rate)
+    return None if rate is None else min(max(rate, 0.0), 100.0)
+
+
+def step_order(step: Any) -> float:
+    """스텝 정렬 기준 order (없거나 숫자가 아니면 0)"""
+    order = as_number(step.get("order")) if isinstance(step, dict) else None
+    return order or 0
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip().lower()
+    return value
+
+
+def _minutes(seconds: Any) -> Optional[int]:
+    """기준 시간은 분 단위로 반올림 (몇 초 차이는 같은 팁)"""
+    seconds = as_number(seconds)
+    return None if seconds is None else round(seconds / 60)
+
+
+def canonical_step(step: Any) -> Any:
+    if not isinstance(step, dict):
+        return _text(step)
+    canonical = {field: _text(step.get(field)) for field in STEP_FIELDS}
+    canonical["t_ref_sec"] = _minutes(step.get("t_ref_sec"))
+    return canonical
+
+
+def _step_order(step: Any):
+    if not isinstance(step, dict):
+        return (0, str(step))
+    return (step_order(step), str(_text(step.get("title")) or ""))
+
+
+def canonical_routine(routine_data: Dict[str, Any]) -> Dict[str, Any]:
+    """화이트리스트 필드만 남기고 스텝은 순서(order)대로 정렬"""
+    canonical = {field: _text(routine_data.get(field)) for field in ROUTINE_FIELDS}
+    steps: List[Any] = sorted(routine_data.get("steps") or [], key=_step_order)
+    canonical["steps"] = [canonical_step(step) for step in steps]
+    return canonical
+
+
+def success_decile(rate: Any) -> Optional[int]:
+    """성공률(0-100 퍼센트) 10분위"""
+    rate = success_percent(rate)
+    return None if rate is None else min(int(rate // 10), 9)
+
+
+def bucket_stats(user_stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """팁에 영향을 주는 통계만 구간으로 변환"""
+    user_stats = user_stats or {}
+    streak = as_number(user_stats.get("streak"))
+    completions = as_number(user_stats.get("total_completions"))
+    return {
+        "streak": None if streak is None else bisect_right(STREAK_BOUNDS, streak),
+        "success": success_decile(user_stats.get("success_rate")),
+        "completions": (
+            None
+            if completions is None
+            else bisect_right(COMPLETION_BOUNDS, completions)
+        ),
+        "tier": user_stats.get("tier"),
+    }
+
+
+def stable_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def tip_cache_key(
+    user_id: int,
+    routine_data: Dict[str, Any],
+    user_stats: Optional[Dict[str, Any]] = None,
+) -> str:
+    """사용자 + 정규화된 루틴/통계 해시 기반 팁 캐시 키"""
+    payload = stable_json(
+        {"routine": canonical_routine(routine_data), "stats": bucket_stats(user_stats)}
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"rq:tip:v2:{user_id}:{digest}"
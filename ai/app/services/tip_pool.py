@@ -0,0 +1,280 @@
+# 🧩 세그먼트 팁 풀
+# 비슷한 루틴/통계의 사용자를 세그먼트로 묶고 세그먼트별 팁을 미리 생성해 두었다가
+# 온라인에서는 LLM 호출 없이 가장 가까운 세그먼트의 팁으로 응답
+# - 특징 벡터: 스텝 타입 비율, 난이도, 스텝 수, 스트릭, 성공률 (모두 0-1 범위)
+# - 오프라인 작업: numpy k-means(k-means++ 초기화) → 세그먼트 프로필로 팁 N개씩 생성
+# - 온라인 조회: 중심점과의 거리 계산 1회 (수 μs), 세그먼트 반경 밖이면 miss
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.llm import LLMBackend, LLMError
+from app.services.tip_keys import as_number, success_percent
+
+logger = logging.getLogger(__name__)
+
+STEP_TYPES = ("action", "timer", "check", "habit")
+DIFFICULTY_SCORES = {"easy": 0.0, "medium": 0.5, "hard": 1.0}
+MAX_STEPS = 10
+MAX_STREAK = 60
+
+FEATURES = (
+    *(f"type_{step_type}" for step_type in STEP_TYPES),
+    "difficulty",
+    "hard_share",
+    "steps",
+    "streak",
+    "success",
+)
+
+SEGMENT_SYSTEM_PROMPT = (
+    "당신은 습관 형성 앱 '루틴 퀘스트'의 코치입니다. "
+    "아래 사용자 그룹의 루틴 특징에 맞춰 누구에게나 바로 적용할 수 있는 팁을 "
+    "한국어 200-300자로 한 단락만 작성하세요. 특정 스텝 이름은 언급하지 마세요."
+)
+
+
+def _success_rate(value: Any) -> float:
+    """성공률(0-100 퍼센트) → 0-1 특징값 (없으면 중간값)"""
+    rate = success_percent(value)
+    return 0.5 if rate is None else rate / 100
+
+
+def segment_features(
+    routine_data: Dict[str, Any], user_stats: Optional[Dict[str, Any]]
+) -> np.ndarray:
+    """루틴/통계 → 세그먼트 특징 벡터"""
+    user_stats = user_stats or {}
+    steps = [s for s in routine_data.get("steps") or [] if isinstance(s, dict)]
+    vector = np.zeros(len(FEATURES), dtype=np.float32)
+    if steps:
+        for step in steps:
+            if step.get("type") in STEP_TYPES:
+                vector[STEP_TYPES.index(step["type"])] += 1
+        vector[: len(STEP_TYPES)] /= len(steps)
+        scores = [DIFFICULTY_SCORES.get(step.get("difficulty"), 0.0) for step in steps]
+        vector[4] = sum(scores) / len(scores)
+        vector[5] = scores.count(1.0) / len(scores)
+    vector[6] = min(len(steps), MAX_STEPS) / MAX_STEPS
+    streak = max(as_number(user_stats.get("streak")) or 0, 0)
+    vector[7] = min(streak, MAX_STREAK) / MAX_STREAK
+    vector[8] = _success_rate(user_stats.get("success_rate"))
+    return vector
+
+
+def squared_distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """(n, k) 제곱 거리 - |x|² - 2x·c + |c|² 전개식으로 (n, k, d) 임시 배열 없이 계산"""
+    distances = (
+        (points**2).sum(1)[:, None]
+        - 2 * points @ centroids.T
+        + (centroids**2).sum(1)[None, :]
+    )
+    return np.maximum(distances, 0.0)
+
+
+def kmeans(
+    points: np.ndarray, k: int, iterations: int = 50, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lloyd k-means (k-means++ 초기화) → (중심점, 소속 세그먼트)"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points))
+    centroids = [points[rng.integers(len(points))]]
+    nearest = squared_distances(points, centroids[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = nearest.sum()
+        if total == 0:
+            break
+        centroid = points[rng.choice(len(points), p=nearest / total)]
+        centroids.append(centroid)
+        nearest = np.minimum(
+            nearest, squared_distances(points, centroid[None, :])[:, 0]
+        )
+    centroids = np.array(centroids, dtype=np.float32)
+
+    labels = np.full(len(points), -1, dtype=np.int64)
+    for _ in range(iterations):
+        new_labels = squared_distances(points, centroids).argmin(1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for segment in range(len(centroids)):
+            members = points[labels == segment]
+            if len(members):
+                centroids[segment] = members.mean(0)
+    return centroids, labels
+
+
+def describe_segment(centroid: np.ndarray, size: int) -> Dict[str, Any]:
+    """LLM 프롬프트용 세그먼트 프로필 (특징 벡터 역변환)"""
+    shares = centroid[: len(STEP_TYPES)]
+    difficulty = float(centroid[4])
+    return {
+        "사용자 수": size,
+        "주요 스텝 타입": [
+            STEP_TYPES[index]
+            for index in np.argsort(shares)[::-1]
+            if shares[index] >= 0.2
+        ],
+        "평균 난이도": "쉬움" if difficulty < 0.34 else ("보통" if difficulty < 0.67 else "어려움"),
+        "평균 스텝 수": round(float(centroid[6]) * MAX_STEPS),
+        "평균 스트릭(일)": round(float(centroid[7]) * MAX_STREAK),
+        "평균 성공률(%)": round(float(centroid[8]) * 100),
+    }
+
+
+class TipPool:
+    """세그먼트 중심점/반경/팁 목록과 최근접 세그먼트 조회"""
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        radius: np.ndarray,
+        tips: List[List[str]],
+        built_at: Optional[float] = None,
+    ):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.radius = np.asarray(radius, dtype=np.float32)
+        self.tips = tips
+        self.built_at = built_at or time.time()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self.tips)
+
+    def lookup(
+        self,
+        user_id: int,
+        routine_data: Dict[str, Any],
+        user_stats: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        """가장 가까운 세그먼트의 팁 (반경 밖이거나 팁이 없으면 None)"""
+        features = segment_features(routine_data, user_stats)
+        distances = ((self.centroids - features) ** 2).sum(1)
+        segment = int(distances.argmin())
+        tips = self.tips[segment]
+        if not tips or distances[segment] > self.radius[segment]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # 같은 사용자는 하루 동안 같은 팁, 날마다 다른 팁
+        return tips[(user_id + date.today().toordinal()) % len(tips)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": len(self),
+            "tips": sum(len(tips) for tips in self.tips),
+            "built_at": self.built_at,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+        }
+
+    # 💾 저장/불러오기 (JSON, 임시 파일 교체로 원자적 기록)
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": 1,
+                    "features": FEATURES,
+                    "built_at": self.built_at,
+                    "centroids": self.centroids.tolist(),
+                    "radius": self.radius.tolist(),
+                    "tips": self.tips,
+                },
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TipPool"]:
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        if tuple(data.get("features", ())) != FEATURES:
+            logger.warning("팁 풀 특징 정의가 달라 무시합니다: %s", path)
+            return None
+        return cls(data["centroids"], data["radius"], data["tips"], data["built_at"])
+
+
+async def build_tip_pool(
+    items: List[Dict[str, Any]],
+    llm: LLMBackend,
+    segments: int = 32,
+    tips_per_segment: int = 5,
+    max_tokens: int = 400,
+    concurrency: int = 8,
+    radius_quantile: float = 0.95,
+    radius_slack: float = 1.25,
+    seed: int = 0,
+) -> TipPool:
+    """
+    사용자 표본(items)으로 세그먼트를 만들고 세그먼트별 팁 생성
+
+    세그먼트 반경 = 소속 사용자 거리의 radius_quantile 분위 × radius_slack
+    (표본에 없던 특이한 사용자는 miss → 개인화 생성)
+    """
+    if not items:
+        raise ValueError("세그먼트를 만들 사용자 표본이 없습니다")
+    points = np.stack(
+        [
+            segment_features(item.get("routine_data", {}), item.get("user_stats"))
+            for item in items
+        ]
+    )
+    centroids, labels = kmeans(points, segments, seed=seed)
+    distances = ((points - centroids[labels]) ** 2).sum(1)
+    radius = np.zeros(len(centroids), dtype=np.float32)
+    for segment in range(len(centroids)):
+        member_distances = distances[labels == segment]
+        if len(member_distances):
+            radius[segment] = (
+                np.quantile(member_distances, radius_quantile) * radius_slack**2
+            )
+    # 거리 0인 세그먼트(같은 특징만 모인 경우)도 아주 가까운 사용자는 받도록
+    radius = np.maximum(radius, 1e-4)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(segment: int, variant: int) -> Optional[str]:
+        profile = describe_segment(centroids[segment], int((labels == segment).sum()))
+        messages = [
+            ("system", SEGMENT_SYSTEM_PROMPT),
+            (
+                "human",
+                "사용자 그룹: "
+                + json.dumps(profile, ensure_ascii=False)
+                + f"\n서로 다른 관점의 팁 #{variant + 1}",
+            ),
+        ]
+        async with semaphore:
+            try:
+                result = await llm.generate(messages, max_tokens)
+            except LLMError as exc:
+                logger.warning("세그먼트 %d 팁 생성 실패: %s", segment, exc)
+                return None
+        return result.text
+
+    generated = await asyncio.gather(
+        *[
+            generate(segment, variant)
+            for segment in range(len(centroids))
+            for variant in range(tips_per_segment)
+        ]
+    )
+    tips: List[List[str]] = []
+    for segment in range(len(centroids)):
+        texts = generated[segment * tips_per_segment : (segment + 1) * tips_per_segment]
+        tips.append(list(dict.fromkeys(text for text in texts if text)))
+    return TipPool(centroids, radius, tips)
@@ -0,0 +1 @@
+# 벤치마크 스크립트 패키지 (실행: cd ai && python -m benchmarks.<이름>)
@@ -0,0 +1,142 @@
+# 📦 배치 팁 생성 파이프라인 벤치마크 (가짜 LLM 백엔드, 오프라인)
+# - 동시성별 처리량 (지연 latency_ms짜리 생성 N건, 토큰 예산 제한 없음)
+# - 분당 토큰 예산이 처리량을 제한하는지
+# - 실패율이 있을 때 재시도 횟수/최종 실패 수
+# - 절반에서 중단 후 같은 job_id로 재실행 → 남은 항목만 처리되는지
+#
+# 실행: cd ai && python -m benchmarks.bench_batch [--items 500] [--latency-ms 200]
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_env, synthetic_items
+
+UNLIMITED_TPM = 10**9
+
+
+def make_pipeline(
+    latency: float,
+    concurrency: int,
+    tokens_per_minute: int = UNLIMITED_TPM,
+    failure_rate: float = 0.0,
+):
+    from app.services.batch_pipeline import BatchPipeline, InMemoryCheckpointStore
+    from app.services.coach_service import CoachService
+    from app.services.llm import FakeLLMBackend
+
+    llm = FakeLLMBackend(
+        latency=latency, jitter=latency / 4, failure_rate=failure_rate, seed=7
+    )
+    pipeline = BatchPipeline(
+        CoachService(llm=llm),
+        InMemoryCheckpointStore(),
+        concurrency=concurrency,
+        tokens_per_minute=tokens_per_minute,
+        backoff_base=0.01,
+    )
+    return pipeline, llm
+
+
+async def drain(stream) -> dict:
+    summary = {"attempts": 0, "tokens": 0}
+    async for event in stream:
+        summary["attempts"] += event.get("attempts", 0)
+        summary["tokens"] += event.get("tokens", 0)
+        if event["event"] == "done":
+            summary.update(event)
+    return summary
+
+
+async def bench_concurrency(items, latency: float, concurrency: int) -> dict:
+    pipeline, llm = make_pipeline(latency, concurrency)
+    started = time.perf_counter()
+    summary = await drain(pipeline.run(items))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "items_per_sec": round(len(items) / elapsed, 1),
+        "llm_calls": llm.calls,
+        "generated": summary["generated"],
+        "duplicate": summary["duplicate"],
+    }
+
+
+async def bench_budget(items, latency: float, tokens_per_minute: int) -> dict:
+    """버킷은 1분치만큼 즉시 쓸 수 있고, 이후는 분당 예산 속도로 처리됨"""
+    pipeline, llm = make_pipeline(latency, 64, tokens_per_minute)
+    started = time.perf_counter()
+    summary = await drain(pipeline.run(items))
+    elapsed = time.perf_counter() - started
+    return {
+        "tokens_per_minute": tokens_per_minute,
+        "items": len(items),
+        "tokens_used": summary["tokens"],
+        "seconds": round(elapsed, 2),
+        # 1분치 버스트를 넘는 토큰은 분당 예산 속도로만 처리 가능 (이론 하한)
+        "budget_floor_seconds": round(
+            max(summary["tokens"] - tokens_per_minute, 0) / tokens_per_minute * 60, 2
+        ),
+    }
+
+
+async def bench_failures(items, latency: float, failure_rate: float) -> dict:
+    pipeline, llm = make_pipeline(latency, 32, failure_rate=failure_rate)
+    summary = await drain(pipeline.run(items))
+    return {
+        "failure_rate": failure_rate,
+        "llm_calls": llm.calls,
+        "attempts": summary["attempts"],
+        "generated": summary["generated"],
+        "failed": summary["failed"],
+    }
+
+
+async def bench_resume(items, latency: float) -> dict:
+    pipeline, llm = make_pipeline(latency, 16)
+    stream = pipeline.run(items)
+    job_id = None
+    seen = 0
+    async for event in stream:
+        if event["event"] == "start":
+            job_id = event["job_id"]
+        elif event["event"] == "item":
+            seen += 1
+            if seen >= len(items) // 2:
+                break
+    await stream.aclose()  # 연결 끊김과 같은 중단
+    calls_before = llm.calls
+
+    summary = await drain(pipeline.run(items, job_id))
+    return {
+        "first_run_items": seen,
+        "second_run_llm_calls": llm.calls - calls_before,
+        "second_run_cached": summary["cached"],
+        "second_run_generated": summary["generated"],
+    }
+
+
+async def main(args) -> None:
+    items = synthetic_items(args.items)
+    latency = args.latency_ms / 1000
+    results = {
+        "items": args.items,
+        "latency_ms": args.latency_ms,
+        "concurrency": [
+            await bench_concurrency(items, latency, concurrency)
+            for concurrency in (4, 16, 64)
+        ],
+        "budget": await bench_budget(items[:200], latency / 4, 60_000),
+        "failures": await bench_failures(items, latency / 4, 0.2),
+        "resume": await bench_resume(items, latency / 4),
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="배치 팁 생성 파이프라인 벤치마크")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    configure_env()
+    asyncio.run(main(parser.parse_args()))
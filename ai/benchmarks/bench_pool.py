@@ -0,0 +1,179 @@
+# 🧩 세그먼트 팁 풀 벤치마크 (가짜 LLM 백엔드, 오프라인)
+# 1) 루틴 원형(archetype) + 잡음으로 만든 사용자 표본으로 팁 풀 생성 (k-means + 팁 생성)
+# 2) 풀 조회 지연시간 (목표: 수 μs)
+# 3) 표본에 없던 사용자 요청을 /coach/tip으로 보내 풀에서 응답한 비율과 출처별 지연 측정
+#
+# 실행: cd ai && python -m benchmarks.bench_pool [--sample 5000] [--requests 2000]
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmarks.common import (
+    DIFFICULTIES,
+    STEP_TYPES,
+    auth_headers,
+    configure_env,
+    percentiles,
+    start_app,
+    stop_app,
+)
+
+TIERS = ["free", "basic", "basic", "pro"]  # 프리미엄(pro) 25%
+
+
+def population(count: int, archetypes: int, outliers: float, seed: int) -> list:
+    """원형 루틴 몇 개에 잡음을 섞은 사용자 (일부는 완전히 무작위)"""
+    rng = random.Random(seed)
+    shapes = [
+        {
+            "steps": [
+                (rng.choice(STEP_TYPES), rng.choice(DIFFICULTIES))
+                for _ in range(rng.randint(2, 8))
+            ],
+            "streak": rng.randrange(60),
+            "success": rng.random(),
+        }
+        for _ in range(archetypes)
+    ]
+    users = []
+    for user_id in range(1, count + 1):
+        if rng.random() < outliers:
+            shape = {
+                "steps": [
+                    (rng.choice(STEP_TYPES), rng.choice(DIFFICULTIES))
+                    for _ in range(rng.randint(1, 10))
+                ],
+                "streak": rng.randrange(200),
+                "success": rng.random(),
+            }
+        else:
+            shape = rng.choice(shapes)
+        steps = [
+            {
+                "order": order,
+                "title": f"스텝 {rng.randrange(50)}",
+                "type": t,
+                "difficulty": d,
+            }
+            for order, (t, d) in enumerate(shape["steps"], start=1)
+        ]
+        users.append(
+            {
+                "user_id": user_id,
+                "routine_data": {"title": f"루틴 {rng.randrange(5)}", "steps": steps},
+                "user_stats": {
+                    "streak": max(shape["streak"] + rng.randint(-3, 3), 0),
+                    "success_rate": min(
+                        max(shape["success"] + rng.gauss(0, 0.04), 0), 1
+                    ),
+                    "tier": rng.choice(TIERS),
+                },
+            }
+        )
+    return users
+
+
+async def main(args) -> None:
+    import httpx
+
+    from app.core.metrics import latency
+
+    app, coach_service = await start_app()
+
+    users = population(
+        args.sample + args.requests, args.archetypes, args.outliers, seed=11
+    )
+    sample, requests = users[: args.sample], users[args.sample :]
+
+    # 1) 풀 생성 (팁 생성 지연은 짧게)
+    coach_service.llm.latency, coach_service.llm.jitter = 0.02, 0.0
+    started = time.perf_counter()
+    built = await coach_service.rebuild_tip_pool(
+        {"items": sample, "segments": args.segments, "tips_per_segment": 5}
+    )
+    build_seconds = time.perf_counter() - started
+
+    # 2) 조회 지연 (HTTP 제외)
+    samples = []
+    for item in requests:
+        lookup_started = time.perf_counter()
+        coach_service.tip_pool.lookup(
+            item["user_id"], item["routine_data"], item["user_stats"]
+        )
+        samples.append(time.perf_counter() - lookup_started)
+    coach_service.tip_pool.hits = coach_service.tip_pool.misses = 0
+
+    # 3) 온라인 요청 (개인화 생성은 실제와 비슷한 지연)
+    coach_service.llm.latency = args.latency_ms / 1000
+    coach_service.llm.jitter = args.latency_ms / 5000
+    calls_before = coach_service.llm.calls
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def send(client, item) -> None:
+        async with semaphore:
+            response = await client.post(
+                "/coach/tip",
+                json={
+                    "routine_data": item["routine_data"],
+                    "user_stats": item["user_stats"],
+                },
+                headers=auth_headers(item["user_id"], item["user_stats"]["tier"]),
+            )
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await asyncio.gather(*[send(client, item) for item in requests])
+        stats = (await client.get("/coach/stats", headers=auth_headers(1))).json()
+    await stop_app(app)
+
+    print(
+        json.dumps(
+            {
+                "build": {
+                    **built,
+                    "sample": len(sample),
+                    "seconds": round(build_seconds, 2),
+                },
+                "lookup_us": {
+                    key.replace("_ms", ""): round(value * 1000, 2)
+                    for key, value in percentiles(samples).items()
+                },
+                "requests": len(requests),
+                "tip_sources": stats["tip_sources"],
+                "pool_served_fraction": stats["tip_pool"]["served_fraction"],
+                "pool": {
+                    key: stats["tip_pool"][key]
+                    for key in ("hits", "misses", "bypassed")
+                },
+                "llm_calls": coach_service.llm.calls - calls_before,
+                "latency": {
+                    name: value
+                    for name, value in latency.summary().items()
+                    if name.startswith("tip.")
+                },
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="세그먼트 팁 풀 벤치마크")
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--segments", type=int, default=32)
+    parser.add_argument("--archetypes", type=int, default=24)
+    parser.add_argument("--outliers", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=int, default=800)
+    args = parser.parse_args()
+    configure_env()
+    os.environ.setdefault("FAKE_LLM_LATENCY_MS", str(args.latency_ms))
+    asyncio.run(main(args))
@@ -0,0 +1,116 @@
+# 🧾 프롬프트 조립 벤치마크
+# 스텝 수가 긴 꼬리 분포(1~200개)인 루틴으로
+# - 기존 방식(routine_data/user_stats JSON 그대로)과 토큰 예산 빌더의 프롬프트 토큰 분포 비교
+# - 빌더 1회 호출 시간 (인코더/문자열 캐시가 찬 뒤)
+#
+# 실행: cd ai && python -m benchmarks.bench_prompts [--routines 2000] [--budget 500]
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import DIFFICULTIES, STEP_TYPES, configure_env, percentiles
+
+
+def routines(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    items = []
+    for user_id in range(1, count + 1):
+        # 대부분 2~8개, 일부는 수십~수백 개 (파레토 꼬리)
+        step_count = min(int(rng.paretovariate(1.2) * 3), 200)
+        steps = [
+            {
+                "id": rng.randrange(10**6),
+                "order": order,
+                "title": f"스텝 {rng.randrange(100)} " + "설명" * rng.randrange(5),
+                "type": rng.choice(STEP_TYPES),
+                "difficulty": rng.choice(DIFFICULTIES),
+                "t_ref_sec": rng.choice([30, 60, 120, 300, 600]),
+                "is_optional": rng.random() < 0.2,
+                "created_at": "2024-01-01T00:00:00Z",
+            }
+            for order in range(1, step_count + 1)
+        ]
+        items.append(
+            {
+                "routine_data": {
+                    "id": user_id,
+                    "title": f"루틴 {rng.randrange(5)}",
+                    "description": "아침 루틴 " * rng.randrange(60),
+                    "steps": steps,
+                },
+                "user_stats": {
+                    "streak": rng.randrange(60),
+                    "success_rate": rng.random(),
+                    "total_completions": rng.randrange(200),
+                },
+            }
+        )
+    return items
+
+
+def distribution(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[int(len(ordered) * 0.95)],
+        "max": ordered[-1],
+    }
+
+
+def main(args) -> None:
+    from app.services.prompts import TIP_SYSTEM_PROMPT, TipPromptBuilder, TokenCounter
+
+    counter = TokenCounter("gpt-3.5-turbo")
+    builder = TipPromptBuilder(counter, args.budget)
+    items = routines(args.routines)
+
+    naive = [
+        counter.count_messages(
+            [
+                ("system", TIP_SYSTEM_PROMPT),
+                (
+                    "human",
+                    "루틴: "
+                    + json.dumps(item["routine_data"], ensure_ascii=False)
+                    + "\n통계: "
+                    + json.dumps(item["user_stats"], ensure_ascii=False),
+                ),
+            ]
+        )
+        for item in items
+    ]
+
+    built = [builder.build(item["routine_data"], item["user_stats"]) for item in items]
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        builder.build(item["routine_data"], item["user_stats"])
+        samples.append(time.perf_counter() - started)
+
+    print(
+        json.dumps(
+            {
+                "encoder": "tiktoken" if counter.encoding is not None else "estimate",
+                "budget": args.budget,
+                "steps": distribution(
+                    [len(item["routine_data"]["steps"]) for item in items]
+                ),
+                "naive_prompt_tokens": distribution(naive),
+                "built_prompt_tokens": distribution([p.prompt_tokens for p in built]),
+                "over_budget": sum(p.prompt_tokens > args.budget for p in built),
+                "truncated": sum(p.truncated for p in built),
+                "build": percentiles(samples),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프롬프트 조립 벤치마크")
+    parser.add_argument("--routines", type=int, default=2000)
+    parser.add_argument("--budget", type=int, default=500)
+    args = parser.parse_args()
+    configure_env()
+    main(args)
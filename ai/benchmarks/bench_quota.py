@@ -0,0 +1,148 @@
+# 🎟️ 월 사용 한도 벤치마크
+# 1) 크레딧 확인(reserve)과 reserve+commit 지연시간 백분위 (목표: p99 < 1ms)
+# 2) 한 사용자에게 동시 요청을 몰아도 한도를 넘지 않고, 실패한 생성은 환불되는지 확인
+# 3) DB write-back → 새 프로세스에서 복원한 카운터가 같은지 확인 (임시 SQLite)
+#
+# 실행: cd ai && python -m benchmarks.bench_quota [--ops 20000] [--redis-url redis://...]
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import configure_env, percentiles
+
+LIMITS = {"free": 0, "basic": 3, "pro": 15, "team": 15}
+
+
+async def measure_latency(store, ops: int, users: int) -> dict:
+    from app.services.quota import QuotaExceededError, QuotaService
+
+    quota = QuotaService(store, LIMITS)
+    reserve_samples, total_samples = [], []
+    for op in range(ops):
+        started = time.perf_counter()
+        try:
+            reservation = await quota.reserve(op % users, "pro")
+        except QuotaExceededError:
+            reserve_samples.append(time.perf_counter() - started)
+            continue
+        reserve_samples.append(time.perf_counter() - started)
+        await reservation.commit()
+        total_samples.append(time.perf_counter() - started)
+    return {
+        "ops": ops,
+        "rejected": quota.rejected,
+        "reserve": percentiles(reserve_samples),
+        "reserve_commit": percentiles(total_samples),
+    }
+
+
+async def check_contention(store, requests: int, failure_rate: float) -> dict:
+    """한 사용자(pro, 월 15회)에게 동시 요청 → 확정 수 == 성공한 생성 수 <= 한도"""
+    from app.services.quota import QuotaExceededError, QuotaService, current_month
+
+    quota = QuotaService(store, LIMITS)
+    rng = random.Random(3)
+    outcome = {"generated": 0, "failed": 0, "rejected": 0}
+
+    async def request() -> None:
+        try:
+            reservation = await quota.reserve(42, "pro")
+        except QuotaExceededError:
+            outcome["rejected"] += 1
+            return
+        await asyncio.sleep(rng.uniform(0.001, 0.02))  # LLM 호출 대신
+        if rng.random() < failure_rate:
+            outcome["failed"] += 1
+            await reservation.refund()
+        else:
+            outcome["generated"] += 1
+            await reservation.commit()
+
+    # 실패한 요청이 환불한 크레딧을 뒤이은 요청이 쓰도록 몇 차례에 나눠 보냄
+    for _ in range(5):
+        await asyncio.gather(*[request() for _ in range(requests // 5)])
+    used, reserved = await store.get(current_month(), 42)
+    outcome.update(used=used, reserved=reserved, limit=LIMITS["pro"])
+    outcome["ok"] = (
+        used == outcome["generated"] and used <= LIMITS["pro"] and reserved == 0
+    )
+    return outcome
+
+
+async def check_writeback(users: int) -> dict:
+    from app.services.quota import (
+        DatabaseQuotaSnapshot,
+        InMemoryQuotaStore,
+        QuotaService,
+        metadata,
+    )
+
+    path = os.path.join(tempfile.mkdtemp(), "quota.db")
+    url = f"sqlite+aiosqlite:///{path}"
+    snapshot = DatabaseQuotaSnapshot(url)
+    async with snapshot.engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+    quota = QuotaService(InMemoryQuotaStore(), LIMITS, snapshot)
+    for user_id in range(users):
+        for _ in range(user_id % 4):
+            await (await quota.reserve(user_id, "basic")).commit()
+    started = time.perf_counter()
+    flushed = await quota.flush()
+    flush_ms = (time.perf_counter() - started) * 1000
+
+    # 재시작한 프로세스 (빈 저장소)
+    restored = QuotaService(InMemoryQuotaStore(), LIMITS, DatabaseQuotaSnapshot(url))
+    await restored.restore()
+    mismatched = 0
+    for user_id in range(users):
+        before = await quota.usage(user_id, "basic")
+        after = await restored.usage(user_id, "basic")
+        mismatched += before["used"] != after["used"]
+    await quota.stop()
+    await restored.stop()
+    os.remove(path)
+    return {
+        "users": users,
+        "flushed": flushed,
+        "flush_ms": round(flush_ms, 2),
+        "mismatched_after_restore": mismatched,
+    }
+
+
+async def main(args) -> None:
+    from app.services.quota import InMemoryQuotaStore, RedisQuotaStore
+
+    stores = {"memory": InMemoryQuotaStore}
+    if args.redis_url:
+        import redis.asyncio as redis
+
+        client = redis.from_url(args.redis_url)
+        await client.flushdb()
+        stores["redis"] = lambda: RedisQuotaStore(client)
+
+    report = {}
+    for name, make_store in stores.items():
+        report[name] = {
+            "latency": await measure_latency(make_store(), args.ops, args.users),
+            "contention": await check_contention(
+                make_store(), args.contention, args.failure_rate
+            ),
+        }
+    report["writeback"] = await check_writeback(args.users)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="월 사용 한도 벤치마크")
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--contention", type=int, default=500)
+    parser.add_argument("--failure-rate", type=float, default=0.3)
+    parser.add_argument("--redis-url", default=None, help="실제 Redis로도 측정")
+    args = parser.parse_args()
+    configure_env()
+    asyncio.run(main(args))
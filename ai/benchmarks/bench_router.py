@@ -0,0 +1,156 @@
+# 🔀 LLM 공급자 라우터 벤치마크 (프로세스 내 가짜 공급자, 오프라인)
+# 1) tail: 5% 확률로 +3초 꼬리 지연이 있는 공급자 - 단일 공급자 vs 라우터(p95 헤지)
+# 2) outage: 한 공급자가 전부 실패 → 서킷이 열려 요청이 다른 공급자로 감
+# 3) slowdown: 한 공급자만 느려짐 → 지연 가중치로 트래픽이 빠른 쪽으로 이동
+# 4) deadline: 모든 공급자가 데드라인보다 느림 → /coach/tip이 대체 팁으로 응답
+#
+# 실행: cd ai && python -m benchmarks.bench_router [--requests 400]
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import (
+    auth_headers,
+    configure_env,
+    percentiles,
+    start_app,
+    stop_app,
+    synthetic_items,
+)
+
+
+def fake(name: str, seed: int, **kwargs):
+    from app.services.llm import FakeLLMBackend
+
+    profile = {"latency": 0.4, "jitter": 0.1}
+    profile.update(kwargs)
+    return FakeLLMBackend(seed=seed, name=name, **profile)
+
+
+async def drive(backend, requests: int, concurrency: int) -> dict:
+    """같은 메시지를 동시에 requests번 생성하고 지연시간/실패 수 측정"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, failures = [], 0
+
+    async def one(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await backend.generate([("human", f"요청 {index}")], 400)
+            except Exception:
+                failures += 1
+                return
+            samples.append(time.perf_counter() - started)
+
+    await asyncio.gather(*[one(index) for index in range(requests)])
+    return {"ok": len(samples), "failed": failures, **percentiles(samples)}
+
+
+def router_for(backends, **kwargs):
+    from app.services.llm_router import LLMRouter
+
+    options = {"hedge_default": 0.8, "hedge_min": 0.2, "deadline": 8.0, "seed": 1}
+    options.update(kwargs)
+    return LLMRouter(backends, **options)
+
+
+def shares(router) -> dict:
+    stats = router.stats()
+    return {
+        "hedges": stats["hedges"],
+        "failovers": stats["failovers"],
+        "providers": {
+            label: {key: p[key] for key in ("state", "trips", "calls", "wins")}
+            for label, p in stats["providers"].items()
+        },
+    }
+
+
+async def scenario_tail(args) -> dict:
+    tail = {"tail_rate": 0.05, "tail_latency": 3.0}
+    single = await drive(fake("a", 1, **tail), args.requests, args.concurrency)
+    router = router_for([fake("a", 1, **tail), fake("b", 2, **tail)])
+    # 워밍업으로 p95 샘플을 채운 뒤 측정
+    await drive(router, 100, args.concurrency)
+    hedged = await drive(router, args.requests, args.concurrency)
+    return {"single": single, "router": hedged, **shares(router)}
+
+
+async def scenario_outage(args) -> dict:
+    broken = fake("a", 1, failure_rate=1.0, latency=0.05, jitter=0.0)
+    router = router_for([broken, fake("b", 2)], reset_timeout=60.0)
+    result = await drive(router, args.requests, args.concurrency)
+    return {"router": result, **shares(router)}
+
+
+async def scenario_slowdown(args) -> dict:
+    slow = fake("a", 1)
+    router = router_for([slow, fake("b", 2)])
+    await drive(router, 100, args.concurrency)
+    before = shares(router)["providers"]
+    slow.latency = 2.0
+    result = await drive(router, args.requests, args.concurrency)
+    after = shares(router)["providers"]
+    return {
+        "router": result,
+        "wins_after_slowdown": {
+            label: after[label]["wins"] - before[label]["wins"] for label in after
+        },
+        "hedges": router.hedges,
+    }
+
+
+async def scenario_deadline(args) -> dict:
+    import httpx
+
+    app, coach_service = await start_app()
+    coach_service.llm = router_for(
+        [fake("a", 1, latency=5.0), fake("b", 2, latency=5.0)],
+        hedge_default=0.3,
+        deadline=1.0,
+    )
+    items = synthetic_items(args.concurrency)
+    sources, samples = {}, []
+
+    async def one(client, item) -> None:
+        started = time.perf_counter()
+        response = await client.post(
+            "/coach/tip",
+            json={
+                "routine_data": item["routine_data"],
+                "user_stats": item["user_stats"],
+            },
+            headers=auth_headers(item["user_id"]),
+        )
+        samples.append(time.perf_counter() - started)
+        source = response.json().get("source", response.status_code)
+        sources[source] = sources.get(source, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await asyncio.gather(*[one(client, item) for item in items])
+    await stop_app(app)
+    return {"sources": sources, **percentiles(samples)}
+
+
+async def main(args) -> None:
+    report = {
+        "tail": await scenario_tail(args),
+        "outage": await scenario_outage(args),
+        "slowdown": await scenario_slowdown(args),
+        "deadline": await scenario_deadline(args),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 공급자 라우터 벤치마크")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    configure_env()
+    asyncio.run(main(args))
@@ -0,0 +1,71 @@
+# 🌊 팁 스트리밍 벤치마크 (가짜 LLM 백엔드, 오프라인)
+# 같은 요청을 /coach/tip(전체 완료 후 응답)과 /coach/tip/stream(SSE)으로 보내
+# 서버에서 기록한 첫 바이트까지 시간(TTFB)과 전체 지연시간을 비교
+#
+# 실행: cd ai && python -m benchmarks.bench_stream [--requests 200] [--latency-ms 1500]
+import argparse
+import asyncio
+import json
+import os
+
+from benchmarks.common import (
+    auth_headers,
+    configure_env,
+    start_app,
+    stop_app,
+    synthetic_items,
+)
+
+
+async def main(args) -> None:
+    import httpx
+
+    from app.core.metrics import latency
+
+    app, _ = await start_app()
+
+    items = synthetic_items(args.requests)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def send(client, path: str, item) -> None:
+        async with semaphore:
+            response = await client.post(
+                path,
+                json={
+                    "routine_data": item["routine_data"],
+                    "user_stats": item["user_stats"],
+                },
+                headers=auth_headers(item["user_id"]),
+            )
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        # 사용자 id를 바꿔 두 경로가 서로의 캐시를 쓰지 않도록 함
+        await asyncio.gather(*[send(client, "/coach/tip", item) for item in items])
+        for item in items:
+            item["user_id"] += args.requests
+        await asyncio.gather(
+            *[send(client, "/coach/tip/stream", item) for item in items]
+        )
+        # 캐시 hit 스트림 (이벤트 1개)
+        await asyncio.gather(
+            *[send(client, "/coach/tip/stream", item) for item in items]
+        )
+    await stop_app(app)
+
+    print(json.dumps(latency.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="팁 스트리밍 벤치마크")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=int, default=1500)
+    args = parser.parse_args()
+    configure_env()
+    os.environ.setdefault("FAKE_LLM_LATENCY_MS", str(args.latency_ms))
+    os.environ.setdefault("FAKE_LLM_JITTER_MS", str(args.latency_ms // 5))
+    asyncio.run(main(args))
@@ -0,0 +1,96 @@
+# 🧰 벤치마크 공용 유틸리티
+# 환경변수 기본값, 앱 시작/종료, 합성 요청 데이터, 지연시간 백분위 계산
+import logging
+import os
+import random
+import statistics
+from typing import Any, Dict, List, Optional, Sequence
+
+STEP_TYPES = ["action", "timer", "check", "habit"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def configure_env() -> None:
+    """Settings 필수값/오프라인 실행 기본값 설정 (app 임포트 전에 호출)"""
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("TIP_CACHE_BACKEND", "memory")
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1")
+    # 사용 한도는 bench_quota에서 따로 측정 (다른 벤치마크는 한도 없이 실행)
+    os.environ.setdefault("QUOTA_BACKEND", "memory")
+    os.environ.setdefault("QUOTA_DATABASE_URL", "")
+    os.environ.setdefault("COACH_MONTHLY_LIMITS", '{"free": 1000000000}')
+    os.environ.setdefault("TIP_POOL_PATH", "")
+    # Redis 없이 실행할 때 Redis 부가 기능(분산 락 등)의 경고 로그 억제
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+
+async def start_app():
+    """lifespan 시작 단계를 실행한 app.main의 (앱, 코치 서비스)"""
+    import app.main as main
+
+    # httpx ASGITransport는 lifespan 이벤트를 보내지 않으므로 직접 실행
+    main.app.state.lifespan = main.app.router.lifespan_context(main.app)
+    await main.app.state.lifespan.__aenter__()
+    return main.app, main.coach_service
+
+
+async def stop_app(app) -> None:
+    """lifespan 종료 단계 실행 (사용량 write-back 중지, Redis 연결 정리)"""
+    await app.state.lifespan.__aexit__(None, None, None)
+
+
+def auth_headers(
+    user_id: int, tier: str = "free", scope: Optional[str] = None
+) -> Dict[str, str]:
+    """메인 API가 발급하는 것과 같은 형식의 Bearer 토큰 (sub=사용자 id, tier, scope)"""
+    from jose import jwt
+
+    from app.core.config import settings
+
+    payload = {"sub": str(user_id), "tier": tier}
+    if scope:
+        payload["scope"] = scope
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def synthetic_item(user_id: int, rng: random.Random) -> Dict[str, Any]:
+    """루틴 1개 + 사용자 통계 합성 데이터"""
+    steps = [
+        {
+            "order": order,
+            "title": f"스텝 {rng.randrange(20)}",
+            "type": rng.choice(STEP_TYPES),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "t_ref_sec": rng.choice([30, 60, 120, 300, 600]),
+            "is_optional": rng.random() < 0.2,
+        }
+        for order in range(1, rng.randint(2, 8))
+    ]
+    return {
+        "user_id": user_id,
+        "routine_data": {"title": f"루틴 {rng.randrange(5)}", "steps": steps},
+        "user_stats": {
+            "streak": rng.randrange(60),
+            "success_rate": rng.random(),
+            "total_completions": rng.randrange(200),
+        },
+    }
+
+
+def synthetic_items(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [synthetic_item(user_id, rng) for user_id in range(1, count + 1)]
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """지연시간 샘플(초)을 ms 단위 p50/p95/p99로 요약"""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    q = statistics.quantiles(sorted(samples), n=100, method="inclusive")
+    return {
+        "p50_ms": round(q[49] * 1000, 3),
+        "p95_ms": round(q[94] * 1000, 3),
+        "p99_ms": round(q[98] * 1000, 3),
+    }
@@ -0,0 +1,29 @@
+# 🧪 AI 서비스 테스트 공용 설정
+# - app 임포트 전에 Settings 기본값 설정 (벤치마크와 같은 configure_env: 가짜 LLM, 메모리 캐시)
+# - 외부 API/Redis 없이 실행 (Redis가 필요한 검사는 fakeredis)
+import sys
+from pathlib import Path
+
+import httpx
+import pytest_asyncio
+
+AI_DIR = Path(__file__).resolve().parents[1]
+if str(AI_DIR) not in sys.path:
+    sys.path.insert(0, str(AI_DIR))
+
+from benchmarks.common import configure_env, start_app, stop_app  # noqa: E402
+
+configure_env()
+
+
+@pytest_asyncio.fixture
+async def coach_api():
+    """시작 이벤트를 실행한 앱의 (HTTP 클라이언트, 코치 서비스) - LLM은 빠른 가짜 백엔드"""
+    from app.services.llm import FakeLLMBackend
+
+    app, service = await start_app()
+    service.llm = FakeLLMBackend(latency=0.01, jitter=0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, service
+    await stop_app(app)
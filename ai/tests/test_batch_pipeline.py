@@ -0,0 +1,128 @@
+# 📦 배치 팁 생성 파이프라인
+# - 캐시에 있는 항목/같은 배치의 중복 키는 생성하지 않음
+# - LLMError는 백오프 후 재시도, 재시도를 다 쓰면 failed (체크포인트에 남기지 않음)
+# - 같은 job_id로 다시 실행하면 남은 항목만 처리 (인메모리/fakeredis 체크포인트)
+# - 토큰 버킷은 예산이 모자라면 충전될 때까지 대기
+# - 배치 엔드포인트는 관리자 scope 토큰만 (일반 사용자 토큰은 403)
+import json
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.core.auth import ADMIN_SCOPE
+from app.services.batch_pipeline import (
+    BatchPipeline,
+    InMemoryCheckpointStore,
+    RedisCheckpointStore,
+    TokenBucket,
+)
+from app.services.coach_service import CoachService
+from app.services.llm import FakeLLMBackend, LLMError
+from benchmarks.common import auth_headers, synthetic_items
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+
+class Flaky(FakeLLMBackend):
+    """처음 failures번은 실패하는 가짜 백엔드"""
+
+    def __init__(self, failures: int):
+        super().__init__(latency=0, jitter=0)
+        self.failures = failures
+
+    async def generate(self, messages, max_tokens):
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise LLMError("rate limited")
+        return await super().generate(messages, max_tokens)
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def checkpoints(request):
+    if request.param == "memory":
+        yield InMemoryCheckpointStore()
+        return
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    yield RedisCheckpointStore(client)
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def service():
+    service = CoachService(llm=FakeLLMBackend(latency=0, jitter=0))
+    yield service
+    await service.close()
+
+
+def pipeline(service, checkpoints, **kwargs) -> BatchPipeline:
+    options = {"concurrency": 4, "backoff_base": 0.001, "backoff_cap": 0.01}
+    return BatchPipeline(service, checkpoints, **{**options, **kwargs})
+
+
+async def collect(pipeline, items, job_id=None) -> list:
+    return [event async for event in pipeline.run(items, job_id)]
+
+
+async def test_skips_cached_and_duplicate_items(service, checkpoints):
+    items = synthetic_items(4)
+    items.append(dict(items[0]))  # 같은 키
+    await service.cache_tip(
+        items[1]["user_id"], items[1]["routine_data"], "기존 팁", items[1]["user_stats"]
+    )
+
+    events = await collect(pipeline(service, checkpoints), items)
+    start, done = events[0], events[-1]
+    assert start["total"] == 5 and start["resumed"] == 0
+    assert (done["generated"], done["cached"], done["duplicate"]) == (3, 1, 1)
+    assert service.llm.calls == 3
+    assert await service.get_cached_tip(
+        items[2]["user_id"], items[2]["routine_data"], items[2]["user_stats"]
+    )
+
+
+async def test_retries_then_resumes_failed_items(service, checkpoints):
+    items = synthetic_items(3)
+    service.llm = Flaky(failures=100)
+    events = await collect(pipeline(service, checkpoints, max_retries=1), items)
+    job_id = events[0]["job_id"]
+    assert events[-1]["failed"] == 3
+    assert all(e["attempts"] == 2 and e["error"] for e in events[1:-1])
+
+    # 공급자 회복 후 같은 job_id로 재실행 → 실패한 항목만 다시 처리
+    service.llm = Flaky(failures=1)
+    events = await collect(pipeline(service, checkpoints), items, job_id)
+    assert events[0]["resumed"] == 0
+    assert events[-1]["generated"] == 3
+    resumed = await collect(pipeline(service, checkpoints), items, job_id)
+    assert resumed[0]["resumed"] == 3 and resumed[-1]["generated"] == 0
+
+
+async def test_token_bucket_waits_for_budget():
+    bucket = TokenBucket(tokens_per_minute=600)  # 초당 10토큰
+    await bucket.acquire(600)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started >= 0.15
+    bucket.adjust(-1000)  # 예상보다 적게 쓴 만큼 돌려받되 용량을 넘지 않음
+    assert bucket.tokens <= bucket.capacity
+
+
+async def test_batch_endpoint_requires_admin(coach_api):
+    client, _ = coach_api
+    request = {"items": synthetic_items(2)}
+
+    user_token = await client.post(
+        "/coach/batch-generate", json=request, headers=auth_headers(1, "pro")
+    )
+    assert user_token.status_code == 403
+
+    admin_token = await client.post(
+        "/coach/batch-generate",
+        json=request,
+        headers=auth_headers(0, scope=ADMIN_SCOPE),
+    )
+    events = [json.loads(line) for line in admin_token.text.splitlines()]
+    assert events[0]["event"] == "start" and events[-1]["event"] == "done"
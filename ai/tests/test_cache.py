@@ -0,0 +1,88 @@
+# 🧊 팁 캐시 (L1 LRU + L2) / 캐시 키
+# - L1은 항목 수/바이트 한도와 TTL로 축출, L2 hit은 L1에 채움
+# - Redis 장애는 miss로 처리 (요청은 계속 진행)
+# - 스텝 순서/작은 통계 변화는 같은 키 → 같은 팁, 토큰의 티어가 다르면 다른 키
+import asyncio
+
+import pytest
+
+from app.core.cache import InMemoryBackend, LRUCache, RedisBackend, TieredCache
+from benchmarks.common import auth_headers, synthetic_items
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+
+async def test_lru_evicts_by_entries_bytes_and_ttl():
+    lru = LRUCache(max_entries=2, max_bytes=10, ttl=0.05)
+    lru.set("a", "1234")
+    lru.set("b", "1234")
+    lru.get("a")  # b가 가장 오래 안 쓰임
+    lru.set("c", "1234")
+    assert lru.get("b") is None and lru.get("a") == "1234"
+
+    lru.set("big", "12345678")  # 바이트 한도 초과 → 오래된 항목부터 축출
+    assert lru.bytes <= 10 and lru.get("big") == "12345678"
+    lru.set("huge", "x" * 11)  # 한 항목이 한도보다 크면 저장하지 않음
+    assert lru.get("huge") is None
+
+    await asyncio.sleep(0.06)
+    assert lru.get("big") is None and len(lru) == 0
+
+
+async def test_tiered_cache_fills_l1_from_l2():
+    backend = InMemoryBackend()
+    cache = TieredCache(backend, LRUCache(10, 1024, 60), ttl=60)
+    await backend.set("k", "tip", 60)
+
+    assert await cache.get("k") == "tip"  # L2 hit
+    assert await cache.get("k") == "tip"  # L1 hit
+    assert await cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+async def test_redis_errors_are_misses():
+    class Broken:
+        async def get(self, key):
+            raise ConnectionError("redis down")
+
+        async def set(self, key, value, ex=None):
+            raise ConnectionError("redis down")
+
+    backend = RedisBackend(Broken())
+    await backend.set("k", "tip", 60)
+    assert await backend.get("k") is None
+
+
+async def test_redis_backend_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    backend = RedisBackend(client)
+    await backend.set("k", "오늘의 팁", 60)
+    assert await backend.get("k") == "오늘의 팁"
+    assert 0 < await client.ttl("k") <= 60
+    await client.aclose()
+
+
+async def test_equivalent_requests_hit_cache(coach_api):
+    client, service = coach_api
+    item = synthetic_items(1)[0]
+    body = {"routine_data": item["routine_data"], "user_stats": item["user_stats"]}
+    first = await client.post("/coach/tip", json=body, headers=auth_headers(1))
+    assert first.json()["source"] == "generated"
+
+    reordered = {
+        **body,
+        "routine_data": {
+            **item["routine_data"],
+            "steps": list(reversed(item["routine_data"]["steps"])),
+        },
+    }
+    again = await client.post("/coach/tip", json=reordered, headers=auth_headers(1))
+    assert again.json() == {"tip": first.json()["tip"], "source": "cache"}
+
+    # 다른 티어(토큰 기준)는 다른 키
+    pro = await client.post("/coach/tip", json=body, headers=auth_headers(1, "pro"))
+    assert pro.json()["source"] == "generated"
+    assert service.llm.calls == 2
@@ -0,0 +1,145 @@
+# 🔀 LLM 공급자 라우터
+# - 실패한 공급자 → 남은 공급자로 장애 조치, 연속 실패 시 서킷 열림 → 시험 호출 1회
+# - 1순위가 p95 안에 응답하지 않으면 헤지 요청, 먼저 온 응답 사용 / 진 쪽은 취소
+# - 하드 데드라인 초과 → LLMDeadlineExceededError,
+#   모든 공급자 실패/모든 서킷 열림 → LLMUnavailableError
+#   (둘 다 /coach/tip, /coach/tip/stream이 대체 팁으로 응답)
+import asyncio
+
+import pytest
+
+from app.services.llm import (
+    FakeLLMBackend,
+    LLMDeadlineExceededError,
+    LLMUnavailableError,
+)
+from app.services.llm_router import CircuitBreaker, LLMRouter
+from benchmarks.common import auth_headers, synthetic_items
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+MESSAGES = [("system", "코치"), ("human", "아침 루틴")]
+
+
+def fake(name: str, latency: float = 0.01, failure_rate: float = 0.0):
+    return FakeLLMBackend(
+        latency=latency, jitter=0, failure_rate=failure_rate, seed=1, name=name
+    )
+
+
+def router(*backends, **kwargs) -> LLMRouter:
+    options = {"hedge_default": 1.0, "deadline": 2.0, "seed": 3}
+    return LLMRouter(list(backends), **{**options, **kwargs})
+
+
+async def test_failover_to_next_provider():
+    broken, healthy = fake("broken", failure_rate=1.0), fake("healthy")
+    llm = router(broken, healthy)
+    for _ in range(5):
+        result = await llm.generate(MESSAGES, 100)
+        assert result.text
+    stats = llm.stats()["providers"]
+    assert stats["healthy"]["wins"] == 5
+    assert stats["broken"]["wins"] == 0
+    assert healthy.calls == 5
+
+
+async def test_hedge_uses_faster_provider():
+    slow, fast = fake("slow", latency=1.0), fake("fast", latency=0.01)
+    llm = router(slow, fast, hedge_default=0.05, hedge_min=0.01)
+    llm.ranked = lambda: [llm.providers[0], llm.providers[1]]  # 느린 쪽이 1순위
+
+    started = asyncio.get_running_loop().time()
+    await llm.generate(MESSAGES, 100)
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert llm.hedges == 1
+    providers = llm.stats()["providers"]
+    assert providers["fast"]["wins"] == 1 and providers["slow"]["cancelled"] == 1
+
+
+async def test_breaker_opens_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.available()
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.available()
+    breaker.start()
+    assert not breaker.available()  # 시험 호출은 1개만
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.trips == 2
+
+    await asyncio.sleep(0.06)
+    breaker.start()
+    breaker.success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_all_breakers_open_raises_unavailable():
+    llm = router(fake("a", failure_rate=1.0), failure_threshold=1, reset_timeout=60)
+    with pytest.raises(LLMUnavailableError, match="호출 실패"):
+        await llm.generate(MESSAGES, 100)
+    with pytest.raises(LLMUnavailableError):
+        await llm.generate(MESSAGES, 100)
+    with pytest.raises(LLMUnavailableError):
+        async for _ in llm.stream(MESSAGES, 100):
+            pass
+
+
+async def test_deadline_exceeded():
+    llm = router(fake("slow", latency=1.0), hedge_default=0.05, deadline=0.1)
+    with pytest.raises(LLMDeadlineExceededError):
+        await llm.generate(MESSAGES, 100)
+    with pytest.raises(LLMDeadlineExceededError):
+        async for _ in llm.stream(MESSAGES, 100):
+            pass
+    assert llm.deadline_misses == 2
+
+
+async def test_stream_fails_over_before_first_chunk():
+    llm = router(fake("broken", failure_rate=1.0), fake("healthy"))
+    llm.ranked = lambda: list(llm.providers)
+    text = "".join([chunk async for chunk in llm.stream(MESSAGES, 100)])
+    assert text and llm.failovers == 1
+
+
+@pytest.mark.parametrize("path", ["/coach/tip", "/coach/tip/stream"])
+async def test_open_breakers_fall_back(coach_api, path):
+    client, service = coach_api
+    service.llm = router(
+        fake("a", failure_rate=1.0), failure_threshold=1, reset_timeout=60
+    )
+    item = synthetic_items(1)[0]
+    body = {"routine_data": item["routine_data"], "user_stats": item["user_stats"]}
+    await client.post(path, json=body, headers=auth_headers(1))  # 서킷 열림
+
+    response = await client.post(path, json=body, headers=auth_headers(1))
+    assert response.status_code == 200
+    if path.endswith("/stream"):
+        assert '"source": "fallback"' in response.text
+        assert "event: error" not in response.text
+    else:
+        assert response.json()["source"] == "fallback"
+    usage = await client.get("/coach/usage/1", headers=auth_headers(1))
+    assert usage.json()["used"] == 0
+
+
+@pytest.mark.parametrize("path", ["/coach/tip", "/coach/tip/stream"])
+async def test_every_provider_failing_falls_back(coach_api, path):
+    client, service = coach_api
+    service.llm = router(
+        fake("a", failure_rate=1.0), fake("b", failure_rate=1.0), failure_threshold=5
+    )
+    item = synthetic_items(1)[0]
+    body = {"routine_data": item["routine_data"], "user_stats": item["user_stats"]}
+
+    response = await client.post(path, json=body, headers=auth_headers(1))
+    assert response.status_code == 200
+    if path.endswith("/stream"):
+        assert '"source": "fallback"' in response.text
+        assert "event: error" not in response.text
+    else:
+        assert response.json()["source"] == "fallback"
+    assert service.llm.failovers == 1  # 서킷은 닫힌 채로 두 공급자 모두 실패
@@ -0,0 +1,245 @@
+# 🎟️ 월 사용 한도 (예약 임대 / 환불 / DB write-back) + 토큰 기준 사용자
+# 인메모리 저장소와 fakeredis(Lua) 저장소에 같은 시나리오 실행
+# - 확정/환불 없이 사라진 예약은 임대 만료 후 회수
+# - 요청이 취소돼도 환불은 백그라운드로 끝까지 실행
+# - write-back 실패 시 사용자를 dirty로 되돌려 다음 주기에 기록
+# - 월말 예약이 자정 뒤에 확정돼도 예약한 달(지난달)로 기록
+# - 사용자 id/티어는 검증된 토큰에서만 (쿼리/본문 값 무시)
+# - write-back DB가 있으면 한도는 DB의 현재 티어 기준 (토큰의 tier는 발급 시점 값)
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from app.services.quota import (
+    DatabaseQuotaSnapshot,
+    InMemoryQuotaStore,
+    QuotaExceededError,
+    QuotaService,
+    RedisQuotaStore,
+    current_month,
+    metadata,
+    previous_month,
+    users,
+)
+from benchmarks.common import auth_headers, synthetic_items
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+LIMITS = {"free": 0, "basic": 3, "pro": 15}
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def store(request):
+    if request.param == "memory":
+        yield InMemoryQuotaStore()
+        return
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+    yield RedisQuotaStore(client)
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def snapshot():
+    path = os.path.join(tempfile.mkdtemp(), "quota.db")
+    snapshot = DatabaseQuotaSnapshot(f"sqlite+aiosqlite:///{path}")
+    async with snapshot.engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+    yield snapshot
+    await snapshot.close()
+    os.remove(path)
+
+
+async def test_concurrent_reservations_respect_limit(store):
+    quota = QuotaService(store, LIMITS)
+
+    async def request():
+        try:
+            reservation = await quota.reserve(1, "basic")
+        except QuotaExceededError:
+            return False
+        await asyncio.sleep(0.01)
+        await reservation.commit()
+        return True
+
+    results = await asyncio.gather(*[request() for _ in range(10)])
+    assert sum(results) == 3
+    assert (await quota.usage(1, "basic"))["used"] == 3
+    with pytest.raises(QuotaExceededError):
+        await quota.reserve(1, "free")
+
+
+async def test_abandoned_reservation_expires(store):
+    quota = QuotaService(store, {"basic": 1}, reservation_ttl=0.05)
+    await quota.reserve(1, "basic")  # 확정/환불 전에 프로세스가 죽은 예약
+    with pytest.raises(QuotaExceededError):
+        await quota.reserve(1, "basic")
+
+    await asyncio.sleep(0.1)
+    assert (await quota.usage(1, "basic"))["reserved"] == 0
+    await (await quota.reserve(1, "basic")).commit()
+    assert await store.get(current_month(), 1) == (1, 0)
+
+
+async def test_commit_after_lease_expired_still_counts(store):
+    quota = QuotaService(store, {"basic": 2}, reservation_ttl=0.01)
+    reservation = await quota.reserve(1, "basic")
+    await asyncio.sleep(0.05)  # 생성이 임대보다 오래 걸림
+    await reservation.commit()
+    await reservation.refund()  # 처음 settle만 반영
+    assert await store.get(current_month(), 1) == (1, 0)
+
+
+async def test_cancelled_generation_refunds(store):
+    from app.services.coach_service import CoachService
+    from app.services.llm import FakeLLMBackend
+
+    service = CoachService(llm=FakeLLMBackend(latency=5, jitter=0))
+    service.quota = QuotaService(store, {"basic": 1})
+    item = synthetic_items(1)[0]
+    stats = {**item["user_stats"], "tier": "basic"}
+
+    task = asyncio.create_task(
+        service.generate_personalized_tip(1, item["routine_data"], stats)
+    )
+    await asyncio.sleep(0.05)
+    task.cancel()  # 클라이언트 연결 끊김
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.01)  # 백그라운드 환불
+
+    assert await store.get(current_month(), 1) == (0, 0)
+    await service.close()
+
+
+async def test_failed_writeback_is_retried(store, snapshot):
+    class Unavailable:
+        async def save(self, month, used):
+            raise ConnectionError("db down")
+
+        async def close(self):
+            pass
+
+    quota = QuotaService(store, LIMITS, Unavailable())
+    for user_id in (1, 2):
+        await (await quota.reserve(user_id, "pro")).commit()
+    with pytest.raises(ConnectionError):
+        await quota.flush()
+
+    quota.snapshot = snapshot
+    assert await quota.flush() == 2
+    assert await snapshot.load(current_month()) == {1: 1, 2: 1}
+
+
+async def test_flush_records_reservations_committed_after_month_end(
+    store, snapshot, monkeypatch
+):
+    import app.services.quota as quota_module
+
+    quota = QuotaService(store, LIMITS, snapshot)
+    monkeypatch.setattr(quota_module, "current_month", lambda: "2026-12")
+    reservation = await quota.reserve(1, "pro")  # 월말 23:59에 예약
+    monkeypatch.setattr(quota_module, "current_month", lambda: "2027-01")
+    await reservation.commit()  # 자정 뒤에 생성 완료
+    await (await quota.reserve(2, "pro")).commit()
+
+    assert await quota.flush() == 2
+    assert await snapshot.load("2026-12") == {1: 1}
+    assert await snapshot.load("2027-01") == {2: 1}
+    assert previous_month("2027-01") == "2026-12"
+    assert previous_month("2026-10") == "2026-09"
+
+
+async def test_restore_from_database(store, snapshot):
+    month = current_month()
+    quota = QuotaService(InMemoryQuotaStore(), LIMITS, snapshot)
+    for _ in range(2):
+        await (await quota.reserve(7, "basic")).commit()
+    await quota.flush()
+    await snapshot.save(month, {7: 1})  # 늦게 도착한 write-back이 값을 줄이지 않음
+
+    restored = QuotaService(store, LIMITS, snapshot)
+    await restored.restore()
+    assert await store.get(month, 7) == (2, 0)
+    await (await restored.reserve(7, "basic")).commit()
+    with pytest.raises(QuotaExceededError):
+        await restored.reserve(7, "basic")
+
+
+@pytest_asyncio.fixture
+async def client(coach_api):
+    client, service = coach_api
+    service.quota = QuotaService(InMemoryQuotaStore(), {"free": 0, "basic": 1})
+    return client
+
+
+async def test_tier_and_user_come_from_token(client):
+    first, second = synthetic_items(2)
+    for item in (first, second):
+        item["user_stats"]["tier"] = "pro"  # 클라이언트가 보낸 티어는 무시
+
+    generated = await client.post(
+        "/coach/tip?user_id=99",
+        json={k: first[k] for k in ("routine_data", "user_stats")},
+        headers=auth_headers(5, "basic"),
+    )
+    assert generated.json()["source"] == "generated"
+    rejected = await client.post(
+        "/coach/tip",
+        json={k: second[k] for k in ("routine_data", "user_stats")},
+        headers=auth_headers(5, "basic"),
+    )
+    assert rejected.status_code == 429
+
+    usage = await client.get("/coach/usage/5", headers=auth_headers(5, "basic"))
+    assert usage.json()["used"] == 1 and usage.json()["tier"] == "basic"
+    other = await client.get("/coach/usage/99", headers=auth_headers(5, "basic"))
+    assert other.status_code == 403
+
+
+async def test_tier_comes_from_database(snapshot, client, coach_api):
+    _, service = coach_api
+    service.quota = QuotaService(
+        InMemoryQuotaStore(), {"free": 0, "basic": 1}, snapshot, tier_ttl=0.05
+    )
+    async with snapshot.engine.begin() as conn:
+        await conn.execute(users.insert().values(id=5, tier="free"))
+    item = synthetic_items(1)[0]
+    body = {k: item[k] for k in ("routine_data", "user_stats")}
+
+    # 구독 해지 후에도 토큰에는 basic이 남아 있음
+    rejected = await client.post(
+        "/coach/tip", json=body, headers=auth_headers(5, "basic")
+    )
+    assert rejected.status_code == 429
+
+    async with snapshot.engine.begin() as conn:
+        await conn.execute(users.update().values(tier="basic"))
+    cached = await client.get("/coach/usage/5", headers=auth_headers(5, "free"))
+    assert cached.json()["tier"] == "free"  # 캐시 TTL 동안은 이전 티어
+    await asyncio.sleep(0.1)
+    generated = await client.post(
+        "/coach/tip", json=body, headers=auth_headers(5, "free")
+    )
+    assert generated.json()["source"] == "generated"
+
+    # DB에 없는 사용자는 토큰의 티어
+    assert await service.quota.resolve_tier(6, "basic") == "basic"
+
+
+async def test_token_without_user_is_rejected(client):
+    from jose import jwt
+
+    from app.core.config import settings
+
+    token = jwt.encode({"tier": "pro"}, settings.SECRET_KEY, settings.ALGORITHM)
+    response = await client.post(
+        "/coach/tip",
+        json={"routine_data": {}, "user_stats": {}},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 401
@@ -0,0 +1,106 @@
+# 🛫 single-flight 요청 합치기
+# - 같은 키의 동시 요청은 생성 1회를 공유, 기다리던 요청이 끊겨도 생성은 계속
+# - 레플리카 간(fakeredis 공유): 락을 못 잡은 쪽은 캐시에 써진 결과를 사용
+# - Redis 장애 시 프로세스 내 합치기만 적용
+import asyncio
+
+import pytest
+
+from app.core.singleflight import RedisLock, SingleFlight
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+
+def counted(value="tip", delay: float = 0.05):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return fn, calls
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    fn, calls = counted()
+    results = await asyncio.gather(*[flight.do("k", fn) for _ in range(10)])
+
+    assert len(calls) == 1
+    assert {value for value, _ in results} == {"tip"}
+    outcomes = [outcome for _, outcome in results]
+    assert outcomes.count(SingleFlight.LEADER) == 1
+    assert outcomes.count(SingleFlight.COALESCED) == 9
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_cancelled_caller_does_not_cancel_generation():
+    flight = SingleFlight()
+    fn, calls = counted()
+    leader = asyncio.create_task(flight.do("k", fn))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(flight.do("k", fn))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == ("tip", SingleFlight.COALESCED)
+    assert len(calls) == 1
+
+
+async def test_failure_is_shared_and_not_cached():
+    flight = SingleFlight()
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("llm down")
+
+    results = await asyncio.gather(
+        *[flight.do("k", broken) for _ in range(3)], return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.failures == 1
+    fn, calls = counted()
+    assert await flight.do("k", fn) == ("tip", SingleFlight.LEADER)
+
+
+async def test_replicas_share_result_through_cache():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    clients = [fakeredis.FakeAsyncRedis(server=server) for _ in range(2)]
+    replicas = [
+        SingleFlight(RedisLock(client, 5_000, wait_timeout=2, poll_interval=0.01))
+        for client in clients
+    ]
+    cache = {}
+
+    async def generate():
+        await asyncio.sleep(0.05)
+        cache["k"] = "tip"
+        return "tip"
+
+    async def recheck():
+        return cache.get("k")
+
+    results = await asyncio.gather(
+        *[replica.do("k", generate, recheck=recheck) for replica in replicas]
+    )
+    assert sorted(outcome for _, outcome in results) == [
+        SingleFlight.LEADER,
+        SingleFlight.REMOTE,
+    ]
+    assert not await clients[0].exists("k:lock")
+    for client in clients:
+        await client.aclose()
+
+
+async def test_lock_errors_fall_back_to_local():
+    class Broken:
+        async def set(self, *args, **kwargs):
+            raise ConnectionError("redis down")
+
+    flight = SingleFlight(RedisLock(Broken(), 5_000, 1, 0.01))
+    fn, calls = counted()
+    assert await flight.do("k", fn) == ("tip", SingleFlight.LEADER)
+    assert flight.lock_errors == 1 and len(calls) == 1
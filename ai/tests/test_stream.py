@@ -0,0 +1,60 @@
+# 🌊 팁 스트리밍 (SSE)
+# - 캐시 miss: token 이벤트 여러 개 → done, 완료 후 캐시 저장/크레딧 확정
+# - 캐시 hit: tip 이벤트 1개 → done (LLM 호출/차감 없음)
+# - 한도 초과: error 이벤트(status 429)
+import json
+
+import pytest
+
+from app.services.quota import InMemoryQuotaStore, QuotaService
+from benchmarks.common import auth_headers, synthetic_items
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+
+def parse_events(text: str) -> list:
+    events = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+async def stream(client, item, user_id: int = 1, tier: str = "basic") -> list:
+    response = await client.post(
+        "/coach/tip/stream",
+        json={"routine_data": item["routine_data"], "user_stats": item["user_stats"]},
+        headers=auth_headers(user_id, tier),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return parse_events(response.text)
+
+
+async def test_stream_tokens_then_cache(coach_api):
+    client, service = coach_api
+    service.quota = QuotaService(InMemoryQuotaStore(), {"basic": 1})
+    item = synthetic_items(1)[0]
+
+    events = await stream(client, item)
+    names = [name for name, _ in events]
+    assert names[-1] == "done" and events[-1][1]["source"] == "generated"
+    assert set(names[:-1]) == {"token"} and len(names) > 2
+    tip = "".join(data["text"] for name, data in events if name == "token")
+
+    cached = await stream(client, item)
+    assert cached == [
+        ("tip", {"tip": tip.strip(), "source": "cache"}),
+        ("done", {"source": "cache"}),
+    ]
+    usage = await service.get_user_usage(1, "basic")
+    assert (usage["used"], usage["reserved"]) == (1, 0)
+    assert service.llm.calls == 1
+
+
+async def test_stream_quota_exceeded(coach_api):
+    client, service = coach_api
+    service.quota = QuotaService(InMemoryQuotaStore(), {"free": 0})
+    events = await stream(client, synthetic_items(1)[0], tier="free")
+    assert events[0][0] == "error" and events[0][1]["status"] == 429
+    assert service.llm.calls == 0
@@ -0,0 +1,84 @@
+# 🔑 팁 캐시 키 / 프롬프트 통계의 숫자 입력
+# - success_rate는 0-100 퍼센트 한 가지 척도 (0.8은 0.8%)
+# - 숫자가 아닌 streak/t_ref_sec/order는 예외 없이 "없음"으로 처리
+import pytest
+
+from app.services.prompts import TipPromptBuilder, TokenCounter, render_stats
+from app.services.tip_keys import bucket_stats, success_decile, tip_cache_key
+from app.services.tip_pool import segment_features
+
+pytestmark = pytest.mark.unit
+
+ROUTINE = {
+    "title": "아침 루틴",
+    "steps": [
+        {"title": "스트레칭", "order": 2, "t_ref_sec": 300, "type": "timer"},
+        {"title": "물 마시기", "order": 1, "t_ref_sec": 60, "type": "action"},
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    ("rate", "decile"),
+    [(None, None), (0, 0), (0.8, 0), (1, 0), (45, 4), (99.9, 9), (100, 9), (250, 9)],
+)
+def test_success_rate_is_a_percentage(rate, decile):
+    assert success_decile(rate) == decile
+
+
+def test_success_rate_scale_is_shared():
+    assert render_stats({"success_rate": 1}) == "성공률 1%"
+    assert render_stats({"success_rate": 80}) == "성공률 80%"
+    features = segment_features(ROUTINE, {"success_rate": 80})
+    assert features[-1] == pytest.approx(0.8)
+
+
+def test_cache_key_ignores_ids_and_small_changes():
+    renamed = {
+        **ROUTINE,
+        "id": 7,
+        "title": "  아침   루틴 ",
+        "steps": list(reversed(ROUTINE["steps"])),
+    }
+    stats = {"streak": 4, "success_rate": 81}
+    assert tip_cache_key(1, ROUTINE, stats) == tip_cache_key(
+        1, renamed, {"streak": 5, "success_rate": 88}
+    )
+    assert tip_cache_key(1, ROUTINE, stats) != tip_cache_key(2, ROUTINE, stats)
+    assert tip_cache_key(1, ROUTINE, stats) != tip_cache_key(
+        1, ROUTINE, {"streak": 40, "success_rate": 81}
+    )
+
+
+@pytest.mark.parametrize("bad", ["abc", "", [], {}, True, float("nan")])
+def test_non_numeric_inputs_do_not_raise(bad):
+    routine = {
+        "title": "루틴",
+        "steps": [
+            {"title": "a", "order": bad, "t_ref_sec": bad},
+            {"title": "b", "order": 1, "t_ref_sec": "120"},
+            "문자열 스텝",
+        ],
+    }
+    stats = {"streak": bad, "success_rate": bad, "total_completions": bad}
+
+    assert tip_cache_key(1, routine, stats).startswith("rq:tip:v2:1:")
+    assert bucket_stats(stats) == {
+        "streak": None,
+        "success": None,
+        "completions": None,
+        "tier": None,
+    }
+    assert render_stats(stats) is None
+    segment_features(routine, stats)
+    prompt = TipPromptBuilder(TokenCounter("gpt-3.5-turbo"), budget=500).build(
+        routine, stats
+    )
+    assert prompt.steps_total == 3
+
+
+def test_numeric_strings_are_numbers():
+    assert bucket_stats({"streak": "7"}) == bucket_stats({"streak": 7})
+    assert render_stats({"streak": "7", "total_completions": "12"}) == (
+        "스트릭 7일, 누적 완료 12회"
+    )
@@ -0,0 +1,109 @@
+# 🧩 세그먼트 팁 풀
+# - 표본 사용자는 자기 세그먼트 팁을 받고, 표본과 동떨어진 사용자는 miss (개인화 생성)
+# - 풀 대상이 아닌 티어는 풀을 건너뜀 (티어는 토큰 기준)
+# - 저장/불러오기 왕복, 특징 정의가 바뀐 파일은 무시
+# - 풀 재생성 엔드포인트는 관리자 scope 토큰만 (일반 사용자 토큰은 403)
+import json
+import os
+import tempfile
+
+import pytest
+
+from app.core.auth import ADMIN_SCOPE
+from app.services.llm import FakeLLMBackend
+from app.services.tip_pool import TipPool, build_tip_pool
+from benchmarks.common import auth_headers
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit]
+
+
+def user(user_id: int, streak: int, success: float, minutes: int) -> dict:
+    steps = [
+        {"order": order, "title": "스텝", "type": "action", "t_ref_sec": minutes * 60}
+        for order in range(1, 4)
+    ]
+    return {
+        "user_id": user_id,
+        "routine_data": {"title": "루틴", "steps": steps},
+        "user_stats": {"streak": streak, "success_rate": success, "tier": "free"},
+    }
+
+
+SAMPLE = [user(n, 3 + n % 3, 60 + n % 5, 5) for n in range(20)] + [
+    user(100 + n, 40 + n % 3, 95, 1) for n in range(20)
+]
+OUTLIER = user(999, 365, 1, 120)
+
+
+@pytest.fixture
+def pool_path(monkeypatch):
+    from app.core.config import settings
+
+    path = os.path.join(tempfile.mkdtemp(), "tip_pool.json")
+    monkeypatch.setattr(settings, "TIP_POOL_PATH", path)
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def build() -> TipPool:
+    llm = FakeLLMBackend(latency=0, jitter=0)
+    return await build_tip_pool(SAMPLE, llm, segments=2, tips_per_segment=3)
+
+
+async def test_lookup_hits_members_and_misses_outliers():
+    pool = await build()
+    member = SAMPLE[0]
+    tip = pool.lookup(member["user_id"], member["routine_data"], member["user_stats"])
+    assert tip in {text for tips in pool.tips for text in tips}
+    assert pool.lookup(999, OUTLIER["routine_data"], OUTLIER["user_stats"]) is None
+    assert (pool.hits, pool.misses) == (1, 1)
+
+
+async def test_save_and_load(pool_path):
+    pool = await build()
+    pool.save(pool_path)
+    loaded = TipPool.load(pool_path)
+    assert loaded.tips == pool.tips and len(loaded) == 2
+
+    with open(pool_path, encoding="utf-8") as file:
+        data = json.load(file)
+    data["features"] = ["old"]
+    with open(pool_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    assert TipPool.load(pool_path) is None
+    assert TipPool.load(pool_path + ".missing") is None
+
+
+async def test_pool_serves_pool_tiers_only(coach_api, pool_path):
+    client, service = coach_api
+    stats = await service.rebuild_tip_pool(
+        {"items": SAMPLE, "segments": 2, "tips_per_segment": 3}
+    )
+    assert stats["segments"] == 2 and os.path.exists(pool_path)
+    member = SAMPLE[0]
+    body = {"routine_data": member["routine_data"], "user_stats": member["user_stats"]}
+
+    free = await client.post("/coach/tip", json=body, headers=auth_headers(1))
+    assert free.json()["source"] == "pool"
+    # 본문은 free여도 토큰이 pro면 개인화 생성
+    pro = await client.post("/coach/tip", json=body, headers=auth_headers(1, "pro"))
+    assert pro.json()["source"] == "generated"
+    assert service.tip_pool.bypassed == 1
+
+
+async def test_pool_build_requires_admin(coach_api, pool_path):
+    client, _ = coach_api
+    request = {"items": SAMPLE, "segments": 2, "tips_per_segment": 1}
+
+    user_token = await client.post(
+        "/coach/pool/build", json=request, headers=auth_headers(1, "pro")
+    )
+    assert user_token.status_code == 403
+    assert not os.path.exists(pool_path)
+
+    admin_token = await client.post(
+        "/coach/pool/build", json=request, headers=auth_headers(0, scope=ADMIN_SCOPE)
+    )
+    assert admin_token.status_code == 200
+    assert admin_token.json()["segments"] == 2
@@ -0,0 +1,65 @@
+# 🗄️ Alembic 실행 환경 (비동기 엔진)
+# API와 같은 드라이버(asyncpg/aiosqlite)로 마이그레이션 실행
+# - URL: -x db_url=... > alembic.ini sqlalchemy.url > app.core.database.ASYNC_DATABASE_URL
+# - target_metadata: app.models의 Base.metadata (autogenerate 비교 대상)
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import ASYNC_DATABASE_URL
+from app.models import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return (
+        context.get_x_argument(as_dictionary=True).get("db_url")
+        or config.get_main_option("sqlalchemy.url")
+        or ASYNC_DATABASE_URL
+    )
+
+
+def run_migrations_offline() -> None:
+    """SQL 스크립트만 출력 (alembic upgrade head --sql)"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=database_url().startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite는 ALTER TABLE 제약 변경이 안 되므로 테이블 재작성 방식
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(database_url(), poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
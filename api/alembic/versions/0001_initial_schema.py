@@ -0,0 +1,110 @@
+"""초기 스키마 (users, routines, steps)
+
+마이그레이션 도입 전 Base.metadata.create_all로 만든 스키마와 같음 (인덱스 이름 포함)
+그때 만든 기존 DB는 `alembic stamp 0001` 후 `alembic upgrade head`로 이후 리비전만 적용
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("firebase_uid", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.Column("avatar_url", sa.String(), nullable=True),
+        sa.Column("tier", sa.String(), nullable=False),
+        sa.Column("timezone", sa.String(), nullable=False),
+        sa.Column("pbt_time", sa.Time(), nullable=True),
+        sa.Column("streak", sa.Integer(), nullable=False),
+        sa.Column("grace_tokens", sa.Integer(), nullable=False),
+        sa.Column("last_activity_date", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("push_enabled", sa.Boolean(), nullable=False),
+        sa.Column("language", sa.String(), nullable=False),
+        sa.Column("total_xp", sa.Integer(), nullable=False),
+        sa.Column("completed_chains", sa.Integer(), nullable=False),
+        sa.Column("total_steps_done", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("last_login_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_firebase_uid", "users", ["firebase_uid"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "routines",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("icon", sa.String(length=50), nullable=False),
+        sa.Column("color", sa.String(length=7), nullable=False),
+        sa.Column("is_public", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("today_display", sa.Boolean(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("total_completions", sa.Integer(), nullable=False),
+        sa.Column("success_rate", sa.Integer(), nullable=False),
+        sa.Column("avg_completion_time", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("last_changed_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_routines_id", "routines", ["id"])
+    op.create_index("ix_routines_user_id", "routines", ["user_id"])
+
+    op.create_table(
+        "steps",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("routine_id", sa.Integer(), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("difficulty", sa.String(), nullable=False),
+        sa.Column("t_ref_sec", sa.Integer(), nullable=False),
+        sa.Column("is_optional", sa.Boolean(), nullable=False),
+        sa.Column("xp_reward", sa.Integer(), nullable=False),
+        sa.Column("completion_count", sa.Integer(), nullable=False),
+        sa.Column("skip_count", sa.Integer(), nullable=False),
+        sa.Column("avg_time_spent", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["routine_id"], ["routines.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_steps_id", "steps", ["id"])
+    op.create_index("ix_steps_routine_id", "steps", ["routine_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("steps")
+    op.drop_table("routines")
+    op.drop_table("users")
@@ -0,0 +1,25 @@
+"""루틴 목록 복합 인덱스 routines (user_id, id)
+
+사용자별 루틴 목록(WHERE user_id = ? ORDER BY id)과 커서 페이지네이션을
+정렬 없이 인덱스 순서로 읽기 위한 인덱스
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_routines_user_id_id", "routines", ["user_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_routines_user_id_id", table_name="routines")
@@ -0,0 +1,52 @@
+"""스텝 이벤트 로그 테이블 step_events
+
+퀘스트 실행(run) 중 각 스텝의 완료/스킵 기록 (추가 전용)
+- (routine_id, occurred_at): 루틴별 최근 기록
+- (user_id, occurred_at): 사용자별 활동 조회
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "step_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("routine_id", sa.Integer(), nullable=False),
+        sa.Column("step_id", sa.Integer(), nullable=False),
+        sa.Column("run_id", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("duration_sec", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["routine_id"], ["routines.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["step_id"], ["steps.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_step_events_routine_id_occurred_at",
+        "step_events",
+        ["routine_id", "occurred_at"],
+    )
+    op.create_index(
+        "ix_step_events_user_id_occurred_at", "step_events", ["user_id", "occurred_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("step_events")
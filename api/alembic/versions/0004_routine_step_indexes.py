@@ -0,0 +1,87 @@
+"""루틴/스텝 복합·부분 인덱스, 스텝 순서 유일 제약
+
+- routines (user_id, is_active, id): 활성 여부 필터 목록
+- routines (user_id, id) WHERE today_display IS true: 오늘 페이지 목록 (부분 인덱스)
+- steps (routine_id, order) 유일: 스텝 조회/최대 순서/순서 범위 UPDATE
+  PostgreSQL은 DEFERRABLE INITIALLY IMMEDIATE 제약, SQLite는 유니크 인덱스
+- 단일 컬럼 인덱스 ix_routines_user_id, ix_steps_routine_id는 복합 인덱스가 대신함
+
+제약을 만들기 전에 순서가 겹치거나 1보다 작은 루틴의 스텝을 (order, id) 순으로 1부터 다시 매김
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STEP_ORDER_CONSTRAINT = "uq_steps_routine_id_order"
+
+# 부분 인덱스 조건은 쿼리와 같은 식이어야 함 (PostgreSQL: IS true, SQLite: IS 1)
+TODAY_DISPLAY = sa.column("today_display").is_(True)
+
+RENUMBER_STEPS = """
+UPDATE steps SET "order" = numbered.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY routine_id ORDER BY "order", id)
+        AS position
+    FROM steps
+    WHERE routine_id IN (
+        SELECT routine_id FROM steps
+        GROUP BY routine_id
+        HAVING count(*) <> count(DISTINCT "order") OR min("order") < 1
+    )
+) AS numbered
+WHERE steps.id = numbered.id
+"""
+
+
+def upgrade() -> None:
+    op.execute(RENUMBER_STEPS)
+
+    op.create_index(
+        "ix_routines_user_id_is_active_id", "routines", ["user_id", "is_active", "id"]
+    )
+    op.create_index(
+        "ix_routines_user_id_today_display",
+        "routines",
+        ["user_id", "id"],
+        postgresql_where=TODAY_DISPLAY,
+        sqlite_where=TODAY_DISPLAY,
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_unique_constraint(
+            STEP_ORDER_CONSTRAINT,
+            "steps",
+            ["routine_id", "order"],
+            deferrable=True,
+            initially="IMMEDIATE",
+        )
+    else:
+        op.create_index(
+            STEP_ORDER_CONSTRAINT, "steps", ["routine_id", "order"], unique=True
+        )
+
+    op.drop_index("ix_routines_user_id", table_name="routines")
+    op.drop_index("ix_steps_routine_id", table_name="steps")
+
+
+def downgrade() -> None:
+    op.create_index("ix_steps_routine_id", "steps", ["routine_id"])
+    op.create_index("ix_routines_user_id", "routines", ["user_id"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint(STEP_ORDER_CONSTRAINT, "steps", type_="unique")
+    else:
+        op.drop_index(STEP_ORDER_CONSTRAINT, table_name="steps")
+
+    op.drop_index("ix_routines_user_id_today_display", table_name="routines")
+    op.drop_index("ix_routines_user_id_is_active_id", table_name="routines")
@@ -0,0 +1,49 @@
+"""실행 멱등성: step_events.seq와 (user_id, run_id, seq) 유일 인덱스
+
+실행마다 seq 0 행이 생기므로 같은 사용자의 같은 run_id를 다시 넣으면 INSERT가 실패함
+기존 이벤트는 (user_id, run_id)별 id 순서로 0부터 번호를 매김
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RUN_EVENT_CONSTRAINT = "uq_step_events_user_id_run_id_seq"
+
+NUMBER_EVENTS = """
+UPDATE step_events SET seq = numbered.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY user_id, run_id ORDER BY id) - 1
+        AS position
+    FROM step_events
+) AS numbered
+WHERE step_events.id = numbered.id
+"""
+
+
+def upgrade() -> None:
+    op.add_column("step_events", sa.Column("seq", sa.Integer(), nullable=True))
+    op.execute(NUMBER_EVENTS)
+    with op.batch_alter_table("step_events") as batch_op:
+        batch_op.alter_column("seq", existing_type=sa.Integer(), nullable=False)
+    op.create_index(
+        RUN_EVENT_CONSTRAINT,
+        "step_events",
+        ["user_id", "run_id", "seq"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(RUN_EVENT_CONSTRAINT, table_name="step_events")
+    with op.batch_alter_table("step_events") as batch_op:
+        batch_op.drop_column("seq")
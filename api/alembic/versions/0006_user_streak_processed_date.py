@@ -0,0 +1,26 @@
+"""users.streak_processed_date (야간 스트릭 배치가 마지막으로 마감한 현지 날짜)
+
+같은 날을 두 번 마감하지 않도록 배치가 기록, 기존 사용자는 NULL (다음 배치에서 처리)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("streak_processed_date", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("streak_processed_date")
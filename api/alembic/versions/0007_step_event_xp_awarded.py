@@ -0,0 +1,38 @@
+"""step_events.xp_awarded (이벤트가 실제로 적립한 XP)
+
+시즌 리더보드 재구축이 현재 steps.xp_reward 대신 적립 당시 XP를 합산하도록 기록
+기존 완료 이벤트는 알 수 있는 가장 가까운 값(현재 스텝 xp_reward)으로 채움
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_XP = """
+UPDATE step_events SET xp_awarded = (
+    SELECT steps.xp_reward FROM steps WHERE steps.id = step_events.step_id
+)
+WHERE status = 'completed'
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "step_events",
+        sa.Column("xp_awarded", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(BACKFILL_XP)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("step_events") as batch_op:
+        batch_op.drop_column("xp_awarded")
@@ -0,0 +1,33 @@
+"""coach_usage (AI 코치 월 사용량 write-back)
+
+AI 서비스가 Redis 확정 카운터를 주기적으로 upsert하고 시작 시 복원하는 테이블
+(레플리카/재배포 간 공유 - 로컬 스냅샷 파일 대체)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coach_usage",
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("used", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("month", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("coach_usage")
@@ -0,0 +1,43 @@
+"""step_events.step_id ON DELETE SET NULL
+
+스텝 삭제가 추가 전용 이벤트 로그의 완료 기록까지 지우지 않도록 CASCADE → SET NULL
+(시즌 리더보드 재구축은 이벤트의 xp_awarded를 합산하므로 기록이 남아야 함)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 0003은 FK 이름을 정하지 않음 - PostgreSQL 기본 이름과 같은 규칙으로 SQLite 재작성 시 이름 부여
+STEP_FK = "step_events_step_id_fkey"
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def replace_step_fk(nullable: bool, ondelete: str) -> None:
+    with op.batch_alter_table(
+        "step_events", naming_convention=NAMING_CONVENTION
+    ) as batch_op:
+        batch_op.drop_constraint(STEP_FK, type_="foreignkey")
+        batch_op.alter_column("step_id", existing_type=sa.Integer(), nullable=nullable)
+        batch_op.create_foreign_key(
+            STEP_FK, "steps", ["step_id"], ["id"], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    replace_step_fk(nullable=True, ondelete="SET NULL")
+
+
+def downgrade() -> None:
+    # 스텝이 지워진 이벤트는 NOT NULL로 되돌릴 수 없으므로 삭제
+    op.execute("DELETE FROM step_events WHERE step_id IS NULL")
+    replace_step_fk(nullable=False, ondelete="CASCADE")
@@ -0,0 +1,30 @@
+"""users (timezone, streak_processed_date, id) 인덱스
+
+야간 스트릭 배치의 시간대별 조회용
+- 청크: WHERE timezone = ? AND streak_processed_date = ? (또는 IS NULL) AND id > ? ORDER BY id
+- 마감할 날짜: 시간대별 min(streak_processed_date), 마감 이력 없는 사용자 유무
+- 드라이버의 SELECT DISTINCT timezone
+인덱스가 없으면 실행마다 시간대 수만큼 users 전체를 스캔 (이미 마감한 시간대 포함)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_users_timezone_streak_processed_date_id"
+
+
+def upgrade() -> None:
+    op.create_index(INDEX_NAME, "users", ["timezone", "streak_processed_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="users")
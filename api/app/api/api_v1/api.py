@@ -2,9 +2,17 @@
 # 모든 API 엔드포인트를 통합하는 메인 라우터
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import routines
+from app.api.api_v1.endpoints import leaderboard, routines, users
 
 api_router = APIRouter()
 
 # 📋 루틴 관련 엔드포인트
 api_router.include_router(routines.router, prefix="/routines", tags=["routines"])
+
+# 🏆 리더보드 엔드포인트
+api_router.include_router(
+    leaderboard.router, prefix="/leaderboard", tags=["leaderboard"]
+)
+
+# 👤 사용자 계정 엔드포인트
+api_router.include_router(users.router, prefix="/users", tags=["users"])
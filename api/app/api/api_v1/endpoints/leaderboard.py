@@ -0,0 +1,71 @@
+# 🏆 리더보드 API 엔드포인트
+# 전체 / 주간 시즌 / 내 티어 보드의 내 순위, 상위 N명, 내 주변 순위 조회
+# 모든 조회는 정렬 집합에서 O(log n) (+ 반환 개수) - users 테이블 정렬 없음
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.deps import get_current_user
+from app.core.security import Principal
+from app.services.leaderboard import Leaderboard, get_leaderboard
+
+router = APIRouter()
+
+
+class BoardKind(str, Enum):
+    GLOBAL = "global"
+    SEASON = "season"
+    TIER = "tier"
+
+
+def resolve_board(
+    kind: BoardKind, leaderboard: Leaderboard, current_user: Principal
+) -> str:
+    """보드 종류 → 보드 키 (티어 보드는 현재 사용자의 티어)"""
+    if kind == BoardKind.SEASON:
+        return leaderboard.season_board()
+    if kind == BoardKind.TIER:
+        return leaderboard.tier_board(current_user.tier)
+    return leaderboard.global_board()
+
+
+# 🙋 내 순위
+@router.get("/{kind}/me")
+async def get_my_rank(
+    kind: BoardKind,
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+    current_user: Principal = Depends(get_current_user),
+):
+    """내 순위와 XP"""
+    board = resolve_board(kind, leaderboard, current_user)
+    entry = await leaderboard.my_rank(board, current_user.id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="아직 리더보드에 기록이 없습니다")
+    entry["total"] = await leaderboard.backend.size(board)
+    return entry
+
+
+# 🥇 상위 N명
+@router.get("/{kind}/top")
+async def get_top(
+    kind: BoardKind,
+    limit: int = Query(10, ge=1, le=100),
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+    current_user: Principal = Depends(get_current_user),
+):
+    """상위 limit명"""
+    board = resolve_board(kind, leaderboard, current_user)
+    return await leaderboard.top(board, limit)
+
+
+# 👥 내 주변 순위
+@router.get("/{kind}/around")
+async def get_around_me(
+    kind: BoardKind,
+    radius: int = Query(5, ge=1, le=50),
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+    current_user: Principal = Depends(get_current_user),
+):
+    """내 위아래 radius명"""
+    board = resolve_board(kind, leaderboard, current_user)
+    return await leaderboard.around(board, current_user.id, radius)
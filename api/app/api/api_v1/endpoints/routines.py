@@ -1,14 +1,40 @@
 # 📋 루틴 관리 API 엔드포인트
 # 루틴 CRUD 작업과 스텝 관리를 담당하는 API
-from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-
-from app.core.database import get_db
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, noload, selectinload
+from pydantic import BaseModel, Field, field_validator
+
+from app.api.deps import get_current_user, get_read_db
+from app.core.cache import (
+    TieredCache,
+    get_routine_cache,
+    routine_list_namespace,
+    routine_namespace,
+)
+from app.core.config import settings
+from app.core.database import get_db, utcnow
+from app.core.etag import etag_matches, etag_response, make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.core.security import Principal
+from app.core.serialization import dumps, json_response
 from app.models.routine import Routine, Step, StepType, StepDifficulty
-from app.models.user import User
+from app.models.step_event import StepEvent, StepEventStatus
+from app.services.leaderboard import Leaderboard, get_leaderboard
+from app.services.run_service import (
+    StepResult,
+    apply_routine_aggregates,
+    apply_step_aggregates,
+    apply_user_progress,
+    insert_step_events,
+    run_recorded,
+)
 
 router = APIRouter()
 
@@ -19,7 +45,7 @@ class StepCreate(BaseModel):
 
     title: str
     description: Optional[str] = None
-    order: Optional[int] = None  # 선택사항으로 변경 (자동 계산)
+    order: Optional[int] = Field(default=None, ge=1)  # 선택사항 (없으면 자동 계산)
     type: StepType = StepType.ACTION
     difficulty: StepDifficulty = StepDifficulty.EASY
     t_ref_sec: int = 120
@@ -58,6 +84,43 @@ class RoutineCreate(BaseModel):
     steps: List[StepCreate] = []
 
 
+class RoutineBulkCreate(BaseModel):
+    """루틴 일괄 생성 요청 모델 (온보딩 템플릿, 가져오기용)"""
+
+    routines: List[RoutineCreate] = Field(min_length=1, max_length=100)
+
+
+class StepOrderUpdate(BaseModel):
+    """스텝 전체 순서 변경 요청 모델"""
+
+    step_ids: List[int]  # 새 순서대로 나열한 루틴의 모든 스텝 id
+    version: int  # 클라이언트가 마지막으로 본 루틴 버전 (동시 편집 충돌 감지)
+
+
+class RunStepResult(BaseModel):
+    """실행 중 스텝 1개의 결과"""
+
+    step_id: int
+    status: StepEventStatus
+    duration_sec: int = Field(default=0, ge=0)  # 실제 소요 시간(초)
+
+
+class RunCreate(BaseModel):
+    """퀘스트 실행(run) 1건 기록 요청 모델"""
+
+    run_id: Optional[str] = Field(default=None, max_length=64)  # 미지정 시 서버 생성
+    completed_at: Optional[datetime] = None  # 미지정 시 서버 시각
+    steps: List[RunStepResult] = Field(min_length=1)
+
+    @field_validator("completed_at")
+    @classmethod
+    def to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """시간대가 있는 시각은 UTC로 바꿔 tz 없이 저장 (DB 시각은 모두 UTC)"""
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class RoutineUpdate(BaseModel):
     """루틴 수정 요청 모델"""
 
@@ -92,15 +155,208 @@ class RoutineResponse(BaseModel):
         from_attributes = True
 
 
-# 🔍 현재 사용자 가져오기 (실제 인증 구현 필요)
-def get_current_user(db: Session = Depends(get_db)) -> User:
-    """현재 사용자 가져오기"""
-    # TODO: 실제 JWT 토큰에서 사용자 정보를 가져와야 함
-    # 임시로 첫 번째 사용자를 반환 (실제 구현에서는 인증 토큰에서 사용자 ID 추출)
-    user = db.query(User).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="인증이 필요합니다")
-    return user
+# 🧩 스텝 로딩 전략 (엔드포인트별 지정)
+# - "selectin": 루틴 N개 + 스텝 1쿼리 (목록용, offset/limit과 함께 안전)
+# - "joined": LEFT JOIN 단일 쿼리 (단건 상세용)
+# - "none": 스텝을 로드하지 않음 (권한 확인 등 스텝이 필요 없는 경우)
+STEP_LOAD_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "none": noload,
+}
+
+
+def steps_option(strategy: str = "selectin"):
+    """Routine.steps 로딩 옵션 생성"""
+    return STEP_LOAD_STRATEGIES[strategy](Routine.steps)
+
+
+# 🔎 사용자 소유 루틴 조회 (비동기 세션에서는 lazy load가 불가하므로 steps를 함께 로드)
+async def get_user_routine(
+    db: AsyncSession, routine_id: int, user_id: int, steps: str = "selectin"
+) -> Optional[Routine]:
+    """사용자 소유의 루틴을 지정한 스텝 로딩 전략으로 조회"""
+    result = await db.execute(
+        select(Routine)
+        .options(steps_option(steps))
+        .filter(Routine.id == routine_id, Routine.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.unique().scalar_one_or_none()
+
+
+# 🏷️ ETag 계산용 경량 집계 쿼리 (본문을 로드/직렬화하지 않음)
+async def get_routine_etag(
+    db: AsyncSession, routine_id: int, user_id: int, include_steps: bool
+) -> Optional[Tuple[int, str]]:
+    """루틴 (버전, 상세 strong ETag) - 버전, 수정 시각, 스텝 개수/최대 id/최종 수정 시각"""
+    row = (
+        await db.execute(
+            select(
+                Routine.version,
+                Routine.updated_at,
+                func.count(Step.id),
+                func.max(Step.id),
+                func.max(Step.updated_at),
+            )
+            .outerjoin(Step, Step.routine_id == Routine.id)
+            .filter(Routine.id == routine_id, Routine.user_id == user_id)
+            .group_by(Routine.id)
+        )
+    ).first()
+    if row is None:
+        return None
+    return row.version, make_etag((routine_id, *row, include_steps))
+
+
+def routine_list_filter(
+    user_id: int, is_active: Optional[bool], today_display: Optional[bool]
+) -> list:
+    """
+    목록 조회 조건 (목록 쿼리와 ETag 집계가 같은 인덱스를 타도록 공용)
+
+    today_display는 바인드 파라미터 대신 IS true/false 리터럴로 비교해야
+    부분 인덱스(ix_routines_user_id_today_display)를 사용할 수 있음
+    """
+    routine_filter = [Routine.user_id == user_id]
+    if is_active is not None:
+        routine_filter.append(Routine.is_active == is_active)
+    if today_display is not None:
+        routine_filter.append(Routine.today_display.is_(today_display))
+    return routine_filter
+
+
+async def get_routines_etag(db: AsyncSession, routine_filter: list, *params) -> str:
+    """루틴 목록 weak ETag (루틴 개수/버전 합/수정 시각 + 스텝 개수/수정 시각 + 쿼리 파라미터)"""
+
+    step_stats = (
+        select(Step.id, Step.updated_at)
+        .join(Routine, Step.routine_id == Routine.id)
+        .filter(*routine_filter)
+        .subquery()
+    )
+    row = (
+        await db.execute(
+            select(
+                func.count(Routine.id),
+                func.sum(Routine.version),
+                func.max(Routine.updated_at),
+                select(func.count(step_stats.c.id)).scalar_subquery(),
+                select(func.max(step_stats.c.id)).scalar_subquery(),
+                select(func.max(step_stats.c.updated_at)).scalar_subquery(),
+            ).filter(*routine_filter)
+        )
+    ).one()
+    return make_etag((*row, *params), weak=True)
+
+
+# 🧊 응답 캐시 헬퍼
+# 캐시 필드에 버전/ETag를 포함하므로 삭제 이후 늦게 도착한 쓰기도 다시 읽히지 않음
+def render_json(payload) -> bytes:
+    """FastAPI 기본 응답과 동일한 JSON 바이트로 직렬화"""
+    return JSONResponse(content=payload).body
+
+
+def render_routine(routine: Routine) -> bytes:
+    """루틴 ORM 객체를 RoutineResponse JSON 바이트로 직렬화"""
+    return render_json(RoutineResponse.model_validate(routine).model_dump(mode="json"))
+
+
+# ⚡ 빠른 직렬화 경로 (settings.RESPONSE_FAST_PATH)
+# ORM 객체 로드 → from_attributes 검증 → 표준 json 인코딩 대신
+# 응답 필드 컬럼만 튜플로 조회해 dict를 만들고 orjson으로 인코딩
+# 필드 순서/스텝 정렬 쿼리를 기존 경로와 맞춰 같은 바이트를 만듦
+# (tests/integration/test_json_fastpath가 두 경로의 응답 바이트를 비교)
+ROUTINE_FIELDS = tuple(name for name in RoutineResponse.model_fields if name != "steps")
+STEP_FIELDS = tuple(StepResponse.model_fields)
+ROUTINE_COLUMNS = tuple(getattr(Routine, name) for name in ROUTINE_FIELDS)
+STEP_COLUMNS = tuple(getattr(Step, name) for name in STEP_FIELDS)
+
+
+def step_payload(step: Step) -> dict:
+    """ORM 스텝 → StepResponse 형태 dict"""
+    return {name: getattr(step, name) for name in STEP_FIELDS}
+
+
+async def fetch_step_payloads(
+    db: AsyncSession, routine_ids: List[int]
+) -> Dict[int, List[dict]]:
+    """
+    루틴들의 스텝을 1쿼리로 조회 (selectin 로더와 같은 IN, 루틴별 "order" 순)
+
+    (routine_id, order) 유니크 인덱스 순서대로 읽으므로 별도 정렬 없음
+    """
+    steps: Dict[int, List[dict]] = {routine_id: [] for routine_id in routine_ids}
+    result = await db.execute(
+        select(Step.routine_id, *STEP_COLUMNS)
+        .filter(Step.routine_id.in_(routine_ids))
+        .order_by(Step.routine_id, Step.order)
+    )
+    for routine_id, *values in result:
+        steps[routine_id].append(dict(zip(STEP_FIELDS, values, strict=True)))
+    return steps
+
+
+async def fetch_routine_payloads(
+    db: AsyncSession, query, include_steps: bool
+) -> List[dict]:
+    """루틴 컬럼 조회(query: select(*ROUTINE_COLUMNS)...) + 스텝 1쿼리 → 응답 dict 목록"""
+    payloads = [
+        dict(zip(ROUTINE_FIELDS, row, strict=True))
+        for row in (await db.execute(query)).all()
+    ]
+    steps = (
+        await fetch_step_payloads(db, [payload["id"] for payload in payloads])
+        if include_steps and payloads
+        else {}
+    )
+    for payload in payloads:
+        payload["steps"] = steps.get(payload["id"], [])
+    return payloads
+
+
+async def fetch_routine_payload(
+    db: AsyncSession, routine_id: int, user_id: int, include_steps: bool = True
+) -> Optional[dict]:
+    """사용자 소유 루틴 1개 → 응답 dict (스텝은 joined 로더와 같은 LEFT JOIN 1쿼리)"""
+    owned = (Routine.id == routine_id, Routine.user_id == user_id)
+    if not include_steps:
+        row = (await db.execute(select(*ROUTINE_COLUMNS).filter(*owned))).first()
+        return (
+            {**dict(zip(ROUTINE_FIELDS, row, strict=True)), "steps": []}
+            if row
+            else None
+        )
+
+    rows = (
+        await db.execute(
+            select(*ROUTINE_COLUMNS, *STEP_COLUMNS)
+            .outerjoin(Step, Step.routine_id == Routine.id)
+            .filter(*owned)
+            .order_by(Step.order)
+        )
+    ).all()
+    if not rows:
+        return None
+    split = len(ROUTINE_FIELDS)
+    payload = dict(zip(ROUTINE_FIELDS, rows[0][:split], strict=True))
+    # LEFT JOIN이라 스텝이 없으면 스텝 컬럼이 모두 NULL인 행 1개 (STEP_FIELDS[0] == "id")
+    payload["steps"] = [
+        dict(zip(STEP_FIELDS, row[split:], strict=True))
+        for row in rows
+        if row[split] is not None
+    ]
+    return payload
+
+
+async def invalidate_routine_cache(
+    cache: TieredCache, user_id: int, routine_id: Optional[int] = None
+) -> None:
+    """루틴 변경 후 상세/목록 캐시 무효화"""
+    namespaces = [routine_list_namespace(user_id)]
+    if routine_id is not None:
+        namespaces.append(routine_namespace(user_id, routine_id))
+    await cache.invalidate(*namespaces)
 
 
 # 📋 루틴 목록 조회
@@ -108,84 +364,254 @@ def get_current_user(db: Session = Depends(get_db)) -> User:
 async def get_routines(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    today_display: Optional[bool] = None,
+    include_steps: bool = True,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """사용자의 루틴 목록 조회"""
-    query = db.query(Routine).filter(Routine.user_id == current_user.id)
+    """
+    사용자의 루틴 목록 조회 (include_steps=false면 스텝 없이 1쿼리)
+
+    - cursor 미지정: 기존 skip/limit offset 방식 (하위 호환)
+    - cursor 지정: (user_id, id) 인덱스를 타는 키셋 방식, skip 무시
+    - is_active/today_display 지정 시 해당 루틴만 (오늘 페이지: today_display=true)
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서 전달
+    - If-None-Match가 weak ETag와 같으면 본문 없이 304
+    - 직렬화된 목록은 (사용자, ETag) 단위로 캐시
+    """
+    routine_filter = routine_list_filter(current_user.id, is_active, today_display)
+    etag = await get_routines_etag(
+        db,
+        routine_filter,
+        is_active,
+        today_display,
+        skip,
+        limit,
+        cursor,
+        include_steps,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    namespace = routine_list_namespace(current_user.id)
+    cached = await cache.get(namespace, etag)
+    if cached is not None:
+        # 캐시 값: "<다음 커서>\n<JSON 본문>" (커서는 base64url이라 개행 없음)
+        cursor_value, body = cached.split(b"\n", 1)
+        headers = {NEXT_CURSOR_HEADER: cursor_value.decode()} if cursor_value else None
+        return etag_response(body, etag, headers)
+
+    if settings.RESPONSE_FAST_PATH:
+        query = select(*ROUTINE_COLUMNS)
+    else:
+        query = select(Routine).options(
+            steps_option("selectin" if include_steps else "none")
+        )
+    query = query.filter(*routine_filter).order_by(Routine.id)
 
-    if is_active is not None:
-        query = query.filter(Routine.is_active == is_active)
+    if cursor:
+        query = query.filter(Routine.id > decode_cursor(cursor))
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit)
+
+    if settings.RESPONSE_FAST_PATH:
+        routines = await fetch_routine_payloads(db, query, include_steps)
+        body = dumps(routines)
+    else:
+        routines = (await db.execute(query)).scalars().all()
+        body = render_json(
+            [
+                RoutineResponse.model_validate(routine).model_dump(mode="json")
+                for routine in routines
+            ]
+        )
+    cursor_value = next_cursor(routines, limit)
+    await cache.set(namespace, etag, (cursor_value or "").encode() + b"\n" + body)
 
-    routines = query.offset(skip).limit(limit).all()
-    return routines
+    headers = {NEXT_CURSOR_HEADER: cursor_value} if cursor_value else None
+    return etag_response(body, etag, headers)
 
 
 # 📋 루틴 상세 조회
 @router.get("/{routine_id}", response_model=RoutineResponse)
 async def get_routine(
     routine_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    include_steps: bool = True,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """특정 루틴 상세 조회"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
+    """
+    특정 루틴 상세 조회
+
+    - If-None-Match가 strong ETag와 같으면 본문 없이 304
+    - 직렬화된 응답은 (사용자, 루틴, 버전) 단위로 캐시
+    """
+    version_etag = await get_routine_etag(
+        db, routine_id, current_user.id, include_steps
     )
 
-    if not routine:
+    if version_etag is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="루틴을 찾을 수 없습니다"
         )
 
-    return routine
+    version, etag = version_etag
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    namespace = routine_namespace(current_user.id, routine_id)
+    field = f"v{version}:{etag}"
+    body = await cache.get(namespace, field)
+    if body is None:
+        if settings.RESPONSE_FAST_PATH:
+            routine = await fetch_routine_payload(
+                db, routine_id, current_user.id, include_steps
+            )
+        else:
+            routine = await get_user_routine(
+                db,
+                routine_id,
+                current_user.id,
+                steps="joined" if include_steps else "none",
+            )
+
+        if not routine:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="루틴을 찾을 수 없습니다",
+            )
+
+        body = dumps(routine) if isinstance(routine, dict) else render_routine(routine)
+        await cache.set(namespace, field, body)
+
+    return etag_response(body, etag)
+
+
+# 🔢 스텝 순서 부여 (order가 없는 스텝은 직전까지의 최대 순서 + 1)
+def number_steps(steps: List[StepCreate]) -> List[int]:
+    """요청 스텝들의 최종 순서 목록 계산 (순서가 겹치면 400 - 루틴 안에서 순서 유일)"""
+    orders = []
+    next_order = 1
+    for step_data in steps:
+        order = step_data.order if step_data.order is not None else next_order
+        next_order = max(next_order, order) + 1
+        orders.append(order)
+    if len(set(orders)) != len(orders):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="스텝 순서가 중복되었습니다",
+        )
+    return orders
+
+
+# 📥 루틴 + 스텝 일괄 INSERT (트랜잭션 커밋은 호출자가 담당)
+async def insert_routines(
+    db: AsyncSession, user_id: int, routines_data: List[RoutineCreate]
+) -> List[int]:
+    """
+    루틴들과 스텝들을 다중행 INSERT 2회로 저장하고 루틴 id 목록 반환
+
+    - 루틴: INSERT ... RETURNING id (요청 순서대로 id 반환)
+    - 스텝: 모든 루틴의 스텝을 한 번의 executemany/다중행 VALUES로 저장
+    """
+    routine_rows = [
+        {
+            "user_id": user_id,
+            "title": routine_data.title,
+            "description": routine_data.description,
+            "icon": routine_data.icon,
+            "color": routine_data.color,
+            "is_public": routine_data.is_public,
+            "is_active": True,
+        }
+        for routine_data in routines_data
+    ]
+    result = await db.execute(
+        insert(Routine).returning(Routine.id, sort_by_parameter_order=True),
+        routine_rows,
+    )
+    routine_ids = result.scalars().all()
+
+    step_rows = [
+        {
+            "routine_id": routine_id,
+            "title": step_data.title,
+            "description": step_data.description,
+            "order": order,
+            "type": step_data.type,
+            "difficulty": step_data.difficulty,
+            "t_ref_sec": step_data.t_ref_sec,
+            "is_optional": step_data.is_optional,
+            "xp_reward": step_data.xp_reward,
+        }
+        for routine_id, routine_data in zip(routine_ids, routines_data, strict=True)
+        for step_data, order in zip(
+            routine_data.steps, number_steps(routine_data.steps), strict=True
+        )
+    ]
+    if step_rows:
+        await db.execute(insert(Step), step_rows)
+
+    return list(routine_ids)
 
 
 # ➕ 새 루틴 생성
 @router.post("/", response_model=RoutineResponse)
 async def create_routine(
     routine_data: RoutineCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """새 루틴 생성"""
-    # 루틴 생성
-    routine = Routine(
-        user_id=current_user.id,
-        title=routine_data.title,
-        description=routine_data.description,
-        icon=routine_data.icon,
-        color=routine_data.color,
-        is_public=routine_data.is_public,
-        is_active=True,
-    )
+    """새 루틴 생성 (루틴과 스텝을 한 트랜잭션에서 저장)"""
+    [routine_id] = await insert_routines(db, current_user.id, [routine_data])
+
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id)
 
-    db.add(routine)
-    db.commit()
-    db.refresh(routine)
-
-    # 스텝들 생성
-    for step_data in routine_data.steps:
-        step = Step(
-            routine_id=routine.id,
-            title=step_data.title,
-            description=step_data.description,
-            order=step_data.order,
-            type=step_data.type,
-            difficulty=step_data.difficulty,
-            t_ref_sec=step_data.t_ref_sec,
-            is_optional=step_data.is_optional,
-            xp_reward=step_data.xp_reward,
+    if settings.RESPONSE_FAST_PATH:
+        return json_response(
+            await fetch_routine_payload(db, routine_id, current_user.id)
         )
-        db.add(step)
+    return await get_user_routine(db, routine_id, current_user.id, steps="joined")
 
-    db.commit()
-    db.refresh(routine)
 
-    return routine
+# 📦 루틴 일괄 생성
+@router.post("/bulk", response_model=List[RoutineResponse])
+async def create_routines_bulk(
+    bulk_data: RoutineBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
+):
+    """여러 루틴을 한 트랜잭션에서 생성 (온보딩 템플릿, 가져오기)"""
+    routine_ids = await insert_routines(db, current_user.id, bulk_data.routines)
+
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id)
+
+    if settings.RESPONSE_FAST_PATH:
+        query = (
+            select(*ROUTINE_COLUMNS)
+            .filter(Routine.id.in_(routine_ids))
+            .order_by(Routine.id)
+        )
+        return json_response(await fetch_routine_payloads(db, query, True))
+
+    result = await db.execute(
+        select(Routine)
+        .options(steps_option("selectin"))
+        .filter(Routine.id.in_(routine_ids))
+        .order_by(Routine.id)
+    )
+    return result.scalars().all()
 
 
 # ✏️ 루틴 수정
@@ -193,15 +619,12 @@ async def create_routine(
 async def update_routine(
     routine_id: int,
     routine_data: RoutineUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴 정보 수정"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(
@@ -215,33 +638,35 @@ async def update_routine(
 
     routine.version += 1  # 버전 증가
 
-    db.commit()
-    db.refresh(routine)
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
-    return routine
+    if settings.RESPONSE_FAST_PATH:
+        return json_response(
+            await fetch_routine_payload(db, routine_id, current_user.id)
+        )
+    return await get_user_routine(db, routine_id, current_user.id, steps="joined")
 
 
 # 🗑️ 루틴 삭제
 @router.delete("/{routine_id}")
 async def delete_routine(
     routine_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴 삭제"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id)
 
     if not routine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="루틴을 찾을 수 없습니다"
         )
 
-    db.delete(routine)
-    db.commit()
+    await db.delete(routine)
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
     return {"message": "루틴이 삭제되었습니다"}
 
@@ -250,15 +675,12 @@ async def delete_routine(
 @router.patch("/{routine_id}/toggle")
 async def toggle_routine(
     routine_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴 활성화/비활성화 토글"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(
@@ -268,8 +690,8 @@ async def toggle_routine(
     routine.is_active = not routine.is_active
     routine.version += 1
 
-    db.commit()
-    db.refresh(routine)
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
     return {
         "message": f"루틴이 {'활성화' if routine.is_active else '비활성화'}되었습니다",
@@ -281,21 +703,26 @@ async def toggle_routine(
 @router.get("/{routine_id}/stats")
 async def get_routine_stats(
     routine_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴 통계 조회"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id)
 
     if not routine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="루틴을 찾을 수 없습니다"
         )
 
+    # 마지막 실행 시각 ((routine_id, occurred_at) 인덱스로 조회)
+    last_completed = (
+        await db.execute(
+            select(func.max(StepEvent.occurred_at)).filter(
+                StepEvent.routine_id == routine_id
+            )
+        )
+    ).scalar_one()
+
     return {
         "routine_id": routine.id,
         "title": routine.title,
@@ -304,32 +731,126 @@ async def get_routine_stats(
         "avg_completion_time": routine.avg_completion_time,
         "total_steps": len(routine.steps),
         "created_at": routine.created_at,
-        "last_completed": None,  # TODO: 실제 완료 기록에서 가져오기
+        "last_completed": last_completed,
+    }
+
+
+# 🏃 퀘스트 실행 기록
+@router.post("/{routine_id}/runs")
+async def record_routine_run(
+    routine_id: int,
+    run_data: RunCreate,
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    퀘스트 실행 1건(스텝별 완료/스킵, 소요 시간)을 한 트랜잭션으로 기록
+
+    - 스텝 이벤트는 step_events에 추가만 함
+    - Step/Routine 통계는 이동 평균으로 증분 갱신 (이력 재스캔 없음)
+    - 완료한 스텝의 XP를 사용자에게 적립하고 리더보드에 반영
+    - run_id가 같은 재전송은 저장/적립 없이 duplicate=true로 응답 (재시도 안전)
+    """
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
+
+    if not routine:
+        raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
+
+    result = await db.execute(
+        select(Step.id, Step.is_optional, Step.xp_reward).filter(
+            Step.routine_id == routine_id
+        )
+    )
+    step_rows = result.all()
+    optional_by_step = {row.id: row.is_optional for row in step_rows}
+    xp_by_step = {row.id: row.xp_reward for row in step_rows}
+
+    step_ids = [step.step_id for step in run_data.steps]
+    if len(set(step_ids)) != len(step_ids) or not set(step_ids) <= set(
+        optional_by_step
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="루틴에 속한 스텝을 한 번씩만 보내야 합니다",
+        )
+
+    results = [
+        StepResult(
+            step.step_id,
+            step.status,
+            step.duration_sec,
+            xp_by_step[step.step_id] if step.status == StepEventStatus.COMPLETED else 0,
+        )
+        for step in run_data.steps
+    ]
+    completed_ids = {
+        r.step_id for r in results if r.status == StepEventStatus.COMPLETED
     }
+    required_ids = {sid for sid, optional in optional_by_step.items() if not optional}
+    success = required_ids <= completed_ids
+    total_duration = sum(r.duration_sec for r in results)
+    xp_earned = sum(r.xp_awarded for r in results)
+
+    summary = {
+        "steps_completed": len(completed_ids),
+        "steps_skipped": len(results) - len(completed_ids),
+        "total_duration_sec": total_duration,
+        "xp_earned": xp_earned,
+        "success": success,
+    }
+    run_id = run_data.run_id or uuid.uuid4().hex
+
+    try:
+        await insert_step_events(
+            db,
+            current_user.id,
+            routine_id,
+            run_id,
+            run_data.completed_at or utcnow(),
+            results,
+        )
+    except IntegrityError:
+        # 같은 run_id 재전송 (응답 유실 후 재시도) - 통계/XP는 다시 반영하지 않음
+        await db.rollback()
+        if not await run_recorded(db, current_user.id, run_id):
+            raise
+        return {"message": "이미 기록된 실행입니다", "duplicate": True, **summary}
+
+    await apply_step_aggregates(db, routine_id, results)
+    await apply_routine_aggregates(db, routine_id, success, total_duration)
+    await apply_user_progress(
+        db, current_user.id, xp_earned, len(completed_ids), success
+    )
+
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
+    # 리더보드는 커밋 이후 반영 (실패는 로그만 남기고 재구축 배치로 복구)
+    await leaderboard.record_xp(current_user.id, current_user.tier, xp_earned)
+
+    return {"message": "실행 기록이 저장되었습니다", "duplicate": False, **summary}
 
 
 # 🎯 오늘 페이지 표시 토글
 @router.patch("/{routine_id}/today-display")
 async def toggle_today_display(
     routine_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴 오늘 페이지 표시 토글"""
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
 
     # 🎯 현재 루틴의 today_display 토글 (여러 루틴 동시 표시 가능)
     routine.today_display = not routine.today_display
-    routine.updated_at = datetime.now()
-    db.commit()
-    db.refresh(routine)
+    routine.updated_at = utcnow()
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
     return {
         "message": f"루틴이 오늘 페이지에 {'표시' if routine.today_display else '숨김'}됩니다",
@@ -337,37 +858,86 @@ async def toggle_today_display(
     }
 
 
+# 🔒 루틴 스텝 순서 잠금
+async def lock_routine_steps(db: AsyncSession, routine_id: int) -> None:
+    """
+    루틴 버전을 올려 같은 루틴의 스텝 순서 변경을 트랜잭션 끝까지 직렬화
+
+    PostgreSQL은 루틴 행 잠금, SQLite는 쓰기 잠금 - 이후에 읽는 현재/최대 순서가
+    동시 요청 때문에 오래된 값이 되지 않음 (오래된 순서로 쓰면 유일 제약 위반)
+    """
+    await db.execute(
+        update(Routine)
+        .filter(Routine.id == routine_id)
+        .values(version=Routine.version + 1)
+    )
+
+
+# 🔢 스텝 순서 일괄 UPDATE ((routine_id, order) 유일 제약을 지키며)
+async def update_step_orders(
+    db: AsyncSession, routine_id: int, new_order: Callable, *criteria
+) -> None:
+    """
+    루틴의 대상 스텝(criteria)의 순서를 new_order(현재 순서 식)로 변경
+
+    - PostgreSQL: DEFERRABLE 제약이라 UPDATE 한 번 (중복 검사는 문장 끝에서)
+    - SQLite: 유니크 인덱스를 행마다 검사하므로 대상 행을 음수 순서로 비켜 둔 뒤
+      음수 행만 최종 순서로 변경 (UPDATE 두 번, 같은 트랜잭션)
+    """
+    target = update(Step).execution_options(synchronize_session=False)
+    if (await db.connection()).dialect.name == "postgresql":
+        await db.execute(
+            target.filter(Step.routine_id == routine_id, *criteria).values(
+                order=new_order(Step.order), updated_at=utcnow()
+            )
+        )
+        return
+
+    await db.execute(
+        target.filter(Step.routine_id == routine_id, *criteria).values(
+            order=-Step.order
+        )
+    )
+    await db.execute(
+        target.filter(Step.routine_id == routine_id, Step.order < 0).values(
+            order=new_order(-Step.order), updated_at=utcnow()
+        )
+    )
+
+
 # ➕ 루틴에 스텝 추가
 @router.post("/{routine_id}/steps", response_model=StepResponse)
 async def add_step_to_routine(
     routine_id: int,
     step_data: StepCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """루틴에 새 스텝 추가"""
     # 루틴 존재 및 권한 확인
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
 
+    # 동시 추가가 같은 최대 순서를 읽지 않도록 잠금 후 순서 결정
+    await lock_routine_steps(db, routine_id)
+
     # 순서 결정 (제공된 값이 있으면 사용, 없으면 자동 계산)
     if step_data.order is not None:
         order = step_data.order
     else:
         # 다음 순서 자동 계산 (기존 스텝들 중 가장 큰 order + 1)
         max_order = (
-            db.query(Step.order)
-            .filter(Step.routine_id == routine_id)
-            .order_by(Step.order.desc())
-            .first()
-        )
-        order = (max_order[0] if max_order else 0) + 1
+            await db.execute(
+                select(Step.order)
+                .filter(Step.routine_id == routine_id)
+                .order_by(Step.order.desc())
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        order = (max_order or 0) + 1
 
     # 스텝 생성
     step = Step(
@@ -383,10 +953,77 @@ async def add_step_to_routine(
     )
 
     db.add(step)
-    db.commit()
-    db.refresh(step)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # (routine_id, order) 유일 제약 - 지정한 순서가 이미 있거나 동시 추가와 겹침
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="같은 순서의 스텝이 이미 있습니다",
+        ) from None
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
+    await db.refresh(step)
 
-    return step
+    return json_response(step_payload(step)) if settings.RESPONSE_FAST_PATH else step
+
+
+# 🔀 스텝 전체 순서 일괄 변경 (/steps/{step_id}보다 먼저 등록해야 "order"가 매칭됨)
+@router.put("/{routine_id}/steps/order")
+async def reorder_steps(
+    routine_id: int,
+    order_data: StepOrderUpdate,
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    드래그 앤 드롭 결과(스텝 id 전체 순열)를 한 트랜잭션, 한 번의 UPDATE로 반영
+
+    - version이 현재 루틴 버전과 다르면 409 (다른 편집자가 먼저 변경)
+    - step_ids가 루틴 스텝 전체의 순열이 아니면 400
+    """
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
+
+    if not routine:
+        raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
+
+    result = await db.execute(select(Step.id).filter(Step.routine_id == routine_id))
+    current_ids = set(result.scalars().all())
+    requested_ids = order_data.step_ids
+    if len(requested_ids) != len(current_ids) or set(requested_ids) != current_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="루틴의 모든 스텝을 한 번씩 포함해야 합니다",
+        )
+
+    # 버전 조건부 증가 (compare-and-set) - 0행이면 그 사이 다른 변경이 있었음
+    bumped = await db.execute(
+        update(Routine)
+        .filter(Routine.id == routine_id, Routine.version == order_data.version)
+        .values(version=Routine.version + 1)
+    )
+    if bumped.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="다른 곳에서 루틴이 변경되었습니다. 새로고침 후 다시 시도해주세요",
+        )
+
+    # 전체 순열을 CASE 한 번으로 적용
+    new_orders = {
+        step_id: index for index, step_id in enumerate(order_data.step_ids, 1)
+    }
+    await update_step_orders(db, routine_id, lambda _: case(new_orders, value=Step.id))
+
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
+
+    return {
+        "message": "스텝 순서가 변경되었습니다",
+        "step_ids": order_data.step_ids,
+        "version": order_data.version + 1,
+    }
 
 
 # ✏️ 스텝 수정
@@ -395,24 +1032,23 @@ async def update_step(
     routine_id: int,
     step_id: int,
     step_data: StepCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """스텝 정보 수정"""
     # 루틴 권한 확인
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
 
     # 스텝 존재 확인
     step = (
-        db.query(Step).filter(Step.id == step_id, Step.routine_id == routine_id).first()
-    )
+        await db.execute(
+            select(Step).filter(Step.id == step_id, Step.routine_id == routine_id)
+        )
+    ).scalar_one_or_none()
 
     if not step:
         raise HTTPException(status_code=404, detail="스텝을 찾을 수 없습니다")
@@ -425,11 +1061,13 @@ async def update_step(
     step.t_ref_sec = step_data.t_ref_sec
     step.is_optional = step_data.is_optional
     step.xp_reward = step_data.xp_reward
+    step.updated_at = utcnow()  # ETag 갱신 (변경 값이 같아도 시각은 바뀜)
 
-    db.commit()
-    db.refresh(step)
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
+    await db.refresh(step)
 
-    return step
+    return json_response(step_payload(step)) if settings.RESPONSE_FAST_PATH else step
 
 
 # 🗑️ 스텝 삭제
@@ -437,30 +1075,30 @@ async def update_step(
 async def delete_step(
     routine_id: int,
     step_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """스텝 삭제"""
     # 루틴 권한 확인
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
 
     # 스텝 존재 확인
     step = (
-        db.query(Step).filter(Step.id == step_id, Step.routine_id == routine_id).first()
-    )
+        await db.execute(
+            select(Step).filter(Step.id == step_id, Step.routine_id == routine_id)
+        )
+    ).scalar_one_or_none()
 
     if not step:
         raise HTTPException(status_code=404, detail="스텝을 찾을 수 없습니다")
 
-    db.delete(step)
-    db.commit()
+    await db.delete(step)
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
     return {"message": "스텝이 삭제되었습니다"}
 
@@ -471,48 +1109,56 @@ async def reorder_step(
     routine_id: int,
     step_id: int,
     new_order: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: TieredCache = Depends(get_routine_cache),
+    current_user: Principal = Depends(get_current_user),
 ):
     """스텝 순서 변경"""
     # 루틴 권한 확인
-    routine = (
-        db.query(Routine)
-        .filter(Routine.id == routine_id, Routine.user_id == current_user.id)
-        .first()
-    )
+    routine = await get_user_routine(db, routine_id, current_user.id, steps="none")
 
     if not routine:
         raise HTTPException(status_code=404, detail="루틴을 찾을 수 없습니다")
 
+    await lock_routine_steps(db, routine_id)
+
     # 스텝 존재 확인
     step = (
-        db.query(Step).filter(Step.id == step_id, Step.routine_id == routine_id).first()
-    )
+        await db.execute(
+            select(Step).filter(Step.id == step_id, Step.routine_id == routine_id)
+        )
+    ).scalar_one_or_none()
 
     if not step:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="스텝을 찾을 수 없습니다")
 
+    # 새 순서 범위 검증 (1 ~ 스텝 개수)
+    step_count = (
+        await db.execute(
+            select(func.count(Step.id)).filter(Step.routine_id == routine_id)
+        )
+    ).scalar_one()
+    if not 1 <= new_order <= step_count:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"순서는 1부터 {step_count} 사이여야 합니다",
+        )
+
     old_order = step.order
 
-    # 순서 재정렬 로직
-    if new_order > old_order:
-        # 아래로 이동: old_order < order <= new_order 인 스텝들을 -1
-        db.query(Step).filter(
-            Step.routine_id == routine_id,
-            Step.order > old_order,
-            Step.order <= new_order,
-        ).update({Step.order: Step.order - 1})
-    else:
-        # 위로 이동: new_order <= order < old_order 인 스텝들을 +1
-        db.query(Step).filter(
-            Step.routine_id == routine_id,
-            Step.order >= new_order,
-            Step.order < old_order,
-        ).update({Step.order: Step.order + 1})
-
-    # 해당 스텝의 순서 변경
-    step.order = new_order
-    db.commit()
+    # 순서 재정렬: 이동할 스텝 + 사이 구간을 CASE 하나로 변경
+    # 아래로 이동: old_order < order <= new_order 인 스텝들을 -1
+    # 위로 이동: new_order <= order < old_order 인 스텝들을 +1
+    shift = -1 if new_order > old_order else 1
+    await update_step_orders(
+        db,
+        routine_id,
+        lambda order: case((Step.id == step_id, new_order), else_=order + shift),
+        Step.order.between(min(old_order, new_order), max(old_order, new_order)),
+    )
+    await db.commit()
+    await invalidate_routine_cache(cache, current_user.id, routine_id)
 
     return {"message": "스텝 순서가 변경되었습니다", "new_order": new_order}
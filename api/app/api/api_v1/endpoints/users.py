@@ -0,0 +1,24 @@
+# 👤 사용자 계정 API 엔드포인트
+# 계정 비활성화 (티어 변경은 결제 연동에서 app.services.user_service 사용)
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import get_db
+from app.core.security import Principal
+from app.services.leaderboard import Leaderboard, get_leaderboard
+from app.services.user_service import deactivate_user
+
+router = APIRouter()
+
+
+# 🚪 내 계정 비활성화
+@router.delete("/me")
+async def deactivate_me(
+    db: AsyncSession = Depends(get_db),
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+    current_user: Principal = Depends(get_current_user),
+):
+    """계정 비활성화 - 모든 워커에서 이후 요청이 401, 리더보드에서 제외"""
+    await deactivate_user(db, leaderboard, current_user.id)
+    return {"message": "계정이 비활성화되었습니다"}
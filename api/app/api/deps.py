@@ -0,0 +1,84 @@
+# 🔌 API 공용 의존성
+# 인증된 현재 사용자(principal) 조회, 읽기 전용 엔드포인트 세션(레플리카) 선택
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db, read_session
+from app.core.security import (
+    Principal,
+    cache_principal,
+    decode_access_token,
+    get_cached_principal,
+)
+from app.models.user import User
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="인증이 필요합니다",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+# 🔍 현재 사용자 가져오기
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    Bearer 토큰에서 현재 사용자 principal 조회
+
+    - 토큰 검증은 매 요청 수행 (서명/만료 확인은 CPU만 사용)
+    - 사용자 조회 결과는 TTL 동안 캐시 → 캐시 hit이면 DB 조회 없음
+    - 토큰이 없으면 401, 단 개발 환경에서 AUTH_DEV_FALLBACK_USER를 켠 경우에만
+      첫 번째 사용자로 동작 (클라이언트 인증 연동 전까지)
+    """
+    if credentials is None:
+        if not (
+            settings.ENVIRONMENT == "development" and settings.AUTH_DEV_FALLBACK_USER
+        ):
+            raise _unauthorized()
+        user = (await db.execute(select(User).limit(1))).scalar_one_or_none()
+        if not user:
+            raise _unauthorized()
+        db.info["user_id"] = user.id
+        return Principal.from_user(user)
+
+    uid = decode_access_token(credentials.credentials)
+    if uid is None:
+        raise _unauthorized()
+
+    principal = get_cached_principal(uid)
+    if principal is None:
+        user = await db.get(User, int(uid)) if uid.isdigit() else None
+        if not user:
+            raise _unauthorized()
+        principal = Principal.from_user(user)
+        cache_principal(uid, principal)
+
+    if not principal.is_active:
+        raise _unauthorized()
+    # 이 요청의 쓰기 커밋을 사용자 단위 read-your-writes로 기록 (app.core.database)
+    db.info["user_id"] = principal.id
+    return principal
+
+
+# 📖 읽기 전용 엔드포인트 세션
+async def get_read_db(
+    current_user: Principal = Depends(get_current_user),
+) -> AsyncIterator[AsyncSession]:
+    """
+    레플리카 세션 (레플리카가 없거나 방금 쓰기를 커밋한 사용자는 primary)
+
+    조회만 하는 엔드포인트에서 get_db 대신 사용 - 이 세션으로 쓰기를 하면 안 됨
+    """
+    async with await read_session(current_user.id) as db:
+        yield db
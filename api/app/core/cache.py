@@ -0,0 +1,224 @@
+# 🧊 루틴 응답 캐시 (L1 인-프로세스 LRU + L2 Redis)
+# 직렬화된 응답 바이트를 네임스페이스(해시) 단위로 저장
+# - 네임스페이스: 루틴 1개 또는 사용자 목록 1개 → 변경 시 네임스페이스 통째로 삭제
+# - 필드: 버전/ETag/표현 방식을 포함 → 삭제와 경합한 늦은 쓰기도 다시 읽히지 않음
+# 백엔드는 교체 가능 (Redis / 인메모리 가짜 / 비활성)
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """L2 캐시 백엔드 인터페이스"""
+
+    async def get(self, namespace: str, field: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, namespace: str, field: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *namespaces: str) -> None:
+        raise NotImplementedError
+
+
+class NullBackend(CacheBackend):
+    """캐시 비활성 (항상 miss)"""
+
+    async def get(self, namespace: str, field: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, namespace: str, field: str, value: bytes, ttl: int) -> None:
+        return None
+
+    async def delete(self, *namespaces: str) -> None:
+        return None
+
+
+class InMemoryBackend(CacheBackend):
+    """Redis 없이 동작하는 인메모리 백엔드 (테스트/로컬 개발용)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, Dict[str, bytes]]] = {}
+
+    async def get(self, namespace: str, field: str) -> Optional[bytes]:
+        entry = self._data.get(namespace)
+        if entry is None:
+            return None
+        expires_at, fields = entry
+        if expires_at <= time.monotonic():
+            del self._data[namespace]
+            return None
+        return fields.get(field)
+
+    async def set(self, namespace: str, field: str, value: bytes, ttl: int) -> None:
+        entry = self._data.get(namespace)
+        fields = entry[1] if entry and entry[0] > time.monotonic() else {}
+        fields[field] = value
+        self._data[namespace] = (time.monotonic() + ttl, fields)
+
+    async def delete(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self._data.pop(namespace, None)
+
+
+class RedisBackend(CacheBackend):
+    """Redis 해시 기반 백엔드 (장애 시 miss로 처리해 요청은 계속 진행)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    async def get(self, namespace: str, field: str) -> Optional[bytes]:
+        try:
+            return await self._redis.hget(namespace, field)
+        except Exception as exc:  # Redis 장애는 캐시 miss로 취급
+            logger.warning("Redis 캐시 조회 실패: %s", exc)
+            return None
+
+    async def set(self, namespace: str, field: str, value: bytes, ttl: int) -> None:
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(namespace, field, value)
+                pipe.expire(namespace, ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Redis 캐시 저장 실패: %s", exc)
+
+    async def delete(self, *namespaces: str) -> None:
+        try:
+            await self._redis.delete(*namespaces)
+        except Exception as exc:
+            logger.warning("Redis 캐시 삭제 실패: %s", exc)
+
+
+class LRUCache:
+    """TTL이 있는 인-프로세스 LRU (L1)"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, namespace: str, field: str) -> Optional[bytes]:
+        key = (namespace, field)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, namespace: str, field: str, value: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (namespace, field)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, namespace: str, field: str) -> None:
+        self._data.pop((namespace, field), None)
+
+    def delete(self, *namespaces: str) -> None:
+        targets = set(namespaces)
+        for key in [key for key in self._data if key[0] in targets]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """L1(LRU) → L2(백엔드) 순서로 조회하는 read-through 캐시"""
+
+    def __init__(self, backend: CacheBackend, l1: LRUCache, ttl: int):
+        self.backend = backend
+        self.l1 = l1
+        self.ttl = ttl
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, namespace: str, field: str) -> Optional[bytes]:
+        value = self.l1.get(namespace, field)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+        value = await self.backend.get(namespace, field)
+        if value is not None:
+            self.l2_hits += 1
+            self.l1.set(namespace, field, value)
+            return value
+        self.misses += 1
+        return None
+
+    async def set(self, namespace: str, field: str, value: bytes) -> None:
+        self.l1.set(namespace, field, value)
+        await self.backend.set(namespace, field, value, self.ttl)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        self.invalidations += 1
+        self.l1.delete(*namespaces)
+        await self.backend.delete(*namespaces)
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스/축출 카운터"""
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_evictions": self.l1.evictions,
+            "l1_size": len(self.l1),
+            "invalidations": self.invalidations,
+        }
+
+
+# 🔑 루틴 캐시 네임스페이스
+def routine_namespace(user_id: int, routine_id: int) -> str:
+    """루틴 상세 캐시 네임스페이스"""
+    return f"rq:routine:{user_id}:{routine_id}"
+
+
+def routine_list_namespace(user_id: int) -> str:
+    """사용자 루틴 목록 캐시 네임스페이스"""
+    return f"rq:routines:{user_id}"
+
+
+def create_backend(kind: str) -> CacheBackend:
+    """설정값으로 L2 백엔드 생성"""
+    if kind == "redis":
+        return RedisBackend(settings.REDIS_URL)
+    if kind == "memory":
+        return InMemoryBackend()
+    return NullBackend()
+
+
+_routine_cache: Optional[TieredCache] = None
+
+
+def get_routine_cache() -> TieredCache:
+    """루틴 응답 캐시 의존성 (테스트에서는 dependency_overrides로 교체)"""
+    global _routine_cache
+    if _routine_cache is None:
+        _routine_cache = TieredCache(
+            backend=create_backend(settings.CACHE_BACKEND),
+            l1=LRUCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL_SECONDS),
+            ttl=settings.CACHE_TTL_SECONDS,
+        )
+    return _routine_cache
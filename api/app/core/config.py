@@ -39,13 +39,54 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    # 🔌 연결 풀 설정 (워커 프로세스별, primary/레플리카 엔진에 각각 적용)
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=30, env="DB_POOL_TIMEOUT")  # 대기 한도(초)
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")  # 연결 재생성(초)
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+
+    # 📖 읽기 전용 레플리카 (비동기 URL, 없으면 읽기도 primary 사용)
+    DATABASE_REPLICA_URL: Optional[str] = Field(
+        default=None, env="DATABASE_REPLICA_URL"
+    )
+    # read-your-writes: 쓰기를 커밋한 사용자의 읽기를 이 시간 동안 primary로 (복제 지연 상한)
+    READ_YOUR_WRITES_SECONDS: float = Field(default=5, env="READ_YOUR_WRITES_SECONDS")
+    # 표식 저장소 (redis: 모든 워커 공유 | memory: 워커 프로세스 단위, 단일 프로세스용)
+    READ_YOUR_WRITES_BACKEND: str = Field(
+        default="redis", env="READ_YOUR_WRITES_BACKEND"
+    )
+    READ_YOUR_WRITES_MAX_USERS: int = Field(
+        default=10000, env="READ_YOUR_WRITES_MAX_USERS"
+    )
+
     # 🔄 Redis 설정 (캐시/큐용)
     REDIS_URL: str = Field(default="redis://localhost:6379", env="REDIS_URL")
 
+    # 🧊 응답 캐시 설정 (redis | memory | none)
+    CACHE_BACKEND: str = Field(default="redis", env="CACHE_BACKEND")
+    CACHE_TTL_SECONDS: int = Field(default=300, env="CACHE_TTL_SECONDS")
+    CACHE_L1_MAX_ENTRIES: int = Field(default=1024, env="CACHE_L1_MAX_ENTRIES")
+    CACHE_L1_TTL_SECONDS: int = Field(default=30, env="CACHE_L1_TTL_SECONDS")
+
+    # ⚡ 루틴 응답 빠른 직렬화 (컬럼 튜플 → dict → orjson, 끄면 응답 모델 검증 경로)
+    RESPONSE_FAST_PATH: bool = Field(default=True, env="RESPONSE_FAST_PATH")
+
+    # 🏆 리더보드 저장소 (redis | memory)
+    LEADERBOARD_BACKEND: str = Field(default="redis", env="LEADERBOARD_BACKEND")
+
     # 🔐 보안 설정
     SECRET_KEY: str = Field(env="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8일
     ALGORITHM: str = "HS256"
+    AUTH_CACHE_TTL_SECONDS: int = Field(default=60, env="AUTH_CACHE_TTL_SECONDS")
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000, env="AUTH_CACHE_MAX_ENTRIES")
+    # principal 무효화를 다른 워커에 알리는 방식 (redis: pub/sub | none: TTL 만료만)
+    AUTH_INVALIDATION_BACKEND: str = Field(
+        default="redis", env="AUTH_INVALIDATION_BACKEND"
+    )
+    # 개발 환경에서 토큰 없는 요청을 첫 번째 사용자로 처리 (명시적으로 켤 때만)
+    AUTH_DEV_FALLBACK_USER: bool = Field(default=False, env="AUTH_DEV_FALLBACK_USER")
 
     # 🔥 Firebase 설정 (개발용으로 선택적)
     FIREBASE_PROJECT_ID: Optional[str] = Field(default=None, env="FIREBASE_PROJECT_ID")
@@ -1,40 +1,362 @@
 # 🗄️ 데이터베이스 연결 설정
 # SQLAlchemy를 사용한 PostgreSQL 데이터베이스 연결 관리
-from sqlalchemy import create_engine
+# API 요청은 AsyncSession(비동기), 스크립트/마이그레이션은 Session(동기) 사용
+# - 비동기 엔진: 설정 기반 풀 크기/오버플로/pre-ping/recycle, 풀 대기 시간·포화도 지표
+# - 읽기 전용 엔드포인트는 레플리카 엔진 (DATABASE_REPLICA_URL, 없으면 primary)
+# - read-your-writes: 쓰기를 커밋한 사용자는 READ_YOUR_WRITES_SECONDS 동안 읽기도 primary
+#   (표식은 Redis에 두어 모든 워커/인스턴스가 공유, READ_YOUR_WRITES_BACKEND)
+import logging
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IN_USE,
+    DB_POOL_TIMEOUTS,
+    DB_READ_SESSIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+REPLICA = "replica"
 
-# 📊 데이터베이스 엔진 생성
+# 📊 데이터베이스 URL
 # 개발 환경에서는 SQLite 사용 (PostgreSQL 설정 전까지)
 if settings.ENVIRONMENT == "development":
-    # SQLite 개발용 설정
     SQLALCHEMY_DATABASE_URL = "sqlite:///./routine_quest.db"
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
-        connect_args={"check_same_thread": False},  # SQLite 전용
-        poolclass=StaticPool,
-    )
+    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./routine_quest.db"
 else:
     # PostgreSQL 프로덕션 설정
     SQLALCHEMY_DATABASE_URL = (
         f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
         f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
     )
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    ASYNC_DATABASE_URL = settings.DATABASE_URL  # postgresql+asyncpg://
+
+
+# ✍️ 쓰기 추적 세션
+class WriteTrackingSession(AsyncSession):
+    """
+    쓰기를 커밋하면 응답 전에 read-your-writes 표식을 남기는 비동기 세션
+
+    커밋 여부는 동기 Session 이벤트(after_commit)가 info에 기록하고,
+    표식 저장(Redis I/O)은 여기서 await - 다음 요청이 어느 워커로 가도 보임
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        user_id = self.info.pop("committed_writer", None)
+        if user_id is not None:
+            await get_recent_writers().mark(user_id)
+
+
+# 🔧 세션 팩토리 생성 (엔진은 처음 필요할 때 만들어 연결)
+# 임포트만으로 엔진/DB 드라이버를 만들지 않음 - 워커 부팅/테스트 수집이 빨라지고
+# gunicorn이 fork하기 전에 연결 풀이 생기지 않음 (API는 시작 이벤트에서 생성)
+# 동기 세션: 스크립트, 시드 데이터, 마이그레이션 전용 (API 핸들러에서 사용 금지)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# 비동기 세션: API 요청 처리용 (이벤트 루프를 막지 않음)
+# expire_on_commit=False - 커밋 후 속성 접근 시 암묵적 I/O가 발생하지 않도록 함
+AsyncSessionLocal = async_sessionmaker(
+    class_=WriteTrackingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# 읽기 전용 세션: 레플리카 엔진에 연결 (레플리카가 없으면 사용하지 않음)
+ReplicaSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+replica_engine: Optional[AsyncEngine] = None
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    체크아웃 대기 시간과 사용 중 연결 수를 기록하는 비동기 큐 풀
+
+    지표 라벨은 pool_logging_name (primary/replica) - dispose() 후 재생성돼도 유지됨
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.logging_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name).observe(
+                time.perf_counter() - started
+            )
+        DB_POOL_IN_USE.labels(self.logging_name).set(self.checkedout())
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        DB_POOL_IN_USE.labels(self.logging_name).set(self.checkedout())
+
+
+def create_db_engine(url: str, role: str = PRIMARY) -> AsyncEngine:
+    """
+    설정(DB_POOL_*)을 적용한 비동기 엔진 생성
+
+    - pool_pre_ping: 체크아웃 시 끊긴 연결(DB 재시작, 유휴 종료)을 감지해 다시 연결
+    - pool_recycle: 오래된 연결을 주기적으로 교체 (프록시/방화벽 유휴 타임아웃 대비)
+    """
+    DB_POOL_CAPACITY.labels(role).set(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_logging_name=role,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def get_engine() -> Engine:
+    """동기 엔진 (첫 호출 시 생성해 SessionLocal에 연결)"""
+    global engine
+    if engine is None:
+        if settings.ENVIRONMENT == "development":
+            engine = create_engine(
+                SQLALCHEMY_DATABASE_URL,
+                connect_args={"check_same_thread": False},  # SQLite 전용
+                poolclass=StaticPool,
+            )
+        else:
+            engine = create_engine(SQLALCHEMY_DATABASE_URL)
+        SessionLocal.configure(bind=engine)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """비동기 엔진 (첫 호출 시 생성해 AsyncSessionLocal에 연결)"""
+    global async_engine
+    if async_engine is None:
+        use_engines(create_db_engine(ASYNC_DATABASE_URL, PRIMARY), replica_engine)
+    return async_engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """레플리카 엔진 (DATABASE_REPLICA_URL이 있을 때만, 첫 호출 시 생성)"""
+    if replica_engine is None and settings.DATABASE_REPLICA_URL:
+        use_engines(
+            get_async_engine(),
+            create_db_engine(settings.DATABASE_REPLICA_URL, REPLICA),
+        )
+    return replica_engine
+
+
+def use_engines(primary: AsyncEngine, replica: Optional[AsyncEngine] = None) -> None:
+    """주어진 엔진을 primary/레플리카로 연결 (스크립트/검증에서 다른 DB를 쓸 때)"""
+    global async_engine, replica_engine
+    async_engine, replica_engine = primary, replica
+    AsyncSessionLocal.configure(bind=primary)
+    ReplicaSessionLocal.configure(bind=replica or primary)
+
+
+async def dispose_engines() -> None:
+    """만들어진 엔진의 연결 풀 정리 (앱/배치 종료 시)"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    if engine is not None:
+        engine.dispose()
 
-# 🔧 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # 📋 베이스 모델 클래스
 Base = declarative_base()
 
 
+# 🕒 애플리케이션 시각
+def utcnow() -> datetime:
+    """
+    created_at/updated_at 등에 쓰는 단일 시계 (UTC, tz 없는 datetime, 마이크로초)
+
+    모델의 default/onupdate와 핸들러의 직접 갱신이 모두 이 함수를 사용 -
+    server_default(func.now())는 ORM 밖에서 넣는 행(마이그레이션/수동 SQL)용
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ✍️ read-your-writes
+# 세션 info["user_id"](get_current_user가 설정)가 있는 세션이 쓰기를 커밋하면 사용자를 기록
+class RecentWriters:
+    """최근 쓰기를 커밋한 사용자 표식 저장소 (READ_YOUR_WRITES_SECONDS 동안 유지)"""
+
+    async def mark(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        raise NotImplementedError
+
+    async def forget(self, user_id: int) -> None:
+        raise NotImplementedError
+
+
+class InMemoryRecentWriters(RecentWriters):
+    """워커 프로세스 단위 LRU (단일 프로세스 개발/테스트용)"""
+
+    def __init__(self, max_users: int, ttl: float):
+        self.cache = LRUCache(max_users, ttl)
+
+    async def mark(self, user_id: int) -> None:
+        self.cache.set("writer", str(user_id), b"1")
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        return self.cache.get("writer", str(user_id)) is not None
+
+    async def forget(self, user_id: int) -> None:
+        self.cache.discard("writer", str(user_id))
+
+
+class RedisRecentWriters(RecentWriters):
+    """
+    Redis 키 rq:ryw:{user_id} (만료 = 창) - 모든 워커/인스턴스가 공유
+
+    Redis 장애 시 읽기는 primary로 (복제 지연된 데이터를 보여주지 않는 쪽으로 실패)
+    """
+
+    def __init__(self, ttl: float, url: str = "", client=None):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(url)
+        self._redis = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"rq:ryw:{user_id}"
+
+    async def mark(self, user_id: int) -> None:
+        try:
+            await self._redis.set(self._key(user_id), b"1", px=int(self.ttl * 1000))
+        except Exception as exc:
+            logger.warning("read-your-writes 표식 저장 실패 (user_id=%s): %s", user_id, exc)
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        try:
+            return bool(await self._redis.exists(self._key(user_id)))
+        except Exception as exc:
+            logger.warning("read-your-writes 표식 조회 실패: %s", exc)
+            return True
+
+    async def forget(self, user_id: int) -> None:
+        await self._redis.delete(self._key(user_id))
+
+
+def create_recent_writers(kind: str) -> RecentWriters:
+    """설정값으로 표식 저장소 생성"""
+    if kind == "redis":
+        return RedisRecentWriters(settings.READ_YOUR_WRITES_SECONDS, settings.REDIS_URL)
+    return InMemoryRecentWriters(
+        settings.READ_YOUR_WRITES_MAX_USERS, settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+_recent_writers: Optional[RecentWriters] = None
+
+
+def get_recent_writers() -> RecentWriters:
+    global _recent_writers
+    if _recent_writers is None:
+        _recent_writers = create_recent_writers(settings.READ_YOUR_WRITES_BACKEND)
+    return _recent_writers
+
+
+def use_recent_writers(store: Optional[RecentWriters]) -> None:
+    """표식 저장소 교체 (검증/테스트에서 다른 저장소를 쓸 때, None이면 설정값으로)"""
+    global _recent_writers
+    _recent_writers = store
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_write_statement(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_writer(session) -> None:
+    # 표식 저장은 I/O라 여기서 하지 않고 WriteTrackingSession.commit이 이어서 처리
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        session.info["committed_writer"] = user_id
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session) -> None:
+    session.info.pop("wrote", None)
+
+
 # 🔌 데이터베이스 세션 의존성
-def get_db():
-    """데이터베이스 세션을 제공하는 의존성 함수"""
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """비동기 데이터베이스 세션을 제공하는 의존성 함수"""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def read_session(user_id: Optional[int]) -> AsyncSession:
+    """
+    읽기 전용 세션 선택
+
+    - 레플리카가 없으면 primary
+    - 최근 쓰기를 커밋한 사용자는 primary (복제 지연 중에도 자기 변경이 보이도록)
+    - 그 외는 레플리카
+    """
+    get_async_engine()
+    if get_replica_engine() is None:
+        DB_READ_SESSIONS.labels(PRIMARY, "no_replica").inc()
+        return AsyncSessionLocal()
+    if user_id is not None and await get_recent_writers().wrote_recently(user_id):
+        DB_READ_SESSIONS.labels(PRIMARY, "sticky").inc()
+        return AsyncSessionLocal()
+    DB_READ_SESSIONS.labels(REPLICA, "default").inc()
+    return ReplicaSessionLocal()
+
+
+def get_sync_db():
+    """동기 데이터베이스 세션 제공 (스크립트 전용)"""
+    get_engine()
     db = SessionLocal()
     try:
         yield db
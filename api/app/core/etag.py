@@ -0,0 +1,49 @@
+# 🏷️ 조건부 GET (ETag / If-None-Match) 유틸리티
+# 변경 추적 값(버전, 개수, 최종 수정 시각)으로 ETag를 만들고,
+# 클라이언트가 가진 값과 같으면 본문 직렬화 없이 304를 반환
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from fastapi import Response, status
+
+from app.core.serialization import JSON_MEDIA_TYPE
+
+# 캐시는 허용하되 매번 재검증 (사용자별 데이터이므로 private)
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(parts: Iterable[object], weak: bool = False) -> str:
+    """변경 추적 값들로 ETag 문자열 생성"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    digest = hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()[:20]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더와 ETag 비교 (RFC 7232 약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return opaque in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """본문 없는 304 응답"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def etag_response(
+    body: bytes, etag: str, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """이미 직렬화된 JSON 본문을 ETag/Cache-Control 헤더와 함께 반환"""
+    return Response(
+        content=body,
+        media_type=JSON_MEDIA_TYPE,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, **(headers or {})},
+    )
@@ -0,0 +1,111 @@
+# 📈 Prometheus 요청 지표
+# 라우트별 지연시간/응답 크기/DB 쿼리 수 히스토그램과 처리 중 요청 게이지
+# - 라벨은 URL 대신 라우트 템플릿("/api/v1/routines/{routine_id}") → 카디널리티 고정
+# - gunicorn 다중 워커: PROMETHEUS_MULTIPROC_DIR이 설정되면 워커별 mmap 파일에 기록하고
+#   /metrics에서 모든 워커 파일을 합산 (gunicorn.conf.py가 디렉터리 준비/정리 담당)
+# - DB 쿼리 수: 요청마다 ContextVar 카운터를 두고 모든 엔진의 before_cursor_execute에서 증가
+# - 연결 풀: 풀(primary/replica)별 체크아웃 대기 시간, 사용 중/최대 연결 수(포화도), 대기 초과,
+#   읽기 세션이 어느 풀로 갔는지 (레플리카 / read-your-writes로 primary)
+import os
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 라우트에 매칭되지 않은 요청 (404, FastAPI 라우트가 아닌 문서 경로 등)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "요청 처리 시간 (응답 본문 전송 완료까지)",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "처리 중인 요청 수",
+    ["method"],
+    multiprocess_mode="livesum",  # 살아 있는 워커 값만 합산
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "응답 본문 크기",
+    ["method", "route"],
+    buckets=(128, 512, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "요청 1건이 실행한 SQL 문 수",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 32),
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "연결 풀에서 연결을 얻기까지 기다린 시간 (pre-ping 포함)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "체크아웃된 연결 수",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_connections_max",
+    "풀 최대 연결 수 (pool_size + max_overflow) - in_use / max = 포화도",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "pool_timeout 안에 연결을 얻지 못한 횟수",
+    ["pool"],
+)
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total",
+    "읽기 전용 세션 배정 (target: replica/primary, reason: default/sticky/no_replica)",
+    ["target", "reason"],
+)
+
+# 요청별 SQL 문 카운터 ([개수] 리스트 - 세션이 만든 greenlet에서도 같은 객체를 증가)
+_query_count: ContextVar[Optional[List[int]]] = ContextVar("query_count", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(*args) -> None:
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def start_query_count() -> Tuple[List[int], object]:
+    """현재 요청의 쿼리 카운터 시작 → (카운터, 복원 토큰)"""
+    counter = [0]
+    return counter, _query_count.set(counter)
+
+
+def stop_query_count(token) -> None:
+    _query_count.reset(token)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus 텍스트 형식 (다중 워커면 모든 워커 값 합산) → (본문, content-type)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
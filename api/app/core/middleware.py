@@ -0,0 +1,77 @@
+# 🧱 순수 ASGI 미들웨어
+# @app.middleware("http")(BaseHTTPMiddleware)는 요청마다 태스크/메모리 스트림을 만들고
+# 응답 본문을 한 번 더 중계하므로 오버헤드가 크고 스트리밍 응답에도 끼어듦
+# → send 메시지만 가로채는 ASGI 미들웨어 하나로 charset 보정과 요청 지표 기록을 처리
+import time
+
+from app.core.metrics import (
+    DB_QUERIES,
+    REQUEST_LATENCY,
+    REQUESTS_IN_PROGRESS,
+    RESPONSE_SIZE,
+    UNMATCHED_ROUTE,
+    start_query_count,
+    stop_query_count,
+)
+
+JSON_CONTENT_TYPE = b"application/json"
+JSON_UTF8_CONTENT_TYPE = b"application/json; charset=utf-8"
+
+
+def with_json_charset(headers):
+    """application/json 응답의 content-type을 UTF-8 charset 포함 값으로 교체"""
+    return [
+        (
+            (name, JSON_UTF8_CONTENT_TYPE)
+            if name.lower() == b"content-type" and value.startswith(JSON_CONTENT_TYPE)
+            else (name, value)
+        )
+        for name, value in headers
+    ]
+
+
+class MetricsMiddleware:
+    """
+    JSON 응답 charset 보정 + 요청 지표 기록
+
+    - 지연시간: 응답 본문 전송 완료(또는 예외)까지, 라우트/메서드/상태 코드별
+    - 응답 크기: 전송한 본문 바이트 합계 (스트리밍 응답은 청크 합계)
+    - DB 쿼리 수: 요청 처리 중 실행된 SQL 문 수
+    라우트 템플릿은 FastAPI 라우터가 scope["route"]에 남긴 값을 사용
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500  # 응답 시작 전 예외면 500으로 기록
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = with_json_charset(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        counter, token = start_query_count()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            stop_query_count(token)
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            DB_QUERIES.labels(method, route).observe(counter[0])
@@ -0,0 +1,36 @@
+# 📑 키셋(커서) 페이지네이션 유틸리티
+# offset 방식은 깊은 페이지일수록 느려지고, 페이지 사이에 생성/삭제가 있으면 행이 밀림
+# 마지막으로 본 행의 정렬 키(id)를 불투명한 커서 문자열로 인코딩해 다음 페이지 조건으로 사용
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """마지막 행 id를 URL-safe 커서 문자열로 인코딩"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """커서 문자열에서 마지막 행 id 복원 (잘못된 커서는 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다"
+        ) from None
+
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """페이지가 가득 찼으면 다음 페이지 커서 반환, 마지막 페이지면 None (행은 ORM 객체 또는 dict)"""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["id"] if isinstance(last, dict) else last.id)
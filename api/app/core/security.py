@@ -0,0 +1,147 @@
+# 🔐 인증 토큰 및 사용자 principal 캐시
+# JWT(HS256, SECRET_KEY) 발급/검증과, 검증된 사용자 정보를 TTL LRU에 보관해
+# 같은 사용자의 요청은 TTL 창마다 최대 한 번만 DB를 조회하도록 함
+# 티어 변경/비활성화는 invalidate_principal → 모든 워커에 Redis pub/sub로 전파
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jose import JWTError, jwt
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "rq:auth:invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """요청 처리에 필요한 사용자 정보 스냅샷 (세션과 분리되어 캐시 가능)"""
+
+    id: int
+    firebase_uid: Optional[str]
+    email: str
+    tier: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            firebase_uid=user.firebase_uid,
+            email=user.email,
+            tier=user.tier,
+            is_active=user.is_active,
+        )
+
+
+def create_access_token(
+    user_id: int,
+    tier: Optional[str] = None,
+    expires_delta: Optional[timedelta] = None,
+) -> str:
+    """
+    사용자 id를 subject로 하는 액세스 토큰 발급
+
+    tier 클레임은 발급 시점 값 - AI 서비스는 DB의 현재 티어를 우선하고,
+    DB를 쓸 수 없을 때만 이 값으로 사용 한도를 정함 (없으면 free로 취급)
+    """
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    payload = {"sub": str(user_id), "exp": expire}
+    if tier:
+        payload["tier"] = tier
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[str]:
+    """토큰 서명/만료 검증 후 subject(uid) 반환, 유효하지 않으면 None"""
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    return str(subject) if subject else None
+
+
+# 👤 principal 캐시 (uid → Principal)
+principal_cache = LRUCache(
+    settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+def _principal_key(uid: str) -> str:
+    return f"principal:{uid}"
+
+
+def get_cached_principal(uid: str) -> Optional[Principal]:
+    """캐시된 principal 조회"""
+    return principal_cache.get(_principal_key(uid), "")
+
+
+def cache_principal(uid: str, principal: Principal) -> None:
+    """principal 캐시 저장"""
+    principal_cache.set(_principal_key(uid), "", principal)
+
+
+def discard_principal(uid) -> None:
+    """이 워커의 캐시에서만 principal 제거"""
+    principal_cache.discard(_principal_key(str(uid)), "")
+
+
+_redis = None
+
+
+def _invalidation_client():
+    global _redis
+    if _redis is None:
+        import redis.asyncio as redis
+
+        _redis = redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+async def invalidate_principal(uid) -> None:
+    """
+    권한 회수, 티어 변경, 비활성화 후(커밋 뒤) 호출해 다음 요청에서 DB를 다시 읽게 함
+
+    이 워커는 즉시 제거, 다른 워커는 pub/sub 메시지로 제거 -
+    발행이 실패하면 다른 워커는 AUTH_CACHE_TTL_SECONDS 안에 만료로 반영
+    """
+    discard_principal(uid)
+    if settings.AUTH_INVALIDATION_BACKEND != "redis":
+        return
+    try:
+        await _invalidation_client().publish(INVALIDATION_CHANNEL, str(uid))
+    except Exception as exc:
+        logger.warning("principal 무효화 발행 실패 (uid=%s): %s", uid, exc)
+
+
+async def listen_for_invalidations(client=None, retry_seconds: float = 1.0) -> None:
+    """
+    다른 워커가 발행한 무효화를 이 워커 캐시에 반영 (앱 수명 동안 실행하는 태스크)
+
+    연결이 끊기면 그 사이 메시지를 놓쳤을 수 있으므로 캐시를 비우고 다시 구독
+    """
+    client = client or _invalidation_client()
+    while True:
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        discard_principal(message["data"].decode())
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("principal 무효화 구독 끊김: %s", exc)
+        principal_cache.clear()
+        await asyncio.sleep(retry_seconds)
@@ -0,0 +1,2 @@
+# 배치 작업 패키지
+# cron / Celery beat 등에서 `python -m app.jobs.<이름>` 형태로 실행
@@ -0,0 +1,34 @@
+# 🏆 리더보드 재구축 배치
+# Redis 유실/초기 배포/시즌 전환 시 DB 값으로 전체·티어·이번 주 시즌 보드를 다시 채움
+# 사용자를 키셋 배치로 스트리밍하고 staging 보드에 쓴 뒤 교체하므로 서비스 중에도 실행 가능
+# (재구축 중 들어온 XP 증분/티어 변경은 DB에서 다시 읽어 반영, 동시에 두 개는 실행 불가)
+#
+# 실행: cd api && python -m app.jobs.leaderboard [--batch-size 5000]
+import argparse
+import asyncio
+import logging
+
+from app.core.database import AsyncSessionLocal, dispose_engines, get_async_engine
+from app.services.leaderboard import get_leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> int:
+    """리더보드 재구축 후 처리한 사용자 수 반환"""
+    get_async_engine()
+    try:
+        async with AsyncSessionLocal() as db:
+            total = await get_leaderboard().rebuild_from_db(db, batch_size)
+    finally:
+        await dispose_engines()
+    logger.info("리더보드 재구축 완료: 사용자 %d명", total)
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="리더보드 재구축 배치")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.batch_size))
@@ -0,0 +1,269 @@
+# 🔥 야간 스트릭 / 보호권 배치
+# 시간대별로 현지 자정이 지나면 그 시간대 사용자들의 "어제"를 마감 처리
+# - 어제 활동함: 스트릭 +1 (어제 현지 하루 범위의 step_events가 있거나 마지막 활동이 어제)
+# - 어제 활동 안 함: 보호권이 있으면 1개 소모하고 스트릭 유지, 없으면 스트릭 0
+# - 어제가 일요일이면 주간 보호권 리필
+#
+# 사용자 단위 루프 대신 청크(키셋) 단위로 읽어 numpy/pandas로 한 번에 계산하고
+# executemany UPDATE로 되돌려 씀. streak_processed_date로 같은 날 중복 처리를 막으므로
+# 15~30분마다 실행해도 안전함 (현지 자정이 지난 시간대만 새로 처리됨)
+# 배치가 빠진 날이 있으면 streak_processed_date 다음 날부터 어제까지 하루씩 차례로 마감
+# 활동 여부는 이벤트 로그의 날짜로 판단하므로 자정 이후(배치 전)에 또 활동해도 어제가 유지됨
+# 잘못된 시간대 이름은 그 시간대만 건너뛰고 로그를 남김
+#
+# 실행: cd api && python -m app.jobs.streaks [--now 2025-01-01T15:00:00]
+import argparse
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import distinct, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, get_engine
+from app.models.step_event import StepEvent
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000
+WEEKLY_GRACE_TOKENS = 1  # 주간 보호권 리필 수량
+REFILL_WEEKDAY = 6  # 일요일 마감 시 리필 (월요일 = 0)
+
+
+@dataclass
+class StreakRunResult:
+    """시간대 1개 처리 결과"""
+
+    timezone: str
+    day: date
+    users: int = 0
+    continued: int = 0
+    protected: int = 0
+    broken: int = 0
+    error: Optional[str] = None  # 처리하지 못한 이유 (잘못된 시간대 등)
+
+
+def local_day_to_close(now_utc: datetime, tz_name: str) -> date:
+    """해당 시간대에서 마감할 날짜 (현지 기준 어제)"""
+    return (now_utc.astimezone(ZoneInfo(tz_name)) - timedelta(days=1)).date()
+
+
+def days_to_close(db: Session, tz_name: str, yesterday: date) -> List[date]:
+    """
+    시간대에서 마감할 날짜 목록 (오래된 날부터, 마지막은 현지 어제)
+
+    가장 뒤처진 사용자의 streak_processed_date 다음 날부터 어제까지 - 배치가 하루 이상
+    빠졌어도 건너뛴 날의 활동/미활동이 차례로 반영됨
+    모두 어제까지 마감했으면 마감 이력이 없는(NULL) 사용자가 있을 때만 어제 하루
+    (NULL 사용자는 밀린 날 없이 어제부터 마감 - 가입/도입 전 날짜로 끊기지 않음)
+    """
+    oldest = db.scalar(
+        select(func.min(User.streak_processed_date)).filter(User.timezone == tz_name)
+    )
+    if oldest is not None and oldest < yesterday:
+        return [
+            oldest + timedelta(days=offset)
+            for offset in range(1, (yesterday - oldest).days + 1)
+        ]
+    unprocessed = db.scalar(
+        select(User.id)
+        .filter(User.timezone == tz_name, User.streak_processed_date.is_(None))
+        .limit(1)
+    )
+    return [yesterday] if unprocessed is not None else []
+
+
+def local_day_bounds(day: date, tz_name: str) -> Tuple[datetime, datetime]:
+    """현지 day 하루의 [시작, 끝) UTC naive 범위 (DST로 23/25시간인 날 포함)"""
+    zone = ZoneInfo(tz_name)
+    start = datetime.combine(day, time(), tzinfo=zone)
+    end = datetime.combine(day + timedelta(days=1), time(), tzinfo=zone)
+    return (
+        start.astimezone(timezone.utc).replace(tzinfo=None),
+        end.astimezone(timezone.utc).replace(tzinfo=None),
+    )
+
+
+def compute_streaks(frame: pd.DataFrame, day: date, tz_name: str) -> pd.DataFrame:
+    """
+    청크 단위 스트릭/보호권 계산 (벡터 연산)
+
+    입력 컬럼: id, streak, grace_tokens, last_activity_date (UTC naive),
+              logged (day 현지 하루 범위의 step_events 유무)
+    출력 컬럼: id, streak, grace_tokens, outcome(continued/protected/broken/idle)
+
+    last_activity_date는 마지막 활동 1개뿐이라 자정 이후 활동으로 덮이므로 logged가 기준,
+    이벤트 로그 도입 전 활동은 last_activity_date로 보완
+    """
+    last_active = pd.to_datetime(frame["last_activity_date"])
+    local_dates = last_active.dt.tz_localize("UTC").dt.tz_convert(tz_name).dt.date
+    active = frame["logged"].to_numpy(dtype=bool) | (local_dates == day).to_numpy(
+        dtype=bool
+    )
+
+    streak = frame["streak"].to_numpy(dtype=np.int64)
+    tokens = frame["grace_tokens"].to_numpy(dtype=np.int64)
+
+    missed = ~active & (streak > 0)
+    protected = missed & (tokens > 0)
+    broken = missed & ~protected
+
+    new_streak = np.where(active, streak + 1, np.where(broken, 0, streak))
+    new_tokens = tokens - protected.astype(np.int64)
+    if day.weekday() == REFILL_WEEKDAY:
+        new_tokens = np.maximum(new_tokens, WEEKLY_GRACE_TOKENS)
+
+    outcome = np.select(
+        [active, protected, broken], ["continued", "protected", "broken"], "idle"
+    )
+    return pd.DataFrame(
+        {
+            "id": frame["id"].to_numpy(),
+            "streak": new_streak,
+            "grace_tokens": new_tokens,
+            "outcome": outcome,
+        }
+    )
+
+
+def iter_user_chunks(
+    db: Session,
+    tz_name: str,
+    day: date,
+    chunk_size: int = CHUNK_SIZE,
+    include_new: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    day를 마감할 시간대 사용자들을 id 키셋으로 청크 조회
+    - 전날(day - 1)까지 마감한 사용자 (하루씩 차례로 마감하므로 그보다 뒤처진 사용자는
+      run이 더 이른 날부터 따라잡음)
+    - include_new면 한 번도 마감하지 않은 사용자(NULL)도 포함 - 밀린 날 마감에서는 제외
+
+    두 그룹을 따로 조회해 각 쿼리가 (timezone, streak_processed_date, id) 인덱스의
+    id 순 범위 스캔이 되도록 함 (OR 조건이면 시간대 사용자 전체를 읽고 정렬)
+    청크마다 (user_id, occurred_at) 인덱스로 청크 id 범위 안에서 day 현지 하루에
+    이벤트가 있는 사용자를 1쿼리로 조회해 logged 컬럼으로 붙임
+    """
+    start, end = local_day_bounds(day, tz_name)
+    groups = [User.streak_processed_date == day - timedelta(days=1)]
+    if include_new:
+        groups.insert(0, User.streak_processed_date.is_(None))
+    for pending in groups:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(User.id, User.streak, User.grace_tokens, User.last_activity_date)
+                .filter(User.timezone == tz_name, pending, User.id > last_id)
+                .order_by(User.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            first_id, last_id = rows[0].id, rows[-1].id
+            logged_ids = (
+                db.execute(
+                    select(distinct(StepEvent.user_id)).filter(
+                        StepEvent.user_id.between(first_id, last_id),
+                        StepEvent.occurred_at >= start,
+                        StepEvent.occurred_at < end,
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            frame = pd.DataFrame(
+                rows, columns=["id", "streak", "grace_tokens", "last_activity_date"]
+            )
+            frame["logged"] = frame["id"].isin(logged_ids)
+            yield frame
+
+
+def process_timezone(
+    db: Session,
+    tz_name: str,
+    day: date,
+    chunk_size: int = CHUNK_SIZE,
+    include_new: bool = True,
+) -> StreakRunResult:
+    """시간대 1개의 day 마감 처리 (청크마다 커밋)"""
+    result = StreakRunResult(timezone=tz_name, day=day)
+    for frame in iter_user_chunks(db, tz_name, day, chunk_size, include_new):
+        computed = compute_streaks(frame, day, tz_name)
+        db.execute(
+            update(User),
+            [
+                {
+                    "id": int(row.id),
+                    "streak": int(row.streak),
+                    "grace_tokens": int(row.grace_tokens),
+                    "streak_processed_date": day,
+                }
+                for row in computed.itertuples(index=False)
+            ],
+        )
+        db.commit()
+
+        counts = computed["outcome"].value_counts()
+        result.users += len(computed)
+        result.continued += int(counts.get("continued", 0))
+        result.protected += int(counts.get("protected", 0))
+        result.broken += int(counts.get("broken", 0))
+    return result
+
+
+def run(now_utc: Optional[datetime] = None) -> List[StreakRunResult]:
+    """
+    현지 자정이 지난 모든 시간대를 처리 (잘못된 시간대는 건너뛰고 계속)
+
+    결과는 (시간대, 마감한 날짜)마다 1개 - 밀린 날이 있으면 한 시간대에 여러 개
+    """
+    now_utc = now_utc or datetime.now(timezone.utc)
+    results = []
+    get_engine()
+    with SessionLocal() as db:
+        zones = db.execute(select(distinct(User.timezone))).scalars().all()
+        for tz_name in zones:
+            try:
+                yesterday = local_day_to_close(now_utc, tz_name)
+            except (ZoneInfoNotFoundError, ValueError) as exc:
+                # 사용자 입력 시간대 오타 등 - 다른 시간대 처리는 막지 않음
+                logger.warning("알 수 없는 시간대 %r 건너뜀: %s", tz_name, exc)
+                results.append(
+                    StreakRunResult(
+                        timezone=tz_name, day=now_utc.date(), error=repr(exc)
+                    )
+                )
+                continue
+            for day in days_to_close(db, tz_name, yesterday):
+                result = process_timezone(
+                    db, tz_name, day, include_new=day == yesterday
+                )
+                if result.users:
+                    logger.info("스트릭 마감 완료: %s", result)
+                results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="야간 스트릭/보호권 배치")
+    parser.add_argument("--now", default=None, help="기준 시각 (UTC ISO 8601)")
+    args = parser.parse_args()
+    now = (
+        datetime.fromisoformat(args.now).replace(tzinfo=timezone.utc)
+        if args.now
+        else None
+    )
+    results = run(now)
+    logger.info(
+        "스트릭 배치 종료: 시간대 %d개, 마감 %d건, 사용자 %d명, 실패 시간대 %s",
+        len({result.timezone for result in results}),
+        len(results),
+        sum(result.users for result in results),
+        [result.timezone for result in results if result.error] or "없음",
+    )
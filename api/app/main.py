@@ -2,26 +2,62 @@
 # 루틴 퀘스트 백엔드 API 서버의 진입점
 # 라우터 등록, 미들웨어 설정, 전역 설정을 담당
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
+from fastapi.responses import JSONResponse, Response
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import dispose_engines, get_async_engine, get_replica_engine
+from app.core.metrics import render_metrics
+from app.core.middleware import MetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import listen_for_invalidations
 from app.models import Base
 from app.api.api_v1.api import api_router
 
-# Sentry 에러 모니터링 초기화 (프로덕션용)
+# Sentry 에러 모니터링 초기화 (프로덕션용, DSN이 있을 때만 임포트)
 if settings.SENTRY_DSN:
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
         integrations=[FastApiIntegration()],
         environment=settings.ENVIRONMENT,
     )
 
+
+# 🏁🛑 앱 수명 주기 (시작 시 초기화, 종료 시 정리)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 초기화 작업 → (요청 처리) → 종료 시 정리 작업"""
+    # 데이터베이스 엔진 생성 (워커 프로세스 안에서, 임포트 시점이 아니라 시작 시)
+    async_engine = get_async_engine()
+    get_replica_engine()  # DATABASE_REPLICA_URL이 있을 때만
+
+    # 다른 워커의 principal 무효화(티어 변경/비활성화) 구독
+    listener = None
+    if settings.AUTH_INVALIDATION_BACKEND == "redis":
+        listener = asyncio.create_task(listen_for_invalidations())
+    app.state.invalidation_listener = listener
+
+    try:
+        # 데이터베이스 테이블 생성 (개발용 - 프로덕션에서는 Alembic 사용)
+        if settings.ENVIRONMENT == "development":
+            async with async_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        yield
+    finally:
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+        await dispose_engines()
+
+
 # 📱 FastAPI 앱 인스턴스 생성
 app = FastAPI(
     title="Routine Quest API",
@@ -34,6 +70,7 @@ app = FastAPI(
     ),
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    lifespan=lifespan,
 )
 
 # 🔒 보안 미들웨어 설정
@@ -46,17 +83,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 
-# 🔤 UTF-8 인코딩 미들웨어
-@app.middleware("http")
-async def add_charset_header(request: Request, call_next):
-    """모든 JSON 응답에 UTF-8 charset 추가"""
-    response = await call_next(request)
-    if response.headers.get("content-type", "").startswith("application/json"):
-        response.headers["content-type"] = "application/json; charset=utf-8"
-    return response
+# 🔤📈 JSON 응답 UTF-8 charset 보정 + 요청 지표 (순수 ASGI, 가장 바깥에 등록)
+app.add_middleware(MetricsMiddleware)
 
 
 # 📡 API 라우터 등록
@@ -70,6 +102,14 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
 
+# 📈 Prometheus 지표 엔드포인트
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """라우트별 지연시간/응답 크기/DB 쿼리 수, 처리 중 요청 수 (모든 워커 합산)"""
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
+
+
 # 🚨 글로벌 예외 핸들러
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -83,22 +123,6 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# 🏁 앱 시작 이벤트
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 실행되는 초기화 작업"""
-    # 데이터베이스 테이블 생성 (개발용 - 프로덕션에서는 Alembic 사용)
-    if settings.ENVIRONMENT == "development":
-        Base.metadata.create_all(bind=engine)
-
-
-# 🛑 앱 종료 이벤트
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서버 종료 시 정리 작업"""
-    pass
-
-
 if __name__ == "__main__":
     import uvicorn
 
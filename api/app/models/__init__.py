@@ -10,10 +10,18 @@ from .user import User
 # 루틴 관련 모델
 from .routine import Routine, Step
 
+# 실행 기록 모델
+from .step_event import StepEvent
+
+# AI 코치 사용량 (AI 서비스가 write-back)
+from .coach_usage import CoachUsage
+
 # 모든 모델 리스트 (Alembic이 자동으로 인식)
 __all__ = [
     "Base",
     "User",
     "Routine",
     "Step",
+    "StepEvent",
+    "CoachUsage",
 ]
@@ -0,0 +1,18 @@
+# 🎟️ AI 코치 월 사용량 (AI 서비스의 확정 카운터 write-back 대상)
+# AI 서비스(app.services.quota.coach_usage)가 같은 테이블을 Core로 upsert
+# 카운터는 Redis가 원본이고, 이 테이블은 재시작/Redis 유실 시 복원용
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.core.database import Base, utcnow
+
+
+class CoachUsage(Base):
+    """사용자/월별 AI 코치 팁 생성 횟수"""
+
+    __tablename__ = "coach_usage"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM (UTC)
+    user_id = Column(Integer, primary_key=True)
+    used = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=utcnow, nullable=False)
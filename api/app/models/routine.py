@@ -3,12 +3,22 @@
 #                  steps(id, routine_id, "order", title, difficulty, t_ref_sec, type)
 # 사용자가 만든 루틴과 각 루틴의 스텝들을 관리
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    Index,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 
 class StepType(str, Enum):
@@ -32,10 +42,17 @@ class Routine(Base):
     """루틴 테이블 - 사용자가 만든 루틴 목록"""
 
     __tablename__ = "routines"
+    __table_args__ = (
+        # 키셋 페이지네이션: WHERE user_id = ? AND id > ? ORDER BY id
+        # (user_id만 거는 조회/ETag 집계도 이 인덱스를 사용 - 단일 인덱스는 두지 않음)
+        Index("ix_routines_user_id_id", "user_id", "id"),
+        # 활성 여부 필터 목록: WHERE user_id = ? AND is_active = ? ORDER BY id
+        Index("ix_routines_user_id_is_active_id", "user_id", "is_active", "id"),
+    )
 
     # 🆔 기본 필드
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # 📝 루틴 기본 정보
     title = Column(String(200), nullable=False)  # 루틴 이름
@@ -59,9 +76,15 @@ class Routine(Base):
     )  # 평균 완료 시간(초)
 
     # 📅 타임스탬프
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
-    last_changed_at = Column(DateTime, server_default=func.now())  # 마지막 편집 시간
+    created_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), onupdate=utcnow
+    )
+    last_changed_at = Column(
+        DateTime, default=utcnow, server_default=func.now()
+    )  # 마지막 편집 시간
 
     # 🔗 관계 설정
     user = relationship("User", back_populates="routines")
@@ -76,14 +99,45 @@ class Routine(Base):
         return f"<Routine(id={self.id}, title={self.title}, user_id={self.user_id})>"
 
 
+# 오늘 페이지 목록 (표시 루틴은 일부뿐이라 부분 인덱스)
+# WHERE user_id = ? AND today_display IS true ORDER BY id - 쿼리도 같은 식(is_(True))을 써야
+# 플래너가 인덱스 조건을 증명할 수 있음 (바인드 파라미터로는 부분 인덱스를 쓰지 못함)
+Index(
+    "ix_routines_user_id_today_display",
+    Routine.user_id,
+    Routine.id,
+    postgresql_where=Routine.today_display.is_(True),
+    sqlite_where=Routine.today_display.is_(True),
+)
+
+# 스텝 순서 유일성 제약 이름 (마이그레이션 0004와 같은 이름)
+STEP_ORDER_CONSTRAINT = "uq_steps_routine_id_order"
+
+
 class Step(Base):
     """스텝 테이블 - 각 루틴의 개별 단계들"""
 
     __tablename__ = "steps"
+    __table_args__ = (
+        # 루틴 안에서 순서 유일 + 스텝 조회 인덱스
+        # (WHERE routine_id = ? ORDER BY "order", 최대 순서 조회, 순서 범위 UPDATE)
+        # PostgreSQL: DEFERRABLE 제약 - 재정렬 UPDATE 도중의 일시적인 중복은 문장 끝에서 검사
+        # SQLite: UNIQUE에 DEFERRABLE을 쓸 수 없어 같은 이름의 유니크 인덱스 (행마다 검사)
+        UniqueConstraint(
+            "routine_id",
+            "order",
+            name=STEP_ORDER_CONSTRAINT,
+            deferrable=True,
+            initially="IMMEDIATE",
+        ).ddl_if(dialect="postgresql"),
+        Index(STEP_ORDER_CONSTRAINT, "routine_id", "order", unique=True).ddl_if(
+            dialect="sqlite"
+        ),
+    )
 
     # 🆔 기본 필드
     id = Column(Integer, primary_key=True, index=True)
-    routine_id = Column(Integer, ForeignKey("routines.id"), nullable=False, index=True)
+    routine_id = Column(Integer, ForeignKey("routines.id"), nullable=False)
 
     # 📝 스텝 정보
     order = Column(Integer, nullable=False)  # 순서 (1, 2, 3...)
@@ -105,8 +159,12 @@ class Step(Base):
     avg_time_spent = Column(Integer, default=0, nullable=False)  # 실제 평균 소요 시간
 
     # 📅 타임스탬프
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), onupdate=utcnow
+    )
 
     # 🔗 관계 설정
     routine = relationship("Routine", back_populates="steps")
@@ -0,0 +1,64 @@
+# 🧾 스텝 이벤트 모델 (추가 전용 로그)
+# 퀘스트 실행(run) 중 각 스텝의 완료/스킵 기록
+# Step/Routine의 통계 캐시 컬럼은 이 로그를 다시 스캔하지 않고 증분 갱신됨
+# (user_id, run_id, seq) 유일 - 실행마다 seq 0 행이 있으므로 같은 run_id 재전송은 INSERT 실패
+
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base, utcnow
+
+
+# 실행 멱등성 유니크 인덱스 이름 (마이그레이션 0005와 같은 이름)
+RUN_EVENT_CONSTRAINT = "uq_step_events_user_id_run_id_seq"
+
+
+class StepEventStatus(str, Enum):
+    """스텝 이벤트 상태"""
+
+    COMPLETED = "completed"  # 완료
+    SKIPPED = "skipped"  # 건너뜀
+
+
+class StepEvent(Base):
+    """스텝 이벤트 테이블 - 수정/삭제 없이 INSERT만 수행"""
+
+    __tablename__ = "step_events"
+    __table_args__ = (
+        Index("ix_step_events_routine_id_occurred_at", "routine_id", "occurred_at"),
+        Index("ix_step_events_user_id_occurred_at", "user_id", "occurred_at"),
+        Index(RUN_EVENT_CONSTRAINT, "user_id", "run_id", "seq", unique=True),
+    )
+
+    # 🆔 기본 필드
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    routine_id = Column(
+        Integer, ForeignKey("routines.id", ondelete="CASCADE"), nullable=False
+    )
+    # 스텝을 지워도 완료 기록(시즌 XP 합계의 근거)은 남기고 step_id만 비움
+    step_id = Column(
+        Integer, ForeignKey("steps.id", ondelete="SET NULL"), nullable=True
+    )
+    run_id = Column(String(64), nullable=False)  # 같은 실행에서 나온 이벤트 묶음
+    seq = Column(Integer, nullable=False)  # 실행 안의 이벤트 순번 (0부터)
+
+    # 📝 이벤트 정보
+    status = Column(String(16), nullable=False)  # completed / skipped
+    duration_sec = Column(Integer, default=0, nullable=False)  # 실제 소요 시간(초)
+    xp_awarded = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )  # 적립한 XP (스텝 xp_reward가 나중에 바뀌어도 시즌 합계가 유지됨)
+
+    # 📅 타임스탬프
+    occurred_at = Column(DateTime, nullable=False)  # 클라이언트 기준 발생 시각
+    created_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return (
+            f"<StepEvent(id={self.id}, step_id={self.step_id}, status={self.status})>"
+        )
@@ -2,12 +2,12 @@
 # PRD 데이터 모델: users(id, tier, tz, pbt_time, streak, grace_tokens, created_at)
 # 사용자 기본 정보, 구독 티어, 스트릭, 보호권 등을 관리
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Time
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Index, Time
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 
 class UserTier(str, Enum):
@@ -23,6 +23,17 @@ class User(Base):
     """사용자 테이블"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # 야간 스트릭 배치: WHERE timezone = ? AND streak_processed_date = ? (또는 IS NULL)
+        # AND id > ? ORDER BY id 청크 조회, 시간대별 min(streak_processed_date),
+        # SELECT DISTINCT timezone (인덱스만 읽음) - 이미 마감한 시간대는 사용자를 스캔하지 않음
+        Index(
+            "ix_users_timezone_streak_processed_date_id",
+            "timezone",
+            "streak_processed_date",
+            "id",
+        ),
+    )
 
     # 🆔 기본 필드
     id = Column(Integer, primary_key=True, index=True)
@@ -46,6 +57,7 @@ class User(Base):
     streak = Column(Integer, default=0, nullable=False)  # 연속일수
     grace_tokens = Column(Integer, default=1, nullable=False)  # 주간 보호권
     last_activity_date = Column(DateTime, nullable=True)  # 마지막 활동일
+    streak_processed_date = Column(Date, nullable=True)  # 스트릭 마감 처리한 현지 날짜
 
     # ⚙️ 앱 설정
     is_active = Column(Boolean, default=True, nullable=False)
@@ -58,8 +70,12 @@ class User(Base):
     total_steps_done = Column(Integer, default=0, nullable=False)
 
     # 📅 타임스탬프
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime, default=utcnow, server_default=func.now(), onupdate=utcnow
+    )
     last_login_at = Column(DateTime, nullable=True)
 
     # 🔗 관계 설정
@@ -0,0 +1,2 @@
+# 비즈니스 로직 서비스 패키지
+# 여러 엔드포인트에서 공유하는 DB 작업을 모아둠
@@ -0,0 +1,809 @@
+# 🏆 XP 리더보드 서비스
+# 전체 / 주간 시즌 / 티어별 보드를 정렬 집합(sorted set)으로 유지
+# - Redis: ZINCRBY / ZREVRANK / ZREVRANGE (모두 O(log n))
+# - 인메모리: 같은 연산을 제공하는 인덱스 스킵 리스트 (테스트/로컬 개발용)
+# XP가 바뀔 때마다 증분 갱신하고, DB에서 배치 스트리밍으로 전체 재구축 가능
+# 재구축 중 들어온 증분/티어 변경은 dirty 집합에 기록해 DB에서 다시 읽어 반영
+# 주간 시즌 보드는 주마다 새 키가 생기므로 쓸 때마다 만료를 갱신 (지난 시즌은 몇 주 뒤 삭제)
+import asyncio
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import utcnow
+from app.models.step_event import StepEvent, StepEventStatus
+from app.models.user import User, UserTier
+
+logger = logging.getLogger(__name__)
+
+REBUILD_TTL_SECONDS = 6 * 60 * 60  # 재구축 표식 수명 (작업이 죽어도 표식이 남지 않도록)
+REBUILD_SETTLE_SECONDS = 1.0  # 교체 후 늦게 도착한 증분을 기다리는 시간
+SEASON_TTL_SECONDS = 4 * 7 * 24 * 60 * 60  # 시즌 보드 수명 (마지막 갱신 후 4주)
+
+# (user_id, score) 목록
+Entries = List[Tuple[int, float]]
+
+
+# 🪜 인덱스 스킵 리스트 (Redis zset과 같은 span 기반 순위 계산)
+class _Node:
+    __slots__ = ("score", "member", "forward", "span")
+
+    def __init__(self, level: int, score: float, member: int):
+        self.score = score
+        self.member = member
+        self.forward: List[Optional["_Node"]] = [None] * level
+        self.span = [0] * level
+
+
+class SkipList:
+    """점수 내림차순(동점은 member 내림차순) 정렬, 순위 조회/범위 조회 O(log n)"""
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self):
+        self.head = _Node(self.MAX_LEVEL, float("inf"), -1)
+        self.level = 1
+        self.length = 0
+
+    @staticmethod
+    def _before(node: _Node, score: float, member: int) -> bool:
+        """node가 (score, member)보다 앞 순위인지"""
+        return node.score > score or (node.score == score and node.member > member)
+
+    def _random_level(self) -> int:
+        level = 1
+        while random.random() < self.P and level < self.MAX_LEVEL:
+            level += 1
+        return level
+
+    def insert(self, score: float, member: int) -> None:
+        update: List[_Node] = [self.head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = 0 if i == self.level - 1 else rank[i + 1]
+            while node.forward[i] and self._before(node.forward[i], score, member):
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                rank[i] = 0
+                update[i] = self.head
+                self.head.span[i] = self.length
+            self.level = level
+
+        new = _Node(level, score, member)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = (rank[0] - rank[i]) + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        self.length += 1
+
+    def delete(self, score: float, member: int) -> bool:
+        update: List[_Node] = [self.head] * self.MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] and self._before(node.forward[i], score, member):
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        if target is None or target.score != score or target.member != member:
+            return False
+        for i in range(self.level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.length -= 1
+        return True
+
+    def rank(self, score: float, member: int) -> Optional[int]:
+        """0부터 시작하는 순위"""
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] and (
+                self._before(node.forward[i], score, member)
+                or (node.forward[i].score == score and node.forward[i].member == member)
+            ):
+                traversed += node.span[i]
+                node = node.forward[i]
+            if node is not self.head and node.member == member:
+                return traversed - 1
+        return None
+
+    def range_by_rank(self, start: int, stop: int) -> Entries:
+        """start~stop 순위(0부터, 양끝 포함) 구간"""
+        start = max(start, 0)
+        if start >= self.length or stop < start:
+            return []
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] and traversed + node.span[i] <= start + 1:
+                traversed += node.span[i]
+                node = node.forward[i]
+        entries: Entries = []
+        current: Optional[_Node] = node
+        while current is not None and len(entries) < stop - start + 1:
+            entries.append((current.member, current.score))
+            current = current.forward[0]
+        return entries
+
+
+# 🔌 리더보드 백엔드
+# 재구축 표식(marker)이 있는 동안 record/move/remove는 대상 사용자를 "{marker}:dirty"에 추가
+# (보드 갱신과 dirty 기록은 한 번에 - Redis는 Lua 스크립트, 인메모리는 await 없이 처리)
+class LeaderboardBackend:
+    """정렬 집합 백엔드 인터페이스 (rank는 0부터, 점수 내림차순)"""
+
+    async def incr(self, board: str, member: int, delta: float) -> float:
+        raise NotImplementedError
+
+    async def set_many(self, board: str, entries: Entries, ttl: int = 0) -> None:
+        """점수 일괄 설정 (ttl > 0이면 보드 만료를 ttl초 뒤로 갱신)"""
+        raise NotImplementedError
+
+    async def remove_many(self, board: str, members: List[int]) -> None:
+        raise NotImplementedError
+
+    async def score(self, board: str, member: int) -> Optional[float]:
+        raise NotImplementedError
+
+    async def rank(self, board: str, member: int) -> Optional[int]:
+        raise NotImplementedError
+
+    async def range_by_rank(self, board: str, start: int, stop: int) -> Entries:
+        raise NotImplementedError
+
+    async def size(self, board: str) -> int:
+        raise NotImplementedError
+
+    async def delete(self, boards: List[str]) -> None:
+        raise NotImplementedError
+
+    async def record(
+        self,
+        boards: List[str],
+        member: int,
+        delta: float,
+        marker: str,
+        ttls: Optional[List[int]] = None,
+    ) -> None:
+        """
+        모든 보드에 delta를 더하고, 재구축 중이면 member를 dirty로 표시
+        (ttls는 boards와 같은 순서의 만료 초 - 0이면 만료 없음)
+        """
+        raise NotImplementedError
+
+    async def move(
+        self, member: int, source: str, target: str, fallback: str, marker: str
+    ) -> None:
+        """source 보드의 점수(없으면 fallback 보드 점수)로 target 보드로 이동"""
+        raise NotImplementedError
+
+    async def remove(self, boards: List[str], member: int, marker: str) -> None:
+        """모든 보드에서 member 제거 (재구축 중이면 dirty로 표시)"""
+        raise NotImplementedError
+
+    async def begin_rebuild(self, marker: str, ttl: int) -> bool:
+        """재구축 표식 설정 (이미 진행 중이면 False)"""
+        raise NotImplementedError
+
+    async def pop_dirty(self, marker: str, count: int) -> List[int]:
+        raise NotImplementedError
+
+    async def swap(self, marker: str, pairs: List[Tuple[str, str]]) -> int:
+        """
+        dirty가 비어 있으면 (board, staging) 쌍을 원자적으로 교체
+
+        1: 교체함 (표식은 유지 - 늦게 온 증분도 계속 dirty로 기록), 0: dirty 남음,
+        -1: 표식이 사라짐 (TTL 만료/중단)
+        """
+        raise NotImplementedError
+
+    async def end_rebuild(self, marker: str) -> bool:
+        """dirty가 비어 있으면 표식 제거 (남아 있으면 False)"""
+        raise NotImplementedError
+
+    async def abort_rebuild(self, marker: str, stagings: List[str]) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLeaderboardBackend(LeaderboardBackend):
+    """스킵 리스트 기반 인메모리 백엔드"""
+
+    def __init__(self):
+        self._boards: Dict[str, Tuple[SkipList, Dict[int, float]]] = {}
+        self._markers: Dict[str, float] = {}  # marker -> 만료 시각 (monotonic)
+        self._dirty: Dict[str, set] = {}
+        self._expires: Dict[str, float] = {}  # board -> 만료 시각 (monotonic)
+
+    def _board(self, board: str) -> Tuple[SkipList, Dict[int, float]]:
+        deadline = self._expires.get(board)
+        if deadline is not None and deadline <= time.monotonic():
+            del self._expires[board]
+            self._boards.pop(board, None)
+        if board not in self._boards:
+            self._boards[board] = (SkipList(), {})
+        return self._boards[board]
+
+    def _set(self, board: str, member: int, score: float) -> None:
+        skiplist, scores = self._board(board)
+        old = scores.get(member)
+        if old is not None:
+            skiplist.delete(old, member)
+        skiplist.insert(score, member)
+        scores[member] = score
+
+    def _remove(self, board: str, member: int) -> None:
+        skiplist, scores = self._board(board)
+        old = scores.pop(member, None)
+        if old is not None:
+            skiplist.delete(old, member)
+
+    def _expire(self, board: str, ttl: int) -> None:
+        if ttl > 0:
+            self._expires[board] = time.monotonic() + ttl
+
+    def _rebuilding(self, marker: str) -> bool:
+        deadline = self._markers.get(marker)
+        if deadline is not None and deadline <= time.monotonic():
+            del self._markers[marker]
+            self._dirty.pop(marker, None)
+            return False
+        return deadline is not None
+
+    def _mark(self, marker: str, member: int) -> None:
+        if self._rebuilding(marker):
+            self._dirty.setdefault(marker, set()).add(member)
+
+    async def incr(self, board: str, member: int, delta: float) -> float:
+        _, scores = self._board(board)
+        score = scores.get(member, 0.0) + delta
+        self._set(board, member, score)
+        return score
+
+    async def set_many(self, board: str, entries: Entries, ttl: int = 0) -> None:
+        for member, score in entries:
+            self._set(board, member, float(score))
+        if entries:
+            self._expire(board, ttl)
+
+    async def remove_many(self, board: str, members: List[int]) -> None:
+        for member in members:
+            self._remove(board, member)
+
+    async def score(self, board: str, member: int) -> Optional[float]:
+        return self._board(board)[1].get(member)
+
+    async def rank(self, board: str, member: int) -> Optional[int]:
+        skiplist, scores = self._board(board)
+        if member not in scores:
+            return None
+        return skiplist.rank(scores[member], member)
+
+    async def range_by_rank(self, board: str, start: int, stop: int) -> Entries:
+        return self._board(board)[0].range_by_rank(start, stop)
+
+    async def size(self, board: str) -> int:
+        return self._board(board)[0].length
+
+    async def delete(self, boards: List[str]) -> None:
+        for board in boards:
+            self._boards.pop(board, None)
+            self._expires.pop(board, None)
+
+    async def record(
+        self,
+        boards: List[str],
+        member: int,
+        delta: float,
+        marker: str,
+        ttls: Optional[List[int]] = None,
+    ) -> None:
+        for board, ttl in zip(boards, ttls or [0] * len(boards), strict=True):
+            _, scores = self._board(board)
+            self._set(board, member, scores.get(member, 0.0) + delta)
+            self._expire(board, ttl)
+        self._mark(marker, member)
+
+    async def move(
+        self, member: int, source: str, target: str, fallback: str, marker: str
+    ) -> None:
+        score = self._board(source)[1].get(member)
+        if score is None:
+            score = self._board(fallback)[1].get(member)
+        self._remove(source, member)
+        if score is not None:
+            self._set(target, member, score)
+        self._mark(marker, member)
+
+    async def remove(self, boards: List[str], member: int, marker: str) -> None:
+        for board in boards:
+            self._remove(board, member)
+        self._mark(marker, member)
+
+    async def begin_rebuild(self, marker: str, ttl: int) -> bool:
+        if self._rebuilding(marker):
+            return False
+        self._markers[marker] = time.monotonic() + ttl
+        self._dirty[marker] = set()
+        return True
+
+    async def pop_dirty(self, marker: str, count: int) -> List[int]:
+        dirty = self._dirty.get(marker, set())
+        return [dirty.pop() for _ in range(min(count, len(dirty)))]
+
+    async def swap(self, marker: str, pairs: List[Tuple[str, str]]) -> int:
+        if not self._rebuilding(marker):
+            return -1
+        if self._dirty.get(marker):
+            return 0
+        for board, staging in pairs:
+            self._boards[board] = self._boards.pop(staging, (SkipList(), {}))
+            # RENAME처럼 staging의 만료를 그대로 가져감
+            deadline = self._expires.pop(staging, None)
+            if deadline is None:
+                self._expires.pop(board, None)
+            else:
+                self._expires[board] = deadline
+        return 1
+
+    async def end_rebuild(self, marker: str) -> bool:
+        if self._dirty.get(marker):
+            return False
+        self._markers.pop(marker, None)
+        self._dirty.pop(marker, None)
+        return True
+
+    async def abort_rebuild(self, marker: str, stagings: List[str]) -> None:
+        self._markers.pop(marker, None)
+        self._dirty.pop(marker, None)
+        await self.delete(stagings)
+
+
+# KEYS: marker, dirty, 보드... / ARGV: member, delta, 보드별 만료 초... (0이면 만료 없음)
+_RECORD_LUA = """
+for i = 3, #KEYS do
+    redis.call('ZINCRBY', KEYS[i], ARGV[2], ARGV[1])
+    local ttl = tonumber(ARGV[i])
+    if ttl and ttl > 0 then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+"""
+
+# KEYS: marker, dirty, source, target, fallback / ARGV: member
+_MOVE_LUA = """
+local score = redis.call('ZSCORE', KEYS[3], ARGV[1])
+if not score then
+    score = redis.call('ZSCORE', KEYS[5], ARGV[1])
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+if score then
+    redis.call('ZADD', KEYS[4], score, ARGV[1])
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+"""
+
+# KEYS: marker, dirty, 보드... / ARGV: member
+_REMOVE_LUA = """
+for i = 3, #KEYS do
+    redis.call('ZREM', KEYS[i], ARGV[1])
+end
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+"""
+
+# KEYS: marker, dirty, board1, staging1, board2, staging2, ...
+_SWAP_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if redis.call('SCARD', KEYS[2]) > 0 then
+    return 0
+end
+for i = 3, #KEYS, 2 do
+    if redis.call('EXISTS', KEYS[i + 1]) == 1 then
+        redis.call('RENAME', KEYS[i + 1], KEYS[i])
+    else
+        redis.call('DEL', KEYS[i])
+    end
+end
+return 1
+"""
+
+# KEYS: marker, dirty
+_END_LUA = """
+if redis.call('SCARD', KEYS[2]) > 0 then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return 1
+"""
+
+
+class RedisLeaderboardBackend(LeaderboardBackend):
+    """Redis sorted set 백엔드"""
+
+    def __init__(self, url: str = "", client=None):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(url)
+        self._redis = client
+        self._record = client.register_script(_RECORD_LUA)
+        self._move = client.register_script(_MOVE_LUA)
+        self._remove = client.register_script(_REMOVE_LUA)
+        self._swap = client.register_script(_SWAP_LUA)
+        self._end = client.register_script(_END_LUA)
+
+    async def incr(self, board: str, member: int, delta: float) -> float:
+        return await self._redis.zincrby(board, delta, str(member))
+
+    async def set_many(self, board: str, entries: Entries, ttl: int = 0) -> None:
+        if not entries:
+            return
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(board, {str(m): s for m, s in entries})
+            if ttl > 0:
+                pipe.expire(board, ttl)
+            await pipe.execute()
+
+    async def remove_many(self, board: str, members: List[int]) -> None:
+        if members:
+            await self._redis.zrem(board, *map(str, members))
+
+    async def score(self, board: str, member: int) -> Optional[float]:
+        return await self._redis.zscore(board, str(member))
+
+    async def rank(self, board: str, member: int) -> Optional[int]:
+        return await self._redis.zrevrank(board, str(member))
+
+    async def range_by_rank(self, board: str, start: int, stop: int) -> Entries:
+        rows = await self._redis.zrevrange(board, max(start, 0), stop, withscores=True)
+        return [(int(member), score) for member, score in rows]
+
+    async def size(self, board: str) -> int:
+        return await self._redis.zcard(board)
+
+    async def delete(self, boards: List[str]) -> None:
+        if boards:
+            await self._redis.delete(*boards)
+
+    async def record(
+        self,
+        boards: List[str],
+        member: int,
+        delta: float,
+        marker: str,
+        ttls: Optional[List[int]] = None,
+    ) -> None:
+        await self._record(
+            keys=[marker, f"{marker}:dirty", *boards],
+            args=[str(member), delta, *(ttls or [0] * len(boards))],
+        )
+
+    async def move(
+        self, member: int, source: str, target: str, fallback: str, marker: str
+    ) -> None:
+        await self._move(
+            keys=[marker, f"{marker}:dirty", source, target, fallback],
+            args=[str(member)],
+        )
+
+    async def remove(self, boards: List[str], member: int, marker: str) -> None:
+        await self._remove(
+            keys=[marker, f"{marker}:dirty", *boards], args=[str(member)]
+        )
+
+    async def begin_rebuild(self, marker: str, ttl: int) -> bool:
+        started = await self._redis.set(marker, b"1", nx=True, ex=ttl)
+        if started:
+            await self._redis.delete(f"{marker}:dirty")
+        return bool(started)
+
+    async def pop_dirty(self, marker: str, count: int) -> List[int]:
+        members = await self._redis.spop(f"{marker}:dirty", count)
+        return [int(member) for member in members or []]
+
+    async def swap(self, marker: str, pairs: List[Tuple[str, str]]) -> int:
+        keys = [marker, f"{marker}:dirty"]
+        for board, staging in pairs:
+            keys += [board, staging]
+        return int(await self._swap(keys=keys))
+
+    async def end_rebuild(self, marker: str) -> bool:
+        return bool(await self._end(keys=[marker, f"{marker}:dirty"]))
+
+    async def abort_rebuild(self, marker: str, stagings: List[str]) -> None:
+        await self._redis.delete(marker, f"{marker}:dirty", *stagings)
+
+
+# 🏆 리더보드 서비스
+def season_key(day: date) -> str:
+    """ISO 주차 기반 주간 시즌 키 (예: 2025-W02)"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class Leaderboard:
+    """전체 / 주간 시즌 / 티어별 XP 보드"""
+
+    def __init__(self, backend: LeaderboardBackend, prefix: str = "rq:lb"):
+        self.backend = backend
+        self.prefix = prefix
+
+    def global_board(self) -> str:
+        return f"{self.prefix}:global"
+
+    def season_board(self, day: Optional[date] = None) -> str:
+        """주간 시즌 보드 (기본은 UTC 오늘 - _season_query의 UTC 주 시작과 같은 기준)"""
+        return f"{self.prefix}:season:{season_key(day or utcnow().date())}"
+
+    def board_ttl(self, board: str) -> int:
+        """보드 만료 초 (시즌 보드와 그 staging만 만료, 나머지는 0)"""
+        return SEASON_TTL_SECONDS if board.startswith(f"{self.prefix}:season:") else 0
+
+    def tier_board(self, tier: str) -> str:
+        return f"{self.prefix}:tier:{tier}"
+
+    def boards_for(self, tier: str) -> List[str]:
+        return [self.global_board(), self.season_board(), self.tier_board(tier)]
+
+    def rebuild_marker(self) -> str:
+        return f"{self.prefix}:rebuilding"
+
+    async def record_xp(self, user_id: int, tier: str, delta: int) -> None:
+        """XP 변화를 모든 보드에 증분 반영"""
+        if not delta:
+            return
+        try:
+            boards = self.boards_for(tier)
+            await self.backend.record(
+                boards,
+                user_id,
+                delta,
+                self.rebuild_marker(),
+                [self.board_ttl(board) for board in boards],
+            )
+        except Exception as exc:  # 리더보드 장애가 XP 적립 요청을 실패시키지 않도록
+            logger.warning("리더보드 갱신 실패 (user_id=%s): %s", user_id, exc)
+
+    async def move_tier(self, user_id: int, old_tier: str, new_tier: str) -> None:
+        """티어 변경: 이전 티어 보드에서 새 티어 보드로 점수째 이동"""
+        if old_tier == new_tier:
+            return
+        try:
+            await self.backend.move(
+                user_id,
+                self.tier_board(old_tier),
+                self.tier_board(new_tier),
+                self.global_board(),
+                self.rebuild_marker(),
+            )
+        except Exception as exc:
+            logger.warning("리더보드 티어 이동 실패 (user_id=%s): %s", user_id, exc)
+
+    async def remove_user(self, user_id: int, tier: str) -> None:
+        """비활성화된 사용자를 모든 보드에서 제거"""
+        try:
+            await self.backend.remove(
+                self.boards_for(tier), user_id, self.rebuild_marker()
+            )
+        except Exception as exc:
+            logger.warning("리더보드 사용자 제거 실패 (user_id=%s): %s", user_id, exc)
+
+    async def my_rank(self, board: str, user_id: int) -> Optional[Dict]:
+        """내 순위(1부터)와 점수"""
+        rank = await self.backend.rank(board, user_id)
+        if rank is None:
+            return None
+        score = await self.backend.score(board, user_id)
+        return {"user_id": user_id, "rank": rank + 1, "xp": int(score or 0)}
+
+    async def top(self, board: str, limit: int) -> List[Dict]:
+        """상위 limit명"""
+        entries = await self.backend.range_by_rank(board, 0, limit - 1)
+        return _ranked(entries, 0)
+
+    async def around(self, board: str, user_id: int, radius: int) -> List[Dict]:
+        """내 위아래 radius명"""
+        rank = await self.backend.rank(board, user_id)
+        if rank is None:
+            return []
+        start = max(rank - radius, 0)
+        entries = await self.backend.range_by_rank(board, start, rank + radius)
+        return _ranked(entries, start)
+
+    async def rebuild_from_db(
+        self,
+        db: AsyncSession,
+        batch_size: int = 5000,
+        settle_seconds: float = REBUILD_SETTLE_SECONDS,
+    ) -> int:
+        """
+        DB에서 전체/티어/이번 주 시즌 보드 재구축
+
+        사용자를 id 키셋 배치로 스트리밍해 staging 보드에 쓰고 마지막에 교체하므로
+        재구축 중에도 기존 보드가 계속 서비스됨. 그 사이 record_xp/move_tier/remove_user가
+        건드린 사용자는 dirty로 기록되고, DB에서 다시 읽어 staging에 반영한 뒤
+        dirty가 빈 순간에만 교체함. 교체 직후 settle_seconds 동안 도착한 늦은 증분도
+        같은 방식으로 라이브 보드에 절대값으로 덮어씀
+        """
+        today = utcnow().date()
+        live = {
+            "global": self.global_board(),
+            "season": self.season_board(today),
+            **{tier.value: self.tier_board(tier.value) for tier in UserTier},
+        }
+        staging = {name: f"{board}:rebuild" for name, board in live.items()}
+        marker = self.rebuild_marker()
+        if not await self.backend.begin_rebuild(marker, REBUILD_TTL_SECONDS):
+            raise RuntimeError("리더보드 재구축이 이미 진행 중입니다")
+
+        try:
+            await self.backend.delete(list(staging.values()))
+            total = await self._stage_users(db, staging, batch_size)
+            await self._stage_season(db, staging, today, batch_size)
+            while True:
+                await self._refresh_dirty(db, staging, today, batch_size)
+                swapped = await self.backend.swap(
+                    marker, [(live[name], staging[name]) for name in live]
+                )
+                if swapped < 0:
+                    raise RuntimeError("리더보드 재구축 표식이 만료되었습니다")
+                if swapped:
+                    break
+            await asyncio.sleep(settle_seconds)
+            while True:
+                await self._refresh_dirty(db, live, today, batch_size)
+                if await self.backend.end_rebuild(marker):
+                    break
+        except BaseException:
+            await self.backend.abort_rebuild(marker, list(staging.values()))
+            raise
+        return total
+
+    async def _stage_users(
+        self, db: AsyncSession, boards: Dict[str, str], batch_size: int
+    ) -> int:
+        total = 0
+        last_id = 0
+        while True:
+            rows = (
+                await db.execute(
+                    select(User.id, User.tier, User.total_xp)
+                    .filter(User.id > last_id, User.is_active.is_(True))
+                    .order_by(User.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                return total
+            last_id = rows[-1].id
+            total += len(rows)
+            await self.backend.set_many(
+                boards["global"], [(r.id, r.total_xp) for r in rows]
+            )
+            by_tier: Dict[str, Entries] = {}
+            for r in rows:
+                by_tier.setdefault(r.tier, []).append((r.id, r.total_xp))
+            for tier, entries in by_tier.items():
+                if tier in boards:  # UserTier 밖의 값은 티어 보드 없음
+                    await self.backend.set_many(boards[tier], entries)
+
+    async def _stage_season(
+        self, db: AsyncSession, boards: Dict[str, str], today: date, batch_size: int
+    ) -> None:
+        """이번 주 시즌: 주 시작 이후 완료 이벤트가 실제로 적립한 XP 합계"""
+        season_rows = await db.stream(
+            _season_query(today).execution_options(yield_per=batch_size)
+        )
+        async for partition in season_rows.partitions():
+            await self.backend.set_many(
+                boards["season"],
+                [(r[0], r[1]) for r in partition],
+                self.board_ttl(boards["season"]),
+            )
+
+    async def _refresh_dirty(
+        self, db: AsyncSession, boards: Dict[str, str], today: date, batch_size: int
+    ) -> None:
+        """dirty 사용자를 DB 현재값으로 다시 읽어 boards에 절대값으로 반영"""
+        marker = self.rebuild_marker()
+        while ids := await self.backend.pop_dirty(marker, batch_size):
+            await db.commit()  # 이전 트랜잭션 스냅샷이 아닌 최신 커밋을 읽도록
+            users = (
+                await db.execute(
+                    select(User.id, User.tier, User.total_xp).filter(
+                        User.id.in_(ids), User.is_active.is_(True)
+                    )
+                )
+            ).all()
+            season = (
+                await db.execute(
+                    _season_query(today).filter(StepEvent.user_id.in_(ids))
+                )
+            ).all()
+            for board in boards.values():
+                await self.backend.remove_many(board, ids)
+            await self.backend.set_many(
+                boards["global"], [(r.id, r.total_xp) for r in users]
+            )
+            for r in users:
+                if r.tier in boards:
+                    await self.backend.set_many(boards[r.tier], [(r.id, r.total_xp)])
+            await self.backend.set_many(
+                boards["season"],
+                [(r[0], r[1]) for r in season],
+                self.board_ttl(boards["season"]),
+            )
+
+
+def _season_query(today: date):
+    """today(UTC 날짜)가 속한 주의 월요일 00:00 UTC 이후 완료 이벤트의 적립 XP 합계"""
+    week_start = datetime.combine(
+        today - timedelta(days=today.weekday()), datetime.min.time()
+    )
+    return (
+        select(StepEvent.user_id, func.sum(StepEvent.xp_awarded))
+        .join(User, User.id == StepEvent.user_id)
+        .filter(
+            StepEvent.status == StepEventStatus.COMPLETED.value,
+            StepEvent.occurred_at >= week_start,
+            User.is_active.is_(True),
+        )
+        .group_by(StepEvent.user_id)
+    )
+
+
+def _ranked(entries: Iterable[Tuple[int, float]], start: int) -> List[Dict]:
+    return [
+        {"user_id": member, "rank": start + offset + 1, "xp": int(score)}
+        for offset, (member, score) in enumerate(entries)
+    ]
+
+
+def create_leaderboard_backend(kind: str) -> LeaderboardBackend:
+    """설정값으로 리더보드 백엔드 생성"""
+    if kind == "redis":
+        return RedisLeaderboardBackend(settings.REDIS_URL)
+    return InMemoryLeaderboardBackend()
+
+
+_leaderboard: Optional[Leaderboard] = None
+
+
+def get_leaderboard() -> Leaderboard:
+    """리더보드 의존성 (테스트에서는 dependency_overrides로 교체)"""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard(
+            create_leaderboard_backend(settings.LEADERBOARD_BACKEND)
+        )
+    return _leaderboard
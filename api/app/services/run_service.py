@@ -0,0 +1,170 @@
+# 🏃 퀘스트 실행(run) 기록 서비스
+# 스텝 이벤트를 추가 전용 테이블에 한 번에 INSERT하고,
+# Step/Routine 통계 캐시 컬럼을 이력 재스캔 없이 이동 평균으로 증분 갱신
+#
+# 실행 1건의 쓰기 비용: 이벤트 다중행 INSERT 1회 + 스텝/루틴/사용자 UPDATE 각 1회
+# 잠금은 해당 루틴/스텝 행에만 걸리므로 아침 피크에 사용자 간 경합이 없음
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import case, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import utcnow
+
+from app.models.routine import Routine, Step
+from app.models.step_event import StepEvent, StepEventStatus
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """실행 중 스텝 1개의 결과"""
+
+    step_id: int
+    status: StepEventStatus
+    duration_sec: int
+    xp_awarded: int = 0  # 이 실행에서 적립한 XP (완료한 스텝의 그 시점 xp_reward)
+
+
+def _per_step(values: Dict[int, int]):
+    """스텝 id별 값 CASE 식 (해당 없는 스텝은 0)"""
+    if not values:
+        return literal(0)
+    return case(values, value=Step.id, else_=0)
+
+
+async def insert_step_events(
+    db: AsyncSession,
+    user_id: int,
+    routine_id: int,
+    run_id: str,
+    occurred_at: datetime,
+    results: List[StepResult],
+) -> None:
+    """
+    실행의 모든 스텝 이벤트를 다중행 INSERT 1회로 저장
+
+    같은 사용자의 같은 run_id가 이미 있으면 (user_id, run_id, seq) 유일 인덱스 위반
+    → IntegrityError (호출 측에서 롤백 후 run_recorded로 중복 여부 확인)
+    """
+    await db.execute(
+        insert(StepEvent),
+        [
+            {
+                "user_id": user_id,
+                "routine_id": routine_id,
+                "step_id": result.step_id,
+                "run_id": run_id,
+                "seq": seq,
+                "status": result.status.value,
+                "duration_sec": result.duration_sec,
+                "xp_awarded": result.xp_awarded,
+                "occurred_at": occurred_at,
+            }
+            for seq, result in enumerate(results)
+        ],
+    )
+
+
+async def run_recorded(db: AsyncSession, user_id: int, run_id: str) -> bool:
+    """사용자의 run_id 실행이 이미 저장되어 있는지 (유일 인덱스 조회 1회)"""
+    result = await db.execute(
+        select(StepEvent.id).filter(
+            StepEvent.user_id == user_id,
+            StepEvent.run_id == run_id,
+            StepEvent.seq == 0,
+        )
+    )
+    return result.first() is not None
+
+
+async def apply_step_aggregates(
+    db: AsyncSession, routine_id: int, results: List[StepResult]
+) -> None:
+    """
+    스텝 통계 증분 갱신 (UPDATE 1회)
+
+    avg' = (avg * n + 이번 소요 시간) / (n + 1)  ← 완료된 스텝만
+    SET 절의 모든 식은 갱신 전 값을 참조하므로 한 문장에서 안전하게 계산됨
+    """
+    completed = {r.step_id: 1 for r in results if r.status == StepEventStatus.COMPLETED}
+    skipped = {r.step_id: 1 for r in results if r.status == StepEventStatus.SKIPPED}
+    durations = {
+        r.step_id: r.duration_sec
+        for r in results
+        if r.status == StepEventStatus.COMPLETED
+    }
+
+    completed_delta = _per_step(completed)
+    new_count = Step.completion_count + completed_delta
+    await db.execute(
+        update(Step)
+        .filter(
+            Step.routine_id == routine_id,
+            Step.id.in_([r.step_id for r in results]),
+        )
+        .values(
+            completion_count=new_count,
+            skip_count=Step.skip_count + _per_step(skipped),
+            avg_time_spent=case(
+                (
+                    completed_delta > 0,
+                    (Step.avg_time_spent * Step.completion_count + _per_step(durations))
+                    / new_count,
+                ),
+                else_=Step.avg_time_spent,
+            ),
+            updated_at=utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_routine_aggregates(
+    db: AsyncSession, routine_id: int, success: bool, duration_sec: int
+) -> None:
+    """
+    루틴 통계 증분 갱신 (UPDATE 1회)
+
+    - total_completions: 기록된 실행 수
+    - success_rate: 필수 스텝을 모두 완료한 실행 비율(0-100)의 이동 평균
+    - avg_completion_time: 실행 총 소요 시간의 이동 평균
+    """
+    runs = Routine.total_completions
+    await db.execute(
+        update(Routine)
+        .filter(Routine.id == routine_id)
+        .values(
+            total_completions=runs + 1,
+            success_rate=(Routine.success_rate * runs + (100 if success else 0))
+            / (runs + 1),
+            avg_completion_time=(Routine.avg_completion_time * runs + duration_sec)
+            / (runs + 1),
+            updated_at=utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_user_progress(
+    db: AsyncSession, user_id: int, xp: int, steps_done: int, success: bool
+) -> None:
+    """
+    사용자 누적 진행도 갱신 (UPDATE 1회)
+
+    - total_xp / total_steps_done / completed_chains 증분
+    - 마지막 활동 시각 (UTC, 야간 스트릭 배치의 입력)
+    """
+    await db.execute(
+        update(User)
+        .filter(User.id == user_id)
+        .values(
+            total_xp=User.total_xp + xp,
+            total_steps_done=User.total_steps_done + steps_done,
+            completed_chains=User.completed_chains + (1 if success else 0),
+            last_activity_date=utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
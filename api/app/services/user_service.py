@@ -0,0 +1,49 @@
+# 👤 사용자 계정 상태 변경 서비스
+# 티어 변경/비활성화는 모두 여기를 거침 - DB 커밋 후
+# 1) principal 캐시 무효화 (모든 워커, app.core.security.invalidate_principal)
+# 2) 리더보드 티어 보드 이동 / 전체 보드에서 제거
+# 결제 웹훅, 관리자 작업, 계정 삭제 요청이 같은 경로를 사용
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import invalidate_principal
+from app.models.user import User, UserTier
+from app.services.leaderboard import Leaderboard
+
+
+async def _lock_user(db: AsyncSession, user_id: int) -> User:
+    user = (
+        await db.execute(select(User).filter(User.id == user_id).with_for_update())
+    ).scalar_one_or_none()
+    if user is None:
+        raise LookupError(f"사용자를 찾을 수 없습니다: {user_id}")
+    return user
+
+
+async def set_user_tier(
+    db: AsyncSession, leaderboard: Leaderboard, user_id: int, tier: UserTier
+) -> User:
+    """구독 티어 변경 (같은 티어면 아무것도 하지 않음)"""
+    user = await _lock_user(db, user_id)
+    old_tier = user.tier
+    if old_tier == tier.value:
+        await db.rollback()
+        return user
+    user.tier = tier.value
+    await db.commit()
+    await invalidate_principal(user_id)
+    if user.is_active:
+        await leaderboard.move_tier(user_id, old_tier, tier.value)
+    return user
+
+
+async def deactivate_user(
+    db: AsyncSession, leaderboard: Leaderboard, user_id: int
+) -> User:
+    """계정 비활성화 (이후 토큰은 401, 리더보드에서 제외)"""
+    user = await _lock_user(db, user_id)
+    user.is_active = False
+    await db.commit()
+    await invalidate_principal(user_id)
+    await leaderboard.remove_user(user_id, user.tier)
+    return user
@@ -0,0 +1,2 @@
+# 📈 API 성능 벤치마크 패키지
+# api/ 디렉토리에서 `python -m benchmarks.<이름>` 형태로 실행
@@ -0,0 +1,56 @@
+# ⏱️ 비동기 DB 경로 부하 벤치마크
+# 동시성을 늘려가며 루틴 목록/상세 조회의 p50/p95/p99 지연시간을 측정
+# 이벤트 루프가 DB I/O로 막히지 않으면 동시성이 늘어도 p99가 평평하게 유지되어야 함
+#
+# 실행: cd api && python -m benchmarks.bench_async_load [--db-url URL]
+import argparse
+import asyncio
+import json
+
+from benchmarks.common import (
+    build_app,
+    configure_env,
+    make_client,
+    prepare_database,
+    run_load,
+    seed_routines,
+    temp_sqlite_url,
+)
+
+
+async def main(db_url: str, levels, requests_per_level: int) -> None:
+    engine, session_factory = await prepare_database(db_url)
+    routine_ids = await seed_routines(session_factory, routines_per_user=30, steps=8)
+    app = build_app(session_factory)
+
+    results = []
+    async with make_client(app) as client:
+
+        async def hit(i: int):
+            if i % 2:
+                return await client.get("/api/v1/routines/")
+            routine_id = routine_ids[i % len(routine_ids)]
+            return await client.get(f"/api/v1/routines/{routine_id}")
+
+        await run_load(hit, 4, 50)  # 워밍업
+        for level in levels:
+            results.append(await run_load(hit, level, requests_per_level))
+
+    await engine.dispose()
+    print(json.dumps({"benchmark": "async_load", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    configure_env()
+    parser = argparse.ArgumentParser(description="비동기 DB 경로 부하 벤치마크")
+    parser.add_argument("--db-url", default=None, help="비동기 DB URL (기본: 임시 SQLite)")
+    parser.add_argument("--levels", default="1,8,32,64", help="동시성 단계")
+    parser.add_argument("--requests", type=int, default=500, help="단계별 요청 수")
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.db_url or temp_sqlite_url(),
+            [int(x) for x in args.levels.split(",")],
+            args.requests,
+        )
+    )
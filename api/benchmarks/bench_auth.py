@@ -0,0 +1,73 @@
+# 🔐 인증 의존성 오버헤드 마이크로벤치마크
+# 요청당 인증 비용을 경로별로 측정
+# - table_scan: 기존 방식 (매 요청 SELECT users LIMIT 1)
+# - jwt_cache_miss: 토큰 검증 + DB 조회 (TTL 창의 첫 요청)
+# - jwt_cache_hit: 토큰 검증 + principal 캐시 hit (DB 조회 없음)
+#
+# 실행: cd api && python -m benchmarks.bench_auth [--iterations 5000]
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+
+from benchmarks.common import (
+    configure_env,
+    prepare_database,
+    seed_routines,
+    temp_sqlite_url,
+)
+
+
+async def time_per_call(call, iterations: int) -> float:
+    """호출 1회당 평균 소요 시간(µs)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    return round((time.perf_counter() - start) / iterations * 1_000_000, 2)
+
+
+async def main(iterations: int) -> None:
+    from app.api.deps import get_current_user
+    from app.core.security import create_access_token, principal_cache
+    from app.models import User
+
+    engine, session_factory = await prepare_database(temp_sqlite_url())
+    await seed_routines(session_factory, users=100, routines_per_user=1, steps=1)
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token(42)
+    )
+
+    async with session_factory() as db:
+
+        async def table_scan():
+            (await db.execute(select(User).limit(1))).scalar_one_or_none()
+
+        async def cache_miss():
+            principal_cache.delete("principal:42")
+            await get_current_user(credentials, db)
+
+        async def cache_hit():
+            await get_current_user(credentials, db)
+
+        await cache_hit()  # 워밍업
+        results = {
+            "table_scan_us": await time_per_call(table_scan, iterations),
+            "jwt_cache_miss_us": await time_per_call(cache_miss, iterations),
+            "jwt_cache_hit_us": await time_per_call(cache_hit, iterations),
+        }
+
+    await engine.dispose()
+    print(
+        json.dumps({"benchmark": "auth", "iterations": iterations, **results}, indent=2)
+    )
+
+
+if __name__ == "__main__":
+    configure_env()
+    parser = argparse.ArgumentParser(description="인증 의존성 오버헤드 측정")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,95 @@
+# 🏆 리더보드 순위 조회 벤치마크
+# 같은 사용자 집합에서 "내 순위"를 두 방식으로 비교
+# - sql: SELECT count(*) FROM users WHERE total_xp > :xp (요청마다 users 스캔)
+# - skiplist: 인메모리 정렬 집합 rank (O(log n), Redis ZREVRANK와 같은 구조)
+#
+# 실행: cd api && python -m benchmarks.bench_leaderboard [--users 200000] [--queries 2000]
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import configure_env, percentiles
+
+
+def bench_sql(users: list, queries: list) -> dict:
+    from sqlalchemy import create_engine, func, insert, select
+
+    from app.models import Base, User
+
+    fd, path = tempfile.mkstemp(prefix="rq_lb_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"email": f"u{uid}@routinequest.com", "total_xp": xp}
+                for uid, xp in users
+            ],
+        )
+
+    xp_by_user = dict(users)
+    samples = []
+    with engine.connect() as conn:
+        for uid in queries:
+            start = time.perf_counter()
+            conn.execute(
+                select(func.count())
+                .select_from(User)
+                .filter(User.total_xp > xp_by_user[uid])
+            ).scalar_one()
+            samples.append(time.perf_counter() - start)
+    engine.dispose()
+    os.unlink(path)
+    return {"mode": "sql", **percentiles(samples)}
+
+
+async def bench_skiplist(users: list, queries: list) -> dict:
+    from app.services.leaderboard import InMemoryLeaderboardBackend, Leaderboard
+
+    leaderboard = Leaderboard(InMemoryLeaderboardBackend())
+    board = leaderboard.global_board()
+    start = time.perf_counter()
+    await leaderboard.backend.set_many(board, users)
+    load_seconds = time.perf_counter() - start
+
+    samples = []
+    for uid in queries:
+        start = time.perf_counter()
+        await leaderboard.my_rank(board, uid)
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for uid in queries:
+        await leaderboard.record_xp(uid, "free", 10)
+    incr_seconds = time.perf_counter() - start
+    return {
+        "mode": "skiplist",
+        "load_seconds": round(load_seconds, 3),
+        "incr_per_sec": round(len(queries) * 3 / incr_seconds),
+        **percentiles(samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="리더보드 순위 조회 벤치마크")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    configure_env()
+    rng = random.Random(7)
+    users = [(uid, rng.randrange(0, 100_000)) for uid in range(1, args.users + 1)]
+    queries = [rng.randrange(1, args.users + 1) for _ in range(args.queries)]
+
+    results = [bench_sql(users, queries), asyncio.run(bench_skiplist(users, queries))]
+    print(json.dumps({"users": args.users, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# 🧱 미들웨어 오버헤드 벤치마크: BaseHTTPMiddleware charset 훅 vs 순수 ASGI MetricsMiddleware
+# 같은 최소 앱(JSON 엔드포인트 + 스트리밍 엔드포인트)에 미들웨어만 바꿔 ASGI 앱을 직접 호출
+# (HTTP 클라이언트 비용 없이 미들웨어 비용만 비교)
+# - none: 미들웨어 없음 (하한)
+# - base_http: 기존 @app.middleware("http") add_charset_header
+# - asgi: MetricsMiddleware (charset 보정 + 지연시간/크기/쿼리 수 지표 기록)
+# 스트리밍은 첫 청크 뒤 delay만큼 쉬는 응답의 첫 바이트 시간(TTFB)과 전체 시간을 측정
+#
+# 실행: cd api && python -m benchmarks.bench_middleware [--requests 20000]
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_env, percentiles
+
+
+def build_variant(name: str, stream_delay: float):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    from app.core.middleware import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id, "title": "물 한 잔 마시기", "done": False}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"first\n"
+            await asyncio.sleep(stream_delay)
+            yield b"second\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    if name == "base_http":
+
+        @app.middleware("http")
+        async def add_charset_header(request: Request, call_next):
+            response = await call_next(request)
+            if response.headers.get("content-type", "").startswith("application/json"):
+                response.headers["content-type"] = "application/json; charset=utf-8"
+            return response
+
+    elif name == "asgi":
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app, path: str) -> dict:
+    """ASGI 앱에 GET 1회 → 상태/헤더/첫 본문/완료 시각"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    disconnected = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    result = {"started": time.perf_counter(), "first_body": None}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = dict(message["headers"])
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if result["first_body"] is None:
+                result["first_body"] = time.perf_counter()
+
+    await app(scope, receive, send)
+    result["finished"] = time.perf_counter()
+    disconnected.set()
+    return result
+
+
+async def measure_json(app, requests: int, concurrency: int) -> dict:
+    latencies = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            result = await call(app, f"/items/{i}")
+            assert result["status"] == 200
+            latencies.append(result["finished"] - result["started"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "mean_us": round(sum(latencies) / len(latencies) * 1e6, 1),
+        **percentiles(latencies),
+    }
+
+
+async def measure_stream(app, repeat: int) -> dict:
+    ttfb, total = [], []
+    for _ in range(repeat):
+        result = await call(app, "/stream")
+        ttfb.append(result["first_body"] - result["started"])
+        total.append(result["finished"] - result["started"])
+    return {
+        "ttfb_p50_ms": percentiles(ttfb)["p50_ms"],
+        "total_p50_ms": percentiles(total)["p50_ms"],
+    }
+
+
+async def main(args) -> None:
+    report = {}
+    for name in ("none", "base_http", "asgi"):
+        app = build_variant(name, args.stream_delay)
+        # 워밍업 (라우트/검증기 준비, 지표 라벨 생성)
+        await measure_json(app, 500, 1)
+        content_type = (await call(app, "/items/1"))["headers"][b"content-type"]
+        report[name] = {
+            "content_type": content_type.decode(),
+            "sequential": await measure_json(app, args.requests, 1),
+            "concurrent": await measure_json(app, args.requests, args.concurrency),
+            "stream": await measure_stream(app, 20),
+        }
+
+    baseline = report["none"]["sequential"]["mean_us"]
+    for name in ("base_http", "asgi"):
+        report[name]["overhead_us_per_request"] = round(
+            report[name]["sequential"]["mean_us"] - baseline, 1
+        )
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="미들웨어 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--stream-delay", type=float, default=0.2)
+    args = parser.parse_args()
+    configure_env()
+    asyncio.run(main(args))
@@ -0,0 +1,82 @@
+# 📑 offset vs 키셋(커서) 페이지네이션 깊은 페이지 지연시간 비교
+# 한 사용자에게 루틴 1M개를 만들고, 같은 깊이의 페이지를 두 방식으로 조회
+#
+# 실행: cd api && python -m benchmarks.bench_pagination [--rows 1000000]
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.pagination import encode_cursor
+from benchmarks.common import (
+    build_app,
+    bulk_insert_routines,
+    configure_env,
+    make_client,
+    percentiles,
+    prepare_database,
+    temp_sqlite_url,
+)
+
+
+async def timed_get(client, url: str, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return percentiles(samples)
+
+
+async def main(db_url: str, rows: int, page_size: int, repeat: int) -> None:
+    engine, session_factory = await prepare_database(db_url)
+    seed_start = time.perf_counter()
+    await bulk_insert_routines(session_factory, rows)
+    seed_seconds = round(time.perf_counter() - seed_start, 1)
+    app = build_app(session_factory)
+
+    base = f"/api/v1/routines/?include_steps=false&limit={page_size}"
+    results = []
+    async with make_client(app) as client:
+        for depth in (0.0, 0.5, 0.99):
+            skip = int(rows * depth)
+            # id는 1부터 연속이므로 skip번째 행 직전 id가 같은 페이지의 커서
+            offset_stats = await timed_get(client, f"{base}&skip={skip}", repeat)
+            cursor = encode_cursor(skip)
+            keyset_stats = await timed_get(client, f"{base}&cursor={cursor}", repeat)
+            results.append(
+                {
+                    "depth": depth,
+                    "skip": skip,
+                    "offset": offset_stats,
+                    "keyset": keyset_stats,
+                }
+            )
+
+    await engine.dispose()
+    print(
+        json.dumps(
+            {
+                "benchmark": "pagination",
+                "rows": rows,
+                "page_size": page_size,
+                "seed_seconds": seed_seconds,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    configure_env()
+    parser = argparse.ArgumentParser(description="offset vs 키셋 페이지네이션 비교")
+    parser.add_argument("--db-url", default=None, help="비동기 DB URL (기본: 임시 SQLite)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="루틴 행 수")
+    parser.add_argument("--page-size", type=int, default=50, help="페이지 크기")
+    parser.add_argument("--repeat", type=int, default=20, help="깊이별 반복 횟수")
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.db_url or temp_sqlite_url(), args.rows, args.page_size, args.repeat)
+    )
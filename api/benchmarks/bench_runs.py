@@ -0,0 +1,76 @@
+# 🌅 실행 기록(POST /routines/{id}/runs) 아침 피크 부하 벤치마크
+# 여러 사용자가 같은 시간대에 동시에 루틴을 끝내는 상황을 재현
+# SQLite는 writer가 하나라 꼬리 지연이 크므로 실제 수치는 --db-url로 Postgres에서 측정
+#
+# 실행: cd api && python -m benchmarks.bench_runs [--users 200 --concurrency 16]
+import argparse
+import asyncio
+import json
+import random
+
+from benchmarks.common import (
+    auth_headers,
+    build_app,
+    configure_env,
+    make_client,
+    prepare_database,
+    run_load,
+    seed_routines,
+    temp_sqlite_url,
+)
+
+STEPS_PER_ROUTINE = 6
+
+
+async def main(db_url: str, users: int, concurrency: int, total: int) -> None:
+    engine, session_factory = await prepare_database(db_url)
+    routine_ids = await seed_routines(
+        session_factory, users=users, routines_per_user=1, steps=STEPS_PER_ROUTINE
+    )
+    app = build_app(session_factory)
+    # seed_routines는 사용자/루틴/스텝 id를 순서대로 만듦 → 사용자 i의 루틴은 routine_ids[i]
+    headers = [auth_headers(user_id) for user_id in range(1, users + 1)]
+
+    async with make_client(app) as client:
+
+        async def post_run(i: int):
+            user_index = i % users
+            routine_id = routine_ids[user_index]
+            first_step = (routine_id - 1) * STEPS_PER_ROUTINE + 1
+            steps = [
+                {
+                    "step_id": first_step + offset,
+                    "status": "completed" if random.random() > 0.1 else "skipped",
+                    "duration_sec": random.randint(20, 300),
+                }
+                for offset in range(STEPS_PER_ROUTINE)
+            ]
+            response = await client.post(
+                f"/api/v1/routines/{routine_id}/runs",
+                json={"steps": steps},
+                headers=headers[user_index],
+            )
+            response.raise_for_status()
+
+        result = await run_load(post_run, concurrency, total)
+
+    await engine.dispose()
+    print(json.dumps({"benchmark": "runs", "users": users, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    configure_env()
+    parser = argparse.ArgumentParser(description="실행 기록 쓰기 경로 부하 측정")
+    parser.add_argument("--db-url", default=None, help="비동기 DB URL (기본: 임시 SQLite)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.db_url or temp_sqlite_url(),
+            args.users,
+            args.concurrency,
+            args.requests,
+        )
+    )
@@ -0,0 +1,123 @@
+# 🔥 응답 직렬화 CPU 프로파일 비교: ORM → pydantic → json.dumps vs 행 튜플 → dict → orjson
+# 캐시 없는 앱에서 같은 요청을 RESPONSE_FAST_PATH 끔/켬으로 반복하며 cProfile로 CPU 시간 측정
+# - cpu_ms_per_request: 프로파일러 없이 잰 요청당 프로세스 CPU 시간 (time.process_time)
+# - top: 프로파일러로 잰 tottime 상위 함수 (어디서 시간을 쓰는지)
+# - --profile-dir를 주면 모드별 .prof 파일 저장 (snakeviz 등으로 확인)
+#
+# 실행: cd api && python -m benchmarks.bench_serialization [--routines 100] [--requests 300]
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import time
+
+from benchmarks.common import (
+    auth_headers,
+    build_app,
+    configure_env,
+    make_client,
+    prepare_database,
+    run_load,
+    seed_routines,
+    temp_sqlite_url,
+)
+
+SCENARIOS = {
+    "list_with_steps": "/api/v1/routines/?limit=100",
+    "list_without_steps": "/api/v1/routines/?limit=100&include_steps=false",
+    "detail": "/api/v1/routines/{routine_id}",
+}
+
+
+def top_functions(profile: cProfile.Profile, requests: int, limit: int) -> list:
+    """tottime 상위 함수 → [{함수, 요청당 µs}] (이벤트 루프 대기 poll은 CPU가 아니므로 제외)"""
+    stats = pstats.Stats(profile)
+    rows = sorted(
+        (item for item in stats.stats.items() if "poll" not in item[0][2]),
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "tottime_us_per_request": round(tottime / requests * 1e6, 1),
+        }
+        for (filename, line, name), (_, _, tottime, _, _) in rows[:limit]
+    ]
+
+
+async def measure(client, url: str, args) -> dict:
+    async def request(_):
+        response = await client.get(url)
+        assert response.status_code == 200, response.text
+
+    # 워밍업
+    await run_load(request, 1, 20)
+
+    started = time.process_time()
+    load = await run_load(request, 1, args.requests)
+    cpu = time.process_time() - started
+
+    profile = cProfile.Profile()
+    profile.enable()
+    await run_load(request, 1, args.requests)
+    profile.disable()
+    return {
+        "cpu_ms_per_request": round(cpu / args.requests * 1000, 3),
+        "rps": load["rps"],
+        "p50_ms": load["p50_ms"],
+        "top": top_functions(profile, args.requests, args.top),
+        "_profile": profile,
+    }
+
+
+async def main(args) -> None:
+    from app.core.cache import LRUCache, NullBackend, TieredCache
+    from app.core.config import settings
+
+    engine, session_factory = await prepare_database(temp_sqlite_url())
+    routine_ids = await seed_routines(
+        session_factory, routines_per_user=args.routines, steps=args.steps
+    )
+    # 캐시 없이 매 요청 직렬화
+    app = build_app(
+        session_factory, cache=TieredCache(NullBackend(), LRUCache(0, 0), ttl=0)
+    )
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+
+    report = {}
+    async with make_client(app, auth_headers(1)) as client:
+        for scenario, template in SCENARIOS.items():
+            url = template.format(routine_id=routine_ids[0])
+            results = {}
+            for mode, fast in (("orm_pydantic", False), ("orjson_rows", True)):
+                settings.RESPONSE_FAST_PATH = fast
+                results[mode] = await measure(client, url, args)
+                profile = results[mode].pop("_profile")
+                if args.profile_dir:
+                    profile.dump_stats(
+                        os.path.join(args.profile_dir, f"{scenario}_{mode}.prof")
+                    )
+            slow = results["orm_pydantic"]["cpu_ms_per_request"]
+            fast = results["orjson_rows"]["cpu_ms_per_request"]
+            results["cpu_speedup"] = round(slow / fast, 2) if fast else None
+            report[scenario] = results
+
+    settings.RESPONSE_FAST_PATH = True
+    await engine.dispose()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="응답 직렬화 CPU 프로파일 비교")
+    parser.add_argument("--routines", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--profile-dir", default=None)
+    args = parser.parse_args()
+    configure_env()
+    asyncio.run(main(args))
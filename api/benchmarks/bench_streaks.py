@@ -0,0 +1,123 @@
+# 🔥 야간 스트릭 배치 벤치마크 (합성 사용자 1M)
+# - compute: 청크 단위 벡터 계산만 측정 (DB 제외)
+# - --with-db: 임시 SQLite에 여러 시간대 사용자를 넣고 조회/계산/UPDATE 전체 경로 측정,
+#   이어서 이미 마감한 시간대 재확인(15~30분 주기 재실행) 비용 측정
+#
+# 실행: cd api && python -m benchmarks.bench_streaks [--users 1000000] [--with-db]
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import configure_env
+
+TIMEZONE = "Asia/Seoul"
+# --with-db 사용자 분포 (id 순으로 돌아가며 배정)
+TIMEZONES = ["Asia/Seoul", "America/New_York", "Europe/London", "UTC"]
+DAY = date(2025, 1, 5)  # 일요일 → 보호권 리필 경로 포함
+
+
+def synthetic_users(count: int, seed: int = 7) -> pd.DataFrame:
+    """활동 40% / 1~3일 전 활동 40% / 미활동 20% 분포의 합성 사용자 (logged는 이벤트 유무)"""
+    rng = np.random.default_rng(seed)
+    base = datetime(2025, 1, 5, 3, 0)  # 현지 2025-01-05 12:00
+    days_ago = rng.choice([0, 1, 2, 3, -1], size=count, p=[0.4, 0.2, 0.1, 0.1, 0.2])
+    last_active = pd.Series(
+        [base - timedelta(days=int(d)) if d >= 0 else None for d in days_ago],
+        dtype="datetime64[ns]",
+    )
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, count + 1),
+            "streak": rng.integers(0, 60, size=count),
+            "grace_tokens": rng.integers(0, 2, size=count),
+            "last_activity_date": last_active,
+            "logged": days_ago == 0,
+        }
+    )
+
+
+def bench_compute(users: int, chunk: int) -> dict:
+    from app.jobs.streaks import compute_streaks
+
+    frame = synthetic_users(users)
+    start = time.perf_counter()
+    for offset in range(0, users, chunk):
+        compute_streaks(frame.iloc[offset : offset + chunk], DAY, TIMEZONE)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "compute",
+        "users": users,
+        "seconds": round(elapsed, 3),
+        "users_per_sec": round(users / elapsed),
+    }
+
+
+def bench_with_db(users: int, chunk: int) -> dict:
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+
+    from app.jobs.streaks import days_to_close, process_timezone
+    from app.models import Base, User
+
+    fd, path = tempfile.mkstemp(prefix="rq_streak_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    frame = synthetic_users(users)
+    rows = [
+        {
+            "email": f"u{row.id}@routinequest.com",
+            "timezone": TIMEZONES[row.id % len(TIMEZONES)],
+            "streak": int(row.streak),
+            "grace_tokens": int(row.grace_tokens),
+            "last_activity_date": (
+                None if pd.isna(row.last_activity_date) else row.last_activity_date
+            ),
+        }
+        for row in frame.itertuples(index=False)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(User), rows)
+
+    with sessionmaker(bind=engine)() as db:
+        start = time.perf_counter()
+        results = [process_timezone(db, tz, DAY, chunk) for tz in TIMEZONES]
+        elapsed = time.perf_counter() - start
+        # 모든 시간대를 마감한 뒤의 재실행 - 시간대마다 인덱스 조회만 하고 끝나야 함
+        start = time.perf_counter()
+        pending = [days_to_close(db, tz, DAY) for tz in TIMEZONES]
+        recheck = time.perf_counter() - start
+    engine.dispose()
+    os.remove(path)
+    processed = sum(result.users for result in results)
+    return {
+        "mode": "with_db",
+        "timezones": len(TIMEZONES),
+        "users": processed,
+        "continued": sum(result.continued for result in results),
+        "protected": sum(result.protected for result in results),
+        "broken": sum(result.broken for result in results),
+        "seconds": round(elapsed, 3),
+        "users_per_sec": round(processed / elapsed),
+        "recheck_ms": round(recheck * 1000, 3),
+        "recheck_pending_days": sum(len(days) for days in pending),
+    }
+
+
+if __name__ == "__main__":
+    configure_env()
+    parser = argparse.ArgumentParser(description="야간 스트릭 배치 벤치마크")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    parser.add_argument("--with-db", action="store_true", help="SQLite 왕복 포함 측정")
+    args = parser.parse_args()
+    report = [bench_compute(args.users, args.chunk)]
+    if args.with_db:
+        report.append(bench_with_db(args.users, args.chunk))
+    print(json.dumps({"benchmark": "streaks", "results": report}, indent=2))
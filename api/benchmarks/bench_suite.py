@@ -0,0 +1,528 @@
+# 🧪 routines.py 엔드포인트 전체 종단 간 벤치마크
+# factory-boy로 규모별 데이터셋(루틴 1k/100k/1M + 스텝)을 시드한 뒤 모든 엔드포인트를
+# ASGI 클라이언트로 고정 동시성 부하 → 처리량, p50/p95/p99, 요청당 쿼리 수를 JSON으로 출력
+# - 시나리오마다 다른 사용자로 실행 (쓰기 시나리오끼리 서로의 데이터를 건드리지 않음)
+# - 삭제처럼 대상을 소모하는 시나리오는 측정 전에 대상 루틴/스텝을 미리 생성
+# - --repeat N이면 매번 새 DB로 N회 실행해 지표별 중앙값 보고 (SQLite 쓰기 지연 편차 완화)
+# - --save-baseline으로 결과를 기준 파일에 저장, --compare로 기준 대비 회귀 확인 (회귀면 종료 코드 1)
+# SQLite는 writer가 하나라 쓰기 시나리오 꼬리 지연이 크므로 실제 수치는 --db-url로 Postgres에서 측정
+#
+# 실행: cd api && python -m benchmarks.bench_suite [--scale 1k] [--compare benchmarks/baselines/suite_1k.json]
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import (
+    auth_headers,
+    build_app,
+    configure_env,
+    count_queries,
+    make_client,
+    prepare_database,
+    run_load,
+    temp_sqlite_url,
+)
+
+API = "/api/v1/routines"
+
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+# 회귀 판정에 쓰는 지연시간 (p95/p99는 SQLite 쓰기 락 대기에 좌우되어
+# 같은 커밋에서도 ±50% 흔들리므로 비교표에만 표시)
+REGRESSION_KEYS = ("p50_ms",)
+
+
+@dataclass
+class Scenario:
+    """엔드포인트 1개 부하 시나리오"""
+
+    name: str
+    method: str
+    path: str  # 라우트 경로 (보고서 표시용)
+    # setup(client, headers, {루틴 id: 스텝 id 목록}) → 요청 i를 보내는 함수
+    setup: Callable[..., Awaitable[Callable[[int], Awaitable[object]]]]
+
+
+async def load_targets(session_factory, user_id: int) -> Dict[int, List[int]]:
+    """사용자의 루틴 id → 스텝 id 목록 (순서대로)"""
+    from sqlalchemy import select
+
+    from app.models import Routine, Step
+
+    async with session_factory() as db:
+        rows = (
+            await db.execute(
+                select(Routine.id, Step.id)
+                .outerjoin(Step, Step.routine_id == Routine.id)
+                .filter(Routine.user_id == user_id)
+                .order_by(Routine.id, Step.order)
+            )
+        ).all()
+    targets: Dict[int, List[int]] = {}
+    for routine_id, step_id in rows:
+        targets.setdefault(routine_id, [])
+        if step_id is not None:
+            targets[routine_id].append(step_id)
+    return targets
+
+
+def step_payload(title: str) -> dict:
+    return {"title": title, "type": "action", "difficulty": "easy", "t_ref_sec": 60}
+
+
+def routine_payload(title: str, steps: int) -> dict:
+    return {
+        "title": title,
+        "steps": [step_payload(f"{title} 스텝 {s + 1}") for s in range(steps)],
+    }
+
+
+async def create_routines(client, headers, count: int, steps: int) -> List[dict]:
+    """측정 전 준비: POST /bulk로 루틴 count개 생성 (응답의 루틴/스텝 반환)"""
+    created: List[dict] = []
+    for start in range(0, count, 100):
+        response = await client.post(
+            f"{API}/bulk",
+            json={
+                "routines": [
+                    routine_payload(f"준비 루틴 {i}", steps)
+                    for i in range(start, min(start + 100, count))
+                ]
+            },
+            headers=headers,
+        )
+        response.raise_for_status()
+        created.extend(response.json())
+    return created
+
+
+# 📋 시나리오 정의 (setup은 측정 전에 1회 실행되어 요청 함수를 반환)
+def build_scenarios(requests: int) -> List[Scenario]:
+    def simple(method: str, url: Callable[[List[int], int], str], body=None):
+        async def setup(client, headers, targets):
+            routine_ids = list(targets)
+
+            async def call(i: int):
+                return await client.request(
+                    method,
+                    url(routine_ids, i),
+                    json=body(i) if body else None,
+                    headers=headers,
+                )
+
+            return call
+
+        return setup
+
+    def nth(routine_ids: List[int], i: int) -> int:
+        return routine_ids[i % len(routine_ids)]
+
+    async def list_cursor(client, headers, targets):
+        first = await client.get(f"{API}/?limit=5", headers=headers)
+        first.raise_for_status()
+        cursor = first.headers["X-Next-Cursor"]
+        return lambda i: client.get(f"{API}/?limit=5&cursor={cursor}", headers=headers)
+
+    async def detail_not_modified(client, headers, targets):
+        routine_id = next(iter(targets))
+        first = await client.get(f"{API}/{routine_id}", headers=headers)
+        first.raise_for_status()
+        conditional = {**headers, "If-None-Match": first.headers["ETag"]}
+        return lambda i: client.get(f"{API}/{routine_id}", headers=conditional)
+
+    async def record_run(client, headers, targets):
+        routine_ids = list(targets)
+
+        def call(i: int):
+            routine_id = nth(routine_ids, i)
+            steps = [
+                {
+                    "step_id": step_id,
+                    "status": "completed" if (i + s) % 10 else "skipped",
+                    "duration_sec": 30 + (i * 7 + s * 13) % 240,
+                }
+                for s, step_id in enumerate(targets[routine_id])
+            ]
+            return client.post(
+                f"{API}/{routine_id}/runs", json={"steps": steps}, headers=headers
+            )
+
+        return call
+
+    async def reorder_steps(client, headers, targets):
+        # 같은 루틴에 대한 요청이 겹치면 버전 충돌(409)이므로 루틴별로 직렬화
+        routine_ids = list(targets)
+        versions = dict.fromkeys(routine_ids, 1)
+        locks = {routine_id: asyncio.Lock() for routine_id in routine_ids}
+
+        async def call(i: int):
+            routine_id = nth(routine_ids, i)
+            async with locks[routine_id]:
+                step_ids = targets[routine_id][::-1]
+                response = await client.put(
+                    f"{API}/{routine_id}/steps/order",
+                    json={"step_ids": step_ids, "version": versions[routine_id]},
+                    headers=headers,
+                )
+                if response.status_code == 200:
+                    targets[routine_id] = step_ids
+                    versions[routine_id] += 1
+                return response
+
+        return call
+
+    def step_call(method: str, suffix: str = "", body=None):
+        async def setup(client, headers, targets):
+            pairs = [(r, s) for r, steps in targets.items() for s in steps]
+
+            def call(i: int):
+                routine_id, step_id = pairs[i % len(pairs)]
+                return client.request(
+                    method,
+                    f"{API}/{routine_id}/steps/{step_id}{suffix}",
+                    json=body(i) if body else None,
+                    headers=headers,
+                )
+
+            return call
+
+        return setup
+
+    async def delete_routine(client, headers, targets):
+        created = await create_routines(client, headers, requests, steps=3)
+        return lambda i: client.delete(f"{API}/{created[i]['id']}", headers=headers)
+
+    async def delete_step(client, headers, targets):
+        created = await create_routines(client, headers, -(-requests // 5), steps=5)
+        pairs = [(r["id"], s["id"]) for r in created for s in r["steps"]]
+        return lambda i: client.delete(
+            f"{API}/{pairs[i][0]}/steps/{pairs[i][1]}", headers=headers
+        )
+
+    return [
+        Scenario("list", "GET", "/", simple("GET", lambda ids, i: f"{API}/")),
+        Scenario(
+            "list_without_steps",
+            "GET",
+            "/",
+            simple("GET", lambda ids, i: f"{API}/?include_steps=false"),
+        ),
+        Scenario("list_cursor", "GET", "/", list_cursor),
+        Scenario(
+            "detail",
+            "GET",
+            "/{routine_id}",
+            simple("GET", lambda ids, i: f"{API}/{nth(ids, i)}"),
+        ),
+        Scenario(
+            "detail_without_steps",
+            "GET",
+            "/{routine_id}",
+            simple("GET", lambda ids, i: f"{API}/{nth(ids, i)}?include_steps=false"),
+        ),
+        Scenario("detail_not_modified", "GET", "/{routine_id}", detail_not_modified),
+        Scenario(
+            "stats",
+            "GET",
+            "/{routine_id}/stats",
+            simple("GET", lambda ids, i: f"{API}/{nth(ids, i)}/stats"),
+        ),
+        Scenario(
+            "create",
+            "POST",
+            "/",
+            simple(
+                "POST",
+                lambda ids, i: f"{API}/",
+                lambda i: routine_payload(f"새 루틴 {i}", 5),
+            ),
+        ),
+        Scenario(
+            "create_bulk",
+            "POST",
+            "/bulk",
+            simple(
+                "POST",
+                lambda ids, i: f"{API}/bulk",
+                lambda i: {
+                    "routines": [
+                        routine_payload(f"일괄 루틴 {i}-{r}", 3) for r in range(10)
+                    ]
+                },
+            ),
+        ),
+        Scenario(
+            "update",
+            "PUT",
+            "/{routine_id}",
+            simple(
+                "PUT",
+                lambda ids, i: f"{API}/{nth(ids, i)}",
+                lambda i: {"title": f"수정된 루틴 {i}"},
+            ),
+        ),
+        Scenario("delete", "DELETE", "/{routine_id}", delete_routine),
+        Scenario(
+            "toggle",
+            "PATCH",
+            "/{routine_id}/toggle",
+            simple("PATCH", lambda ids, i: f"{API}/{nth(ids, i)}/toggle"),
+        ),
+        Scenario(
+            "today_display",
+            "PATCH",
+            "/{routine_id}/today-display",
+            simple("PATCH", lambda ids, i: f"{API}/{nth(ids, i)}/today-display"),
+        ),
+        Scenario("record_run", "POST", "/{routine_id}/runs", record_run),
+        Scenario(
+            "add_step",
+            "POST",
+            "/{routine_id}/steps",
+            simple(
+                "POST",
+                lambda ids, i: f"{API}/{nth(ids, i)}/steps",
+                lambda i: step_payload(f"추가 스텝 {i}"),
+            ),
+        ),
+        Scenario("reorder_steps", "PUT", "/{routine_id}/steps/order", reorder_steps),
+        Scenario(
+            "update_step",
+            "PUT",
+            "/{routine_id}/steps/{step_id}",
+            step_call("PUT", body=lambda i: step_payload(f"수정된 스텝 {i}")),
+        ),
+        Scenario(
+            "reorder_step",
+            "PATCH",
+            "/{routine_id}/steps/{step_id}/reorder",
+            step_call("PATCH", suffix="/reorder?new_order=1"),
+        ),
+        Scenario("delete_step", "DELETE", "/{routine_id}/steps/{step_id}", delete_step),
+    ]
+
+
+async def run_scenario(
+    scenario: Scenario,
+    client,
+    engine,
+    session_factory,
+    user_id: int,
+    concurrency: int,
+    requests: int,
+) -> dict:
+    headers = auth_headers(user_id)
+    targets = await load_targets(session_factory, user_id)
+    # principal 캐시 워밍 (사용자 조회는 TTL 창마다 1회라 측정에서 제외)
+    (await client.get(f"{API}/?limit=1", headers=headers)).raise_for_status()
+    call = await scenario.setup(client, headers, targets)
+
+    statuses: Dict[str, int] = {}
+
+    async def request(i: int):
+        response = await call(i)
+        key = str(response.status_code)
+        statuses[key] = statuses.get(key, 0) + 1
+
+    with count_queries(engine) as counter:
+        result = await run_load(request, concurrency, requests)
+    errors = sum(n for code, n in statuses.items() if not code.startswith(("2", "3")))
+    return {
+        "method": scenario.method,
+        "path": scenario.path,
+        **result,
+        "queries_per_request": round(counter.count / requests, 2),
+        "errors": errors,
+        "statuses": statuses,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# 📉 기준 파일 비교
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    기준 대비 회귀 목록
+
+    - p50 지연시간이 threshold 비율 이상 증가, 처리량이 threshold 비율 이상 감소
+    - 요청당 쿼리 수 증가, 에러 발생 (둘 다 허용 오차 없음)
+    """
+    regressions = []
+    for name, current in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        for key in REGRESSION_KEYS:
+            if before[key] and current[key] > before[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {key} {before[key]} → {current[key]} "
+                    f"(+{current[key] / before[key] - 1:.0%})"
+                )
+        if before["rps"] and current["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: rps {before['rps']} → {current['rps']} "
+                f"({current['rps'] / before['rps'] - 1:.0%})"
+            )
+        if current["queries_per_request"] > before["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries/request {before['queries_per_request']} → "
+                f"{current['queries_per_request']}"
+            )
+        if current["errors"] > before["errors"]:
+            regressions.append(
+                f"{name}: errors {before['errors']} → {current['errors']}"
+            )
+    return regressions
+
+
+def diff_table(report: dict, baseline: dict) -> Dict[str, dict]:
+    """엔드포인트별 기준 대비 변화 (보고서에 함께 출력)"""
+    table = {}
+    for name, current in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        table[name] = {
+            key: {"baseline": before[key], "current": current[key]}
+            for key in ("rps", *LATENCY_KEYS, "queries_per_request")
+        }
+    return table
+
+
+async def run_suite(args) -> dict:
+    """새 DB에 데이터셋을 시드하고 전체 시나리오를 1회 실행"""
+    from benchmarks.factories import SCALES, seed_dataset
+
+    engine, session_factory = await prepare_database(args.db_url or temp_sqlite_url())
+    dataset = await seed_dataset(
+        session_factory,
+        SCALES[args.scale],
+        routines_per_user=args.routines_per_user,
+        steps_per_routine=args.steps,
+        seed=args.seed,
+    )
+    scenarios = [
+        s
+        for s in build_scenarios(args.requests)
+        if not args.only or s.name in args.only
+    ]
+    if len(scenarios) > len(dataset.user_ids):
+        raise SystemExit("시나리오 수보다 사용자가 적습니다 (--routines-per-user를 줄이세요)")
+
+    app = build_app(session_factory)
+    endpoints = {}
+    async with make_client(app) as client:
+        users = dataset.user_ids[: len(scenarios)]
+        for scenario, user_id in zip(scenarios, users, strict=True):
+            endpoints[scenario.name] = await run_scenario(
+                scenario,
+                client,
+                engine,
+                session_factory,
+                user_id,
+                args.concurrency,
+                args.requests,
+            )
+    await engine.dispose()
+    return {
+        "dialect": engine.dialect.name,
+        **dataset.summary(),
+        "endpoints": endpoints,
+    }
+
+
+def median_runs(runs: List[dict]) -> dict:
+    """반복 실행 결과를 지표별 중앙값으로 합침 (에러/상태 코드는 합계)"""
+    merged = dict(runs[-1])
+    merged["seed_seconds"] = statistics.median(run["seed_seconds"] for run in runs)
+    endpoints = {}
+    for name, last in runs[-1]["endpoints"].items():
+        samples = [run["endpoints"][name] for run in runs]
+        statuses: Dict[str, int] = {}
+        for sample in samples:
+            for code, count in sample["statuses"].items():
+                statuses[code] = statuses.get(code, 0) + count
+        endpoints[name] = {
+            **last,
+            **{
+                key: statistics.median(sample[key] for sample in samples)
+                for key in ("rps", *LATENCY_KEYS, "queries_per_request")
+            },
+            "errors": sum(sample["errors"] for sample in samples),
+            "statuses": statuses,
+        }
+    merged["endpoints"] = endpoints
+    return merged
+
+
+async def main(args) -> int:
+    runs = [await run_suite(args) for _ in range(args.repeat)]
+    result = median_runs(runs)
+    report = {
+        "benchmark": "suite",
+        "revision": git_revision(),
+        "scale": args.scale,
+        "dialect": result["dialect"],
+        "users": result["users"],
+        "routines": result["routines"],
+        "steps": result["steps"],
+        "seed_seconds": result["seed_seconds"],
+        "steps_per_routine": args.steps,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "repeat": args.repeat,
+        "endpoints": result["endpoints"],
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write("\n")
+
+    regressions: List[str] = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.threshold)
+        report["comparison"] = {
+            "baseline_revision": baseline.get("revision"),
+            "threshold": args.threshold,
+            "regressions": regressions,
+            "endpoints": diff_table(report, baseline),
+        }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="routines API 종단 간 벤치마크")
+    parser.add_argument("--db-url", default=None, help="미지정 시 임시 SQLite 파일")
+    parser.add_argument("--scale", choices=["1k", "100k", "1m"], default="1k")
+    parser.add_argument("--routines-per-user", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=5, help="루틴당 스텝 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오당 요청 수")
+    parser.add_argument("--repeat", type=int, default=1, help="전체 반복 횟수 (지표별 중앙값 보고)")
+    parser.add_argument("--only", nargs="*", help="실행할 시나리오 이름")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH", help="비교할 기준 파일")
+    parser.add_argument("--threshold", type=float, default=0.3, help="회귀로 볼 상대 변화율")
+    args = parser.parse_args()
+    configure_env()
+    sys.exit(asyncio.run(main(args)))
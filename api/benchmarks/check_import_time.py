@@ -0,0 +1,116 @@
+# ⏱️ 콜드 스타트 임포트 시간 예산 검사 (python -X importtime)
+# 새 인터프리터에서 app.main 임포트를 여러 번 측정해 중앙값이 예산을 넘거나,
+# 임포트만으로 불러오면 안 되는 모듈(지연 임포트 대상)이 로드되면 종료 코드 1
+# - 예산: --budget-ms 또는 IMPORT_TIME_BUDGET_MS (기본 1500ms, CI 머신 여유 포함)
+# - 보고: app.main 누적 임포트 시간/프로세스 전체 시간 중앙값, 직접 임포트한 모듈별 누적 시간
+#
+# 실행: cd api && python -m benchmarks.check_import_time [--runs 5] [--budget-ms 1500]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from benchmarks.common import configure_env
+
+TARGET = "app.main"
+DEFAULT_BUDGET_MS = 1500
+# 임포트 시점에 불러오면 안 되는 모듈 (Sentry는 DSN이 있을 때만, DB 드라이버는 엔진 생성 시,
+# Redis/배치 계산 라이브러리는 사용하는 곳에서)
+FORBIDDEN = (
+    "sentry_sdk",
+    "aiosqlite",
+    "asyncpg",
+    "psycopg2",
+    "redis",
+    "pandas",
+    "numpy",
+)
+
+
+def measure_once(env: Dict[str, str]) -> Dict[str, object]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr[-2000:])
+
+    # 출력은 하위 모듈이 먼저, 임포트한 모듈이 나중 (들여쓰기 2칸 = 깊이 1)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative)))
+    loaded = {module for module, _, _ in rows}
+
+    # app.main 직전의 깊이 1 행 = app.main이 직접 임포트한 모듈 (하위 모듈 누적 포함)
+    # 앱 모듈은 모듈별로, 외부 패키지는 최상위 패키지별로 합산
+    target = next(i for i, row in enumerate(rows) if row[0] == TARGET and not row[1])
+    packages: Dict[str, int] = {}
+    for module, depth, cumulative in reversed(rows[:target]):
+        if depth == 0:
+            break
+        if depth == 1:
+            key = module if module.startswith("app.") else module.split(".")[0]
+            packages[key] = packages.get(key, 0) + cumulative
+    return {
+        "import_ms": rows[target][2] / 1000,
+        "wall_ms": wall * 1000,
+        "packages": packages,
+        "forbidden": sorted(loaded.intersection(FORBIDDEN)),
+    }
+
+
+def main(args) -> int:
+    env = dict(os.environ)
+    env.pop("SENTRY_DSN", None)  # 기본 설정(DSN 없음) 기준으로 측정
+    env.setdefault("PYTHONPATH", os.getcwd())
+    runs = [measure_once(env) for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    median_run = min(runs, key=lambda run: abs(run["import_ms"] - import_ms))
+    forbidden = sorted({module for run in runs for module in run["forbidden"]})
+
+    report = {
+        "target": TARGET,
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "import_ms_median": round(import_ms, 1),
+        "import_ms_max": round(max(run["import_ms"] for run in runs), 1),
+        "process_wall_ms_median": round(
+            statistics.median(run["wall_ms"] for run in runs), 1
+        ),
+        "top_packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(
+                median_run["packages"].items(), key=lambda item: item[1], reverse=True
+            )[: args.top]
+        },
+        "forbidden_loaded": forbidden,
+        "over_budget": import_ms > args.budget_ms,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if report["over_budget"] or forbidden else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="콜드 스타트 임포트 시간 예산 검사")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)),
+    )
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    configure_env()
+    sys.exit(main(args))
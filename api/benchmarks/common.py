@@ -0,0 +1,211 @@
+# 🧰 벤치마크 공용 유틸리티
+# 환경변수 기본값, 임시 DB 준비, 시드 데이터, 부하 생성기, 지연시간 백분위 계산
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+def configure_env() -> None:
+    """Settings 필수값 기본 설정 (app 임포트 전에 호출)"""
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("POSTGRES_SERVER", "localhost")
+    os.environ.setdefault("POSTGRES_USER", "routine_user")
+    os.environ.setdefault("POSTGRES_PASSWORD", "routine_password")
+    os.environ.setdefault("POSTGRES_DB", "routine_quest")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+
+def temp_sqlite_url() -> str:
+    """벤치마크 전용 임시 SQLite 파일 URL"""
+    fd, path = tempfile.mkstemp(prefix="rq_bench_", suffix=".db")
+    os.close(fd)
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def prepare_database(db_url: str):
+    """테이블 생성 후 (엔진, 세션 팩토리) 반환"""
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from app.models import Base
+
+    engine = create_async_engine(db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    return engine, session_factory
+
+
+async def seed_routines(
+    session_factory, users: int = 1, routines_per_user: int = 10, steps: int = 5
+) -> List[int]:
+    """사용자/루틴/스텝 시드 데이터 생성, 생성된 루틴 id 목록 반환"""
+    from app.models import Routine, Step, User
+
+    routine_ids: List[int] = []
+    async with session_factory() as db:
+        for u in range(users):
+            user = User(email=f"bench{u}@routinequest.com", username=f"bench{u}")
+            db.add(user)
+            await db.flush()
+            for r in range(routines_per_user):
+                routine = Routine(user_id=user.id, title=f"루틴 {r}")
+                db.add(routine)
+                await db.flush()
+                routine_ids.append(routine.id)
+                db.add_all(
+                    Step(routine_id=routine.id, order=i + 1, title=f"스텝 {i + 1}")
+                    for i in range(steps)
+                )
+        await db.commit()
+    return routine_ids
+
+
+async def bulk_insert_routines(session_factory, total: int, chunk: int = 50_000) -> int:
+    """대용량 벤치마크용: 한 사용자에게 루틴 total개를 청크 단위 다중행 INSERT로 생성"""
+    from sqlalchemy import insert
+
+    from app.models import Routine, User
+
+    async with session_factory() as db:
+        user = User(email="bulk@routinequest.com", username="bulk")
+        db.add(user)
+        await db.flush()
+        user_id = user.id
+        for start in range(0, total, chunk):
+            rows = [
+                {"user_id": user_id, "title": f"루틴 {i}"}
+                for i in range(start, min(start + chunk, total))
+            ]
+            await db.execute(insert(Routine), rows)
+        await db.commit()
+    return user_id
+
+
+def build_app(session_factory, cache=None, leaderboard=None):
+    """
+    get_db/get_read_db/캐시/리더보드를 벤치마크용으로 교체한 FastAPI 앱 반환
+
+    session_factory가 None이면 세션 의존성은 교체하지 않음 (app.core.database 엔진 사용)
+    """
+    from app.api.deps import get_read_db
+    from app.core.cache import (
+        InMemoryBackend,
+        LRUCache,
+        TieredCache,
+        get_routine_cache,
+    )
+    from app.core.database import get_db
+    from app.main import app
+    from app.services.leaderboard import (
+        InMemoryLeaderboardBackend,
+        Leaderboard,
+        get_leaderboard,
+    )
+
+    async def _get_db():
+        async with session_factory() as db:
+            yield db
+
+    if cache is None:
+        cache = TieredCache(InMemoryBackend(), LRUCache(1024, 30), ttl=300)
+    if leaderboard is None:
+        leaderboard = Leaderboard(InMemoryLeaderboardBackend())
+
+    if session_factory is not None:
+        app.dependency_overrides[get_db] = _get_db
+        app.dependency_overrides[get_read_db] = _get_db
+    else:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+    app.dependency_overrides[get_routine_cache] = lambda: cache
+    app.dependency_overrides[get_leaderboard] = lambda: leaderboard
+    return app
+
+
+def auth_headers(user_id: int) -> Dict[str, str]:
+    """user_id로 발급한 Bearer 토큰 헤더"""
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+
+def make_client(app, headers: Optional[Dict[str, str]] = None):
+    """ASGI 인-프로세스 HTTP 클라이언트"""
+    import httpx
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://localhost",
+        headers=headers,
+    )
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 개수 집계"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+@contextmanager
+def count_queries(engine):
+    """블록 안에서 engine이 실행한 쿼리 수를 세는 컨텍스트 매니저"""
+    from sqlalchemy import event
+
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """지연시간 샘플(초)을 ms 단위 p50/p95/p99로 요약"""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+    q = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {
+        "p50_ms": round(q[49] * 1000, 3),
+        "p95_ms": round(q[94] * 1000, 3),
+        "p99_ms": round(q[98] * 1000, 3),
+    }
+
+
+async def run_load(
+    request: Callable[[int], Awaitable[object]], concurrency: int, total: int
+) -> Dict[str, float]:
+    """동시성 concurrency로 request를 total번 호출하고 처리량/지연시간 보고"""
+    latencies: List[float] = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await request(i)
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        **percentiles(latencies),
+    }
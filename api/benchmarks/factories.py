@@ -0,0 +1,171 @@
+# 🏭 벤치마크 시드 데이터 팩토리 (factory-boy)
+# ORM 객체 대신 INSERT용 dict를 만들어 청크 단위 다중행 INSERT로 저장
+# - SQLite/Postgres 모두 같은 Core INSERT ... RETURNING 사용 (id는 DB가 발급)
+# - 값은 Sequence/Iterator와 고정 시드 난수로 만들어 실행마다 같은 데이터셋
+# - 규모: 루틴 1k / 100k / 1M (루틴당 스텝 steps_per_routine개)
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import factory
+import factory.fuzzy
+import factory.random
+
+from app.models.routine import StepDifficulty, StepType
+
+# 규모 이름 → 루틴 수
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+STEP_POOL_SIZE = 257  # 스텝 행 템플릿 수 (Iterator 주기들과 서로소라 조합이 고르게 섞임)
+
+
+class UserRowFactory(factory.DictFactory):
+    """users 행"""
+
+    email = factory.Sequence(lambda n: f"bench{n}@routinequest.com")
+    username = factory.Sequence(lambda n: f"bench{n}")
+    display_name = factory.Sequence(lambda n: f"벤치 사용자 {n}")
+    tier = factory.Iterator(["free", "basic", "pro", "free", "team"])
+    streak = factory.fuzzy.FuzzyInteger(0, 60)
+    total_xp = factory.fuzzy.FuzzyInteger(0, 20_000)
+
+
+class RoutineRowFactory(factory.DictFactory):
+    """routines 행 (user_id는 호출자가 지정)"""
+
+    user_id = None
+    title = factory.Sequence(lambda n: f"루틴 {n}")
+    description = factory.Iterator([None, "아침에 일어나자마자 하는 루틴", None, "퇴근 후 30분 정리 루틴"])
+    icon = factory.Iterator(["🎯", "🌅", "💪", "📚", "🧘"])
+    color = factory.Iterator(["#6366F1", "#F59E0B", "#10B981", "#EF4444"])
+    is_public = factory.Iterator([False, False, False, True])
+    is_active = factory.Iterator([True, True, True, True, False])
+    today_display = factory.Iterator([True, False, False])
+    total_completions = factory.fuzzy.FuzzyInteger(0, 300)
+    success_rate = factory.fuzzy.FuzzyInteger(0, 100)
+    avg_completion_time = factory.fuzzy.FuzzyInteger(60, 1_800)
+
+
+class StepRowFactory(factory.DictFactory):
+    """steps 행 (routine_id, order는 호출자가 지정)"""
+
+    routine_id = None
+    order = 1
+    title = factory.LazyAttribute(lambda row: f"스텝 {row.order}")
+    description = factory.Iterator([None, None, "천천히 호흡하며 진행"])
+    type = factory.Iterator([step_type.value for step_type in StepType])
+    difficulty = factory.Iterator(
+        [
+            StepDifficulty.EASY.value,
+            StepDifficulty.EASY.value,
+            StepDifficulty.MEDIUM.value,
+            StepDifficulty.HARD.value,
+        ]
+    )
+    t_ref_sec = factory.fuzzy.FuzzyInteger(30, 900)
+    is_optional = factory.Iterator([False, False, False, False, True])
+    xp_reward = factory.Iterator([10, 10, 20, 30])
+
+
+@dataclass
+class Dataset:
+    """시드 결과 (행 수, 소요 시간, 사용자 id 목록)"""
+
+    users: int
+    routines: int
+    steps: int
+    seconds: float
+    user_ids: List[int] = field(repr=False, default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "users": self.users,
+            "routines": self.routines,
+            "steps": self.steps,
+            "seed_seconds": self.seconds,
+        }
+
+
+def reset_factories(seed: int) -> None:
+    """시퀀스/난수 초기화 (같은 시드면 같은 데이터셋)"""
+    factory.random.reseed_random(seed)
+    # DictFactory 하위 팩토리는 시퀀스 카운터를 공유
+    UserRowFactory.reset_sequence(force=True)
+
+
+async def insert_rows(db, table, rows: List[dict]) -> List[int]:
+    """
+    Core executemany로 INSERT 후 새 id 목록 반환
+
+    ORM 대량 INSERT ... RETURNING은 SQLite에서 행마다 실행/결과 병합이 일어나 느리므로
+    INSERT 전 최대 id 이후 범위를 다시 조회 (시드 중에는 다른 writer가 없음)
+    """
+    from sqlalchemy import func, insert, select
+
+    before = (await db.execute(select(func.max(table.c.id)))).scalar() or 0
+    await db.execute(insert(table), rows)
+    result = await db.execute(
+        select(table.c.id).where(table.c.id > before).order_by(table.c.id)
+    )
+    return list(result.scalars().all())
+
+
+async def seed_dataset(
+    session_factory,
+    routines: int,
+    routines_per_user: int = 20,
+    steps_per_routine: int = 5,
+    chunk: int = 20_000,
+    seed: int = 0,
+) -> Dataset:
+    """
+    사용자 routines/routines_per_user명에게 루틴 routines개, 루틴마다 스텝을 생성
+
+    청크마다 루틴 INSERT → 새 루틴 id로 스텝 다중행 INSERT → 커밋
+    (1M 규모에서도 메모리는 청크 크기만큼만 사용)
+    스텝은 순서별로 팩토리가 만든 행 STEP_POOL_SIZE개를 돌려 쓰고 routine_id만 바꿈
+    (스텝 수백만 개를 매번 build하면 시드 시간 대부분이 팩토리에서 쓰임)
+    """
+    from sqlalchemy import insert
+
+    from app.models import Routine, Step, User
+
+    reset_factories(seed)
+    started = time.perf_counter()
+    user_count = max(1, -(-routines // routines_per_user))
+    user_ids: List[int] = []
+    steps = 0
+    step_pool = [
+        StepRowFactory.build_batch(STEP_POOL_SIZE, order=order)
+        for order in range(1, steps_per_routine + 1)
+    ]
+
+    async with session_factory() as db:
+        for start in range(0, user_count, chunk):
+            rows = UserRowFactory.build_batch(min(chunk, user_count - start))
+            user_ids.extend(await insert_rows(db, User.__table__, rows))
+        await db.commit()
+
+        for start in range(0, routines, chunk):
+            indexes = range(start, min(start + chunk, routines))
+            routine_rows = [
+                RoutineRowFactory.build(user_id=user_ids[i // routines_per_user])
+                for i in indexes
+            ]
+            routine_ids = await insert_rows(db, Routine.__table__, routine_rows)
+            step_rows = [
+                {**pool[routine_id % STEP_POOL_SIZE], "routine_id": routine_id}
+                for routine_id in routine_ids
+                for pool in step_pool
+            ]
+            if step_rows:
+                await db.execute(insert(Step.__table__), step_rows)
+            steps += len(step_rows)
+            await db.commit()
+
+    return Dataset(
+        users=user_count,
+        routines=routines,
+        steps=steps,
+        seconds=round(time.perf_counter() - started, 1),
+        user_ids=user_ids,
+    )
@@ -0,0 +1,24 @@
+# 🦄 gunicorn 설정 (api 디렉터리에서 gunicorn을 실행하면 자동으로 불러옴)
+# Prometheus 다중 워커 지표: 워커들이 같은 디렉터리에 지표 파일을 쓰고 /metrics가 합산
+# - 마스터 시작 시 디렉터리를 비움 (이전 실행의 워커 파일이 합산되지 않도록)
+# - 워커 종료 시 해당 워커의 게이지 파일 정리 (livesum 게이지에서 제외)
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "routine_quest_metrics"),
+)
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,41 @@
+# 🧪 API 테스트 공용 설정
+# - app 임포트 전에 Settings 필수 환경변수 기본값 설정 (벤치마크와 같은 configure_env)
+# - database: 테스트마다 새 임시 SQLite 파일 (테이블 생성 후 엔진/세션 팩토리)
+# - postgres_url: TEST_DATABASE_URL(postgresql+asyncpg://)이 있을 때만, 없으면 skip
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from benchmarks.common import (  # noqa: E402
+    configure_env,
+    prepare_database,
+    temp_sqlite_url,
+)
+
+configure_env()
+
+
+@pytest_asyncio.fixture
+async def database():
+    """임시 SQLite DB의 (엔진, 세션 팩토리) - 테스트가 끝나면 파일 삭제"""
+    url = temp_sqlite_url()
+    engine, session_factory = await prepare_database(url)
+    yield engine, session_factory
+    await engine.dispose()
+    os.remove(url.split(":///", 1)[1])
+
+
+@pytest.fixture
+def postgres_url() -> str:
+    """PostgreSQL 전용 검사용 URL (CI는 서비스 컨테이너 DB를 지정)"""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL이 없어 PostgreSQL 검사를 건너뜀")
+    return url
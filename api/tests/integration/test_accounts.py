@@ -0,0 +1,105 @@
+# 👤 계정 상태 변경과 principal 캐시
+# - 티어 변경/비활성화 직후 캐시된 principal이 아닌 DB 값으로 인증 (같은 워커)
+# - 다른 워커: Redis pub/sub 무효화 메시지로 캐시 제거 (fakeredis 서버 공유)
+# - 토큰 없는 요청의 첫 사용자 대체는 AUTH_DEV_FALLBACK_USER를 켤 때만
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from benchmarks.common import auth_headers, build_app, make_client, seed_routines
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+
+@pytest_asyncio.fixture
+async def invalidation_redis(monkeypatch):
+    """invalidate_principal이 발행하는 Redis를 fakeredis로"""
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core import security
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server)
+    monkeypatch.setattr(security, "_redis", client)
+    monkeypatch.setattr(security.settings, "AUTH_INVALIDATION_BACKEND", "redis")
+    security.principal_cache.clear()
+    yield server
+    security.principal_cache.clear()
+    await client.aclose()
+
+
+async def test_tier_change_moves_principal_and_board(database, invalidation_redis):
+    from app.models.user import UserTier
+    from app.services.leaderboard import InMemoryLeaderboardBackend, Leaderboard
+    from app.services.user_service import set_user_tier
+
+    _, session_factory = database
+    await seed_routines(session_factory, routines_per_user=0)
+    leaderboard = Leaderboard(InMemoryLeaderboardBackend())
+    await leaderboard.record_xp(1, UserTier.FREE.value, 10)
+    app = build_app(session_factory, leaderboard=leaderboard)
+
+    async with make_client(app, auth_headers(1)) as client:
+        before = await client.get("/api/v1/leaderboard/tier/me")  # principal 캐시됨
+        async with session_factory() as db:
+            await set_user_tier(db, leaderboard, 1, UserTier.PRO)
+        after = await client.get("/api/v1/leaderboard/tier/me")
+
+    assert before.status_code == after.status_code == 200
+    assert after.json()["xp"] == 10
+    assert await leaderboard.my_rank(leaderboard.tier_board("free"), 1) is None
+
+
+async def test_deactivated_user_is_rejected_immediately(database, invalidation_redis):
+    from app.services.leaderboard import InMemoryLeaderboardBackend, Leaderboard
+
+    _, session_factory = database
+    await seed_routines(session_factory, routines_per_user=0)
+    leaderboard = Leaderboard(InMemoryLeaderboardBackend())
+    await leaderboard.record_xp(1, "free", 10)
+    app = build_app(session_factory, leaderboard=leaderboard)
+
+    async with make_client(app, auth_headers(1)) as client:
+        assert (await client.get("/api/v1/routines/")).status_code == 200
+        assert (await client.delete("/api/v1/users/me")).status_code == 200
+        assert (await client.get("/api/v1/routines/")).status_code == 401
+    assert await leaderboard.my_rank(leaderboard.global_board(), 1) is None
+
+
+async def test_invalidation_reaches_other_workers(invalidation_redis):
+    import fakeredis
+
+    from app.core import security
+
+    principal = security.Principal(1, None, "a@routinequest.com", "free", True)
+    security.cache_principal("1", principal)
+    # 다른 워커의 구독 연결 (같은 Redis 서버, 다른 클라이언트)
+    subscriber = fakeredis.FakeAsyncRedis(server=invalidation_redis)
+    listener = asyncio.create_task(security.listen_for_invalidations(subscriber))
+    await asyncio.sleep(0.05)  # 구독 완료 대기
+
+    # 발행 측 워커: 로컬 캐시는 그대로 두고 메시지만 받았을 때를 재현
+    await security._invalidation_client().publish(security.INVALIDATION_CHANNEL, "1")
+    for _ in range(50):
+        if security.get_cached_principal("1") is None:
+            break
+        await asyncio.sleep(0.01)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+    await subscriber.aclose()
+
+    assert security.get_cached_principal("1") is None
+
+
+async def test_missing_token_needs_dev_fallback_setting(database, monkeypatch):
+    from app.core.config import settings
+
+    _, session_factory = database
+    await seed_routines(session_factory, routines_per_user=1)
+    app = build_app(session_factory)
+
+    async with make_client(app) as client:
+        assert (await client.get("/api/v1/routines/")).status_code == 401
+        monkeypatch.setattr(settings, "AUTH_DEV_FALLBACK_USER", True)
+        assert (await client.get("/api/v1/routines/")).status_code == 200
@@ -0,0 +1,229 @@
+# ⚡ 빠른 직렬화 경로 바이트 동일성 검증
+# RESPONSE_FAST_PATH를 켜고 끈 두 경로의 응답 바이트/헤더가 같은지 확인
+# 1) 값 단위: 까다로운 값(따옴표/백슬래시/제어문자/이모지/U+2028, 마이크로초/UTC/+09:00 시각)을
+#    RoutineResponse → JSONResponse 경로와 orjson 경로로 각각 직렬화해 비교
+# 2) 엔드포인트 단위: 같은 DB를 캐시 없이 조회 (목록 변형/상세 변형)
+# 3) 쓰기 응답: 생성/일괄 생성/수정/스텝 추가/스텝 수정 응답을 직후 기존 경로 조회 결과와 비교
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.common import auth_headers, build_app, make_client
+
+API = "/api/v1/routines"
+TRICKY_TEXT = '따옴표 " 백슬래시 \\ 슬래시 / 줄바꿈\n탭\t제어\x01\x1f DEL\x7f 😀   끝'
+COMPARED_HEADERS = ("content-type", "etag", "x-next-cursor")
+
+
+def tricky_payloads():
+    """값 단위 비교용 RoutineResponse 형태 dict"""
+    times = [
+        datetime(2024, 1, 2, 3, 4, 5),
+        datetime(2024, 1, 2, 3, 4, 5, 678901),
+        datetime(2024, 1, 2, 3, 4, 5, 5),
+        datetime(2024, 1, 2, 3, 4, 5, 120000, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=9))),
+    ]
+    step = {
+        "id": 7,
+        "title": TRICKY_TEXT,
+        "description": None,
+        "order": 1,
+        "type": "timer",
+        "difficulty": "hard",
+        "t_ref_sec": 0,
+        "is_optional": True,
+        "xp_reward": 2**31,
+        "completion_count": 0,
+        "skip_count": 3,
+        "avg_time_spent": 45,
+    }
+    for index, moment in enumerate(times):
+        yield {
+            "id": index + 1,
+            "title": TRICKY_TEXT,
+            "description": None if index % 2 else "",
+            "icon": "🧘",
+            "color": "#6366F1",
+            "is_public": bool(index % 2),
+            "is_active": True,
+            "today_display": False,
+            "version": 3,
+            "total_completions": 12,
+            "success_rate": 100,
+            "avg_completion_time": 0,
+            "created_at": moment,
+            "updated_at": moment,
+            "steps": [step, {**step, "id": 8, "description": "설명"}] * index,
+        }
+
+
+@pytest.mark.parametrize(
+    "payload", list(tricky_payloads()), ids=lambda payload: str(payload["id"])
+)
+def test_fast_path_serializes_values_like_response_model(payload):
+    from app.api.api_v1.endpoints.routines import RoutineResponse, render_json
+    from app.core.serialization import dumps
+
+    reference = render_json(
+        RoutineResponse.model_validate(payload).model_dump(mode="json")
+    )
+    assert dumps(payload) == reference
+
+
+async def seed(session_factory) -> int:
+    """까다로운 제목/시각과 id 순서와 다른 순서의 스텝을 가진 사용자 1명"""
+    from app.models import Routine, Step, User
+
+    async with session_factory() as db:
+        user = User(email="fastpath@routinequest.com", username="fastpath")
+        db.add(user)
+        await db.flush()
+        for r in range(12):
+            routine = Routine(
+                user_id=user.id,
+                title=f"{TRICKY_TEXT} {r}",
+                description=None if r % 3 == 0 else f'설명 {r} "인용"',
+                is_active=r % 4 != 0,
+                created_at=datetime(2024, 1, 2, 3, 4, 5, r * 83_333),
+                updated_at=datetime(2024, 1, 2, 3, 4, 5),
+            )
+            db.add(routine)
+            await db.flush()
+            db.add_all(
+                Step(
+                    routine_id=routine.id,
+                    order=[3, 1, 4, 2][s],  # id 순서와 다른 스텝 순서 (정렬 확인)
+                    title=f"스텝 {s} {TRICKY_TEXT}",
+                    description=None if s % 2 else "🧘",
+                    type=["action", "timer", "check", "habit"][s % 4],
+                    difficulty=["easy", "medium", "hard"][s % 3],
+                    is_optional=s == 3,
+                )
+                for s in range(r % 5)
+            )
+        await db.commit()
+        return user.id
+
+
+def compare_responses(label: str, slow, fast) -> list:
+    problems = []
+    if slow.status_code != fast.status_code:
+        problems.append(f"{label}: status {slow.status_code} != {fast.status_code}")
+    if slow.content != fast.content:
+        problems.append(f"{label}: body differs")
+    for name in COMPARED_HEADERS:
+        if slow.headers.get(name) != fast.headers.get(name):
+            problems.append(
+                f"{label}: {name} {slow.headers.get(name)!r} != {fast.headers.get(name)!r}"
+            )
+    return problems
+
+
+@pytest.fixture
+def restore_fast_path():
+    from app.core.config import settings
+
+    original = settings.RESPONSE_FAST_PATH
+    yield
+    settings.RESPONSE_FAST_PATH = original
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.db
+async def test_fast_path_responses_match_model_path(database, restore_fast_path):
+    from app.core.cache import LRUCache, NullBackend, TieredCache
+    from app.core.config import settings
+    from app.core.serialization import dumps
+
+    _, session_factory = database
+    user_id = await seed(session_factory)
+    # 캐시 없이 매번 직렬화 (두 경로가 서로의 캐시 본문을 재사용하지 않도록)
+    app = build_app(
+        session_factory, cache=TieredCache(NullBackend(), LRUCache(0, 0), ttl=0)
+    )
+    problems, checked = [], 0
+
+    async def both(client, method, url, **kwargs):
+        settings.RESPONSE_FAST_PATH = False
+        slow = await client.request(method, url, **kwargs)
+        settings.RESPONSE_FAST_PATH = True
+        fast = await client.request(method, url, **kwargs)
+        return slow, fast
+
+    async with make_client(app, auth_headers(user_id)) as client:
+        routine_ids = [r["id"] for r in (await client.get(f"{API}/")).json()]
+        first_page = await client.get(f"{API}/?limit=5")
+        cursor = first_page.headers["x-next-cursor"]
+        urls = [
+            f"{API}/",
+            f"{API}/?include_steps=false",
+            f"{API}/?is_active=true",
+            f"{API}/?is_active=false&include_steps=false",
+            f"{API}/?skip=3&limit=4",
+            f"{API}/?limit=5&cursor={cursor}",
+            f"{API}/?limit=0",
+        ]
+        for routine_id in routine_ids:
+            urls += [f"{API}/{routine_id}", f"{API}/{routine_id}?include_steps=false"]
+        urls.append(f"{API}/999999")
+        for url in urls:
+            slow, fast = await both(client, "GET", url)
+            problems += compare_responses(f"GET {url}", slow, fast)
+            checked += 1
+
+        # 쓰기 응답: 각 모드로 실행한 응답 == 직후 기존 경로 상세 조회
+        async def reference_detail(routine_id: int) -> bytes:
+            settings.RESPONSE_FAST_PATH = False
+            return (await client.get(f"{API}/{routine_id}")).content
+
+        new_routine = {
+            "title": TRICKY_TEXT,
+            "description": None,
+            "steps": [{"title": "🧘 명상"}, {"title": "물", "order": 5}, {"title": "끝"}],
+        }
+        for fast_mode in (False, True):
+            mode = "fast" if fast_mode else "slow"
+            settings.RESPONSE_FAST_PATH = fast_mode
+            created = await client.post(f"{API}/", json=new_routine)
+            if created.content != await reference_detail(created.json()["id"]):
+                problems.append(f"POST / ({mode}): body differs from detail")
+
+            settings.RESPONSE_FAST_PATH = fast_mode
+            bulk = await client.post(
+                f"{API}/bulk", json={"routines": [new_routine, {"title": "빈 루틴"}]}
+            )
+            details = [await reference_detail(r["id"]) for r in bulk.json()]
+            if bulk.content != b"[" + b",".join(details) + b"]":
+                problems.append(f"POST /bulk ({mode}): body differs from details")
+
+            settings.RESPONSE_FAST_PATH = fast_mode
+            routine_id = created.json()["id"]
+            updated = await client.put(
+                f"{API}/{routine_id}", json={"title": f"{TRICKY_TEXT} 수정"}
+            )
+            if updated.content != await reference_detail(routine_id):
+                problems.append(f"PUT /{{id}} ({mode}): body differs from detail")
+
+            settings.RESPONSE_FAST_PATH = fast_mode
+            added = await client.post(
+                f"{API}/{routine_id}/steps", json={"title": TRICKY_TEXT}
+            )
+            settings.RESPONSE_FAST_PATH = fast_mode
+            step_id = added.json()["id"]
+            changed = await client.put(
+                f"{API}/{routine_id}/steps/{step_id}",
+                json={"title": "수정된 스텝", "description": "\x01"},
+            )
+            steps = json.loads(await reference_detail(routine_id))["steps"]
+            expected = [step for step in steps if step["id"] == step_id][0]
+            if changed.content != dumps(expected):
+                problems.append(f"PUT steps/{{id}} ({mode}): body differs from detail")
+            if added.json()["title"] != TRICKY_TEXT:
+                problems.append(f"POST steps ({mode}): unexpected body")
+            checked += 5
+
+    assert problems == []
+    assert checked == len(urls) + 10
@@ -0,0 +1,45 @@
+# 🏁 앱 수명 주기 (FastAPI lifespan)
+# - 시작: 엔진 연결, 개발 환경이면 테이블 생성, principal 무효화 구독 시작
+# - 종료: 구독 취소 후 엔진 연결 풀 정리
+import os
+
+import pytest
+from sqlalchemy import inspect
+
+from benchmarks.common import temp_sqlite_url
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+
+async def test_lifespan_starts_and_stops_background_work(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core import database, security
+    from app.core.config import settings
+    from app.main import app
+
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(security, "_redis", client)
+    monkeypatch.setattr(settings, "AUTH_INVALIDATION_BACKEND", "redis")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    url = temp_sqlite_url()
+    previous = (database.async_engine, database.replica_engine)
+    database.use_engines(database.create_db_engine(url, database.PRIMARY))
+
+    try:
+        async with app.router.lifespan_context(app):
+            listener = app.state.invalidation_listener
+            assert listener is not None and not listener.done()
+            async with database.async_engine.connect() as conn:
+                tables = await conn.run_sync(
+                    lambda sync: inspect(sync).get_table_names()
+                )
+            assert {"users", "routines", "coach_usage"} <= set(tables)
+        assert listener.cancelled()
+    finally:
+        await database.async_engine.dispose()
+        if previous[0] is not None:
+            database.use_engines(*previous)
+        else:
+            database.async_engine = database.replica_engine = None
+        await client.aclose()
+        os.remove(url.split(":///", 1)[1])
@@ -0,0 +1,87 @@
+# 🗄️ Alembic 마이그레이션 검사
+# - 빈 DB에 upgrade head → 모델(Base.metadata)과 스키마가 같아야 함 (컬럼 추가 누락 감지)
+# - 마이그레이션 도입 전 create_all DB(0001 상태)도 stamp 없이 이어서 올라가야 함
+# - downgrade base까지 되돌릴 수 있어야 함
+import os
+import tempfile
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+
+pytestmark = [pytest.mark.integration, pytest.mark.db]
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+@pytest.fixture
+def sqlite_path():
+    fd, path = tempfile.mkstemp(prefix="rq_migrate_", suffix=".db")
+    os.close(fd)
+    yield path
+    os.remove(path)
+
+
+def alembic_config(db_url: str) -> Config:
+    # alembic.ini의 로깅 설정(fileConfig)은 다른 테스트의 로거를 끄므로 파일 없이 구성
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.cmd_opts = Namespace(x=[f"db_url={db_url}"])
+    return config
+
+
+def schema_differences(path: str) -> list:
+    from app.models import Base
+    from app.models.routine import STEP_ORDER_CONSTRAINT
+
+    def include_object(obj, name, type_, reflected, compare_to):
+        # 스텝 순서 유일성은 DB별 ddl_if (SQLite 유니크 인덱스 / PostgreSQL 제약)
+        return name != STEP_ORDER_CONSTRAINT and not (
+            type_ == "unique_constraint" and obj.table.name == "steps"
+        )
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_object": include_object}
+        )
+        differences = compare_metadata(context, Base.metadata)
+    engine.dispose()
+    return differences
+
+
+def test_upgrade_head_matches_models(sqlite_path):
+    config = alembic_config(f"sqlite+aiosqlite:///{sqlite_path}")
+    command.upgrade(config, "head")
+    assert schema_differences(sqlite_path) == []
+
+    command.downgrade(config, "base")
+    engine = create_engine(f"sqlite:///{sqlite_path}")
+    assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+    engine.dispose()
+
+
+def test_pre_migration_database_upgrades_after_stamp(sqlite_path):
+    config = alembic_config(f"sqlite+aiosqlite:///{sqlite_path}")
+    command.upgrade(config, "0001")
+    # create_all 시절 DB는 alembic_version이 없음 → stamp 0001 후 upgrade
+    engine = create_engine(f"sqlite:///{sqlite_path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")
+        conn.exec_driver_sql(
+            "INSERT INTO users (email, tier, timezone, streak, grace_tokens,"
+            " is_active, push_enabled, language, total_xp, completed_chains,"
+            " total_steps_done) VALUES"
+            " ('old@routinequest.com', 'free', 'Asia/Seoul', 3, 1, 1, 1, 'ko', 0, 0, 0)"
+        )
+    engine.dispose()
+
+    command.stamp(config, "0001")
+    command.upgrade(config, "head")
+    assert schema_differences(sqlite_path) == []
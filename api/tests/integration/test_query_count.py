@@ -0,0 +1,47 @@
+# 🔢 루틴 목록/상세 조회 쿼리 수 (N+1 회귀 감지)
+# 루틴 수(N)가 늘어도 요청당 쿼리 수가 고정되어야 함
+import pytest
+
+from benchmarks.common import (
+    auth_headers,
+    build_app,
+    count_queries,
+    make_client,
+    seed_routines,
+)
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+# 엔드포인트별 기대 쿼리 수 (principal 캐시 워밍 후, ETag 집계 1회 포함)
+EXPECTED_QUERIES = {
+    "list": 3,  # ETag + 루틴 + 스텝(selectin)
+    "list_without_steps": 2,  # ETag + 루틴
+    "detail": 2,  # ETag + 루틴⋈스텝(joined)
+    "detail_without_steps": 2,  # ETag + 루틴
+}
+
+
+@pytest.mark.parametrize("routine_count", [1, 10, 30, 100])
+async def test_query_count_does_not_grow_with_routines(database, routine_count):
+    engine, session_factory = database
+    routine_ids = await seed_routines(
+        session_factory, routines_per_user=routine_count, steps=5
+    )
+    urls = {
+        "list": "/api/v1/routines/",
+        "list_without_steps": "/api/v1/routines/?include_steps=false",
+        "detail": f"/api/v1/routines/{routine_ids[0]}",
+        "detail_without_steps": f"/api/v1/routines/{routine_ids[0]}?include_steps=false",
+    }
+    counts = {}
+    async with make_client(build_app(session_factory), auth_headers(1)) as client:
+        # principal 캐시 워밍 (사용자 조회는 TTL 창마다 1회)
+        warm = await client.get(f"/api/v1/routines/{routine_ids[0]}/stats")
+        assert warm.status_code == 200
+        for name, url in urls.items():
+            with count_queries(engine) as counter:
+                response = await client.get(url)
+            assert response.status_code == 200, response.text
+            counts[name] = counter.count
+
+    assert counts == EXPECTED_QUERIES
@@ -0,0 +1,217 @@
+# 🔍 엔드포인트 쿼리 실행 계획 회귀 검사 (전체 테이블 스캔 금지)
+# routines.py 전체 시나리오(bench_suite)와 목록 필터 변형을 실행하며 엔진이 보낸 SQL을 모으고,
+# 문장마다 실행 계획을 확인해 실제 테이블을 인덱스 없이 훑는 문장이 있으면 실패
+# - SQLite: EXPLAIN QUERY PLAN의 "SCAN <테이블>" 행 (SEARCH는 인덱스 사용)
+# - PostgreSQL(TEST_DATABASE_URL): enable_seqscan=off에서 EXPLAIN (FORMAT JSON)의 Seq Scan 노드
+#   (작은 테이블은 인덱스가 있어도 Seq Scan을 고르므로 "쓸 수 있는 인덱스가 있는가"를 확인)
+# INSERT는 검사하지 않음, 임시 B-tree 정렬은 실패가 아닌 참고로 보고
+import json
+import re
+from typing import Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from benchmarks.bench_suite import API, build_scenarios, load_targets
+from benchmarks.common import (
+    auth_headers,
+    build_app,
+    make_client,
+    prepare_database,
+    seed_routines,
+)
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+REQUESTS_PER_SCENARIO = 3
+
+# 목록 필터 변형 (복합/부분 인덱스 경로)
+LIST_VARIANTS = (
+    f"{API}/?is_active=true",
+    f"{API}/?is_active=false&include_steps=false",
+    f"{API}/?today_display=true",
+    f"{API}/?today_display=false",
+    f"{API}/?is_active=true&limit=2&cursor=",
+)
+CHECKED_VERBS = ("SELECT", "UPDATE", "DELETE", "WITH")
+SQLITE_ROW = re.compile(r"^(SCAN|SEARCH) (\w+)(?: AS (\w+))?(?: USING (.*))?")
+
+
+class StatementRecorder:
+    """엔진이 실행한 문장을 (SQL → 첫 파라미터, 시나리오 목록)으로 수집"""
+
+    def __init__(self):
+        self.scenario = ""
+        self.statements: Dict[str, dict] = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(CHECKED_VERBS):
+            return
+        entry = self.statements.setdefault(
+            statement, {"parameters": parameters, "scenarios": []}
+        )
+        if self.scenario not in entry["scenarios"]:
+            entry["scenarios"].append(self.scenario)
+
+
+async def record_statements(engine, session_factory, requests: int) -> dict:
+    """전체 시나리오를 requests회씩 실행하며 SQL 수집 (시나리오마다 다른 사용자)"""
+    from sqlalchemy import select, update
+
+    from app.models import Routine
+
+    scenarios = build_scenarios(requests)
+    await seed_routines(
+        session_factory, users=len(scenarios) + 1, routines_per_user=6, steps=4
+    )
+    async with session_factory() as db:
+        user_ids = (
+            (await db.execute(select(Routine.user_id).distinct().order_by("user_id")))
+            .scalars()
+            .all()
+        )
+        # 오늘 페이지 목록이 비지 않도록 목록 변형용 사용자의 루틴 일부를 표시
+        await db.execute(
+            update(Routine)
+            .filter(Routine.user_id == user_ids[-1], Routine.id % 2 == 0)
+            .values(today_display=True)
+        )
+        await db.commit()
+
+    recorder = StatementRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    try:
+        async with make_client(build_app(session_factory)) as client:
+            for scenario, user_id in zip(scenarios, user_ids, strict=False):
+                recorder.scenario = scenario.name
+                headers = auth_headers(user_id)
+                targets = await load_targets(session_factory, user_id)
+                call = await scenario.setup(client, headers, targets)
+                for i in range(requests):
+                    response = await call(i)
+                    if response.status_code >= 400:
+                        raise RuntimeError(
+                            f"{scenario.name}: {response.status_code} {response.text}"
+                        )
+            headers = auth_headers(user_ids[-1])
+            for url in LIST_VARIANTS:
+                recorder.scenario = f"GET {url}"
+                if url.endswith("cursor="):
+                    first = await client.get(url[: -len("&cursor=")], headers=headers)
+                    url += first.headers.get("X-Next-Cursor", "")
+                (await client.get(url, headers=headers)).raise_for_status()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", recorder)
+    return recorder.statements
+
+
+def sqlite_findings(rows, tables) -> Tuple[List[str], List[str], List[str]]:
+    """EXPLAIN QUERY PLAN 행 → (전체 스캔, 사용 인덱스, 임시 정렬)"""
+    scans, indexes, sorts = [], [], []
+    for row in rows:
+        detail = row[-1]
+        if detail.startswith("USE TEMP B-TREE"):
+            sorts.append(detail)
+        match = SQLITE_ROW.match(detail)
+        if not match:
+            continue
+        kind, table, _, using = match.groups()
+        if kind == "SCAN" and table in tables:
+            # 커버링 인덱스 전체 스캔도 행 수에 비례하므로 실패로 봄
+            scans.append(detail)
+        elif using:
+            indexes.append(f"{table}: {using}")
+    return scans, indexes, sorts
+
+
+def postgres_findings(plan) -> Tuple[List[str], List[str], List[str]]:
+    """EXPLAIN (FORMAT JSON) 노드 트리 → (Seq Scan, 사용 인덱스, 정렬)"""
+    scans, indexes, sorts = [], [], []
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        node_type = node["Node Type"]
+        if node_type == "Seq Scan":
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        elif "Index Name" in node:
+            # Bitmap Index Scan 노드에는 테이블 이름이 없음 (부모 Bitmap Heap Scan에 있음)
+            indexes.append(node["Index Name"])
+        elif node_type == "Sort":
+            sorts.append(f"Sort ({', '.join(node.get('Sort Key', []))})")
+    return scans, indexes, sorts
+
+
+async def explain(engine, statements: dict) -> List[dict]:
+    from app.models import Base
+
+    tables = set(Base.metadata.tables)
+    results = []
+    async with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, entry in statements.items():
+            if postgres:
+                explained = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", entry["parameters"]
+                )
+                plan = explained.scalar_one()
+                findings = postgres_findings(
+                    json.loads(plan) if isinstance(plan, str) else plan
+                )
+            else:
+                explained = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", entry["parameters"]
+                )
+                findings = sqlite_findings(explained.all(), tables)
+            scans, indexes, sorts = findings
+            results.append(
+                {
+                    "sql": " ".join(statement.split()),
+                    "scenarios": entry["scenarios"],
+                    "full_scans": scans,
+                    "indexes": sorted(set(indexes)),
+                    "sorts": sorts,
+                }
+            )
+        await conn.rollback()
+    return results
+
+
+def full_scans(results: List[dict]) -> List[dict]:
+    return [
+        {"sql": result["sql"], "full_scans": result["full_scans"]}
+        for result in results
+        if result["full_scans"]
+    ]
+
+
+async def test_sqlite_plans_have_no_full_scans(database):
+    engine, session_factory = database
+    statements = await record_statements(engine, session_factory, REQUESTS_PER_SCENARIO)
+    results = await explain(engine, statements)
+    assert results
+    assert full_scans(results) == []
+    # 복합/부분 인덱스가 실제 계획에 쓰이는지 (PostgreSQL은 작은 테이블에서 다른
+    # 인덱스를 고를 수 있어 SQLite에서만 확인)
+    used = {index for result in results for index in result["indexes"]}
+    for index in (
+        "ix_routines_user_id_is_active_id",
+        "ix_routines_user_id_today_display",
+        "uq_steps_routine_id_order",
+    ):
+        assert any(index in entry for entry in used), index
+
+
+async def test_postgres_plans_have_no_full_scans(postgres_url):
+    engine, session_factory = await prepare_database(postgres_url)
+    try:
+        statements = await record_statements(
+            engine, session_factory, REQUESTS_PER_SCENARIO
+        )
+        results = await explain(engine, statements)
+    finally:
+        await engine.dispose()
+    assert results
+    assert full_scans(results) == []
@@ -0,0 +1,227 @@
+# 📖 읽기 레플리카 라우팅 / read-your-writes / 연결 풀 지표
+# SQLite 파일 두 개를 primary/레플리카로 두고 (복제는 primary 파일을 레플리카로 백업 복사)
+# 실제 get_db/get_read_db 의존성으로 API를 호출해 읽기가 어느 DB로 가는지 확인
+# 1) 쓰기는 primary, 다른 사용자의 읽기는 레플리카 (복제 전이라 새 데이터가 안 보임)
+# 2) 쓰기를 커밋한 사용자는 READ_YOUR_WRITES_SECONDS 동안 primary에서 읽음 → 자기 변경이 보임
+#    표식은 공유 Redis(fakeredis 서버)에 있어 다른 워커의 표식 저장소에서도 보임
+# 3) 창이 지나면 다시 레플리카, 복제 후에는 레플리카에서도 보임
+# 4) 롤백된 쓰기(400 응답)와 조회는 primary 고정을 만들지 않음
+# 5) 풀 지표: 체크아웃 대기 시간 기록, 포화(pool_size=1) 시 대기/타임아웃/사용 중 연결 수
+import asyncio
+import os
+import sqlite3
+
+import pytest
+import pytest_asyncio
+
+from benchmarks.common import auth_headers, build_app, make_client, temp_sqlite_url
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+API = "/api/v1/routines"
+STICKY_WINDOW = 0.3  # 검증용으로 짧게 (초)
+
+
+def sample(name: str, **labels) -> float:
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def read_sessions() -> dict:
+    return {
+        reason: sample("db_read_sessions_total", target=target, reason=reason)
+        for target, reason in (
+            ("replica", "default"),
+            ("primary", "sticky"),
+            ("primary", "no_replica"),
+        )
+    }
+
+
+async def replicate(primary_url: str, replica_url: str, replica_engine) -> None:
+    """primary 파일을 레플리카 파일로 통째로 복사 (SQLite 백업 API)"""
+    await replica_engine.dispose()
+    source = sqlite3.connect(primary_url.split(":///", 1)[1])
+    target = sqlite3.connect(replica_url.split(":///", 1)[1])
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+async def seed_users(session_factory, count: int) -> list:
+    from app.models import Routine, User
+
+    async with session_factory() as db:
+        users = [
+            User(email=f"replica{u}@routinequest.com", username=f"replica{u}")
+            for u in range(count)
+        ]
+        db.add_all(users)
+        await db.flush()
+        for user in users:
+            db.add(Routine(user_id=user.id, title=f"기존 루틴 {user.id}"))
+        await db.commit()
+        return [user.id for user in users]
+
+
+@pytest_asyncio.fixture
+async def shared_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    clients = []
+
+    def client():
+        clients.append(fakeredis.FakeAsyncRedis(server=server))
+        return clients[-1]
+
+    yield client
+    for opened in clients:
+        await opened.aclose()
+
+
+@pytest_asyncio.fixture
+async def replicated(shared_redis):
+    """primary/레플리카 엔진을 연결하고 (primary URL, 레플리카 URL, 레플리카 엔진) 반환"""
+    from app.core import database
+    from app.models import Base
+
+    primary_url, replica_url = temp_sqlite_url(), temp_sqlite_url()
+    primary = database.create_db_engine(primary_url, database.PRIMARY)
+    replica = database.create_db_engine(replica_url, database.REPLICA)
+    previous = (database.async_engine, database.replica_engine)
+    database.use_engines(primary, replica)
+    database.use_recent_writers(
+        database.RedisRecentWriters(STICKY_WINDOW, client=shared_redis())
+    )
+    async with primary.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield primary_url, replica_url, replica
+
+    await primary.dispose()
+    await replica.dispose()
+    if previous[0] is not None:
+        database.use_engines(*previous)
+    else:  # 다음 get_async_engine()이 설정 URL로 다시 만들도록
+        database.async_engine = database.replica_engine = None
+    database.use_recent_writers(None)
+    for url in (primary_url, replica_url):
+        os.remove(url.split(":///", 1)[1])
+
+
+async def test_reads_route_to_replica_except_recent_writers(replicated, shared_redis):
+    from app.core import database
+    from app.core.cache import LRUCache, NullBackend, TieredCache
+
+    primary_url, replica_url, replica = replicated
+    writer, reader, rolled_back = await seed_users(database.AsyncSessionLocal, 3)
+    await replicate(primary_url, replica_url, replica)
+    # 다른 워커의 표식 저장소 (같은 Redis, 다른 연결)
+    other_worker = database.RedisRecentWriters(STICKY_WINDOW, client=shared_redis())
+
+    # 캐시 없이 매번 DB 조회 (캐시 hit이 라우팅을 가리지 않도록)
+    app = build_app(None, cache=TieredCache(NullBackend(), LRUCache(0, 0), ttl=0))
+
+    async def titles(client, user_id: int) -> list:
+        response = await client.get(f"{API}/", headers=auth_headers(user_id))
+        response.raise_for_status()
+        return [routine["title"] for routine in response.json()]
+
+    async with make_client(app) as client:
+        before = read_sessions()
+        created = await client.post(
+            f"{API}/", json={"title": "방금 만든 루틴"}, headers=auth_headers(writer)
+        )
+        assert created.status_code == 200
+        routine_id = created.json()["id"]
+        assert await other_worker.wrote_recently(writer)
+
+        writer_titles = await titles(client, writer)
+        detail = await client.get(f"{API}/{routine_id}", headers=auth_headers(writer))
+        assert "방금 만든 루틴" in writer_titles and detail.status_code == 200
+        await titles(client, reader)
+        after = read_sessions()
+        assert after["sticky"] - before["sticky"] == 2
+        assert after["default"] - before["default"] == 1
+        assert not await other_worker.wrote_recently(reader)
+
+        # 롤백된 쓰기: 잠금 UPDATE 후 범위 검증 실패(400) → 롤백 → primary 고정 없음
+        steps_created = await client.post(
+            f"{API}/",
+            json={"title": "롤백 확인", "steps": [{"title": "하나"}]},
+            headers=auth_headers(rolled_back),
+        )
+        await other_worker.forget(rolled_back)
+        routine = steps_created.json()
+        rejected = await client.patch(
+            f"{API}/{routine['id']}/steps/{routine['steps'][0]['id']}/reorder"
+            "?new_order=5",
+            headers=auth_headers(rolled_back),
+        )
+        assert rejected.status_code == 400
+        assert not await other_worker.wrote_recently(rolled_back)
+
+        await asyncio.sleep(STICKY_WINDOW + 0.1)
+        stale = await titles(client, writer)
+        assert "방금 만든 루틴" not in stale
+        assert not await other_worker.wrote_recently(writer)
+        await replicate(primary_url, replica_url, replica)
+        assert "방금 만든 루틴" in await titles(client, writer)
+
+    for pool in (database.PRIMARY, database.REPLICA):
+        assert sample("db_pool_checkout_wait_seconds_count", pool=pool) > 0
+
+
+async def test_unreachable_marker_store_reads_primary(replicated):
+    from app.core import database
+
+    class Broken:
+        async def exists(self, key):
+            raise ConnectionError("redis down")
+
+    database.use_recent_writers(database.RedisRecentWriters(1, client=Broken()))
+    before = read_sessions()["sticky"]
+    async with await database.read_session(1):
+        pass
+    assert read_sessions()["sticky"] - before == 1
+
+
+async def test_saturated_pool_metrics(monkeypatch):
+    """pool_size=1, max_overflow=0 풀에서 대기/타임아웃/포화도 지표 확인"""
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    from app.core import database
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.2)
+    pool = "saturation"
+    url = temp_sqlite_url()
+    engine = database.create_db_engine(url, pool)
+
+    hold = 0.1  # pool_timeout(0.2)보다 짧게 잡고 있다가 반납
+    wait_sum = sample("db_pool_checkout_wait_seconds_sum", pool=pool)
+    timeouts = sample("db_pool_checkout_timeouts_total", pool=pool)
+
+    async def waiter() -> None:
+        async with engine.connect():
+            pass
+
+    async with engine.connect():
+        in_use = sample("db_pool_connections_in_use", pool=pool)
+        capacity = sample("db_pool_connections_max", pool=pool)
+        assert in_use == capacity == 1
+        with pytest.raises(PoolTimeoutError):
+            await waiter()
+        assert sample("db_pool_checkout_timeouts_total", pool=pool) - timeouts == 1
+        # 타임아웃 한도 안에서 반납을 기다리는 체크아웃
+        pending = asyncio.ensure_future(waiter())
+        await asyncio.sleep(hold)
+    await pending
+
+    waited = sample("db_pool_checkout_wait_seconds_sum", pool=pool) - wait_sum
+    assert waited >= 0.2 + hold * 0.9
+    assert sample("db_pool_connections_in_use", pool=pool) == 0
+    await engine.dispose()
+    os.remove(url.split(":///", 1)[1])
@@ -0,0 +1,133 @@
+# 🏃 퀘스트 실행 기록 (POST /routines/{id}/runs)
+# 증분 통계/XP 적립과 run_id 재전송 멱등성, 스텝을 지워도 남는 이벤트 로그
+import pytest
+from sqlalchemy import func, select, text
+
+from benchmarks.common import auth_headers, build_app, make_client, seed_routines
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+API = "/api/v1/routines"
+
+
+async def post_run(client, routine_id: int, steps: list, run_id=None):
+    body = {"steps": steps}
+    if run_id is not None:
+        body["run_id"] = run_id
+    return await client.post(f"{API}/{routine_id}/runs", json=body)
+
+
+async def test_run_updates_stats_and_xp(database):
+    from app.models import Routine, Step, User
+
+    _, session_factory = database
+    (routine_id,) = await seed_routines(session_factory, routines_per_user=1, steps=2)
+    async with make_client(build_app(session_factory), auth_headers(1)) as client:
+        response = await post_run(
+            client,
+            routine_id,
+            [
+                {"step_id": 1, "status": "completed", "duration_sec": 60},
+                {"step_id": 2, "status": "skipped"},
+            ],
+        )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["duplicate"] is False
+    assert body["steps_completed"] == 1 and body["steps_skipped"] == 1
+    assert body["success"] is False  # 필수 스텝 2 스킵
+
+    async with session_factory() as db:
+        step = await db.get(Step, 1)
+        routine = await db.get(Routine, routine_id)
+        user = await db.get(User, 1)
+    assert (step.completion_count, step.avg_time_spent) == (1, 60)
+    assert (routine.total_completions, routine.success_rate) == (1, 0)
+    assert user.total_xp == body["xp_earned"] == step.xp_reward
+    assert user.last_activity_date is not None
+
+
+async def test_retried_run_is_recorded_once(database):
+    from app.models import Routine, StepEvent, User
+
+    _, session_factory = database
+    (routine_id,) = await seed_routines(session_factory, routines_per_user=1, steps=2)
+    steps = [
+        {"step_id": 1, "status": "completed", "duration_sec": 30},
+        {"step_id": 2, "status": "completed", "duration_sec": 40},
+    ]
+    async with make_client(build_app(session_factory), auth_headers(1)) as client:
+        first = await post_run(client, routine_id, steps, run_id="run-1")
+        retry = await post_run(client, routine_id, steps, run_id="run-1")
+        # 스텝 구성이 달라도 run_id가 같으면 같은 실행
+        partial = await post_run(client, routine_id, steps[1:], run_id="run-1")
+        other = await post_run(client, routine_id, steps, run_id="run-2")
+
+    assert [r.status_code for r in (first, retry, partial, other)] == [200] * 4
+    assert first.json()["duplicate"] is False
+    assert retry.json()["duplicate"] is True and partial.json()["duplicate"] is True
+    assert retry.json()["xp_earned"] == first.json()["xp_earned"]
+    assert other.json()["duplicate"] is False
+
+    async with session_factory() as db:
+        events = await db.scalar(select(func.count()).select_from(StepEvent))
+        routine = await db.get(Routine, routine_id)
+        user = await db.get(User, 1)
+    assert events == 4
+    assert routine.total_completions == 2
+    assert user.total_xp == 2 * first.json()["xp_earned"]
+
+
+async def test_run_ids_are_scoped_per_user(database):
+    _, session_factory = database
+    first_routine, second_routine = await seed_routines(
+        session_factory, users=2, routines_per_user=1, steps=1
+    )
+    app = build_app(session_factory)
+    async with make_client(app) as client:
+        responses = [
+            await client.post(
+                f"{API}/{routine_id}/runs",
+                json={
+                    "run_id": "same",
+                    "steps": [{"step_id": step_id, "status": "completed"}],
+                },
+                headers=auth_headers(user_id),
+            )
+            for user_id, routine_id, step_id in (
+                (1, first_routine, 1),
+                (2, second_routine, 2),
+            )
+        ]
+    assert [r.json()["duplicate"] for r in responses] == [False, False]
+
+
+async def test_deleting_a_step_keeps_its_events(database):
+    from app.models import Step, StepEvent
+
+    _, session_factory = database
+    (routine_id,) = await seed_routines(session_factory, routines_per_user=1, steps=2)
+    async with make_client(build_app(session_factory), auth_headers(1)) as client:
+        response = await post_run(
+            client,
+            routine_id,
+            [
+                {"step_id": 1, "status": "completed", "duration_sec": 30},
+                {"step_id": 2, "status": "completed", "duration_sec": 40},
+            ],
+        )
+    assert response.status_code == 200, response.text
+
+    async with session_factory() as db:
+        # SQLite는 연결마다 FK 검사를 켜야 ON DELETE 동작이 실행됨
+        await db.execute(text("PRAGMA foreign_keys=ON"))
+        await db.delete(await db.get(Step, 1))
+        await db.commit()
+        events = (
+            await db.execute(
+                select(StepEvent.step_id, StepEvent.xp_awarded).order_by(StepEvent.seq)
+            )
+        ).all()
+    # 이벤트 로그는 그대로 - 시즌 XP 합계도 유지
+    assert [step_id for step_id, _ in events] == [None, 2]
+    assert sum(xp for _, xp in events) == response.json()["xp_earned"]
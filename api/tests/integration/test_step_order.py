@@ -0,0 +1,97 @@
+# 🔀 스텝 순서 편집 (추가/수정/삭제/개별 이동/전체 순서 일괄 변경)
+# (routine_id, order) 유일 제약을 지키며 순서를 바꾸고, 루틴 version으로 동시 편집 충돌 감지
+import pytest
+import pytest_asyncio
+
+from benchmarks.common import auth_headers, build_app, make_client, seed_routines
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.db]
+
+API = "/api/v1/routines"
+
+
+async def create_routine(client, *titles: str) -> dict:
+    response = await client.post(
+        f"{API}/",
+        json={"title": "아침 루틴", "steps": [{"title": title} for title in titles]},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def step_titles(client, routine_id: int) -> list:
+    routine = (await client.get(f"{API}/{routine_id}")).json()
+    return [
+        step["title"] for step in sorted(routine["steps"], key=lambda s: s["order"])
+    ]
+
+
+@pytest_asyncio.fixture
+async def client(database):
+    _, session_factory = database
+    await seed_routines(session_factory, routines_per_user=0)
+    async with make_client(build_app(session_factory), auth_headers(1)) as client:
+        yield client
+
+
+async def test_add_update_and_delete_steps(client):
+    routine = await create_routine(client, "물 마시기", "스트레칭")
+    base = f"{API}/{routine['id']}/steps"
+
+    added = await client.post(base, json={"title": "명상"})
+    assert added.status_code == 200 and added.json()["order"] == 3
+    conflict = await client.post(base, json={"title": "중복", "order": 1})
+    assert conflict.status_code == 409
+
+    step_id = added.json()["id"]
+    updated = await client.put(
+        f"{base}/{step_id}", json={"title": "명상 5분", "t_ref_sec": 300}
+    )
+    assert updated.json()["title"] == "명상 5분"
+    assert updated.json()["t_ref_sec"] == 300
+    assert (await client.put(f"{base}/999", json={"title": "x"})).status_code == 404
+
+    assert (await client.delete(f"{base}/{step_id}")).status_code == 200
+    assert (await client.delete(f"{base}/{step_id}")).status_code == 404
+    assert await step_titles(client, routine["id"]) == ["물 마시기", "스트레칭"]
+    missing = await client.post(f"{API}/999/steps", json={"title": "x"})
+    assert missing.status_code == 404
+
+
+async def test_move_single_step(client):
+    routine = await create_routine(client, "하나", "둘", "셋", "넷")
+    base = f"{API}/{routine['id']}/steps"
+    first, *_, last = routine["steps"]
+
+    moved = await client.patch(f"{base}/{first['id']}/reorder?new_order=3")
+    assert moved.status_code == 200
+    assert await step_titles(client, routine["id"]) == ["둘", "셋", "하나", "넷"]
+
+    await client.patch(f"{base}/{last['id']}/reorder?new_order=1")
+    assert await step_titles(client, routine["id"]) == ["넷", "둘", "셋", "하나"]
+
+    out_of_range = await client.patch(f"{base}/{last['id']}/reorder?new_order=9")
+    assert out_of_range.status_code == 400
+    assert (await client.patch(f"{base}/999/reorder?new_order=1")).status_code == 404
+
+
+async def test_reorder_all_steps_with_version_check(client):
+    routine = await create_routine(client, "하나", "둘", "셋")
+    routine = (await client.get(f"{API}/{routine['id']}")).json()
+    url = f"{API}/{routine['id']}/steps/order"
+    ids = [step["id"] for step in routine["steps"]]
+    version = routine["version"]
+
+    reordered = await client.put(url, json={"step_ids": ids[::-1], "version": version})
+    assert reordered.status_code == 200, reordered.text
+    assert reordered.json()["version"] == version + 1
+    assert await step_titles(client, routine["id"]) == ["셋", "둘", "하나"]
+
+    stale = await client.put(url, json={"step_ids": ids, "version": version})
+    assert stale.status_code == 409
+    partial = await client.put(url, json={"step_ids": ids[:2], "version": version + 1})
+    assert partial.status_code == 400
+    missing = await client.put(
+        f"{API}/999/steps/order", json={"step_ids": ids, "version": 1}
+    )
+    assert missing.status_code == 404
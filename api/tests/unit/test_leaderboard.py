@@ -0,0 +1,235 @@
+# 🏆 리더보드 재구축 / 티어 이동
+# 인메모리 백엔드와 fakeredis(Lua) 백엔드에 같은 시나리오 실행
+# - 재구축 중(staging 작성 중, 교체 직후) 들어온 증분이 유실/중복되지 않음
+# - 시즌 보드는 현재 스텝 xp_reward가 아니라 이벤트가 적립한 xp_awarded 합계
+# - 티어 변경/비활성화 시 보드 이동/제거
+# - 시즌 보드는 UTC 날짜의 ISO 주차, 증분/재구축 모두 만료가 걸림 (주마다 키가 쌓이지 않음)
+import time
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.unit, pytest.mark.db]
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def leaderboard(request):
+    from app.services.leaderboard import (
+        InMemoryLeaderboardBackend,
+        Leaderboard,
+        RedisLeaderboardBackend,
+    )
+
+    if request.param == "memory":
+        yield Leaderboard(InMemoryLeaderboardBackend())
+        return
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis()
+    yield Leaderboard(RedisLeaderboardBackend(client=client))
+    await client.aclose()
+
+
+async def seed_users(session_factory, *tiers: str) -> list:
+    from app.models import User
+
+    async with session_factory() as db:
+        users = [
+            User(
+                email=f"lb{n}@routinequest.com",
+                username=f"lb{n}",
+                tier=tier,
+                total_xp=100 * (n + 1),
+            )
+            for n, tier in enumerate(tiers)
+        ]
+        db.add_all(users)
+        await db.commit()
+        return [user.id for user in users]
+
+
+async def earn(session_factory, leaderboard, user_id: int, tier: str, xp: int):
+    """실행 기록 경로와 같은 순서: DB 커밋 후 리더보드 증분"""
+    from app.models import User
+
+    async with session_factory() as db:
+        await db.execute(
+            update(User).where(User.id == user_id).values(total_xp=User.total_xp + xp)
+        )
+        await db.commit()
+    await leaderboard.record_xp(user_id, tier, xp)
+
+
+async def xp(leaderboard, board: str, user_id: int):
+    score = await leaderboard.backend.score(board, user_id)
+    return None if score is None else int(score)
+
+
+async def test_increment_while_staging_is_not_lost(database, leaderboard):
+    _, session_factory = database
+    first, second = await seed_users(session_factory, "free", "pro")
+    await leaderboard.record_xp(first, "free", 100)  # 기존 라이브 보드
+
+    stage_season = leaderboard._stage_season
+
+    async def write_then_stage(*args):
+        # 사용자 staging이 끝난 뒤(이미 옛 값이 staging에 있음) 들어온 증분
+        await earn(session_factory, leaderboard, first, "free", 50)
+        await stage_season(*args)
+
+    leaderboard._stage_season = write_then_stage
+    async with session_factory() as db:
+        assert await leaderboard.rebuild_from_db(db, settle_seconds=0) == 2
+
+    assert await xp(leaderboard, leaderboard.global_board(), first) == 150
+    assert await xp(leaderboard, leaderboard.tier_board("free"), first) == 150
+    assert await xp(leaderboard, leaderboard.tier_board("pro"), second) == 200
+    assert await leaderboard.backend.size(f"{leaderboard.global_board()}:rebuild") == 0
+
+
+async def test_increment_right_after_swap_is_not_double_counted(database, leaderboard):
+    from app.models import User
+
+    _, session_factory = database
+    (user_id,) = await seed_users(session_factory, "free")
+    # DB 커밋은 재구축이 읽기 전에, 리더보드 증분은 교체 직후에 도착한 요청
+    async with session_factory() as db:
+        await db.execute(update(User).where(User.id == user_id).values(total_xp=130))
+        await db.commit()
+    swap = leaderboard.backend.swap
+
+    async def swap_then_record(*args):
+        swapped = await swap(*args)
+        if swapped == 1:
+            await leaderboard.record_xp(user_id, "free", 30)
+        return swapped
+
+    leaderboard.backend.swap = swap_then_record
+    async with session_factory() as db:
+        await leaderboard.rebuild_from_db(db, settle_seconds=0)
+
+    assert await xp(leaderboard, leaderboard.global_board(), user_id) == 130
+    assert await xp(leaderboard, leaderboard.season_board(), user_id) is None
+    # 재구축이 끝나면 표식이 사라져 다음 재구축을 시작할 수 있음
+    assert await leaderboard.backend.begin_rebuild(leaderboard.rebuild_marker(), 1)
+
+
+async def test_concurrent_rebuild_is_rejected(database, leaderboard):
+    _, session_factory = database
+    await leaderboard.backend.begin_rebuild(leaderboard.rebuild_marker(), 60)
+    async with session_factory() as db:
+        with pytest.raises(RuntimeError):
+            await leaderboard.rebuild_from_db(db, settle_seconds=0)
+
+
+async def test_season_sums_awarded_xp(database, leaderboard):
+    from app.core.database import utcnow
+    from app.models import Routine, Step, StepEvent, User
+    from app.models.step_event import StepEventStatus
+
+    _, session_factory = database
+    active, inactive = await seed_users(session_factory, "free", "free")
+    async with session_factory() as db:
+        routine = Routine(user_id=active, title="시즌")
+        db.add(routine)
+        await db.flush()
+        step = Step(routine_id=routine.id, title="물 마시기", order=0, xp_reward=100)
+        db.add(step)
+        await db.flush()
+        for seq, (user_id, awarded) in enumerate(((active, 7), (inactive, 9))):
+            db.add(
+                StepEvent(
+                    user_id=user_id,
+                    routine_id=routine.id,
+                    step_id=step.id,
+                    run_id="season",
+                    seq=seq,
+                    status=StepEventStatus.COMPLETED.value,
+                    xp_awarded=awarded,
+                    occurred_at=utcnow(),
+                )
+            )
+        # 적립 이후 스텝 보상이 바뀌어도 시즌 합계는 적립 당시 값
+        await db.execute(update(Step).where(Step.id == step.id).values(xp_reward=500))
+        await db.execute(
+            update(User).where(User.id == inactive).values(is_active=False)
+        )
+        await db.commit()
+
+        await leaderboard.rebuild_from_db(db, settle_seconds=0)
+
+    season = leaderboard.season_board()
+    assert await xp(leaderboard, season, active) == 7
+    assert await xp(leaderboard, season, inactive) is None
+    assert await xp(leaderboard, leaderboard.global_board(), inactive) is None
+
+
+async def test_move_tier_and_remove_user(leaderboard):
+    await leaderboard.record_xp(1, "free", 40)
+    await leaderboard.move_tier(1, "free", "pro")
+
+    assert await xp(leaderboard, leaderboard.tier_board("free"), 1) is None
+    assert await xp(leaderboard, leaderboard.tier_board("pro"), 1) == 40
+    assert await xp(leaderboard, leaderboard.global_board(), 1) == 40
+
+    await leaderboard.remove_user(1, "pro")
+    for board in leaderboard.boards_for("pro"):
+        assert await xp(leaderboard, board, 1) is None
+
+
+async def ttl(leaderboard, board: str) -> float:
+    """보드 남은 수명(초) - 만료가 없으면 -1"""
+    backend = leaderboard.backend
+    if hasattr(backend, "_redis"):
+        return await backend._redis.ttl(board)
+    deadline = backend._expires.get(board)
+    return -1 if deadline is None else deadline - time.monotonic()
+
+
+async def test_season_boards_expire(database, leaderboard):
+    from app.core.database import utcnow
+    from app.models import Routine, Step, StepEvent
+    from app.services.leaderboard import SEASON_TTL_SECONDS
+
+    _, session_factory = database
+    (user_id,) = await seed_users(session_factory, "free")
+    await leaderboard.record_xp(user_id, "free", 30)
+    season = leaderboard.season_board()
+    assert SEASON_TTL_SECONDS - 5 < await ttl(leaderboard, season)
+    assert await ttl(leaderboard, leaderboard.global_board()) == -1
+
+    # 재구축으로 교체된 시즌 보드도 만료 유지
+    async with session_factory() as db:
+        routine = Routine(user_id=user_id, title="시즌")
+        db.add(routine)
+        await db.flush()
+        step = Step(routine_id=routine.id, title="물 마시기", order=1)
+        db.add(step)
+        await db.flush()
+        db.add(
+            StepEvent(
+                user_id=user_id,
+                routine_id=routine.id,
+                step_id=step.id,
+                run_id="season",
+                seq=0,
+                status="completed",
+                xp_awarded=30,
+                occurred_at=utcnow(),
+            )
+        )
+        await db.commit()
+        await leaderboard.rebuild_from_db(db, settle_seconds=0)
+    assert await xp(leaderboard, season, user_id) == 30
+    assert SEASON_TTL_SECONDS - 5 < await ttl(leaderboard, season)
+
+
+def test_season_week_uses_utc(monkeypatch):
+    from app.services import leaderboard as module
+
+    # 일요일 23:30 UTC = 서울 월요일 08:30 - 서버 현지 날짜와 관계없이 UTC 주차
+    monkeypatch.setattr(module, "utcnow", lambda: datetime(2025, 1, 5, 23, 30))
+    board = module.Leaderboard(module.InMemoryLeaderboardBackend()).season_board()
+    assert board == "rq:lb:season:2025-W01"
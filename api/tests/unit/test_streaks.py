@@ -0,0 +1,233 @@
+# 🔥 야간 스트릭 배치
+# - compute_streaks: 활동/보호권/끊김/리필 벡터 계산
+# - run: 이벤트 로그 기준 활동일, 잘못된 시간대 건너뛰기, 빠진 배치의 날짜 차례로 마감
+# - 시간대별 조회가 (timezone, streak_processed_date, id) 인덱스를 사용 (전체 스캔/정렬 없음)
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pytest
+
+pytestmark = pytest.mark.unit
+
+SUNDAY = date(2025, 1, 5)
+MONDAY = date(2025, 1, 6)
+
+
+def frame(**columns) -> pd.DataFrame:
+    return pd.DataFrame(columns)
+
+
+def test_compute_streaks_outcomes():
+    from app.jobs.streaks import compute_streaks
+
+    users = frame(
+        id=[1, 2, 3, 4, 5],
+        streak=[4, 4, 4, 0, 2],
+        grace_tokens=[0, 1, 0, 0, 0],
+        # 5번: 이벤트는 없지만 마지막 활동이 그날 (이벤트 로그 도입 전 활동)
+        last_activity_date=[None, None, None, None, datetime(2025, 1, 6, 3, 0)],
+        logged=[True, False, False, False, False],
+    )
+    result = compute_streaks(users, MONDAY, "Asia/Seoul")
+
+    assert result["outcome"].tolist() == [
+        "continued",
+        "protected",
+        "broken",
+        "idle",
+        "continued",
+    ]
+    assert result["streak"].tolist() == [5, 4, 0, 0, 3]
+    assert result["grace_tokens"].tolist() == [0, 0, 0, 0, 0]
+
+
+def test_compute_streaks_refills_tokens_on_sunday():
+    from app.jobs.streaks import WEEKLY_GRACE_TOKENS, compute_streaks
+
+    users = frame(
+        id=[1, 2],
+        streak=[3, 3],
+        grace_tokens=[1, 0],
+        last_activity_date=[None, None],
+        logged=[False, True],
+    )
+    result = compute_streaks(users, SUNDAY, "Asia/Seoul")
+    # 보호권을 쓰고도 일요일 마감에 리필
+    assert result["grace_tokens"].tolist() == [WEEKLY_GRACE_TOKENS] * 2
+
+
+def test_local_day_bounds_follow_dst():
+    from app.jobs.streaks import local_day_bounds
+
+    start, end = local_day_bounds(date(2025, 3, 9), "America/New_York")
+    assert start == datetime(2025, 3, 9, 5, 0)
+    assert end == datetime(2025, 3, 10, 4, 0)  # 23시간짜리 하루
+
+
+@pytest.fixture
+def streak_db(monkeypatch, tmp_path):
+    """임시 SQLite에 바인딩한 동기 세션 (배치가 쓰는 SessionLocal/get_engine 교체)"""
+    from sqlalchemy import create_engine
+
+    from app.core import database
+    from app.models import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'streaks.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, "engine", engine)
+    database.SessionLocal.configure(bind=engine)
+    yield database.SessionLocal
+    database.SessionLocal.configure(bind=None)
+    engine.dispose()
+
+
+def add_user(db, email: str, tz: str, streak: int, events=(), last_activity=None):
+    from app.models import Routine, Step, StepEvent, User
+
+    user = User(
+        email=email,
+        timezone=tz,
+        streak=streak,
+        grace_tokens=0,
+        last_activity_date=last_activity,
+    )
+    db.add(user)
+    db.flush()
+    routine = Routine(user_id=user.id, title="루틴")
+    db.add(routine)
+    db.flush()
+    step = Step(routine_id=routine.id, order=1, title="스텝")
+    db.add(step)
+    db.flush()
+    db.add_all(
+        StepEvent(
+            user_id=user.id,
+            routine_id=routine.id,
+            step_id=step.id,
+            run_id=f"{email}-{index}",
+            seq=0,
+            status="completed",
+            occurred_at=occurred_at,
+        )
+        for index, occurred_at in enumerate(events)
+    )
+    return user
+
+
+def test_run_uses_event_log_and_skips_bad_timezones(streak_db, caplog):
+    from app.jobs.streaks import run
+    from app.models import User
+
+    # 서울 1월 6일 01:00 (UTC 1월 5일 16:00) 배치 → 서울 사용자의 1월 5일 마감
+    now = datetime(2025, 1, 5, 16, 0, tzinfo=timezone.utc)
+    with streak_db() as db:
+        night_owl = add_user(
+            db,
+            "owl@routinequest.com",
+            "Asia/Seoul",
+            streak=5,
+            # 1월 5일 22:00, 자정 넘어 1월 6일 00:30 (서울) - 마지막 활동은 오늘
+            events=[datetime(2025, 1, 5, 13, 0), datetime(2025, 1, 5, 15, 30)],
+            last_activity=datetime(2025, 1, 5, 15, 30),
+        )
+        idle = add_user(db, "idle@routinequest.com", "Asia/Seoul", streak=2)
+        typo = add_user(db, "typo@routinequest.com", "Asia/Seol", streak=7)
+        utc_user = add_user(
+            db,
+            "utc@routinequest.com",
+            "UTC",
+            streak=1,
+            events=[datetime(2025, 1, 4, 23, 59)],
+        )
+        db.commit()
+        ids = night_owl.id, idle.id, typo.id, utc_user.id
+
+    results = {result.timezone: result for result in run(now)}
+
+    assert results["Asia/Seol"].error is not None
+    assert "Asia/Seol" in caplog.text
+    assert results["Asia/Seoul"].continued == 1 and results["Asia/Seoul"].broken == 1
+    assert results["UTC"].day == date(2025, 1, 4) and results["UTC"].continued == 1
+    with streak_db() as db:
+        streaks = [db.get(User, user_id).streak for user_id in ids]
+        processed = db.get(User, ids[0]).streak_processed_date
+    assert streaks == [6, 0, 7, 2]
+    assert processed == date(2025, 1, 5)
+
+    # 같은 날 다시 실행해도 중복 처리 없음
+    assert sum(result.users for result in run(now)) == 0
+
+
+def test_run_closes_days_missed_by_a_skipped_run(streak_db):
+    from app.jobs.streaks import run
+    from app.models import User
+
+    def noon(day: int) -> datetime:
+        return datetime(2025, 1, day, 12, 0)
+
+    with streak_db() as db:
+        regular = add_user(
+            db, "regular@routinequest.com", "UTC", 3, [noon(2), noon(3), noon(4)]
+        )
+        missed = add_user(db, "missed@routinequest.com", "UTC", 3, [noon(2), noon(4)])
+        db.commit()
+        ids = [regular.id, missed.id]
+
+    run(datetime(2025, 1, 3, 0, 10, tzinfo=timezone.utc))  # 1월 2일 마감
+    with streak_db() as db:
+        # 마감 이력이 없는 기존 사용자 - 밀린 날이 아니라 어제부터 마감
+        ids.append(add_user(db, "new@routinequest.com", "UTC", 2, [noon(4)]).id)
+        db.commit()
+
+    # 1월 4일 00:10 배치가 빠지고 1월 5일 00:10에 실행 → 1월 3일, 4일 차례로 마감
+    results = run(datetime(2025, 1, 5, 0, 10, tzinfo=timezone.utc))
+
+    assert [(result.day, result.users) for result in results] == [
+        (date(2025, 1, 3), 2),
+        (date(2025, 1, 4), 3),
+    ]
+    assert results[0].broken == 1
+    with streak_db() as db:
+        users = [db.get(User, user_id) for user_id in ids]
+        assert [user.streak for user in users] == [6, 1, 3]
+        assert {user.streak_processed_date for user in users} == {date(2025, 1, 4)}
+
+
+def test_run_reads_users_through_the_timezone_index(streak_db):
+    from sqlalchemy import event
+
+    from app.core import database
+    from app.jobs.streaks import run
+
+    with streak_db() as db:
+        for index, tz in enumerate(["UTC", "Asia/Seoul", "America/New_York"]):
+            add_user(db, f"u{index}@routinequest.com", tz, streak=1)
+        db.commit()
+    run(datetime(2025, 1, 5, 0, 10, tzinfo=timezone.utc))
+
+    statements = []
+
+    def record(conn, cursor, sql, params, *_):
+        statements.append((sql, params))
+
+    engine = database.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # 이미 마감한 시간대 재실행 + 다음 날 마감
+        run(datetime(2025, 1, 5, 0, 40, tzinfo=timezone.utc))
+        run(datetime(2025, 1, 6, 0, 10, tzinfo=timezone.utc))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    with engine.connect() as conn:
+        plans = [
+            [
+                row[-1]
+                for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+            ]
+            for sql, params in statements
+            if sql.lstrip().startswith("SELECT") and "FROM users" in sql
+        ]
+    assert plans
+    for plan in plans:
+        assert all("ix_users_timezone_streak_processed_date_id" in row for row in plan)
+        assert not any(row.startswith("USE TEMP B-TREE") for row in plan)